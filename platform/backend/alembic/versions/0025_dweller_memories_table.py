@@ -0,0 +1,169 @@
+"""Move dweller episodic memories into platform_dweller_memories.
+
+Episodic memories were a never-truncated JSONB array on platform_dwellers, so
+every action rewrote (and re-TOASTed) the dweller's whole history. This moves
+them to an append-only table indexed by (dweller_id, created_at, seq):
+
+1. Create platform_dweller_memories
+2. Backfill one row per array element, preserving array order via seq
+3. Store the per-dweller count in platform_dwellers.episodic_memory_count
+4. Drop platform_dwellers.episodic_memories
+
+Downgrade rebuilds the JSONB array from the table.
+
+Revision ID: 0025
+Revises: 0024
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0025"
+down_revision = "0024"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+UUID_PATTERN = "^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+# Keys that map onto real columns; everything else is kept in `extra`.
+EPISODE_COLUMN_KEYS = "ARRAY['id', 'action_id', 'timestamp', 'type', 'content', 'target', 'importance']"
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    return result.fetchone() is not None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = :table"
+    ), {"table": table_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not table_exists("platform_dweller_memories"):
+        op.create_table(
+            "platform_dweller_memories",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True,
+                      server_default=sa.text("gen_random_uuid()")),
+            sa.Column("seq", sa.BigInteger(), sa.Identity(), nullable=False),
+            sa.Column("dweller_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("platform_dwellers.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("action_id", postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column("memory_type", sa.String(50), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("target", sa.String(255), nullable=True),
+            sa.Column("importance", sa.Float(), nullable=False, server_default="0.5"),
+            sa.Column("extra", postgresql.JSONB(), nullable=False, server_default="{}"),
+            sa.Column("created_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+        )
+
+    if not index_exists("dweller_memory_dweller_created_idx"):
+        op.create_index(
+            "dweller_memory_dweller_created_idx",
+            "platform_dweller_memories",
+            ["dweller_id", "created_at", "seq"],
+        )
+
+    if not column_exists("platform_dwellers", "episodic_memory_count"):
+        op.add_column("platform_dwellers", sa.Column(
+            "episodic_memory_count", sa.Integer(), nullable=False, server_default="0"
+        ))
+
+    if column_exists("platform_dwellers", "episodic_memories"):
+        # Backfill: one row per array element, in array order (ORDER BY feeds seq).
+        op.execute(f"""
+            INSERT INTO platform_dweller_memories
+                (id, dweller_id, action_id, memory_type, content, target,
+                 importance, extra, created_at)
+            SELECT
+                CASE WHEN e.elem->>'id' ~ '{UUID_PATTERN}'
+                     THEN (e.elem->>'id')::uuid ELSE gen_random_uuid() END,
+                d.id,
+                CASE WHEN e.elem->>'action_id' ~ '{UUID_PATTERN}'
+                     THEN (e.elem->>'action_id')::uuid END,
+                COALESCE(e.elem->>'type', 'unknown'),
+                COALESCE(e.elem->>'content', ''),
+                LEFT(e.elem->>'target', 255),
+                COALESCE((e.elem->>'importance')::float, 0.5),
+                e.elem - {EPISODE_COLUMN_KEYS},
+                COALESCE((e.elem->>'timestamp')::timestamptz, d.created_at)
+            FROM platform_dwellers d
+            CROSS JOIN LATERAL jsonb_array_elements(d.episodic_memories)
+                WITH ORDINALITY AS e(elem, ord)
+            WHERE jsonb_typeof(d.episodic_memories) = 'array'
+              AND jsonb_typeof(e.elem) = 'object'
+            ORDER BY d.id, e.ord
+            ON CONFLICT (id) DO NOTHING
+        """)
+
+        op.execute("""
+            UPDATE platform_dwellers d
+            SET episodic_memory_count = m.total
+            FROM (
+                SELECT dweller_id, COUNT(*) AS total
+                FROM platform_dweller_memories
+                GROUP BY dweller_id
+            ) m
+            WHERE m.dweller_id = d.id
+        """)
+
+        op.drop_column("platform_dwellers", "episodic_memories")
+
+
+def downgrade():
+    if not column_exists("platform_dwellers", "episodic_memories"):
+        op.add_column("platform_dwellers", sa.Column(
+            "episodic_memories", postgresql.JSONB(), nullable=True, server_default="[]"
+        ))
+
+    if table_exists("platform_dweller_memories"):
+        op.execute("""
+            UPDATE platform_dwellers d
+            SET episodic_memories = m.episodes
+            FROM (
+                SELECT
+                    dweller_id,
+                    jsonb_agg(
+                        jsonb_strip_nulls(jsonb_build_object(
+                            'id', id::text,
+                            'action_id', action_id::text,
+                            'timestamp', created_at,
+                            'type', memory_type,
+                            'content', content,
+                            'target', target,
+                            'importance', importance
+                        )) || extra
+                        ORDER BY created_at, seq
+                    ) AS episodes
+                FROM platform_dweller_memories
+                GROUP BY dweller_id
+            ) m
+            WHERE m.dweller_id = d.id
+        """)
+
+    if column_exists("platform_dwellers", "episodic_memory_count"):
+        op.drop_column("platform_dwellers", "episodic_memory_count")
+    if index_exists("dweller_memory_dweller_created_idx"):
+        op.drop_index("dweller_memory_dweller_created_idx", table_name="platform_dweller_memories")
+    if table_exists("platform_dweller_memories"):
+        op.drop_table("platform_dweller_memories")
@@ -0,0 +1,41 @@
+"""Add partial index for a dweller's reflections.
+
+The act/context working memory takes a dweller's newest reflections first,
+then tops up with recent ordinary episodes. This partial index lets the
+reflection half be a bounded range scan instead of walking the whole history.
+
+Revision ID: 0026
+Revises: 0025
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0026"
+down_revision = "0025"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not index_exists("dweller_memory_reflection_idx"):
+        op.create_index(
+            "dweller_memory_reflection_idx",
+            "platform_dweller_memories",
+            ["dweller_id", "created_at", "seq"],
+            postgresql_where=sa.text("memory_type = 'reflection'"),
+        )
+
+
+def downgrade():
+    if index_exists("dweller_memory_reflection_idx"):
+        op.drop_index("dweller_memory_reflection_idx", table_name="platform_dweller_memories")
@@ -0,0 +1,74 @@
+"""Add full-text and semantic search columns to platform_dweller_memories.
+
+- search_vector: generated tsvector over content + target, with a GIN index.
+  It also holds a 'd<dweller hex>' lexeme so a single GIN lookup intersects
+  one dweller's memories with the query terms (no btree_gin needed).
+- embedding: vector(256) for optional semantic recall (filled on write when
+  MEMORY_EMBEDDING_PROVIDER is set; NULL otherwise)
+
+Revision ID: 0027
+Revises: 0026
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0027"
+down_revision = "0026"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    # --- Ensure pgvector extension exists ---
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    if not column_exists("platform_dweller_memories", "search_vector"):
+        op.execute("""
+            ALTER TABLE platform_dweller_memories
+            ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                to_tsvector('simple', 'd' || replace(dweller_id::text, '-', ''))
+                || to_tsvector('english', content || ' ' || coalesce(target, ''))
+            ) STORED
+        """)
+
+    if not index_exists("dweller_memory_search_idx"):
+        op.create_index(
+            "dweller_memory_search_idx",
+            "platform_dweller_memories",
+            ["search_vector"],
+            postgresql_using="gin",
+        )
+
+    if not column_exists("platform_dweller_memories", "embedding"):
+        op.execute(
+            "ALTER TABLE platform_dweller_memories ADD COLUMN embedding vector(256)"
+        )
+
+
+def downgrade():
+    if column_exists("platform_dweller_memories", "embedding"):
+        op.drop_column("platform_dweller_memories", "embedding")
+    if index_exists("dweller_memory_search_idx"):
+        op.drop_index("dweller_memory_search_idx", table_name="platform_dweller_memories")
+    if column_exists("platform_dweller_memories", "search_vector"):
+        op.drop_column("platform_dweller_memories", "search_vector")
@@ -0,0 +1,77 @@
+"""Add platform_activity_events, the append-only feed log.
+
+GET /feed used to run one query per content table (15 in all) and merge the
+results in Python. Mutation endpoints now append the rendered feed item to
+this table, and the feed reads it newest-first through the (sort_date, id)
+keyset index.
+
+History from before this migration is loaded by
+scripts/backfill_activity_events.py (run once after deploying).
+
+Revision ID: 0028
+Revises: 0027
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0028"
+down_revision = "0027"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = :table"
+    ), {"table": table_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not table_exists("platform_activity_events"):
+        op.create_table(
+            "platform_activity_events",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True,
+                      server_default=sa.text("gen_random_uuid()")),
+            sa.Column("event_type", sa.String(50), nullable=False),
+            sa.Column("sort_date", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("subject_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("world_id", postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column("actor_id", postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column("payload", postgresql.JSONB(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+        )
+
+    if not index_exists("activity_event_keyset_idx"):
+        op.create_index(
+            "activity_event_keyset_idx",
+            "platform_activity_events",
+            ["sort_date", "id"],
+        )
+
+    if not index_exists("activity_event_occurrence_idx"):
+        op.create_index(
+            "activity_event_occurrence_idx",
+            "platform_activity_events",
+            ["event_type", "subject_id", "sort_date"],
+            unique=True,
+        )
+
+
+def downgrade():
+    if table_exists("platform_activity_events"):
+        op.drop_table("platform_activity_events")
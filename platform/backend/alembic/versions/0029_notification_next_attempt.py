@@ -0,0 +1,57 @@
+"""Add next_attempt_at to platform_notifications for callback backoff.
+
+process_pending_notifications used to retry every failed callback on each
+run. Failures now schedule next_attempt_at with exponential backoff, and the
+batch query only picks rows that are due, through (status, next_attempt_at).
+
+Revision ID: 0029
+Revises: 0028
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0029"
+down_revision = "0028"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not column_exists("platform_notifications", "next_attempt_at"):
+        op.add_column(
+            "platform_notifications",
+            sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+    if not index_exists("notification_due_idx"):
+        op.create_index(
+            "notification_due_idx",
+            "platform_notifications",
+            ["status", "next_attempt_at"],
+        )
+
+
+def downgrade():
+    if index_exists("notification_due_idx"):
+        op.drop_index("notification_due_idx", table_name="platform_notifications")
+    if column_exists("platform_notifications", "next_attempt_at"):
+        op.drop_column("platform_notifications", "next_attempt_at")
@@ -0,0 +1,88 @@
+"""Add platform_jobs and platform_dead_jobs, the durable background job queue.
+
+Media generation, dweller portraits, X publishing and relationship/arc
+updates ran as FastAPI BackgroundTasks or asyncio tasks inside the API
+process and were lost on restart. They are now enqueued as platform_jobs
+rows and run by jobs/worker.py; jobs that exhaust their attempts move to
+platform_dead_jobs.
+
+Revision ID: 0030
+Revises: 0029
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0030"
+down_revision = "0029"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = :table"
+    ), {"table": table_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not table_exists("platform_jobs"):
+        op.create_table(
+            "platform_jobs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("queue", sa.String(50), nullable=False),
+            sa.Column("kind", sa.String(100), nullable=False),
+            sa.Column("payload", postgresql.JSONB(), nullable=False),
+            sa.Column("dedupe_key", sa.String(255), nullable=True),
+            sa.Column("run_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("max_attempts", sa.Integer(), nullable=False),
+            sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("locked_by", sa.String(100), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+        )
+
+    if not index_exists("job_queue_run_at_idx"):
+        op.create_index("job_queue_run_at_idx", "platform_jobs", ["queue", "run_at"])
+
+    if not index_exists("job_dedupe_key_idx"):
+        op.create_index("job_dedupe_key_idx", "platform_jobs", ["dedupe_key"], unique=True)
+
+    if not table_exists("platform_dead_jobs"):
+        op.create_table(
+            "platform_dead_jobs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("queue", sa.String(50), nullable=False),
+            sa.Column("kind", sa.String(100), nullable=False),
+            sa.Column("payload", postgresql.JSONB(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("failed_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+        )
+
+    if not index_exists("dead_job_failed_at_idx"):
+        op.create_index("dead_job_failed_at_idx", "platform_dead_jobs", ["failed_at"])
+
+
+def downgrade():
+    if table_exists("platform_dead_jobs"):
+        op.drop_table("platform_dead_jobs")
+    if table_exists("platform_jobs"):
+        op.drop_table("platform_jobs")
@@ -0,0 +1,61 @@
+"""Persist story arc centroids: centroid vector + member_count on platform_story_arcs.
+
+assign_story_to_arc used to re-fetch and average every member embedding of
+every arc for each new story. Arcs now keep a running centroid, and
+candidates come from a nearest-centroid query. Existing arcs are backfilled
+from their members' content embeddings.
+
+Revision ID: 0031
+Revises: 0030
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0031"
+down_revision = "0030"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not column_exists("platform_story_arcs", "centroid"):
+        op.execute("ALTER TABLE platform_story_arcs ADD COLUMN centroid vector(1536)")
+
+    if not column_exists("platform_story_arcs", "member_count"):
+        op.add_column(
+            "platform_story_arcs",
+            sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # Backfill from member stories that have embeddings
+    op.execute("""
+        UPDATE platform_story_arcs a
+        SET centroid = m.centroid, member_count = m.n
+        FROM (
+            SELECT a2.id, AVG(s.content_embedding) AS centroid, COUNT(*) AS n
+            FROM platform_story_arcs a2
+            CROSS JOIN LATERAL jsonb_array_elements_text(a2.story_ids) AS sid(id)
+            JOIN platform_stories s ON s.id = sid.id::uuid
+            WHERE s.content_embedding IS NOT NULL
+            GROUP BY a2.id
+        ) m
+        WHERE a.id = m.id AND a.centroid IS NULL
+    """)
+
+
+def downgrade():
+    if column_exists("platform_story_arcs", "member_count"):
+        op.drop_column("platform_story_arcs", "member_count")
+    if column_exists("platform_story_arcs", "centroid"):
+        op.drop_column("platform_story_arcs", "centroid")
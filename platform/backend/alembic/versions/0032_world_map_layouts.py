@@ -0,0 +1,67 @@
+"""Add platform_world_map_layouts: cached semantic world map versions.
+
+GET /worlds/map ran MDS, KMeans and one LLM labelling call per cluster on
+every request. Layouts are now computed in the background, stored per
+world-set version (a hash of world ids and premise embeddings), and read
+back by the endpoint.
+
+Revision ID: 0032
+Revises: 0031
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0032"
+down_revision = "0031"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = :table"
+    ), {"table": table_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not table_exists("platform_world_map_layouts"):
+        op.create_table(
+            "platform_world_map_layouts",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("version_hash", sa.String(64), nullable=False),
+            sa.Column("positions", postgresql.JSONB(), nullable=False),
+            sa.Column("cluster_labels", postgresql.JSONB(), nullable=False),
+            sa.Column("fingerprints", postgresql.JSONB(), nullable=False),
+            sa.Column("cluster_centroids", postgresql.JSONB(), nullable=False),
+            sa.Column("laid_out_count", sa.Integer(), nullable=False),
+            sa.Column("placed_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("created_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+        )
+
+    if not index_exists("world_map_layout_version_idx"):
+        op.create_index(
+            "world_map_layout_version_idx", "platform_world_map_layouts", ["version_hash"], unique=True
+        )
+
+    if not index_exists("world_map_layout_created_at_idx"):
+        op.create_index("world_map_layout_created_at_idx", "platform_world_map_layouts", ["created_at"])
+
+
+def downgrade():
+    if table_exists("platform_world_map_layouts"):
+        op.drop_table("platform_world_map_layouts")
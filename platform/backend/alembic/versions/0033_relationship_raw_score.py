@@ -0,0 +1,86 @@
+"""Replace stored combined_score with a generated raw_score on dweller relationships.
+
+combined_score was raw / global max, so every story or SPEAK write had to
+rescan and rewrite every relationship whenever the global max moved. The
+weighted total is now a generated column and readers divide by MAX(raw_score)
+at query time.
+
+Revision ID: 0033
+Revises: 0032
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0033"
+down_revision = "0032"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+RAW_SCORE_EXPR = (
+    "3.0 * speak_count_a_to_b + 3.0 * speak_count_b_to_a"
+    " + 2.0 * story_mention_a_to_b + 2.0 * story_mention_b_to_a"
+    " + 1.0 * thread_count + 1.0 * co_occurrence_count"
+)
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not column_exists("platform_dweller_relationships", "raw_score"):
+        op.execute(
+            "ALTER TABLE platform_dweller_relationships ADD COLUMN raw_score double precision "
+            f"GENERATED ALWAYS AS ({RAW_SCORE_EXPR}) STORED"
+        )
+
+    if not index_exists("idx_dweller_rel_raw_score"):
+        op.create_index("idx_dweller_rel_raw_score", "platform_dweller_relationships", ["raw_score"])
+
+    if index_exists("idx_dweller_rel_score"):
+        op.drop_index("idx_dweller_rel_score", table_name="platform_dweller_relationships")
+
+    if column_exists("platform_dweller_relationships", "combined_score"):
+        op.drop_column("platform_dweller_relationships", "combined_score")
+
+
+def downgrade():
+    if not column_exists("platform_dweller_relationships", "combined_score"):
+        op.add_column(
+            "platform_dweller_relationships",
+            sa.Column("combined_score", sa.Float(), nullable=False, server_default="0"),
+        )
+        if column_exists("platform_dweller_relationships", "raw_score"):
+            op.execute(
+                "UPDATE platform_dweller_relationships SET combined_score = raw_score / m.max_raw "
+                "FROM (SELECT MAX(raw_score) AS max_raw FROM platform_dweller_relationships) m "
+                "WHERE m.max_raw > 0"
+            )
+
+    if not index_exists("idx_dweller_rel_score"):
+        op.create_index(
+            "idx_dweller_rel_score",
+            "platform_dweller_relationships",
+            [sa.text("combined_score DESC")],
+        )
+
+    if index_exists("idx_dweller_rel_raw_score"):
+        op.drop_index("idx_dweller_rel_raw_score", table_name="platform_dweller_relationships")
+
+    if column_exists("platform_dweller_relationships", "raw_score"):
+        op.drop_column("platform_dweller_relationships", "raw_score")
@@ -0,0 +1,83 @@
+"""Unique (world_id, lower(name)) index on platform_dwellers.
+
+SPEAK actions name their target, and take_action resolved it with
+lower(name) = :target, which no index covered. The functional index makes
+that a single probe and enforces what the lookup assumes: at most one
+dweller per name in a world, ignoring case.
+
+Existing case-insensitive duplicates keep the oldest dweller's name; later
+ones get the first " (2)", " (3)", ... suffix not already taken in their
+world, so the index can be built.
+
+Revision ID: 0034
+Revises: 0033
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0034"
+down_revision = "0033"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if index_exists("dweller_world_name_lower_idx"):
+        return
+
+    conn = op.get_bind()
+    duplicates = conn.execute(sa.text("""
+        SELECT id, world_id, name FROM (
+            SELECT id, world_id, name, row_number() OVER (
+                PARTITION BY world_id, lower(name) ORDER BY created_at, id
+            ) AS rn
+            FROM platform_dwellers
+        ) dup
+        WHERE rn > 1
+        ORDER BY world_id, lower(name), rn
+    """)).fetchall()
+
+    if duplicates:
+        world_ids = list({row.world_id for row in duplicates})
+        taken = {
+            (row.world_id, row.lname)
+            for row in conn.execute(sa.text(
+                "SELECT world_id, lower(name) AS lname FROM platform_dwellers "
+                "WHERE world_id = ANY(:world_ids)"
+            ), {"world_ids": world_ids})
+        }
+        for row in duplicates:
+            n = 2
+            while True:
+                suffix = f" ({n})"
+                candidate = row.name[:100 - len(suffix)] + suffix
+                if (row.world_id, candidate.lower()) not in taken:
+                    break
+                n += 1
+            taken.add((row.world_id, candidate.lower()))
+            conn.execute(
+                sa.text("UPDATE platform_dwellers SET name = :name WHERE id = :id"),
+                {"name": candidate, "id": row.id},
+            )
+
+    op.create_index(
+        "dweller_world_name_lower_idx",
+        "platform_dwellers",
+        ["world_id", sa.text("lower(name)")],
+        unique=True,
+    )
+
+
+def downgrade():
+    if index_exists("dweller_world_name_lower_idx"):
+        op.drop_index("dweller_world_name_lower_idx", table_name="platform_dwellers")
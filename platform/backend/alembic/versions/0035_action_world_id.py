@@ -0,0 +1,157 @@
+"""Denormalize world_id and region onto platform_dweller_actions.
+
+World activity reads (deltas, action context, world signals, activity feed,
+heartbeat digests) filtered actions with dweller_id IN (SELECT id FROM
+platform_dwellers WHERE world_id = ...) or joined through dwellers, then
+sorted by created_at on a single-column index. Actions now carry the world
+and the actor's region, with newest-first composite indexes, so each of
+those reads is one index range scan.
+
+Online-friendly: the columns are added nullable, backfilled in batches
+outside the migration transaction and indexed CONCURRENTLY. The foreign key
+and a CHECK (world_id IS NOT NULL) are added NOT VALID and validated in
+their own transactions, which scan the table without blocking writers;
+SET NOT NULL then trusts the validated CHECK instead of scanning under an
+ACCESS EXCLUSIVE lock. Backfilled rows take the dweller's current region,
+the closest record of where past actions happened.
+
+Revision ID: 0035
+Revises: 0034
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0035"
+down_revision = "0034"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+WORLD_FK = "platform_dweller_actions_world_id_fkey"
+WORLD_NOT_NULL_CHECK = "platform_dweller_actions_world_id_not_null"
+
+NEW_INDEXES = {
+    "action_dweller_created_idx": "(dweller_id, created_at DESC)",
+    "action_world_created_idx": "(world_id, created_at DESC, id DESC)",
+    "action_world_region_created_idx": "(world_id, region, created_at DESC)",
+}
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def constraint_exists(constraint_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_constraint WHERE conname = :name"
+    ), {"name": constraint_name})
+    return result.fetchone() is not None
+
+
+def column_is_not_null(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT is_nullable FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    row = result.fetchone()
+    return row is not None and row[0] == "NO"
+
+
+def backfill():
+    """Copy world and region from each action's dweller, BACKFILL_BATCH_SIZE rows per statement."""
+    conn = op.get_bind()
+    while True:
+        updated = conn.execute(sa.text("""
+            UPDATE platform_dweller_actions a
+            SET world_id = d.world_id, region = d.current_region
+            FROM platform_dwellers d
+            WHERE a.dweller_id = d.id
+              AND a.id IN (
+                  SELECT id FROM platform_dweller_actions
+                  WHERE world_id IS NULL
+                  LIMIT :batch
+              )
+        """), {"batch": BACKFILL_BATCH_SIZE}).rowcount
+        if not updated:
+            break
+
+
+def upgrade():
+    if not column_exists("platform_dweller_actions", "world_id"):
+        op.add_column(
+            "platform_dweller_actions",
+            sa.Column("world_id", postgresql.UUID(as_uuid=True), nullable=True),
+        )
+    if not column_exists("platform_dweller_actions", "region"):
+        op.add_column("platform_dweller_actions", sa.Column("region", sa.String(255), nullable=True))
+
+    # Each statement below commits on its own so writers are never blocked for long
+    with op.get_context().autocommit_block():
+        backfill()
+
+        for name, columns in NEW_INDEXES.items():
+            if not index_exists(name):
+                op.execute(f"CREATE INDEX CONCURRENTLY {name} ON platform_dweller_actions {columns}")
+
+        # NOT VALID constraints apply to new rows at once; existing rows are
+        # checked by VALIDATE, which doesn't block inserts or updates
+        if not constraint_exists(WORLD_FK):
+            op.execute(f"""
+                ALTER TABLE platform_dweller_actions ADD CONSTRAINT {WORLD_FK}
+                FOREIGN KEY (world_id) REFERENCES platform_worlds (id) ON DELETE CASCADE NOT VALID
+            """)
+        if not column_is_not_null("platform_dweller_actions", "world_id"):
+            if not constraint_exists(WORLD_NOT_NULL_CHECK):
+                op.execute(f"""
+                    ALTER TABLE platform_dweller_actions ADD CONSTRAINT {WORLD_NOT_NULL_CHECK}
+                    CHECK (world_id IS NOT NULL) NOT VALID
+                """)
+            # Rows written between the first pass and the CHECK
+            backfill()
+            op.execute(f"ALTER TABLE platform_dweller_actions VALIDATE CONSTRAINT {WORLD_NOT_NULL_CHECK}")
+            # The validated CHECK proves no NULLs, so this skips the table scan
+            op.execute("ALTER TABLE platform_dweller_actions ALTER COLUMN world_id SET NOT NULL")
+        if constraint_exists(WORLD_NOT_NULL_CHECK):
+            op.execute(f"ALTER TABLE platform_dweller_actions DROP CONSTRAINT {WORLD_NOT_NULL_CHECK}")
+        op.execute(f"ALTER TABLE platform_dweller_actions VALIDATE CONSTRAINT {WORLD_FK}")
+
+    # Covered by action_dweller_created_idx
+    if index_exists("action_dweller_idx"):
+        op.drop_index("action_dweller_idx", table_name="platform_dweller_actions")
+
+
+def downgrade():
+    if not index_exists("action_dweller_idx"):
+        op.create_index("action_dweller_idx", "platform_dweller_actions", ["dweller_id"])
+
+    for name in NEW_INDEXES:
+        if index_exists(name):
+            op.drop_index(name, table_name="platform_dweller_actions")
+
+    if constraint_exists(WORLD_NOT_NULL_CHECK):
+        op.drop_constraint(WORLD_NOT_NULL_CHECK, "platform_dweller_actions", type_="check")
+    if constraint_exists(WORLD_FK):
+        op.drop_constraint(WORLD_FK, "platform_dweller_actions", type_="foreignkey")
+    if column_exists("platform_dweller_actions", "region"):
+        op.drop_column("platform_dweller_actions", "region")
+    if column_exists("platform_dweller_actions", "world_id"):
+        op.drop_column("platform_dweller_actions", "world_id")
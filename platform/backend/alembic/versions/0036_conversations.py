@@ -0,0 +1,127 @@
+"""Add platform_conversations: materialized SPEAK state per dweller pair.
+
+take_action found unanswered speaks with an anti-join against every reply
+ever written, then ran an OR query for any prior exchange; the action
+context re-derived reply state from seven days of speaks. One row per pair
+now tracks the last action, whose turn it is and the unanswered action ids
+on each side, maintained on every SPEAK.
+
+Existing speaks are folded in: targets resolve by case-insensitive name in
+the speaker's world, a speak counts as answered if its target replies to
+it, and each side keeps its newest 20 unanswered speaks
+(utils.conversations.UNANSWERED_SPEAKS_LIMIT).
+
+Revision ID: 0036
+Revises: 0035
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0036"
+down_revision = "0035"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = :table"
+    ), {"table": table_name})
+    return result.fetchone() is not None
+
+
+def index_exists(index_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not table_exists("platform_conversations"):
+        op.create_table(
+            "platform_conversations",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("world_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("platform_worlds.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("dweller_a_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("platform_dwellers.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("dweller_b_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("platform_dwellers.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("last_action_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("platform_dweller_actions.id", ondelete="SET NULL"), nullable=True),
+            sa.Column("last_speaker_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("turn_dweller_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("unanswered_from_a", postgresql.JSONB(), nullable=False, server_default="[]"),
+            sa.Column("unanswered_from_b", postgresql.JSONB(), nullable=False, server_default="[]"),
+            sa.Column("speak_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("last_action_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+            sa.UniqueConstraint("dweller_a_id", "dweller_b_id", name="uq_conversation_pair"),
+            sa.CheckConstraint("dweller_a_id < dweller_b_id", name="ck_conversation_canonical_order"),
+        )
+
+    if not index_exists("conversation_a_last_action_idx"):
+        op.create_index(
+            "conversation_a_last_action_idx", "platform_conversations", ["dweller_a_id", "last_action_at"]
+        )
+    if not index_exists("conversation_b_last_action_idx"):
+        op.create_index(
+            "conversation_b_last_action_idx", "platform_conversations", ["dweller_b_id", "last_action_at"]
+        )
+
+    op.execute("""
+        WITH speaks AS (
+            SELECT
+                a.id, a.world_id, a.dweller_id AS speaker_id, t.id AS target_id, a.created_at,
+                LEAST(a.dweller_id, t.id) AS a_id,
+                GREATEST(a.dweller_id, t.id) AS b_id,
+                EXISTS (
+                    SELECT 1 FROM platform_dweller_actions r
+                    WHERE r.in_reply_to_action_id = a.id AND r.dweller_id = t.id
+                ) AS answered
+            FROM platform_dweller_actions a
+            JOIN platform_dwellers t
+              ON t.world_id = a.world_id AND lower(t.name) = lower(a.target)
+            WHERE a.action_type = 'speak' AND t.id <> a.dweller_id
+        )
+        INSERT INTO platform_conversations (
+            id, world_id, dweller_a_id, dweller_b_id, last_action_id, last_speaker_id,
+            turn_dweller_id, unanswered_from_a, unanswered_from_b, speak_count, last_action_at
+        )
+        SELECT
+            gen_random_uuid(),
+            (array_agg(world_id))[1],
+            a_id,
+            b_id,
+            (array_agg(id ORDER BY created_at DESC, id DESC))[1],
+            (array_agg(speaker_id ORDER BY created_at DESC, id DESC))[1],
+            (array_agg(target_id ORDER BY created_at DESC, id DESC))[1],
+            jsonb_path_query_array(
+                coalesce(jsonb_agg(id::text ORDER BY created_at, id)
+                         FILTER (WHERE NOT answered AND speaker_id = a_id), '[]'::jsonb),
+                '$[last - 19 to last]'),
+            jsonb_path_query_array(
+                coalesce(jsonb_agg(id::text ORDER BY created_at, id)
+                         FILTER (WHERE NOT answered AND speaker_id = b_id), '[]'::jsonb),
+                '$[last - 19 to last]'),
+            count(*),
+            max(created_at)
+        FROM speaks
+        GROUP BY a_id, b_id
+        ON CONFLICT ON CONSTRAINT uq_conversation_pair DO NOTHING
+    """)
+
+
+def downgrade():
+    if table_exists("platform_conversations"):
+        op.drop_table("platform_conversations")
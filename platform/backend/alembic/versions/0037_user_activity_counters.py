@@ -0,0 +1,91 @@
+"""Add platform_user_activity_counters: per-agent activity totals.
+
+Every heartbeat ran ten COUNT(*) queries for completion tracking (stories,
+reviews, validations, dwellers, actions, proposals, aspects, events,
+unresponded reviews) plus an escalation-eligible count over the actions
+table, and the nudge engine repeated some of them. The totals now live in
+one row per agent, bumped by the write paths and periodically reconciled.
+
+Rows are backfilled for every existing user.
+
+Revision ID: 0037
+Revises: 0036
+"""
+from typing import Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0037"
+down_revision = "0036"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+COUNTERS = (
+    "stories_written",
+    "stories_reviewed",
+    "proposals_validated",
+    "aspects_validated",
+    "dwellers_created",
+    "actions_taken",
+    "worlds_proposed",
+    "aspects_proposed",
+    "events_proposed",
+    "unresponded_reviews",
+    "escalation_eligible_actions",
+)
+
+
+def table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = :table"
+    ), {"table": table_name})
+    return result.fetchone() is not None
+
+
+def upgrade():
+    if not table_exists("platform_user_activity_counters"):
+        op.create_table(
+            "platform_user_activity_counters",
+            sa.Column("user_id", postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey("platform_users.id", ondelete="CASCADE"), primary_key=True),
+            *[
+                sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+                for name in COUNTERS
+            ],
+            sa.Column("reconciled_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True),
+                      server_default=sa.func.now(), nullable=False),
+        )
+
+    op.execute(f"""
+        INSERT INTO platform_user_activity_counters (user_id, {", ".join(COUNTERS)}, reconciled_at, updated_at)
+        SELECT
+            u.id,
+            (SELECT count(*) FROM platform_stories s WHERE s.author_id = u.id),
+            (SELECT count(*) FROM platform_story_reviews r WHERE r.reviewer_id = u.id),
+            (SELECT count(*) FROM platform_validations v WHERE v.agent_id = u.id),
+            (SELECT count(*) FROM platform_aspect_validations v WHERE v.agent_id = u.id),
+            (SELECT count(*) FROM platform_dwellers d WHERE d.created_by = u.id),
+            (SELECT count(*) FROM platform_dweller_actions a WHERE a.actor_id = u.id),
+            (SELECT count(*) FROM platform_proposals p WHERE p.agent_id = u.id),
+            (SELECT count(*) FROM platform_aspects a WHERE a.agent_id = u.id),
+            (SELECT count(*) FROM platform_world_events e WHERE e.proposed_by = u.id),
+            (SELECT count(*) FROM platform_story_reviews r
+               JOIN platform_stories s ON s.id = r.story_id
+              WHERE s.author_id = u.id AND NOT r.author_responded),
+            (SELECT count(*) FROM platform_dweller_actions a
+              WHERE a.actor_id = u.id AND a.escalation_eligible AND a.importance_confirmed_by IS NULL),
+            now(),
+            now()
+        FROM platform_users u
+        ON CONFLICT (user_id) DO NOTHING
+    """)
+
+
+def downgrade():
+    if table_exists("platform_user_activity_counters"):
+        op.drop_table("platform_user_activity_counters")
@@ -15,9 +15,10 @@ from sqlalchemy import select, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from db import get_db, User, DwellerAction, Dweller, World, WorldEvent
+from db import get_db, User, DwellerAction, World, WorldEvent
 from db.models import WorldEventStatus, WorldEventOrigin
 from .auth import get_current_user
+from utils.activity_counters import bump_activity_counters
 from utils.notifications import create_notification
 
 
@@ -190,6 +191,7 @@ async def confirm_importance(
     action.importance_confirmed_by = current_user.id
     action.importance_confirmed_at = utc_now()
     action.importance_confirmation_rationale = request.rationale
+    await bump_activity_counters(db, action.actor_id, escalation_eligible_actions=-1)
 
     # Notify the original actor
     dweller = action.dweller
@@ -313,6 +315,7 @@ async def escalate_to_event(
     )
     db.add(event)
     await db.flush()
+    await bump_activity_counters(db, current_user.id, events_proposed=1)
 
     # Note: The action-to-event link is stored via WorldEvent.origin_action_id
 
@@ -383,9 +386,8 @@ async def list_escalation_eligible_actions(
     # Base query for filtering
     base_query = (
         select(DwellerAction)
-        .join(Dweller)
         .where(
-            Dweller.world_id == world_id,
+            DwellerAction.world_id == world_id,
             DwellerAction.escalation_eligible == True,
             not_escalated,  # Not yet escalated
         )
@@ -94,15 +94,18 @@ async def trigger_arc_detection(
 ):
     """Trigger story arc detection (admin only).
 
-    Embeds all un-embedded stories and clusters them into arcs based on
-    semantic similarity (>= 0.75 cosine). No time window — arcs are purely
-    semantic. Runs synchronously — may be slow with many un-embedded stories.
+    Embeds all un-embedded stories in batches and re-clusters every dweller's
+    stories into arcs based on semantic similarity (>= 0.75 cosine). No time
+    window — arcs are purely semantic. Arcs whose first story is unchanged
+    keep their id.
 
-    Returns a summary of arcs created.
+    Returns the arcs written plus stats (counts, per-phase timings and
+    stories/second).
     """
     result = await detect_arcs(db=db)
     await db.commit()
     return {
-        "message": f"Arc detection complete: {len(result)} arc(s) created",
-        "arcs": result,
+        "message": f"Arc detection complete: {len(result['arcs'])} arc(s) written",
+        "arcs": result["arcs"],
+        "stats": result["stats"],
     }
@@ -37,7 +37,10 @@ from sqlalchemy.orm import selectinload
 from db import get_db, User, World, Aspect, AspectValidation, DwellerAction, Dweller
 from db.models import AspectStatus, ValidationVerdict
 from .auth import get_current_user
+from utils.activity_counters import bump_activity_counters
+from utils.activity_events import aspect_proposed, aspect_revised
 from utils.dedup import check_recent_duplicate
+from utils.feed_cache import invalidate_feed_cache
 from utils.notifications import notify_aspect_validated
 from utils.simulation import buggify, buggify_delay
 from guidance import (
@@ -353,6 +356,7 @@ async def create_aspect(
         status=AspectStatus.DRAFT,
     )
     db.add(aspect)
+    await bump_activity_counters(db, current_user.id, aspects_proposed=1)
     await db.commit()
     await db.refresh(aspect)
 
@@ -523,7 +527,10 @@ async def submit_aspect(
         aspect = result.scalar_one()
 
     aspect.status = AspectStatus.VALIDATING
+    world = await db.get(World, aspect.world_id)
+    db.add(aspect_proposed(aspect, world, current_user))
     await db.commit()
+    await invalidate_feed_cache()
 
     return {
         "aspect_id": str(aspect_id),
@@ -596,8 +603,10 @@ async def revise_aspect(
     from utils.clock import now as utc_now
     aspect.revision_count = (aspect.revision_count or 0) + 1
     aspect.last_revised_at = utc_now()
+    db.add(aspect_revised(aspect, current_user, at=aspect.last_revised_at))
 
     await db.commit()
+    await invalidate_feed_cache()
     await db.refresh(aspect)
 
     # Check if strengthen gate is now cleared
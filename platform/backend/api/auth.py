@@ -17,7 +17,6 @@ OPTIONAL FIELDS:
 - platform_notifications: Receive daily digests and platform updates
 """
 
-import hashlib
 import os
 import re
 from utils.clock import now as utc_now
@@ -26,13 +25,16 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from pydantic import BaseModel, Field, HttpUrl
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from db import get_db, User, ApiKey, UserType
+from utils.activity_events import agent_registered
 from utils.errors import agent_error
+from utils.feed_cache import invalidate_feed_cache
+from utils.principal import hash_api_key, resolve_principal, set_request_user
 
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
 
@@ -96,11 +98,6 @@ class AgentRegistrationRequest(BaseModel):
     )
 
 
-def hash_api_key(key: str) -> str:
-    """Hash an API key for storage."""
-    return hashlib.sha256(key.encode()).hexdigest()
-
-
 def generate_api_key() -> str:
     """Generate a new API key."""
     # Format: dsf_<32 random bytes as base64url>
@@ -161,6 +158,7 @@ async def resolve_username(db: AsyncSession, desired_username: str) -> str:
 
 
 async def get_current_user(
+    request: Request,
     x_api_key: str | None = Header(None),
     authorization: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
@@ -171,6 +169,10 @@ async def get_current_user(
     Accepts either:
     - X-API-Key: dsf_your_key_here
     - Authorization: Bearer dsf_your_key_here
+
+    The key is resolved through utils.principal, so a key already seen by a
+    middleware in this request (or recently, by this process) costs no extra
+    lookup; only the User row is read.
     """
     # Fall back to Authorization: Bearer if X-API-Key not provided
     if not x_api_key and authorization:
@@ -186,14 +188,14 @@ async def get_current_user(
             }
         )
 
-    key_hash = hash_api_key(x_api_key)
-
-    # Find API key (unique constraint on key_hash, but use .first() defensively)
-    key_query = select(ApiKey).where(ApiKey.key_hash == key_hash)
-    result = await db.execute(key_query)
-    api_key = result.scalars().first()
+    principal = await resolve_principal(request.scope, x_api_key, db)
+    user = await db.get(User, principal.user_id) if principal else None
+    if principal and not user:
+        # A cached principal can outlive its user; confirm against the database
+        principal = await resolve_principal(request.scope, x_api_key, db, refresh=True)
+        user = await db.get(User, principal.user_id) if principal else None
 
-    if not api_key or api_key.is_revoked:
+    if not principal:
         raise HTTPException(
             status_code=401,
             detail={
@@ -203,21 +205,16 @@ async def get_current_user(
             }
         )
 
-    if api_key.expires_at and api_key.expires_at < utc_now():
+    if principal.is_expired:
         raise HTTPException(
             status_code=401,
             detail={
                 "error": "API key expired",
-                "expired_at": api_key.expires_at.isoformat(),
+                "expired_at": principal.expires_at.isoformat(),
                 "how_to_fix": "Your API key has expired. Register a new agent at POST /api/auth/agent to get a new key.",
             }
         )
 
-    # Get user
-    user_query = select(User).where(User.id == api_key.user_id)
-    user_result = await db.execute(user_query)
-    user = user_result.scalar_one_or_none()
-
     if not user:
         raise HTTPException(
             status_code=401,
@@ -227,14 +224,21 @@ async def get_current_user(
             }
         )
 
-    # Update last used
-    api_key.last_used_at = utc_now()
-    user.last_active_at = utc_now()
+    # Update last used (the key's timestamp at most once per LAST_USED_RESOLUTION)
+    now = utc_now()
+    if principal.needs_last_used_write():
+        await db.execute(
+            update(ApiKey).where(ApiKey.id == principal.api_key_id).values(last_used_at=now)
+        )
+        principal.last_used_at = now
+    user.last_active_at = now
 
+    set_request_user(request.scope, user)
     return user
 
 
 async def get_optional_user(
+    request: Request,
     x_api_key: str | None = Header(None),
     authorization: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
@@ -247,12 +251,13 @@ async def get_optional_user(
         return None
 
     try:
-        return await get_current_user(x_api_key, authorization, db)
+        return await get_current_user(request, x_api_key, authorization, db)
     except HTTPException:
         return None
 
 
 async def get_admin_user(
+    request: Request,
     x_api_key: str | None = Header(None),
     authorization: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
@@ -281,7 +286,7 @@ async def get_admin_user(
             ),
         )
 
-    return await get_current_user(x_api_key=x_api_key, authorization=authorization, db=db)
+    return await get_current_user(request, x_api_key=x_api_key, authorization=authorization, db=db)
 
 
 @router.get("/check")
@@ -408,7 +413,9 @@ async def register_agent(
         name="Default API Key",
     )
     db.add(api_key_record)
+    db.add(agent_registered(user))
     await db.commit()
+    await invalidate_feed_cache()
 
     # Check for similar existing agents (same name + model_id)
     warning = None
@@ -32,7 +32,6 @@ scientific_basis, or act as if you're in a different year than year_setting.
 You CAN be wrong, ignorant, biased, or opinionated - characters are human.
 """
 
-import asyncio
 import logging
 from typing import Any, Literal
 from uuid import UUID
@@ -41,16 +40,31 @@ from utils.deterministic import deterministic_uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.exc import IntegrityError, DataError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from db import get_db, User, World, Dweller, DwellerAction
+from db import get_db, User, World, Dweller, DwellerAction, Conversation
+from jobs import GenerateDwellerPortrait, enqueue
+from middleware.agent_context import skip_agent_context
 from .auth import get_current_user
+from utils.activity_counters import bump_activity_counters
+from utils.activity_events import dweller_action, dweller_created
+from utils.agent_context_cache import invalidate_agent_context
+from utils.conversations import get_conversation, list_conversations, partner_of, record_speak, unanswered_from
 from utils.dedup import check_recent_duplicate
+from utils.dweller_memory import (
+    append_episode,
+    enqueue_embeddings,
+    get_recent_episodes,
+    get_working_memory,
+    search_memories,
+)
 from utils.errors import agent_error
+from utils.feed_cache import invalidate_feed_cache
 from utils.nudge import build_nudge
+from utils.name_matcher import dwellers_by_name, invalidate_world_name_matcher
 from utils.name_validation import check_name_quality
 from guidance import (
     make_guidance_response,
@@ -74,19 +88,15 @@ router = APIRouter(prefix="/dwellers", tags=["dwellers"])
 SESSION_TIMEOUT_HOURS = 24
 SESSION_WARNING_HOURS = 20
 
-# Keep strong references to fire-and-forget tasks so they're not GC'd before completion
-_background_tasks: set = set()
-
-
 # ============================================================================
-# Portrait Generation (fire-and-forget)
+# Portrait Generation (GenerateDwellerPortrait job)
 # ============================================================================
 
 
 async def _generate_portrait_background(
     dweller_id: str, dweller_data: dict, world_data: dict, image_prompt: str | None = None
 ) -> None:
-    """Background task: generate portrait for a dweller and persist the URL."""
+    """GenerateDwellerPortrait job: generate portrait for a dweller and persist the URL."""
     from db.database import SessionLocal
     from services.art_generation import generate_dweller_portrait
 
@@ -672,6 +682,39 @@ async def create_dweller(
             )
         current_region_canonical = matching_region["name"]
 
+    # Names are unique per world (case-insensitive), retired dwellers included;
+    # SPEAK targets are names
+    existing = (await db.execute(
+        select(Dweller.id, Dweller.is_active, Dweller.is_available).where(
+            Dweller.world_id == world_id,
+            func.lower(Dweller.name) == request.name.lower(),
+        )
+    )).first()
+    if existing:
+        if existing.is_active and existing.is_available:
+            how_to_fix = (
+                "Choose a different name, or claim the existing dweller with "
+                f"POST /api/dwellers/{existing.id}/claim."
+            )
+        else:
+            how_to_fix = (
+                "Choose a different name. The existing dweller is retired or already "
+                "inhabited, so it cannot be claimed."
+            )
+        raise HTTPException(
+            status_code=409,
+            detail=agent_error(
+                error=(
+                    f"A dweller named '{request.name}' already exists in this world. "
+                    "Dweller names are unique within a world, even among retired dwellers, "
+                    "because other dwellers speak to them by name."
+                ),
+                how_to_fix=how_to_fix,
+                existing_dweller_id=str(existing.id),
+                existing_dweller_claimable=existing.is_active and existing.is_available,
+            )
+        )
+
     # Check name quality — rejects AI-slop names before creation
     check_name_quality(
         name=request.name,
@@ -696,7 +739,7 @@ async def create_dweller(
         # Memory architecture
         core_memories=request.core_memories,
         personality_blocks=request.personality_blocks,
-        episodic_memories=[],  # Starts empty, builds over time
+        episodic_memory_count=0,  # Starts empty, builds over time
         relationship_memories=request.relationship_memories,
         current_situation=request.current_situation,
         # Location
@@ -712,7 +755,29 @@ async def create_dweller(
     world.dweller_count = world.dweller_count + 1
 
     try:
+        await db.flush()
+        db.add(dweller_created(dweller, world, current_user))
+        await bump_activity_counters(db, current_user.id, dwellers_created=1)
+        # Portrait generation runs in a job worker, not on the request's event loop
+        await enqueue(db, GenerateDwellerPortrait(
+            dweller_id=dweller.id,
+            dweller_data={
+                "name": dweller.name,
+                "role": dweller.role,
+                "age": dweller.age,
+                "generation": dweller.generation,
+                "cultural_identity": dweller.cultural_identity,
+                "origin_region": dweller.origin_region,
+                "personality": dweller.personality,
+            },
+            world_data={
+                "name": world.name,
+                "premise": world.premise,
+            },
+            image_prompt=dweller.image_prompt,
+        ))
         await db.commit()
+        invalidate_world_name_matcher(world_id)
         await db.refresh(dweller)
     except DataError as e:
         await db.rollback()
@@ -734,6 +799,19 @@ async def create_dweller(
         await db.rollback()
         error_str = str(e.orig) if e.orig else str(e)
 
+        if "dweller_world_name_lower_idx" in error_str:
+            # Lost a race with another create of the same name
+            raise HTTPException(
+                status_code=409,
+                detail=agent_error(
+                    error=(
+                        f"A dweller named '{request.name}' already exists in this world. "
+                        "Dweller names are unique within a world, even among retired dwellers."
+                    ),
+                    how_to_fix="Choose a different name.",
+                ),
+            )
+
         # Try to extract useful info from the constraint violation
         raise HTTPException(
             status_code=400,
@@ -754,27 +832,7 @@ async def create_dweller(
             }
         )
 
-    # Fire-and-forget portrait generation — don't block the response.
-    # Hold a strong reference so the task isn't GC'd before it completes.
-    _task = asyncio.create_task(_generate_portrait_background(
-        dweller_id=str(dweller.id),
-        dweller_data={
-            "name": dweller.name,
-            "role": dweller.role,
-            "age": dweller.age,
-            "generation": dweller.generation,
-            "cultural_identity": dweller.cultural_identity,
-            "origin_region": dweller.origin_region,
-            "personality": dweller.personality,
-        },
-        world_data={
-            "name": world.name,
-            "premise": world.premise,
-        },
-        image_prompt=dweller.image_prompt,
-    ))
-    _background_tasks.add(_task)
-    _task.add_done_callback(_background_tasks.discard)
+    await invalidate_feed_cache()
 
     response_data = {
         "dweller": {
@@ -904,7 +962,7 @@ async def get_dweller(
             "personality_blocks": dweller.personality_blocks,
             "relationship_memories": dweller.relationship_memories,
             "memory_summaries": dweller.memory_summaries,
-            "episodic_memory_count": len(dweller.episodic_memories) if dweller.episodic_memories else 0,
+            "episodic_memory_count": dweller.episodic_memory_count,
             # Meta
             "is_available": dweller.is_available,
             "inhabited_by": str(dweller.inhabited_by) if dweller.inhabited_by else None,
@@ -1124,8 +1182,8 @@ async def get_dweller_state(
 
     # Get working memory (recent episodes based on configurable size)
     working_size = dweller.working_memory_size or 50
-    total_episodes = len(dweller.episodic_memories) if dweller.episodic_memories else 0
-    recent_episodes = dweller.episodic_memories[-working_size:] if dweller.episodic_memories else []
+    total_episodes = dweller.episodic_memory_count
+    recent_episodes = await get_recent_episodes(db, dweller.id, working_size)
     episodes_in_archive = max(0, total_episodes - working_size)
 
     # Get other dwellers in the world for awareness
@@ -1314,32 +1372,10 @@ async def get_action_context(
 
     # Get working memory with reflection weighting
     working_size = dweller.working_memory_size or 50
-    total_episodes = len(dweller.episodic_memories) if dweller.episodic_memories else 0
-
-    # Apply reflection weighting: reflections are kept preferentially
-    # Sort by (is_reflection * 2 + recency_score) when trimming to window size
-    if dweller.episodic_memories:
-        all_memories = dweller.episodic_memories
-
-        # Calculate weighted scores for each memory
-        weighted_memories = []
-        for idx, mem in enumerate(all_memories):
-            is_reflection = mem.get("type") == "reflection"
-            # Recency score: newer memories get higher scores (0.0 to 1.0)
-            recency_score = idx / len(all_memories) if len(all_memories) > 1 else 1.0
-            # Combined score: reflections get 2x boost
-            combined_score = (2.0 if is_reflection else 0.0) + recency_score
-            weighted_memories.append((combined_score, mem))
-
-        # Sort by combined score (descending) and take top N
-        weighted_memories.sort(key=lambda x: x[0], reverse=True)
-        recent_episodes = [mem for _, mem in weighted_memories[:working_size]]
-
-        # Re-sort by original order (chronological) for context presentation
-        # Use timestamp to maintain chronological order
-        recent_episodes.sort(key=lambda x: x.get("timestamp", ""))
-    else:
-        recent_episodes = []
+
+    # Apply reflection weighting: reflections are kept preferentially over
+    # ordinary episodes, newest first, then presented chronologically.
+    recent_episodes = await get_working_memory(db, dweller.id, working_size)
 
     # Get other dwellers
     other_dwellers_query = (
@@ -1349,6 +1385,7 @@ async def get_action_context(
     )
     other_dwellers_result = await db.execute(other_dwellers_query)
     other_dwellers = other_dwellers_result.scalars().all()
+    other_dwellers_by_name = dwellers_by_name(other_dwellers)
 
     # Build conversation threads
     seven_days_ago = utc_now() - timedelta(days=7)
@@ -1360,9 +1397,7 @@ async def get_action_context(
             DwellerAction.created_at >= seven_days_ago,
             # Actions involving this dweller (as actor or target)
             and_(
-                DwellerAction.dweller_id.in_(
-                    select(Dweller.id).where(Dweller.world_id == dweller.world_id)
-                ),
+                DwellerAction.world_id == dweller.world_id,
                 # This dweller is either the actor or the target
                 (DwellerAction.dweller_id == dweller_id) | (func.lower(DwellerAction.target) == dweller.name.lower()),
             ),
@@ -1372,11 +1407,15 @@ async def get_action_context(
     speak_result = await db.execute(speak_actions_query)
     speak_actions = speak_result.scalars().all()
 
-    # Find which actions have been replied to
-    replied_to_ids = {
-        a.in_reply_to_action_id for a in speak_actions
-        if a.in_reply_to_action_id is not None
-    }
+    # Reply state per partner comes from the materialized conversation rows
+    other_dwellers_by_id = {d.id: d for d in other_dwellers}
+    conversation_rows: dict[str, Conversation] = {}
+    for row in await list_conversations(db, dweller_id, seven_days_ago):
+        partner = other_dwellers_by_id.get(partner_of(row, dweller_id))
+        if partner:
+            conversation_rows[partner.name.lower()] = row
+    # Partner's speaks this dweller hasn't answered, per partner
+    owed: dict[str, set[str]] = {}
 
     # Group by conversation partner
     conversations_map: dict[str, dict] = {}
@@ -1395,11 +1434,9 @@ async def get_action_context(
         partner_key = partner_name.lower()
         if partner_key not in conversations_map:
             # Find partner dweller for ID
-            partner_dweller = next(
-                (d for d in other_dwellers if d.name.lower() == partner_key),
-                None
-            )
+            partner_dweller = other_dwellers_by_name.get(partner_key)
             rel_data = (dweller.relationship_memories or {}).get(partner_name, {})
+            row = conversation_rows.get(partner_key)
             conversations_map[partner_key] = {
                 "with_dweller": partner_name,
                 "dweller_id": str(partner_dweller.id) if partner_dweller else None,
@@ -1407,9 +1444,11 @@ async def get_action_context(
                 "thread": [],
                 "unanswered_count": 0,
                 "your_turn": False,
+                "last_action_id": str(row.last_action_id) if row and row.last_action_id else None,
             }
+            owed[partner_key] = set(unanswered_from(row, partner_dweller.id)) if row and partner_dweller else set()
 
-        awaiting = is_from_partner and action.id not in replied_to_ids
+        awaiting = is_from_partner and str(action.id) in owed[partner_key]
         conversations_map[partner_key]["thread"].append({
             "action_id": str(action.id),
             "speaker": speaker,
@@ -1439,14 +1478,10 @@ async def get_action_context(
             select(DwellerAction)
             .options(selectinload(DwellerAction.dweller))
             .where(
+                DwellerAction.world_id == dweller.world_id,
+                DwellerAction.region == dweller.current_region,
                 DwellerAction.created_at >= seven_days_ago,
                 DwellerAction.dweller_id != dweller_id,
-                DwellerAction.dweller_id.in_(
-                    select(Dweller.id).where(
-                        Dweller.world_id == dweller.world_id,
-                        Dweller.current_region == dweller.current_region,
-                    )
-                ),
             )
             .order_by(DwellerAction.created_at.desc(), DwellerAction.id.desc())
             .limit(20)
@@ -1518,6 +1553,7 @@ async def get_action_context(
 
 
 @router.post("/{dweller_id}/act")
+@skip_agent_context
 async def take_action(
     dweller_id: UUID,
     request: DwellerActionRequest,
@@ -1654,13 +1690,15 @@ async def take_action(
     # Validate speak target exists BEFORE creating the action
     target_dweller = None
     if request.action_type == "speak" and request.target:
+        # One probe of dweller_world_name_lower_idx; the result is reused below
+        # for reply checks and relationship updates
         target_name_lower = request.target.lower()
         target_dweller_query = (
             select(Dweller)
             .where(
                 Dweller.world_id == dweller.world_id,
-                Dweller.id != dweller_id,
                 func.lower(Dweller.name) == target_name_lower,
+                Dweller.id != dweller_id,
             )
         )
         target_result = await db.execute(target_dweller_query)
@@ -1690,66 +1728,31 @@ async def take_action(
 
     # For speak actions: check if reply_to is required
     if request.action_type == "speak" and target_dweller:
-        # Find unanswered speaks from target to this dweller
-        unanswered_query = (
-            select(DwellerAction)
-            .where(
-                DwellerAction.dweller_id == target_dweller.id,
-                DwellerAction.action_type == "speak",
-                func.lower(DwellerAction.target) == dweller.name.lower(),
-                ~DwellerAction.id.in_(
-                    select(DwellerAction.in_reply_to_action_id)
-                    .where(DwellerAction.in_reply_to_action_id != None)
-                ),
-            )
-            .order_by(DwellerAction.created_at, DwellerAction.id)
-        )
-        unanswered_result = await db.execute(unanswered_query)
-        unanswered_speaks = unanswered_result.scalars().all()
+        conversation = await get_conversation(db, dweller.id, target_dweller.id)
+        # The target's speaks to this dweller that nobody has replied to yet
+        unanswered_ids = unanswered_from(conversation, target_dweller.id)
 
-        if unanswered_speaks and not request.in_reply_to_action_id:
+        if unanswered_ids and not request.in_reply_to_action_id:
             raise HTTPException(
                 status_code=400,
                 detail=agent_error(
-                    error=f"{target_dweller.name} has {len(unanswered_speaks)} unanswered speak(s) to you. You must reply to one.",
+                    error=f"{target_dweller.name} has {len(unanswered_ids)} unanswered speak(s) to you. You must reply to one.",
                     how_to_fix="Include in_reply_to_action_id in your request. Check conversations in the context endpoint response.",
-                    unanswered_action_ids=[str(a.id) for a in unanswered_speaks],
+                    unanswered_action_ids=unanswered_ids,
                 )
             )
 
         # Even if no unanswered speaks, if there's any prior conversation between
         # these two dwellers, in_reply_to_action_id should be set to maintain threading
-        if not unanswered_speaks and not request.in_reply_to_action_id:
-            prior_conv_query = (
-                select(DwellerAction.id)
-                .where(
-                    or_(
-                        and_(
-                            DwellerAction.dweller_id == target_dweller.id,
-                            DwellerAction.action_type == "speak",
-                            func.lower(DwellerAction.target) == dweller.name.lower(),
-                        ),
-                        and_(
-                            DwellerAction.dweller_id == dweller_id,
-                            DwellerAction.action_type == "speak",
-                            func.lower(DwellerAction.target) == target_dweller.name.lower(),
-                        ),
-                    )
+        if conversation and conversation.last_action_id and not request.in_reply_to_action_id:
+            raise HTTPException(
+                status_code=400,
+                detail=agent_error(
+                    error=f"You have a prior conversation with {target_dweller.name}. Link your reply to maintain the thread.",
+                    how_to_fix="Include in_reply_to_action_id pointing to the most recent action in your conversation. Check the context endpoint for conversation history.",
+                    last_action_id=str(conversation.last_action_id),
                 )
-                .order_by(DwellerAction.created_at.desc())
-                .limit(1)
             )
-            prior_result = await db.execute(prior_conv_query)
-            last_exchange = prior_result.scalar_one_or_none()
-            if last_exchange:
-                raise HTTPException(
-                    status_code=400,
-                    detail=agent_error(
-                        error=f"You have a prior conversation with {target_dweller.name}. Link your reply to maintain the thread.",
-                        how_to_fix="Include in_reply_to_action_id pointing to the most recent action in your conversation. Check the context endpoint for conversation history.",
-                        last_action_id=str(last_exchange),
-                    )
-                )
 
         # Validate in_reply_to_action_id if provided
         if request.in_reply_to_action_id:
@@ -1791,6 +1794,8 @@ async def take_action(
 
     action = DwellerAction(
         dweller_id=dweller_id,
+        world_id=dweller.world_id,
+        region=new_region or dweller.current_region,
         actor_id=current_user.id,
         action_type=request.action_type,
         target=request.target,
@@ -1803,22 +1808,27 @@ async def take_action(
     )
     db.add(action)
     await db.flush()  # Get the action ID
+    db.add(dweller_action(action, dweller, dweller.world, current_user))
+    await bump_activity_counters(
+        db, current_user.id, actions_taken=1, escalation_eligible_actions=int(is_escalation_eligible)
+    )
+    if request.action_type == "speak" and target_dweller:
+        await record_speak(db, action, target_dweller)
 
-    # Create episodic memory (FULL history, never truncated)
+    # Create episodic memory (FULL history, never truncated).
+    # One row insert — cost does not grow with the dweller's history.
     from utils.clock import now as utc_now
 
-    episodic_memory = {
-        "id": str(deterministic_uuid4()),
-        "action_id": str(action.id),
-        "timestamp": utc_now().isoformat(),
-        "type": request.action_type,
-        "content": request.content,
-        "target": request.target,
-        "importance": request.importance,
-    }
-
-    # Append to episodic memories (NEVER truncate - full history)
-    dweller.episodic_memories = dweller.episodic_memories + [episodic_memory]
+    memory = await append_episode(
+        db,
+        dweller,
+        memory_type=request.action_type,
+        content=request.content,
+        target=request.target,
+        importance=request.importance,
+        action_id=action.id,
+    )
+    await enqueue_embeddings(db, [memory])
 
     # If this action involves another dweller, update relationship memories
     # (any action with a target that's not a move is assumed to involve a person)
@@ -1868,11 +1878,12 @@ async def take_action(
         from utils.relationship_service import update_relationships_for_action
         try:
             async with db.begin_nested():
-                await update_relationships_for_action(db, action)
+                await update_relationships_for_action(db, action, target_dweller)
         except Exception:
             logger.exception("Failed to update relationships for action %s", action.id)
 
     await db.commit()
+    await invalidate_feed_cache()
     await db.refresh(action)
 
     # Prepare response
@@ -1947,11 +1958,10 @@ async def get_world_activity(
             }
         )
 
-    # Get recent actions from dwellers in this world
+    # Get recent actions in this world (one range scan of action_world_created_idx)
     query = (
         select(DwellerAction)
-        .join(Dweller)
-        .where(Dweller.world_id == world_id)
+        .where(DwellerAction.world_id == world_id)
         .order_by(DwellerAction.created_at.desc(), DwellerAction.id.desc())
         .limit(limit)
     )
@@ -2030,7 +2040,7 @@ async def get_full_memory(
 
     episodes = []
     if include_episodes:
-        episodes = dweller.episodic_memories[-episode_limit:] if dweller.episodic_memories else []
+        episodes = await get_recent_episodes(db, dweller.id, episode_limit)
 
     return {
         "dweller_id": str(dweller_id),
@@ -2039,7 +2049,7 @@ async def get_full_memory(
             "core_memories": dweller.core_memories,
             "personality_blocks": dweller.personality_blocks,
             "episodic_memories": episodes,
-            "total_episodes": len(dweller.episodic_memories) if dweller.episodic_memories else 0,
+            "total_episodes": dweller.episodic_memory_count,
             "relationship_memories": dweller.relationship_memories,
         },
     }
@@ -2417,34 +2427,31 @@ async def create_reflection(
             )
         )
 
-    from utils.clock import now as utc_now
-
-    reflection_entry = {
-        "id": str(deterministic_uuid4()),
-        "type": "reflection",
-        "timestamp": utc_now().isoformat(),
-        "content": request.content,
-        "topics": request.topics,
-        "importance": request.importance,
-        "source_memory_ids": request.source_memory_ids,
-    }
-
-    # Add to episodic_memories array with type: reflection
-    if dweller.episodic_memories is None:
-        dweller.episodic_memories = []
-    dweller.episodic_memories.append(reflection_entry)
+    # Stored alongside episodic memories with type: reflection
+    reflection = await append_episode(
+        db,
+        dweller,
+        memory_type="reflection",
+        content=request.content,
+        importance=request.importance,
+        extra={
+            "topics": request.topics,
+            "source_memory_ids": request.source_memory_ids,
+        },
+    )
+    await enqueue_embeddings(db, [reflection])
 
     await db.commit()
 
     return {
-        "id": reflection_entry["id"],
+        "id": str(reflection.id),
         "type": "reflection",
         "content": request.content,
         "topics": request.topics,
         "importance": request.importance,
-        "created_at": reflection_entry["timestamp"],
+        "created_at": reflection.created_at.isoformat(),
         "message": "Reflection stored. It will be weighted 2x higher than episodic memories during retrieval.",
-        "total_memories": len(dweller.episodic_memories),
+        "total_memories": dweller.episodic_memory_count,
     }
 
 
@@ -2527,14 +2534,17 @@ async def search_memory(
     q: str = Query(..., min_length=1, description="Search query"),
     importance_min: float = Query(0.0, ge=0.0, le=1.0, description="Minimum importance"),
     limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     """
     Search episodic memories.
 
-    Simple text search - matches words in content.
-    Only the inhabiting agent can search.
+    Full-text search over memory content and targets (stemmed, so "traded"
+    finds "trade"), ranked by relevance, then importance, then recency.
+    When semantic memory search is enabled, meaning-level matches are
+    blended into the same ranking. Only the inhabiting agent can search.
 
     Use this when:
     - Someone mentions something from the past
@@ -2564,38 +2574,27 @@ async def search_memory(
             }
         )
 
-    # Simple text search through episodic memories
-    query_lower = q.lower()
-    query_terms = query_lower.split()
-
-    matches = []
-    for episode in (dweller.episodic_memories or []):
-        content_lower = episode.get("content", "").lower()
-        target_lower = (episode.get("target") or "").lower()
-        importance = episode.get("importance", 0.5)
-
-        # Check importance threshold
-        if importance < importance_min:
-            continue
-
-        # Check if any query term matches
-        text_to_search = f"{content_lower} {target_lower}"
-        if any(term in text_to_search for term in query_terms):
-            matches.append(episode)
-
-    # Sort by importance (desc), then by timestamp (desc)
-    matches.sort(key=lambda x: (-x.get("importance", 0.5), x.get("timestamp", "")), reverse=False)
-    matches.sort(key=lambda x: x.get("importance", 0.5), reverse=True)
-
-    # Limit results
-    matches = matches[:limit]
+    matches, has_more = await search_memories(
+        db,
+        dweller.id,
+        query=q,
+        importance_min=importance_min,
+        limit=limit,
+        offset=offset,
+    )
 
     return {
         "dweller_id": str(dweller_id),
         "query": q,
         "importance_min": importance_min,
         "results": matches,
-        "total_matches": len(matches),
+        # Episodes on this page; has_more says whether another page follows
+        "returned": len(matches),
+        "pagination": {
+            "limit": limit,
+            "offset": offset,
+            "has_more": has_more,
+        },
         "message": f"Found {len(matches)} matching episodes.",
     }
 
@@ -2671,10 +2670,9 @@ async def get_pending_events(
     # Preload the dweller relationship to avoid N+1 queries when getting speaker names
     actions_query = (
         select(DwellerAction)
-        .join(Dweller, DwellerAction.dweller_id == Dweller.id)
         .options(selectinload(DwellerAction.dweller))
         .where(
-            Dweller.world_id == dweller.world_id,
+            DwellerAction.world_id == dweller.world_id,
             DwellerAction.dweller_id != dweller_id,  # Not from this dweller
             DwellerAction.action_type == "speak",
             DwellerAction.created_at >= since_last_check,
@@ -2716,6 +2714,7 @@ async def get_pending_events(
             n.status = NotificationStatus.READ
             n.read_at = utc_now()
         await db.commit()
+        invalidate_agent_context(current_user.id)
 
     return {
         "dweller_id": str(dweller_id),
@@ -22,6 +22,7 @@ from sqlalchemy.orm import selectinload
 from db import get_db, User, World, WorldEvent
 from db.models import WorldEventStatus, WorldEventOrigin
 from .auth import get_current_user
+from utils.activity_counters import bump_activity_counters
 from utils.dedup import check_recent_duplicate
 from utils.notifications import create_notification
 from utils.simulation import buggify, buggify_delay
@@ -162,6 +163,7 @@ async def create_event(
         status=WorldEventStatus.PENDING,
     )
     db.add(event)
+    await bump_activity_counters(db, current_user.id, events_proposed=1)
     await db.commit()
     await db.refresh(event)
 
@@ -39,16 +39,17 @@ from sqlalchemy.orm import selectinload
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from db import (
-    get_db, User, Notification, NotificationStatus, Proposal, ProposalStatus,
-    Validation, World, Dweller, DwellerAction, Aspect, AspectStatus,
-    AspectValidation, ReviewFeedback, FeedbackItem, FeedbackItemStatus,
-)
+from db import get_db, User, NotificationStatus, World, Dweller, DwellerAction
 from .auth import get_current_user
-from utils.progression import build_completion_tracking, build_progression_prompts, build_pipeline_status
+from utils.progression import completion_from_counts, build_progression_prompts, build_pipeline_status
 from utils.nudge import build_nudge
+from utils.heartbeat_snapshot import HeartbeatSnapshot, load_heartbeat_snapshot
 from utils.world_signals import build_world_signals
 from utils.errors import agent_error
+from utils.agent_context_cache import invalidate_agent_context
+from utils.feed_cache import invalidate_feed_cache
+from utils.activity_counters import bump_activity_counters
+from utils.activity_events import dweller_action
 
 router = APIRouter(prefix="/heartbeat", tags=["heartbeat"])
 
@@ -63,53 +64,11 @@ DORMANT_THRESHOLD_DAYS = 7
 MAX_ACTIVE_PROPOSALS = 3
 
 
-async def build_activity_digest(
-    db: AsyncSession,
-    user_id: UUID,
-    since: datetime | None,
-) -> dict[str, Any]:
+def build_activity_digest(snapshot: HeartbeatSnapshot) -> dict[str, Any]:
     """Summarize activity since last heartbeat."""
-    if not since:
-        since = utc_now() - timedelta(hours=24)
-
-    # Count new proposals needing validation (that user hasn't validated)
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == user_id)
-        .scalar_subquery()
-    )
-    new_proposals = await db.scalar(
-        select(func.count(Proposal.id))
-        .where(Proposal.created_at > since)
-        .where(Proposal.status == ProposalStatus.VALIDATING)
-        .where(Proposal.agent_id != user_id)  # Not own proposals
-        .where(Proposal.id.notin_(validated_subq))  # Not already validated
-    )
-
-    # Count validations received on user's proposals
-    validations_received = await db.scalar(
-        select(func.count(Validation.id))
-        .join(Proposal, Validation.proposal_id == Proposal.id)
-        .where(Proposal.agent_id == user_id)
-        .where(Validation.created_at > since)
-    )
-
-    # Count activity in user's worlds (through dwellers)
-    user_worlds_subq = (
-        select(World.id)
-        .where(World.created_by == user_id)
-        .scalar_subquery()
-    )
-    world_activity = await db.scalar(
-        select(func.count(DwellerAction.id))
-        .join(Dweller, DwellerAction.dweller_id == Dweller.id)
-        .where(Dweller.world_id.in_(user_worlds_subq))
-        .where(DwellerAction.created_at > since)
-    )
-
-    np = new_proposals or 0
-    vr = validations_received or 0
-    wa = world_activity or 0
+    np = snapshot.new_proposals_to_validate
+    vr = snapshot.validations_on_your_proposals
+    wa = snapshot.activity_in_your_worlds
 
     # Build narrative summary
     parts = []
@@ -122,7 +81,7 @@ async def build_activity_digest(
     summary = f"While you were away: {', '.join(parts)}." if parts else "Nothing happened while you were away."
 
     return {
-        "since": since.isoformat(),
+        "since": snapshot.digest_since.isoformat(),
         "new_proposals_to_validate": np,
         "validations_on_your_proposals": vr,
         "activity_in_your_worlds": wa,
@@ -130,38 +89,21 @@ async def build_activity_digest(
     }
 
 
-async def build_suggested_actions(
-    db: AsyncSession,
-    user_id: UUID,
-    user_dweller_count: int,
-    approved_world_count: int,
-    user_proposals: int,
-    max_proposals: int,
-) -> list[dict[str, Any]]:
+def build_suggested_actions(snapshot: HeartbeatSnapshot, max_proposals: int) -> list[dict[str, Any]]:
     """Build directive action list — specific things this agent should do RIGHT NOW.
 
     Only includes items that are actually actionable. Each has a direct endpoint
     and enough context that the agent can act without further lookups.
     """
     actions = []
+    user_dweller_count = snapshot.inhabited_dwellers
 
     # 1. Address open feedback on YOUR proposals (highest priority — blocks graduation)
-    my_open_feedback = await db.execute(
-        select(FeedbackItem.id, FeedbackItem.description, FeedbackItem.category,
-               ReviewFeedback.content_type, ReviewFeedback.content_id)
-        .join(ReviewFeedback, FeedbackItem.review_feedback_id == ReviewFeedback.id)
-        .join(Proposal, (ReviewFeedback.content_type == "proposal") & (ReviewFeedback.content_id == Proposal.id))
-        .where(
-            Proposal.agent_id == user_id,
-            FeedbackItem.status == FeedbackItemStatus.OPEN,
-        )
-        .limit(5)
-    )
-    for row in my_open_feedback:
+    for row in snapshot.suggestions_of("address_feedback"):
         actions.append({
             "action": "address_feedback",
             "priority": 1,
-            "message": f"Address feedback on your proposal: {row.description[:80]}",
+            "message": f"Address feedback on your proposal: {row.text[:80]}",
             "endpoint": f"POST /api/review/feedback-item/{row.id}/respond",
             "item_id": str(row.id),
             "content_type": row.content_type,
@@ -169,45 +111,21 @@ async def build_suggested_actions(
         })
 
     # 2. Resolve feedback you raised (you're the reviewer, proposer addressed it)
-    my_addressed_feedback = await db.execute(
-        select(FeedbackItem.id, FeedbackItem.description,
-               ReviewFeedback.content_type, ReviewFeedback.content_id)
-        .join(ReviewFeedback, FeedbackItem.review_feedback_id == ReviewFeedback.id)
-        .where(
-            ReviewFeedback.reviewer_id == user_id,
-            FeedbackItem.status == FeedbackItemStatus.ADDRESSED,
-        )
-        .limit(5)
-    )
-    for row in my_addressed_feedback:
+    for row in snapshot.suggestions_of("resolve_feedback"):
         actions.append({
             "action": "resolve_feedback",
             "priority": 2,
-            "message": f"Proposer addressed your feedback — confirm or reopen: {row.description[:80]}",
+            "message": f"Proposer addressed your feedback — confirm or reopen: {row.text[:80]}",
             "endpoint": f"POST /api/review/feedback-item/{row.id}/resolve",
             "item_id": str(row.id),
         })
 
     # 3. Review proposals needing critical review (you haven't reviewed yet)
-    reviewed_subq = (
-        select(ReviewFeedback.content_id)
-        .where(ReviewFeedback.reviewer_id == user_id, ReviewFeedback.content_type == "proposal")
-        .scalar_subquery()
-    )
-    proposals_to_review = await db.execute(
-        select(Proposal.id, Proposal.name)
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != user_id,
-            Proposal.id.notin_(reviewed_subq),
-        )
-        .limit(3)
-    )
-    for row in proposals_to_review:
+    for row in snapshot.suggestions_of("review_proposal"):
         actions.append({
             "action": "review_proposal",
             "priority": 3,
-            "message": f"Review proposal '{row.name}' — submit critical feedback",
+            "message": f"Review proposal '{row.text}' — submit critical feedback",
             "endpoint": f"POST /api/review/proposal/{row.id}/feedback",
             "proposal_id": str(row.id),
         })
@@ -231,7 +149,7 @@ async def build_suggested_actions(
         })
 
     # 6. Create dweller (if worlds exist but no dwellers)
-    if approved_world_count > 0 and user_dweller_count == 0:
+    if snapshot.world_count > 0 and user_dweller_count == 0:
         actions.append({
             "action": "create_dweller",
             "priority": 3,
@@ -240,7 +158,7 @@ async def build_suggested_actions(
         })
 
     # 7. Propose a world (if slots available)
-    slots = max_proposals - user_proposals
+    slots = max_proposals - snapshot.own_active_proposals
     if slots > 0:
         actions.append({
             "action": "propose_world",
@@ -313,58 +231,40 @@ def get_activity_status(last_heartbeat: datetime | None) -> dict[str, Any]:
         }
 
 
-@router.get("")
-@limiter.limit("30/minute")
-async def heartbeat(
-    request: Request,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> dict[str, Any]:
-    """
-    Heartbeat endpoint - call this periodically to stay active.
-
-    RECOMMENDED INTERVAL: Every 4-12 hours
+def build_skill_update(request: Request) -> dict[str, Any]:
+    """Skill documentation version check against the X-Skill-Version header."""
+    from main import SKILL_VERSION
+    agent_skill_version = request.headers.get("x-skill-version")
+    skill_update = {
+        "latest_version": SKILL_VERSION,
+        "fetch_url": "/skill.md",
+        "check_url": "/api/skill/version",
+    }
+    if agent_skill_version and agent_skill_version != SKILL_VERSION:
+        skill_update["available"] = True
+        skill_update["your_version"] = agent_skill_version
+        skill_update["message"] = f"Skill documentation updated from {agent_skill_version} to {SKILL_VERSION}. Re-fetch GET /skill.md to get the latest capabilities and guidelines."
+    elif not agent_skill_version:
+        skill_update["message"] = f"Send X-Skill-Version header with your cached version to get update alerts."
+    return skill_update
 
-    This endpoint:
-    1. Updates your activity status
-    2. Returns your pending notifications (marks them as read)
-    3. Shows proposals waiting for validation
-    4. Tells you your current activity standing
 
-    FOR OPENCLAW AGENTS:
-    Add this to your HEARTBEAT.md:
-    ```
-    curl https://deepsci.fi/api/heartbeat -H "X-API-Key: YOUR_API_KEY"
-    ```
+async def render_heartbeat(
+    db: AsyncSession,
+    request: Request,
+    current_user: User,
+    snapshot: HeartbeatSnapshot,
+) -> dict[str, Any]:
+    """Build the heartbeat response shared by GET and POST from a snapshot.
 
-    ACTIVITY LEVELS:
-    - active: Heartbeat within 12 hours - full access
-    - warning: 12-24 hours - reminder to heartbeat
-    - inactive: 24+ hours - cannot submit new proposals
-    - dormant: 7+ days - profile hidden from active lists
+    Marks the snapshot's notifications read. Apart from the nudge (which
+    looks up a story title when reviews await a response) nothing here
+    queries the database.
     """
-    now = utc_now()
-    previous_heartbeat = current_user.last_heartbeat_at
-
-    # Update heartbeat timestamp
-    current_user.last_heartbeat_at = now
-    current_user.last_active_at = now
+    now = snapshot.now
 
     # Get activity status (based on PREVIOUS heartbeat, before we updated it)
-    activity_status = get_activity_status(previous_heartbeat)
-
-    # Get pending notifications
-    notif_query = (
-        select(Notification)
-        .where(
-            Notification.user_id == current_user.id,
-            Notification.status.in_([NotificationStatus.PENDING, NotificationStatus.SENT]),
-        )
-        .order_by(Notification.created_at.desc(), Notification.id.desc())
-        .limit(50)
-    )
-    notif_result = await db.execute(notif_query)
-    notifications = notif_result.scalars().all()
+    activity_status = get_activity_status(snapshot.previous_heartbeat)
 
     notification_items = [
         {
@@ -375,124 +275,29 @@ async def heartbeat(
             "data": n.data,
             "created_at": n.created_at.isoformat(),
         }
-        for n in notifications
+        for n in snapshot.notifications
     ]
 
     # Mark notifications as read
-    for n in notifications:
+    for n in snapshot.notifications:
         n.status = NotificationStatus.READ
         n.read_at = now
 
-    # Get proposals waiting for validation (that this agent hasn't validated yet)
-    # Subquery to get proposal IDs this user has already validated
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
+    activity_digest = build_activity_digest(snapshot)
+    suggested_actions = build_suggested_actions(snapshot, MAX_ACTIVE_PROPOSALS)
 
-    pending_proposals_query = (
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != current_user.id,  # Can't validate own
-            Proposal.id.notin_(validated_subq),  # Haven't validated yet
-        )
-    )
-    pending_result = await db.execute(pending_proposals_query)
-    proposals_awaiting_validation = pending_result.scalar() or 0
-
-    # Get agent's own active proposals
-    own_proposals_query = (
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.agent_id == current_user.id,
-            Proposal.status.in_([ProposalStatus.DRAFT, ProposalStatus.VALIDATING]),
-        )
-    )
-    own_result = await db.execute(own_proposals_query)
-    own_active_proposals = own_result.scalar() or 0
-
-    # Get agent's dweller count (dwellers inhabited by this user)
-    dweller_count_query = (
-        select(func.count(Dweller.id))
-        .where(Dweller.inhabited_by == current_user.id)
-    )
-    dweller_result = await db.execute(dweller_count_query)
-    user_dweller_count = dweller_result.scalar() or 0
-
-    # Get approved world count (for creating dwellers/aspects/stories)
-    approved_worlds_query = select(func.count(World.id))
-    approved_worlds_result = await db.execute(approved_worlds_query)
-    approved_world_count = approved_worlds_result.scalar() or 0
-
-    # Get aspects awaiting validation (that this agent hasn't validated yet)
-    validated_aspects_subq = (
-        select(AspectValidation.aspect_id)
-        .where(AspectValidation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
-    pending_aspects_query = (
-        select(func.count(Aspect.id))
-        .where(
-            Aspect.status == AspectStatus.VALIDATING,
-            Aspect.agent_id != current_user.id,
-            Aspect.id.notin_(validated_aspects_subq),
-        )
-    )
-    aspects_result = await db.execute(pending_aspects_query)
-    aspects_awaiting_validation = aspects_result.scalar() or 0
-
-    # Build activity digest - what happened since last heartbeat
-    activity_digest = await build_activity_digest(
-        db=db,
-        user_id=current_user.id,
-        since=previous_heartbeat,
-    )
+    # Completion tracking, progression prompts and pipeline status all read the counters
+    completion = completion_from_counts(snapshot.counts)
+    progression_prompts = await build_progression_prompts(db, current_user.id, snapshot.counts)
+    pipeline_status = build_pipeline_status(snapshot.counts)
 
-    # Build suggested actions - what to do next
-    suggested_actions = await build_suggested_actions(
-        db=db,
-        user_id=current_user.id,
-        user_dweller_count=user_dweller_count,
-        approved_world_count=approved_world_count,
-        user_proposals=own_active_proposals,
-        max_proposals=MAX_ACTIVE_PROPOSALS,
-    )
-
-    # Build completion tracking - what agent has/hasn't done (shared utility)
-    completion = await build_completion_tracking(db, current_user.id)
-
-    # Build progression prompts - contextual nudges (shared utility)
-    progression_prompts = await build_progression_prompts(
-        db, current_user.id, completion["counts"]
-    )
-
-    # Build pipeline status (pure function, no DB needed)
-    pipeline_status = build_pipeline_status(completion["counts"])
-
-    # Build dweller alerts first - inhabited dwellers that haven't acted recently
-    # Query once here and share with nudge engine to avoid duplicate queries
-    dormant_cutoff = now - timedelta(hours=12)
-    dormant_dwellers_query = (
-        select(Dweller.name, Dweller.id, Dweller.last_action_at)
-        .where(
-            Dweller.inhabited_by == current_user.id,
-            Dweller.is_active == True,
-            Dweller.last_action_at != None,
-            Dweller.last_action_at < dormant_cutoff,
-        )
-        .order_by(Dweller.last_action_at.asc(), Dweller.id.asc())
-    )
-    dormant_result = await db.execute(dormant_dwellers_query)
-    dormant_dwellers = dormant_result.all()
-
-    # Build nudge - single recommendation (reuse counts, notifications, and dormant dwellers)
+    # Build nudge - single recommendation (reuse the snapshot instead of re-querying)
     nudge = await build_nudge(
         db, current_user.id,
-        counts=completion["counts"],
-        notifications=list(notifications),
-        dormant_dwellers=dormant_dwellers,
+        counts=snapshot.counts,
+        notifications=snapshot.notifications,
+        dormant_dwellers=snapshot.dormant_dwellers,
+        community=snapshot.community,
     )
 
     dweller_alerts = [
@@ -502,57 +307,25 @@ async def heartbeat(
             "hours_idle": round((now - row[2]).total_seconds() / 3600, 1),
             "message": f"{row[0]} hasn't acted in {round((now - row[2]).total_seconds() / 3600)} hours. Their memories grow dim.",
         }
-        for row in dormant_dwellers
+        for row in snapshot.dormant_dwellers
     ]
 
     # Build callback warning
     callback_warning = None
     if not current_user.callback_url:
-        missed_count = await db.scalar(
-            select(func.count(Notification.id))
-            .where(
-                Notification.user_id == current_user.id,
-                Notification.status == NotificationStatus.SENT,
-            )
-        ) or 0
         callback_warning = {
             "missing_callback_url": True,
             "message": "No callback URL configured. You're missing real-time notifications.",
-            "missed_count": missed_count,
+            "missed_count": snapshot.missed_notifications,
             "how_to_fix": "PATCH /api/auth/me/callback with your webhook URL.",
         }
 
-    # Build proposals_by_status for your_work section
-    proposals_by_status_query = (
-        select(Proposal.status, func.count(Proposal.id))
-        .where(Proposal.agent_id == current_user.id)
-        .group_by(Proposal.status)
-    )
-    pbs_result = await db.execute(proposals_by_status_query)
-    proposals_by_status = {row[0].value: row[1] for row in pbs_result.all()}
-
-    await db.commit()
-
-    # Check for skill update
-    from main import SKILL_VERSION
-    agent_skill_version = request.headers.get("x-skill-version")
-    skill_update = {
-        "latest_version": SKILL_VERSION,
-        "fetch_url": "/skill.md",
-        "check_url": "/api/skill/version",
-    }
-    if agent_skill_version and agent_skill_version != SKILL_VERSION:
-        skill_update["available"] = True
-        skill_update["your_version"] = agent_skill_version
-        skill_update["message"] = f"Skill documentation updated from {agent_skill_version} to {SKILL_VERSION}. Re-fetch GET /skill.md to get the latest capabilities and guidelines."
-    elif not agent_skill_version:
-        skill_update["message"] = f"Send X-Skill-Version header with your cached version to get update alerts."
-
+    proposals_awaiting_validation = snapshot.proposals_awaiting_validation
     response = {
         "heartbeat": "received",
         "timestamp": now.isoformat(),
         "dsf_hint": nudge["message"],
-        "skill_update": skill_update,
+        "skill_update": build_skill_update(request),
         "activity": activity_status,
         "activity_digest": activity_digest,
         "pipeline_status": pipeline_status,
@@ -564,9 +337,9 @@ async def heartbeat(
             "note": "These notifications have been marked as read.",
         },
         "your_work": {
-            "active_proposals": own_active_proposals,
+            "active_proposals": snapshot.own_active_proposals,
             "max_active_proposals": MAX_ACTIVE_PROPOSALS,
-            "proposals_by_status": proposals_by_status,
+            "proposals_by_status": snapshot.proposals_by_status,
         },
         "community_needs": {
             "proposals_awaiting_validation": proposals_awaiting_validation,
@@ -590,6 +363,53 @@ async def heartbeat(
     return response
 
 
+@router.get("")
+@limiter.limit("30/minute")
+async def heartbeat(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    """
+    Heartbeat endpoint - call this periodically to stay active.
+
+    RECOMMENDED INTERVAL: Every 4-12 hours
+
+    This endpoint:
+    1. Updates your activity status
+    2. Returns your pending notifications (marks them as read)
+    3. Shows proposals waiting for validation
+    4. Tells you your current activity standing
+
+    FOR OPENCLAW AGENTS:
+    Add this to your HEARTBEAT.md:
+    ```
+    curl https://deepsci.fi/api/heartbeat -H "X-API-Key: YOUR_API_KEY"
+    ```
+
+    ACTIVITY LEVELS:
+    - active: Heartbeat within 12 hours - full access
+    - warning: 12-24 hours - reminder to heartbeat
+    - inactive: 24+ hours - cannot submit new proposals
+    - dormant: 7+ days - profile hidden from active lists
+    """
+    now = utc_now()
+    previous_heartbeat = current_user.last_heartbeat_at
+
+    # Update heartbeat timestamp
+    current_user.last_heartbeat_at = now
+    current_user.last_active_at = now
+
+    snapshot = await load_heartbeat_snapshot(db, current_user.id, previous_heartbeat, now)
+    response = await render_heartbeat(db, request, current_user, snapshot)
+
+    # GET, so AgentContextMiddleware doesn't treat it as a write
+    invalidate_agent_context(current_user.id)
+    await db.commit()
+
+    return response
+
+
 # ============================================================================
 # POST Heartbeat - Extended Heartbeat with Embedded Action
 # ============================================================================
@@ -648,10 +468,6 @@ async def post_heartbeat(
 
     1. POST /api/heartbeat with dweller_id + action in one call
     """
-    # Run standard GET heartbeat logic first
-    # We'll call the GET handler's core logic by duplicating it here
-    # (In production, you'd refactor to share logic)
-
     now = utc_now()
     previous_heartbeat = current_user.last_heartbeat_at
 
@@ -659,223 +475,9 @@ async def post_heartbeat(
     current_user.last_heartbeat_at = now
     current_user.last_active_at = now
 
-    # Get activity status
-    activity_status = get_activity_status(previous_heartbeat)
-
-    # Get pending notifications
-    notif_query = (
-        select(Notification)
-        .where(
-            Notification.user_id == current_user.id,
-            Notification.status.in_([NotificationStatus.PENDING, NotificationStatus.SENT]),
-        )
-        .order_by(Notification.created_at.desc(), Notification.id.desc())
-        .limit(50)
-    )
-    notif_result = await db.execute(notif_query)
-    notifications = notif_result.scalars().all()
-
-    notification_items = [
-        {
-            "id": str(n.id),
-            "type": n.notification_type,
-            "target_type": n.target_type,
-            "target_id": str(n.target_id) if n.target_id else None,
-            "data": n.data,
-            "created_at": n.created_at.isoformat(),
-        }
-        for n in notifications
-    ]
-
-    # Mark notifications as read
-    for n in notifications:
-        n.status = NotificationStatus.READ
-        n.read_at = now
-
-    # Get counts for suggested actions (same as GET handler)
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
-    pending_proposals_query = (
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != current_user.id,
-            Proposal.id.notin_(validated_subq),
-        )
-    )
-    pending_result = await db.execute(pending_proposals_query)
-    proposals_awaiting_validation = pending_result.scalar() or 0
-
-    own_proposals_query = (
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.agent_id == current_user.id,
-            Proposal.status.in_([ProposalStatus.DRAFT, ProposalStatus.VALIDATING]),
-        )
-    )
-    own_result = await db.execute(own_proposals_query)
-    own_active_proposals = own_result.scalar() or 0
-
-    dweller_count_query = (
-        select(func.count(Dweller.id))
-        .where(Dweller.inhabited_by == current_user.id)
-    )
-    dweller_result = await db.execute(dweller_count_query)
-    user_dweller_count = dweller_result.scalar() or 0
-
-    approved_worlds_query = select(func.count(World.id))
-    approved_worlds_result = await db.execute(approved_worlds_query)
-    approved_world_count = approved_worlds_result.scalar() or 0
-
-    validated_aspects_subq = (
-        select(AspectValidation.aspect_id)
-        .where(AspectValidation.agent_id == current_user.id)
-        .scalar_subquery()
-    )
-    pending_aspects_query = (
-        select(func.count(Aspect.id))
-        .where(
-            Aspect.status == AspectStatus.VALIDATING,
-            Aspect.agent_id != current_user.id,
-            Aspect.id.notin_(validated_aspects_subq),
-        )
-    )
-    aspects_result = await db.execute(pending_aspects_query)
-    aspects_awaiting_validation = aspects_result.scalar() or 0
-
-    activity_digest = await build_activity_digest(
-        db=db,
-        user_id=current_user.id,
-        since=previous_heartbeat,
-    )
-
-    suggested_actions = await build_suggested_actions(
-        db=db,
-        user_id=current_user.id,
-        user_dweller_count=user_dweller_count,
-        approved_world_count=approved_world_count,
-        user_proposals=own_active_proposals,
-        max_proposals=MAX_ACTIVE_PROPOSALS,
-    )
-
-    completion = await build_completion_tracking(db, current_user.id)
-    progression_prompts = await build_progression_prompts(
-        db, current_user.id, completion["counts"]
-    )
-    pipeline_status = build_pipeline_status(completion["counts"])
-
-    dormant_cutoff = now - timedelta(hours=12)
-    dormant_dwellers_query = (
-        select(Dweller.name, Dweller.id, Dweller.last_action_at)
-        .where(
-            Dweller.inhabited_by == current_user.id,
-            Dweller.is_active == True,
-            Dweller.last_action_at != None,
-            Dweller.last_action_at < dormant_cutoff,
-        )
-        .order_by(Dweller.last_action_at.asc(), Dweller.id.asc())
-    )
-    dormant_result = await db.execute(dormant_dwellers_query)
-    dormant_dwellers = dormant_result.all()
-
-    nudge = await build_nudge(
-        db, current_user.id,
-        counts=completion["counts"],
-        notifications=list(notifications),
-        dormant_dwellers=dormant_dwellers,
-    )
-
-    dweller_alerts = [
-        {
-            "dweller_name": row[0],
-            "dweller_id": str(row[1]),
-            "hours_idle": round((now - row[2]).total_seconds() / 3600, 1),
-            "message": f"{row[0]} hasn't acted in {round((now - row[2]).total_seconds() / 3600)} hours. Their memories grow dim.",
-        }
-        for row in dormant_dwellers
-    ]
-
-    callback_warning = None
-    if not current_user.callback_url:
-        missed_count = await db.scalar(
-            select(func.count(Notification.id))
-            .where(
-                Notification.user_id == current_user.id,
-                Notification.status == NotificationStatus.SENT,
-            )
-        ) or 0
-        callback_warning = {
-            "missing_callback_url": True,
-            "message": "No callback URL configured. You're missing real-time notifications.",
-            "missed_count": missed_count,
-            "how_to_fix": "PATCH /api/auth/me/callback with your webhook URL.",
-        }
-
-    proposals_by_status_query = (
-        select(Proposal.status, func.count(Proposal.id))
-        .where(Proposal.agent_id == current_user.id)
-        .group_by(Proposal.status)
-    )
-    pbs_result = await db.execute(proposals_by_status_query)
-    proposals_by_status = {row[0].value: row[1] for row in pbs_result.all()}
-
-    # Check for skill update
-    from main import SKILL_VERSION
-    agent_skill_version = request.headers.get("x-skill-version")
-    skill_update = {
-        "latest_version": SKILL_VERSION,
-        "fetch_url": "/skill.md",
-        "check_url": "/api/skill/version",
-    }
-    if agent_skill_version and agent_skill_version != SKILL_VERSION:
-        skill_update["available"] = True
-        skill_update["your_version"] = agent_skill_version
-        skill_update["message"] = f"Skill documentation updated from {agent_skill_version} to {SKILL_VERSION}. Re-fetch GET /skill.md to get the latest capabilities and guidelines."
-    elif not agent_skill_version:
-        skill_update["message"] = f"Send X-Skill-Version header with your cached version to get update alerts."
-
-    # Build base response (same as GET)
-    response = {
-        "heartbeat": "received",
-        "timestamp": now.isoformat(),
-        "dsf_hint": nudge["message"],
-        "skill_update": skill_update,
-        "activity": activity_status,
-        "activity_digest": activity_digest,
-        "pipeline_status": pipeline_status,
-        "nudge": nudge,
-        "suggested_actions": suggested_actions,
-        "notifications": {
-            "items": notification_items,
-            "count": len(notification_items),
-            "note": "These notifications have been marked as read.",
-        },
-        "your_work": {
-            "active_proposals": own_active_proposals,
-            "max_active_proposals": MAX_ACTIVE_PROPOSALS,
-            "proposals_by_status": proposals_by_status,
-        },
-        "community_needs": {
-            "proposals_awaiting_validation": proposals_awaiting_validation,
-            "note": "These proposals need validators. Consider reviewing some!" if proposals_awaiting_validation > 0 else "No proposals currently need validation.",
-            "validate_endpoint": "/api/proposals?status=validating",
-        },
-        "next_heartbeat": {
-            "recommended_interval": "4-12 hours",
-            "required_by": activity_status.get("next_required_by"),
-        },
-        "progression_prompts": progression_prompts,
-        "completion": completion,
-    }
-
-    if dweller_alerts:
-        response["dweller_alerts"] = dweller_alerts
-
-    if callback_warning:
-        response["callback_warning"] = callback_warning
+    # Same snapshot and response as GET
+    snapshot = await load_heartbeat_snapshot(db, current_user.id, previous_heartbeat, now)
+    response = await render_heartbeat(db, request, current_user, snapshot)
 
     # NEW: Add world signals
     world_signals = await build_world_signals(db, current_user.id)
@@ -972,6 +574,8 @@ async def post_heartbeat(
         # Create action
         action = DwellerAction(
             dweller_id=request_body.dweller_id,
+            world_id=dweller.world_id,
+            region=dweller.current_region,
             actor_id=current_user.id,
             action_type=request_body.action.action_type,
             target=request_body.action.target,
@@ -987,29 +591,51 @@ async def post_heartbeat(
         # Update dweller's last action time
         dweller.last_action_at = now
 
+        await db.flush()
+        world = await db.get(World, dweller.world_id)
+        db.add(dweller_action(action, dweller, world, current_user, at=now))
+        await bump_activity_counters(
+            db, current_user.id, actions_taken=1, escalation_eligible_actions=int(action.escalation_eligible)
+        )
+
+        if action.action_type == "speak" and action.target:
+            from utils.conversations import record_speak
+
+            target_dweller = await db.scalar(
+                select(Dweller).where(
+                    Dweller.world_id == dweller.world_id,
+                    func.lower(Dweller.name) == action.target.lower(),
+                    Dweller.id != dweller.id,
+                )
+            )
+            if target_dweller:
+                await record_speak(db, action, target_dweller)
+
         # Add to episodic memory
-        memory_entry = {
-            "id": str(action.id),
-            "timestamp": now.isoformat(),
-            "type": request_body.action.action_type,
-            "content": request_body.action.content,
-            "target": request_body.action.target,
-            "importance": request_body.action.importance,
-        }
-        if dweller.episodic_memories is None:
-            dweller.episodic_memories = []
-        dweller.episodic_memories.append(memory_entry)
+        from utils.dweller_memory import append_episode, enqueue_embeddings
 
-        await db.flush()
+        memory = await append_episode(
+            db,
+            dweller,
+            memory_type=request_body.action.action_type,
+            content=request_body.action.content,
+            target=request_body.action.target,
+            importance=request_body.action.importance,
+            action_id=action.id,
+            created_at=now,
+        )
+        await enqueue_embeddings(db, [memory])
 
         response["action_result"] = {
             "success": True,
             "action_id": str(action.id),
             "importance": request_body.action.importance,
-            "memory_formed": f"Added to episodic memories (total: {len(dweller.episodic_memories)})",
+            "memory_formed": f"Added to episodic memories (total: {dweller.episodic_memory_count})",
         }
 
     await db.commit()
+    if request_body.action:
+        await invalidate_feed_cache()
 
     return response
 
@@ -3,11 +3,10 @@
 Async generation flow:
 1. Agent requests generation (POST)
 2. Returns generation ID immediately
-3. Background task generates + uploads to R2
+3. A job worker (jobs/) generates + uploads to R2
 4. Agent polls status (GET)
 """
 
-import asyncio
 import logging
 import os
 import uuid as uuid_mod
@@ -15,15 +14,18 @@ from datetime import timedelta
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import (
     get_db, User, World, Story,
     MediaGeneration, MediaGenerationStatus, MediaType,
 )
+from jobs import GenerateMedia, enqueue
+from storage import StoredMedia
 from .auth import get_current_user, get_admin_user
 from utils.clock import now as utc_now
 from utils.errors import agent_error
@@ -82,12 +84,44 @@ class BackfillRequest(BaseModel):
 
 
 # =============================================================================
-# Background Task
+# Generation Job
 # =============================================================================
 
 
+async def _queue_generation(db: AsyncSession, gen: MediaGeneration) -> None:
+    """Enqueue a GenerateMedia job for gen (flushed); it runs once db commits."""
+    await enqueue(
+        db,
+        GenerateMedia(
+            generation_id=gen.id,
+            target_type=gen.target_type,
+            target_id=gen.target_id,
+            media_type=gen.media_type,
+        ),
+        dedupe_key=f"{GenerateMedia.kind}:{gen.id}",
+    )
+
+
+async def _store_video(prompt: str, duration: int, storage_key: str) -> StoredMedia:
+    """Render a video and stream it from xAI into storage, never holding the whole file.
+
+    A dropped download restarts the transfer (the render itself is reused).
+    """
+    from media.generator import MAX_RETRIES, generate_video_url, stream_video
+    from storage import upload_stream
+
+    video_url = await generate_video_url(prompt, duration)
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return await upload_stream(stream_video(video_url), storage_key, "video/mp4")
+        except httpx.HTTPError as e:
+            if attempt == MAX_RETRIES:
+                raise RuntimeError(f"Video download failed after {MAX_RETRIES + 1} attempts: {e}") from e
+            logger.warning(f"Video download attempt {attempt + 1} failed: {e}. Retrying...")
+
+
 async def _run_generation(generation_id: UUID, target_type: str, target_id: UUID, media_type: MediaType):
-    """Background task that runs media generation, uploads to R2, and updates DB."""
+    """GenerateMedia job: run media generation, upload to R2, and update DB."""
     from db.database import SessionLocal
 
     # In DST simulation mode, skip real xAI/R2 calls and mark completed with stub URL
@@ -111,37 +145,55 @@ async def _run_generation(generation_id: UUID, target_type: str, target_id: UUID
             logger.error(f"Generation {generation_id} not found")
             return
 
-        gen.status = MediaGenerationStatus.GENERATING
-        gen.started_at = utc_now()
+        # Take the generation unless it's done or another attempt is still
+        # rendering it, so a re-delivered job never pays for a second render
+        now = utc_now()
+        stale = now - timedelta(minutes=STALE_TIMEOUT_MINUTES)
+        taken = await db.scalar(
+            update(MediaGeneration)
+            .where(
+                MediaGeneration.id == generation_id,
+                MediaGeneration.status != MediaGenerationStatus.COMPLETED,
+                or_(
+                    MediaGeneration.status != MediaGenerationStatus.GENERATING,
+                    MediaGeneration.started_at.is_(None),
+                    MediaGeneration.started_at < stale,
+                ),
+            )
+            .values(status=MediaGenerationStatus.GENERATING, started_at=now)
+            .returning(MediaGeneration.id)
+            .execution_options(synchronize_session=False)
+        )
         await db.commit()
+        if taken is None:
+            logger.info(f"Generation {generation_id} is {gen.status.value}; skipping")
+            return
+        await db.refresh(gen)
 
         try:
-            from media.generator import generate_image, generate_video
-            from storage.r2 import upload_media
+            from media.generator import generate_image
+            from storage import upload_media
+
+            storage_key_base = f"media/{target_type}/{target_id}/{media_type.value}/{uuid_mod.uuid4()}"
 
-            # Generate media
+            # Generate media and upload to R2
             if media_type == MediaType.VIDEO:
                 duration = int(gen.duration_seconds or 10)
-                media_bytes = await generate_video(gen.prompt, duration)
-                ext = "mp4"
-                content_type = "video/mp4"
+                storage_key = f"{storage_key_base}.mp4"
+                stored = await _store_video(gen.prompt, duration, storage_key)
                 cost = 0.05 * duration
             else:
-                media_bytes = await generate_image(gen.prompt)
-                ext = "png"
-                content_type = "image/png"
+                storage_key = f"{storage_key_base}.png"
+                stored = await upload_media(await generate_image(gen.prompt), storage_key, "image/png")
                 cost = 0.02
-
-            # Upload to R2
-            storage_key = f"media/{target_type}/{target_id}/{media_type.value}/{uuid_mod.uuid4()}.{ext}"
-            media_url = upload_media(media_bytes, storage_key, content_type)
+            media_url = stored.url
 
             # Update generation record
             gen.status = MediaGenerationStatus.COMPLETED
             gen.completed_at = utc_now()
             gen.media_url = media_url
             gen.storage_key = storage_key
-            gen.file_size_bytes = len(media_bytes)
+            gen.file_size_bytes = stored.size
             gen.cost_usd = cost
             if media_type == MediaType.VIDEO:
                 gen.duration_seconds = gen.duration_seconds or 10
@@ -178,9 +230,9 @@ async def _run_generation(generation_id: UUID, target_type: str, target_id: UUID
                         provider="grok_imagine_image",
                     )
                     db.add(cover_gen)
+                    await db.flush()
+                    await _queue_generation(db, cover_gen)
                     await db.commit()
-                    # Fire and forget - don't wait for this to complete
-                    asyncio.create_task(_run_generation(cover_gen.id, "story", target_id, MediaType.COVER_IMAGE))
 
         except Exception as e:
             gen.status = MediaGenerationStatus.FAILED
@@ -199,7 +251,6 @@ async def _run_generation(generation_id: UUID, target_type: str, target_id: UUID
 async def generate_world_cover(
     world_id: UUID,
     request: ImageGenerationRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> dict[str, Any]:
@@ -243,11 +294,10 @@ async def generate_world_cover(
         provider="grok_imagine_image",
     )
     db.add(gen)
+    await db.flush()
+    await _queue_generation(db, gen)
     await db.commit()
 
-    # Start background generation (commit first so background task's separate session can see the record)
-    background_tasks.add_task(_run_generation, gen.id, "world", world_id, MediaType.COVER_IMAGE)
-
     return {
         "generation_id": str(gen.id),
         "status": "pending",
@@ -261,7 +311,6 @@ async def generate_world_cover(
 async def generate_story_video(
     story_id: UUID,
     request: VideoGenerationRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> dict[str, Any]:
@@ -305,10 +354,10 @@ async def generate_story_video(
         duration_seconds=float(request.duration_seconds),
     )
     db.add(gen)
+    await db.flush()
+    await _queue_generation(db, gen)
     await db.commit()
 
-    background_tasks.add_task(_run_generation, gen.id, "story", story_id, MediaType.VIDEO)
-
     estimated_cost = 0.05 * request.duration_seconds
     return {
         "generation_id": str(gen.id),
@@ -387,7 +436,6 @@ async def get_budget(
 @router.post("/backfill", include_in_schema=False)
 async def backfill_media(
     request: BackfillRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_admin_user),
 ) -> dict[str, Any]:
@@ -516,18 +564,16 @@ async def backfill_media(
                     "media_type": MediaType.VIDEO,
                 })
 
-    # Commit all records before starting background tasks
-    await db.commit()
+    # Flush to assign generation IDs, then queue one job per record
+    await db.flush()
 
-    # Now schedule background tasks (records are committed and visible)
     result_generations = []
     estimated_cost = 0.0
     for item in generations:
         gen = item["gen"]
         target_type = item["type"]
-        target_id = item["target_id"]
         media_type = item["media_type"]
-        background_tasks.add_task(_run_generation, gen.id, target_type, target_id, media_type)
+        await _queue_generation(db, gen)
         entry = {
             "type": target_type,
             "media_type": media_type.value,
@@ -539,6 +585,7 @@ async def backfill_media(
             entry["title"] = item["title"]
         result_generations.append(entry)
         estimated_cost += 0.50 if media_type == MediaType.VIDEO else 0.02
+    await db.commit()
 
     return {
         "queued": len(result_generations),
@@ -550,7 +597,6 @@ async def backfill_media(
 
 @router.post("/process-pending", include_in_schema=False)
 async def process_pending_generations(
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     """Process any PENDING media generations that were never triggered.
@@ -567,15 +613,14 @@ async def process_pending_generations(
 
     queued = []
     for gen in pending:
-        background_tasks.add_task(
-            _run_generation, gen.id, gen.target_type, gen.target_id, gen.media_type
-        )
+        await _queue_generation(db, gen)
         queued.append({
             "generation_id": str(gen.id),
             "target_type": gen.target_type,
             "target_id": str(gen.target_id),
             "media_type": gen.media_type.value,
         })
+    await db.commit()
 
     return {
         "processed": len(queued),
@@ -585,13 +630,12 @@ async def process_pending_generations(
 
 @router.post("/retry-stuck", include_in_schema=False)
 async def retry_stuck_generations(
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     """Retry all stuck and failed media generations.
 
     Handles three cases:
-    1. PENDING — never started (e.g. server restarted before background task ran)
+    1. PENDING — never started (e.g. its job was dead-lettered, or predates the job queue)
     2. GENERATING >10min — stuck mid-flight (server restarted during generation)
     3. FAILED with retry_count < 3 — previously failed, worth retrying
 
@@ -648,9 +692,7 @@ async def retry_stuck_generations(
 
     queued = []
     for gen in pending:
-        background_tasks.add_task(
-            _run_generation, gen.id, gen.target_type, gen.target_id, gen.media_type
-        )
+        await _queue_generation(db, gen)
         queued.append({
             "generation_id": str(gen.id),
             "target_type": gen.target_type,
@@ -658,6 +700,7 @@ async def retry_stuck_generations(
             "media_type": gen.media_type.value,
             "retry_count": gen.retry_count or 0,
         })
+    await db.commit()
 
     return {
         "reset_stuck": len(stuck),
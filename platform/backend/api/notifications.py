@@ -21,6 +21,7 @@ from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db, User, Notification, NotificationStatus
+from utils.agent_context_cache import invalidate_agent_context
 from utils.errors import agent_error
 from .auth import get_current_user
 
@@ -96,6 +97,7 @@ async def get_pending_notifications(
             .values(status=NotificationStatus.READ, read_at=utc_now())
         )
         await db.commit()
+        invalidate_agent_context(current_user.id)
 
     return {
         "notifications": items,
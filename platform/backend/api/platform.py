@@ -318,6 +318,6 @@ async def process_pending_notifications_endpoint(
         "stats": stats,
         "next_action": (
             "Call this endpoint again after a delay to process any retrying notifications. "
-            "Consider implementing exponential backoff for failed callbacks."
+            "Failed callbacks are retried with exponential backoff and are skipped until due."
         ),
     }
@@ -34,6 +34,9 @@ from sqlalchemy.orm import selectinload
 
 from db import get_db, User, World, Proposal, Validation, ProposalStatus, ValidationVerdict
 from .auth import get_current_user, get_optional_user
+from utils.activity_counters import bump_activity_counters
+from utils.activity_events import proposal_revised, proposal_submitted, world_created_events
+from utils.feed_cache import invalidate_feed_cache
 from utils.notifications import notify_proposal_validated, notify_proposal_status_changed
 from utils.rate_limit import limiter_auth
 from guidance import (
@@ -418,6 +421,7 @@ async def create_proposal(
         status=ProposalStatus.DRAFT,
     )
     db.add(proposal)
+    await bump_activity_counters(db, current_user.id, worlds_proposed=1)
     await db.commit()
     await db.refresh(proposal)
 
@@ -862,7 +866,9 @@ async def submit_proposal(
             proposal = result.scalar_one()
 
     proposal.status = ProposalStatus.VALIDATING
+    db.add(proposal_submitted(proposal, current_user))
     await db.commit()
+    await invalidate_feed_cache()
 
     return make_guidance_response(
         data={
@@ -954,8 +960,10 @@ async def revise_proposal(
     from utils.clock import now as utc_now
     proposal.revision_count = (proposal.revision_count or 0) + 1
     proposal.last_revised_at = utc_now()
+    db.add(proposal_revised(proposal, current_user, at=proposal.last_revised_at))
 
     await db.commit()
+    await invalidate_feed_cache()
     await db.refresh(proposal)
 
     # Check if strengthen gate is now cleared
@@ -1054,10 +1062,12 @@ async def test_approve_proposal(
 
     await db.flush()
 
+    creator = await db.get(User, proposal.agent_id)
+    db.add_all(await world_created_events(db, world, proposal, creator))
+
     # Auto-trigger cover image generation if image_prompt exists
     from db import MediaGeneration, MediaType
-    from api.media import _run_generation
-    from fastapi import BackgroundTasks
+    from api.media import _queue_generation
 
     generation_id = None
     if proposal.image_prompt:
@@ -1070,13 +1080,13 @@ async def test_approve_proposal(
             provider="grok_imagine_image",
         )
         db.add(gen)
+        await db.flush()
+        await _queue_generation(db, gen)
         await db.commit()
         generation_id = gen.id
-
-        # Note: In test mode, we can't use background_tasks, so we'll just queue it
-        # The generation will run when accessed via the media API
     else:
         await db.commit()
+    await invalidate_feed_cache()
 
     await db.refresh(world)
     await db.refresh(proposal)
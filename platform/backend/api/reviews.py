@@ -41,6 +41,13 @@ from db import (
     Story,
 )
 from .auth import get_current_user, get_optional_user
+from utils.activity_events import (
+    content_name,
+    feedback_resolved,
+    review_submitted,
+    world_created_events,
+)
+from utils.feed_cache import invalidate_feed_cache
 from utils.rate_limit import limiter_auth
 from guidance import TIMEOUT_HIGH_IMPACT, TIMEOUT_MEDIUM_IMPACT
 
@@ -231,6 +238,9 @@ async def _auto_graduate_if_ready(
     proposal.resulting_world_id = world.id
     await db.flush()
 
+    creator = await db.get(User, proposal.agent_id)
+    db.add_all(await world_created_events(db, world, proposal, creator))
+
     # Queue cover image generation
     if proposal.image_prompt:
         gen = MediaGeneration(
@@ -242,8 +252,12 @@ async def _auto_graduate_if_ready(
             provider="grok_imagine_image",
         )
         db.add(gen)
+        await db.flush()
+        from api.media import _queue_generation
+        await _queue_generation(db, gen)
 
     await db.commit()
+    await invalidate_feed_cache()
     await db.refresh(world)
 
     _logger.info(
@@ -328,7 +342,11 @@ async def submit_review(
         db.add(item)
         items.append(item)
 
+    content_label = getattr(content, "name", None) or getattr(content, "title", None) or "Unknown"
+    db.add(review_submitted(review, current_user, content_label, items))
+
     await db.commit()
+    await invalidate_feed_cache()
 
     # Reload to get relationships
     await db.refresh(review, ["items"])
@@ -559,7 +577,22 @@ async def resolve_feedback(
     if resolve_request.resolution_note:
         item.resolution_note = resolve_request.resolution_note
 
+    items_remaining = await db.scalar(
+        select(func.count(FeedbackItem.id)).where(
+            FeedbackItem.review_feedback_id == item.review_feedback_id,
+            FeedbackItem.status != FeedbackItemStatus.RESOLVED,
+        )
+    )
+    db.add(feedback_resolved(
+        item,
+        item.review,
+        current_user,
+        await content_name(db, item.review.content_type, item.review.content_id),
+        items_remaining or 0,
+    ))
+
     await db.commit()
+    await invalidate_feed_cache()
     await db.refresh(item)
 
     # Check if this resolution triggers auto-graduation
@@ -24,16 +24,20 @@ from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field, model_validator
 from sqlalchemy import select, and_, desc, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from db import get_db, User, World, Dweller, Story, StoryReview, StoryPerspective, StoryStatus, WorldEvent, DwellerAction
+from jobs import PublishStoryToX, UpdateStoryGraph, enqueue
 from .auth import get_current_user, get_optional_user, get_admin_user
+from utils.activity_counters import bump_activity_counters
+from utils.activity_events import story_created, story_reviewed, story_revised
 from utils.dedup import check_recent_duplicate
 from utils.errors import agent_error
+from utils.feed_cache import invalidate_feed_cache
 from utils.notifications import create_notification, notify_story_acclaimed
 from utils.nudge import build_nudge
 from utils.simulation import buggify, buggify_delay
@@ -461,7 +465,6 @@ async def maybe_transition_to_acclaimed(story: Story, db) -> bool:
 @router.post("")
 async def create_story(
     request: StoryCreateRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> dict[str, Any]:
@@ -559,10 +562,12 @@ async def create_story(
     )
     db.add(story)
     await db.flush()
+    db.add(story_created(story, world, current_user, perspective_dweller))
+    await bump_activity_counters(db, current_user.id, stories_written=1)
 
     # Auto-trigger video generation (same logic as POST /api/media/stories/{id}/video)
     from db import MediaGeneration, MediaType, MediaGenerationStatus
-    from api.media import _run_generation
+    from api.media import _queue_generation
 
     gen = MediaGeneration(
         requested_by=current_user.id,
@@ -574,16 +579,16 @@ async def create_story(
         duration_seconds=10.0,
     )
     db.add(gen)
-    await db.commit()
-
-    # Start background generation
-    background_tasks.add_task(_run_generation, gen.id, "story", story.id, MediaType.VIDEO)
-
-    # Auto-publish to X in background (no-op if credentials not set)
-    background_tasks.add_task(_publish_to_x, story.id)
+    await db.flush()
 
-    # Materialize relationships and arcs (compute-on-write)
-    background_tasks.add_task(_update_graph_and_arcs, story.id)
+    # Queue follow-up work in the same transaction, so it runs iff the story exists:
+    # video generation, X publishing (no-op if credentials not set), and
+    # relationship/arc materialization
+    await _queue_generation(db, gen)
+    await enqueue(db, PublishStoryToX(story_id=story.id), dedupe_key=f"{PublishStoryToX.kind}:{story.id}")
+    await enqueue(db, UpdateStoryGraph(story_id=story.id))
+    await db.commit()
+    await invalidate_feed_cache()
 
     # Add lightweight nudge to story creation response
     nudge = await build_nudge(db, current_user.id, lightweight=True)
@@ -1075,6 +1080,8 @@ async def review_story(
     )
     db.add(review)
     await db.flush()
+    await bump_activity_counters(db, current_user.id, stories_reviewed=1)
+    await bump_activity_counters(db, story.author_id, unresponded_reviews=1)
 
     # Notify the author
     await create_notification(
@@ -1094,6 +1101,11 @@ async def review_story(
         },
     )
 
+    world = await db.get(World, story.world_id)
+    db.add(story_reviewed(review, current_user, story, world))
+    await db.commit()
+    await invalidate_feed_cache()
+
     # Count reviews for response
     total_reviews = len(story.reviews) + 1
     acclaim_reviews = sum(1 for r in story.reviews if r.recommend_acclaim) + (
@@ -1273,6 +1285,7 @@ async def respond_to_review(
     review.author_responded = True
     review.author_response = request.response
     review.author_responded_at = utc_now()
+    await bump_activity_counters(db, story.author_id, unresponded_reviews=-1)
 
     # Check if story should now become acclaimed
     transitioned = await maybe_transition_to_acclaimed(story, db)
@@ -1420,6 +1433,11 @@ async def revise_story(
         response["new_status"] = "acclaimed"
         response["message"] += " Your story has been ACCLAIMED!"
 
+    world = await db.get(World, story.world_id)
+    db.add(story_revised(story, world, current_user, at=story.last_revised_at))
+    await db.commit()
+    await invalidate_feed_cache()
+
     return response
 
 
@@ -1428,19 +1446,8 @@ async def revise_story(
 # =============================================================================
 
 
-async def _publish_to_x(story_id: UUID):
-    """Background task: publish story to X."""
-    try:
-        from services.x_publisher import publish_story_to_x
-        x_post_id = await publish_story_to_x(story_id)
-        if x_post_id:
-            logger.info("Story published to X: story_id=%s, x_post_id=%s", story_id, x_post_id)
-    except Exception:
-        logger.exception("Background X publishing failed for story %s", story_id)
-
-
 async def _update_graph_and_arcs(story_id: UUID):
-    """Background task: materialize relationships and arcs after story creation.
+    """UpdateStoryGraph job: materialize relationships and arcs after story creation.
 
     Runs two independent phases, each in its own session, so a failure in one
     does not block the other. Both phases log exceptions and proceed.
@@ -1496,7 +1503,6 @@ async def _update_graph_and_arcs(story_id: UUID):
 @router.post("/{story_id}/publish-to-x")
 async def publish_story_to_x_endpoint(
     story_id: UUID,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_admin_user),
 ) -> dict[str, Any]:
@@ -1528,12 +1534,13 @@ async def publish_story_to_x_endpoint(
             "message": "Story is already published to X.",
         }
 
-    background_tasks.add_task(_publish_to_x, story.id)
+    await enqueue(db, PublishStoryToX(story_id=story.id), dedupe_key=f"{PublishStoryToX.kind}:{story.id}")
+    await db.commit()
 
     return {
         "success": True,
         "story_id": str(story_id),
-        "message": "X publishing triggered in background. Poll the story detail endpoint to check for x_post_id.",
+        "message": "X publishing queued. Poll the story detail endpoint to check for x_post_id.",
     }
 
 
@@ -1574,6 +1581,13 @@ async def delete_story(
 
     review_count = len(story.reviews)
     title = story.title
+    await bump_activity_counters(
+        db, story.author_id,
+        stories_written=-1,
+        unresponded_reviews=-sum(1 for r in story.reviews if not r.author_responded),
+    )
+    for review in story.reviews:
+        await bump_activity_counters(db, review.reviewer_id, stories_reviewed=-1)
     await db.delete(story)
     await db.commit()
 
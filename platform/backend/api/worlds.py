@@ -9,11 +9,11 @@ from typing import Any, Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from db import get_db, World, Story, Dweller, User
+from db import get_db, World, WorldMapLayout, Story, Dweller, User
 from .auth import get_current_user, get_admin_user
 from utils.errors import agent_error
 from utils.rate_limit import limiter_auth
@@ -97,15 +97,17 @@ async def get_world_map(
     Worlds that explore related ideas cluster together.
     Coordinates are in the range [-1, 1].
 
+    Reads the stored layout; when the set of embedded worlds has changed, a
+    background refresh is queued and newly embedded worlds show as
+    "uncharted" until it lands.
+
     Response:
       worlds: list of world nodes with x, y, cluster, cluster_label, cluster_color
       cluster_labels: unique cluster label strings (sorted by cluster id)
     """
-    import json
-    from sqlalchemy import text
-    from utils.map_service import build_world_map
+    from jobs import RefreshWorldMap, enqueue
+    from utils.map_service import MAP_REFRESH_JOB_KEY, build_world_map, is_stale, refresh_world_map
 
-    # Load all active worlds + their embeddings.
     # Truncate premise in SQL to avoid fetching full KB-sized text for every world.
     rows = await db.execute(
         text("""
@@ -117,7 +119,7 @@ async def get_world_map(
                 cover_image_url,
                 dweller_count,
                 follower_count,
-                premise_embedding::text AS embedding_text
+                premise_embedding IS NOT NULL AS has_embedding
             FROM platform_worlds
             WHERE is_active = TRUE
             ORDER BY created_at ASC
@@ -127,14 +129,6 @@ async def get_world_map(
 
     worlds_input = []
     for row in raw:
-        # Parse embedding from postgres vector literal "[0.1,0.2,...]"
-        embedding: list[float] | None = None
-        if row.embedding_text:
-            try:
-                embedding = json.loads(row.embedding_text)
-            except Exception as e:
-                logger.warning(f"Failed to parse embedding for world {row.id}: {e}")
-
         premise_short = row.premise_short
         worlds_input.append({
             "id": str(row.id),
@@ -145,10 +139,22 @@ async def get_world_map(
             "cover_image_url": row.cover_image_url,
             "dweller_count": row.dweller_count,
             "follower_count": row.follower_count,
-            "embedding": embedding,
+            "has_embedding": row.has_embedding,
         })
 
-    nodes = await build_world_map(worlds_input)
+    layout = await db.scalar(
+        select(WorldMapLayout).order_by(WorldMapLayout.created_at.desc()).limit(1)
+    )
+    embedded = {w["id"] for w in worlds_input if w["has_embedding"]}
+    if embedded and layout is None:
+        # First map ever: lay it out now rather than show everything uncharted
+        layout = await refresh_world_map(db)
+        await db.commit()
+    elif embedded and is_stale(layout, embedded):
+        await enqueue(db, RefreshWorldMap(), dedupe_key=MAP_REFRESH_JOB_KEY)
+        await db.commit()
+
+    nodes = build_world_map(worlds_input, layout)
 
     # Collect unique cluster labels ordered by cluster id (deterministic)
     cluster_label_map: dict[int, str] = {}
@@ -293,6 +299,10 @@ async def delete_world(
 
     # Delete the world — CASCADE FKs handle stories, dwellers, etc.
     await db.delete(world)
+    # The cascade bypasses the activity counter bumps; recompute them all
+    from jobs import ReconcileActivityCounters, enqueue
+
+    await enqueue(db, ReconcileActivityCounters(), dedupe_key=f"{ReconcileActivityCounters.kind}:all")
     await db.commit()
 
     logger.info(f"Admin deleted world '{world_name}' ({world_id}): {story_count} stories, {dweller_count} dwellers")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Benchmark: cost of _agent_context injection by response size.
+
+Measures p50/p99 latency, peak Python allocation per request (tracemalloc)
+and process RSS for three authenticated GETs, each with injection on and
+with `X-Agent-Context: off`:
+
+- /auth/me                        small object, context spliced in
+- /dwellers/{id}/memory (100)     mid-size object, context spliced in
+- /dwellers/{id}/memory (1000)    above MAX_INJECT_BYTES, passed through
+
+Injection splices bytes instead of re-serializing the payload, and large
+bodies are forwarded as produced, so "on" should track "off" closely and
+the large response should cost the same either way.
+
+Usage:
+    cd platform/backend
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.agent_context
+    python -m benchmarks.agent_context --repeat 100
+
+Exits 1 if p99 with injection on exceeds --max-ratio × p99 with it off for
+the passed-through response.
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import tracemalloc
+from uuid import UUID
+
+from benchmarks.harness import (
+    Timing,
+    bench_client,
+    bench_database,
+    create_world_with_dwellers,
+    measure,
+    print_table,
+    register_agent,
+)
+
+# ~2 KB per episode puts 1000 episodes well past MAX_INJECT_BYTES (1 MiB)
+EPISODE_TEXT = "The tide market reopened after the storm and the ration ledger was recounted. " * 26
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def seed_episodes(session_factory, dweller_id: str, total: int) -> None:
+    from sqlalchemy import text
+
+    async with session_factory() as db:
+        await db.execute(
+            text("""
+                INSERT INTO platform_dweller_memories
+                    (id, dweller_id, memory_type, content, target, importance, extra, created_at)
+                SELECT gen_random_uuid(), :dweller_id, 'observe', :content || g, NULL, 0.5,
+                       '{}'::jsonb, now() - make_interval(secs => :total - g)
+                FROM generate_series(1, :total) AS g
+            """),
+            {"dweller_id": UUID(dweller_id), "content": EPISODE_TEXT, "total": total},
+        )
+        await db.execute(
+            text("UPDATE platform_dwellers SET episodic_memory_count = :total WHERE id = :dweller_id"),
+            {"dweller_id": UUID(dweller_id), "total": total},
+        )
+        await db.commit()
+
+
+async def peak_alloc_mb(fn) -> float:
+    """Peak traced allocation while awaiting fn() once."""
+    tracemalloc.start()
+    try:
+        await fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+async def run(repeat: int, max_ratio: float) -> int:
+    async with bench_database() as session_factory, bench_client(session_factory) as client:
+        agent = await register_agent(client, "bench-context-agent")
+        _, (dweller_id,) = await create_world_with_dwellers(
+            session_factory,
+            creator_id=agent["user"]["id"],
+            dweller_names=["Odile Varga"],
+            inhabited_by=agent["user"]["id"],
+        )
+        await seed_episodes(session_factory, dweller_id, 1000)
+
+        targets = [
+            ("auth/me", "/api/auth/me"),
+            ("memory 100", f"/api/dwellers/{dweller_id}/memory?episode_limit=100"),
+            ("memory 1000", f"/api/dwellers/{dweller_id}/memory?episode_limit=1000"),
+        ]
+        rows = []
+        p99s: dict[tuple[str, str], float] = {}
+        for name, url in targets:
+            sizes: dict[str, int] = {}
+
+            def getter(mode: str):
+                headers = {"X-API-Key": agent["api_key"], "X-Skill-Version": "bench"}
+                if mode == "off":
+                    headers["X-Agent-Context"] = "off"
+
+                async def get() -> None:
+                    response = await client.get(url, headers=headers)
+                    response.raise_for_status()
+                    sizes[mode] = len(response.content)
+
+                return get
+
+            # Interleave on/off samples so drift (cache warm-up, GC) hits both alike
+            samples: dict[str, list[float]] = {"on": [], "off": []}
+            for mode in ("on", "off"):
+                await getter(mode)()
+            for _ in range(repeat):
+                for mode in ("on", "off"):
+                    timing = await measure(f"{name} {mode}", getter(mode), repeat=1, warmup=0)
+                    samples[mode].extend(timing.samples_ms)
+            for mode in ("on", "off"):
+                timing = Timing(label=f"{name} {mode}", samples_ms=samples[mode])
+                peak = await peak_alloc_mb(getter(mode))
+                p99s[(name, mode)] = timing.p99
+                rows.append([name, mode, sizes[mode] // 1024, timing.p50, timing.p99, peak, rss_mb()])
+
+        print_table(
+            "Agent context injection: latency (ms) and memory (MB)",
+            ["response", "context", "KB", "p50", "p99", "peak alloc", "RSS"],
+            rows,
+        )
+        print()
+
+    name = targets[-1][0]
+    ratio = p99s[(name, "on")] / p99s[(name, "off")]
+    print(f"{name} p99 on/off: {ratio:.2f}x (limit {max_ratio}x)")
+    return 1 if ratio > max_ratio else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--max-ratio", type=float, default=1.5)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.repeat, args.max_ratio)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Benchmark: dweller action latency vs. episodic memory size.
+
+Seeds one dweller with 100 → 100k episodes in platform_dweller_memories and
+measures POST /dwellers/{id}/act and POST /dwellers/{id}/act/context at each
+size. With episodes stored one row per memory, both should stay flat: an
+action inserts one row instead of rewriting the whole history.
+
+Usage:
+    cd platform/backend
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.dweller_memory
+    python -m benchmarks.dweller_memory --sizes 100 1000 10000 --repeat 30
+
+Exits 1 if p50 act or context latency at the largest size exceeds
+--max-ratio × the smallest size.
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+from benchmarks.harness import (
+    bench_client,
+    bench_database,
+    create_world_with_dwellers,
+    measure,
+    print_table,
+    register_agent,
+)
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+async def seed_episodes(session_factory, dweller_id: str, total: int) -> None:
+    """Top the dweller's history up to `total` episodes with one INSERT ... SELECT."""
+    from sqlalchemy import text
+
+    async with session_factory() as db:
+        await db.execute(
+            text("""
+                INSERT INTO platform_dweller_memories
+                    (id, dweller_id, memory_type, content, target, importance, extra, created_at)
+                SELECT
+                    gen_random_uuid(), :dweller_id,
+                    CASE WHEN g % 10 = 0 THEN 'reflection' ELSE 'observe' END,
+                    'Seeded episode ' || g || ' about the tidal market and the water ration',
+                    NULL,
+                    (g % 10) / 10.0,
+                    '{}'::jsonb,
+                    now() - make_interval(secs => :total - g)
+                FROM generate_series(
+                    (SELECT episodic_memory_count FROM platform_dwellers WHERE id = :dweller_id) + 1,
+                    :total
+                ) AS g
+            """),
+            {"dweller_id": UUID(dweller_id), "total": total},
+        )
+        await db.execute(
+            text("""
+                UPDATE platform_dwellers
+                SET episodic_memory_count = (
+                    SELECT COUNT(*) FROM platform_dweller_memories WHERE dweller_id = :dweller_id
+                )
+                WHERE id = :dweller_id
+            """),
+            {"dweller_id": UUID(dweller_id)},
+        )
+        await db.execute(text("ANALYZE platform_dweller_memories"))
+        await db.commit()
+
+
+async def run(sizes: list[int], repeat: int, max_ratio: float) -> int:
+    async with bench_database() as session_factory, bench_client(session_factory) as client:
+        agent = await register_agent(client, "bench-memory-agent")
+        headers = {"X-API-Key": agent["api_key"]}
+        _, (dweller_id,) = await create_world_with_dwellers(
+            session_factory,
+            creator_id=agent["user"]["id"],
+            dweller_names=["Ilse Marrow"],
+            inhabited_by=agent["user"]["id"],
+        )
+
+        counter = 0
+
+        async def get_context() -> str:
+            response = await client.post(f"/api/dwellers/{dweller_id}/act/context", headers=headers)
+            response.raise_for_status()
+            return response.json()["context_token"]
+
+        token = await get_context()
+
+        async def act() -> None:
+            nonlocal counter
+            counter += 1
+            response = await client.post(
+                f"/api/dwellers/{dweller_id}/act",
+                headers=headers,
+                json={
+                    "context_token": token,
+                    "action_type": "observe",
+                    "content": f"Benchmark observation number {counter} of the harbour at dusk.",
+                    "importance": 0.5,
+                },
+            )
+            response.raise_for_status()
+
+        rows = []
+        p50s: dict[str, dict[int, float]] = {"act": {}, "context": {}}
+        for size in sizes:
+            await seed_episodes(session_factory, dweller_id, size)
+            context = await measure(f"context@{size}", get_context, repeat)
+            token = await get_context()
+            action = await measure(f"act@{size}", act, repeat)
+            p50s["act"][size] = action.p50
+            p50s["context"][size] = context.p50
+            rows.append([size, context.p50, context.p99, action.p50, action.p99])
+
+        print_table(
+            "Dweller memory: latency (ms) vs. episodes",
+            ["episodes", "context p50", "context p99", "act p50", "act p99"],
+            rows,
+        )
+        print()
+
+    failed = False
+    for name, by_size in p50s.items():
+        ratio = by_size[sizes[-1]] / by_size[sizes[0]]
+        print(f"{name} p50 ratio {sizes[-1]}/{sizes[0]} episodes: {ratio:.2f}x (limit {max_ratio}x)")
+        failed = failed or ratio > max_ratio
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-ratio", type=float, default=2.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(sorted(args.sizes), args.repeat, args.max_ratio)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Benchmark: SQL statements and latency per heartbeat versus agent footprint.
+
+Seeds an agent inhabiting three dwellers in each of N worlds, with pending
+notifications, proposals awaiting validation and dormant dwellers, then
+calls GET and POST /api/heartbeat and reports, per call:
+
+    statements   SQL statements the request issued (before_cursor_execute)
+    p50 / p99    request latency in milliseconds
+
+Both endpoints render one HeartbeatSnapshot (utils/heartbeat_snapshot.py),
+loaded in a fixed number of statements, so GET should issue the same
+number of statements for 1 world as for 50. POST adds world signals
+(utils/world_signals.py): the agent's worlds plus one grouped pass per
+signal type, WORLD_SIGNAL_STATEMENTS in all, also independent of the
+number of worlds.
+
+Usage:
+    cd platform/backend
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.heartbeat
+    python -m benchmarks.heartbeat --worlds 1 10 50 --notifications 50 --repeat 20
+
+Exits 1 if any GET heartbeat issues more than --max-statements statements,
+or any POST more than --max-statements + WORLD_SIGNAL_STATEMENTS.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from uuid import UUID
+
+from sqlalchemy import event, text
+
+from benchmarks.harness import (
+    Timing,
+    bench_client,
+    bench_database,
+    create_world_with_dwellers,
+    print_table,
+    register_agent,
+)
+
+METHODS = ("GET", "POST")
+# Worlds lookup + actions by region, by type, active dwellers, aspect counts
+WORLD_SIGNAL_STATEMENTS = 5
+
+
+async def seed_pending(session_factory, user_id: str, notifications: int) -> None:
+    """Give the agent fresh pending notifications and let its dwellers go idle."""
+    async with session_factory() as db:
+        await db.execute(
+            text("DELETE FROM platform_notifications WHERE user_id = :user_id"),
+            {"user_id": UUID(user_id)},
+        )
+        await db.execute(
+            text("""
+                INSERT INTO platform_notifications
+                    (id, user_id, notification_type, target_type, data, status, created_at, retry_count)
+                SELECT gen_random_uuid(), :user_id, 'proposal_validated', 'world',
+                       jsonb_build_object('n', g), 'PENDING', now() - make_interval(secs => g), 0
+                FROM generate_series(1, :total) AS g
+            """),
+            {"user_id": UUID(user_id), "total": notifications},
+        )
+        await db.execute(
+            text("""
+                UPDATE platform_dwellers SET last_action_at = now() - interval '1 day'
+                WHERE inhabited_by = :user_id
+            """),
+            {"user_id": UUID(user_id)},
+        )
+        await db.commit()
+
+
+async def seed_proposals(client, total: int) -> None:
+    """Proposals from another agent, submitted for validation."""
+    author = await register_agent(client, "bench-heartbeat-author")
+    headers = {"X-API-Key": author["api_key"]}
+    for i in range(total):
+        response = await client.post(
+            "/api/proposals",
+            headers=headers,
+            json={
+                "name": f"Benchmark Harbour {i}",
+                "premise": "A harbour city where fusion made shipping cheap and tides predictable",
+                "year_setting": 2090,
+                "causal_chain": [
+                    {"year": 2030, "event": "Fusion reaches commercial viability",
+                     "reasoning": "Sustained investment and a decade of pilot plants"},
+                    {"year": 2045, "event": "Cheap power rebuilds coastal logistics",
+                     "reasoning": "Electrified ports undercut every fossil-fuelled rival"},
+                    {"year": 2070, "event": "Harbour cities federate around shared grids",
+                     "reasoning": "Grid interdependence turns trade partners into polities"},
+                ],
+                "scientific_basis": "Fusion cost curves follow earlier energy technologies. " * 3,
+                "image_prompt": "Cinematic wide shot of a futuristic harbour at golden hour. " * 2,
+            },
+        )
+        response.raise_for_status()
+        response = await client.post(f"/api/proposals/{response.json()['id']}/submit", headers=headers)
+        response.raise_for_status()
+
+
+async def run(worlds: list[int], notifications: int, repeat: int, max_statements: int) -> int:
+    from api.heartbeat import limiter as heartbeat_limiter
+
+    # The router's own 30/minute limit, which bench_client leaves on
+    heartbeat_limiter.enabled = False
+
+    async with bench_database() as session_factory, bench_client(session_factory) as client:
+        engine = session_factory.kw["bind"].sync_engine
+        statements: list[str] = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        await seed_proposals(client, 3)
+
+        rows = []
+        worst = dict.fromkeys(METHODS, 0)
+        for n in worlds:
+            agent = await register_agent(client, f"bench-heartbeat-{n}")
+            user_id = agent["user"]["id"]
+            for i in range(n):
+                await create_world_with_dwellers(
+                    session_factory,
+                    creator_id=user_id,
+                    dweller_names=[f"Dweller {i}-{j}" for j in range(3)],
+                    inhabited_by=user_id,
+                )
+            headers = {"X-API-Key": agent["api_key"], "X-Skill-Version": "bench"}
+
+            async def heartbeat(method: str) -> None:
+                if method == "GET":
+                    response = await client.get("/api/heartbeat", headers=headers)
+                else:
+                    response = await client.post("/api/heartbeat", headers=headers, json={})
+                response.raise_for_status()
+
+            # Warm up: the first request resolves the API key and computes the counters row
+            await heartbeat("GET")
+
+            for method in METHODS:
+                samples: list[float] = []
+                counts: list[int] = []
+                for _ in range(repeat):
+                    await seed_pending(session_factory, user_id, notifications)
+                    statements.clear()
+                    event.listen(engine, "before_cursor_execute", count)
+                    start = time.perf_counter()
+                    try:
+                        await heartbeat(method)
+                    finally:
+                        samples.append((time.perf_counter() - start) * 1000)
+                        event.remove(engine, "before_cursor_execute", count)
+                    counts.append(len(statements))
+
+                timing = Timing(label=f"{method} {n}", samples_ms=samples)
+                rows.append([n, method, max(counts), timing.p50, timing.p99])
+                worst[method] = max(worst[method], max(counts))
+
+        print_table(
+            f"Heartbeat cost with {notifications} pending notifications (ms)",
+            ["worlds", "method", "statements", "p50", "p99"],
+            rows,
+        )
+        print()
+
+    limits = {"GET": max_statements, "POST": max_statements + WORLD_SIGNAL_STATEMENTS}
+    for method in METHODS:
+        print(f"{method} statements per heartbeat: {worst[method]} (limit {limits[method]})")
+    return 1 if any(worst[method] > limits[method] for method in METHODS) else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--worlds", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--notifications", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-statements", type=int, default=14)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.worlds, args.notifications, args.repeat, args.max_statements)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark: event-loop stalls and peak memory while storing a large video.
+
+Stores a --size-mb file through LocalStorage three ways while a ticker task
+measures how late the event loop wakes it (the lag every other request
+would see):
+
+    blocking   bytes written with a plain open()/write() on the loop
+               (what the synchronous boto3 put_object did to the loop)
+    buffered   storage.upload() of the whole file, off the loop
+    streamed   storage.upload_stream() of --chunk-kb chunks, off the loop
+
+Peak memory is traced allocations during the upload, including building the
+payload; streaming never materializes the whole file.
+
+Usage:
+    cd platform/backend
+    python -m benchmarks.media_upload
+    python -m benchmarks.media_upload --size-mb 256 --chunk-kb 1024
+
+Exits 1 if streamed uploads stall the loop for longer than --max-lag-ms.
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+
+from benchmarks.harness import print_table
+from storage import LocalStorage
+
+
+async def _max_loop_lag(work: Callable[[], Awaitable[None]], interval_s: float = 0.001) -> float:
+    """Run work() while a ticker sleeps interval_s; return its worst wake-up lag in ms."""
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def tick() -> None:
+        nonlocal worst
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval_s)
+            worst = max(worst, time.perf_counter() - start - interval_s)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    try:
+        await work()
+    finally:
+        done.set()
+        await ticker
+    return worst * 1000
+
+
+async def run(size_mb: int, chunk_kb: int) -> list[list]:
+    chunk = b"\0" * (chunk_kb * 1024)
+    n_chunks = size_mb * 1024 // chunk_kb
+
+    async def stream():
+        for _ in range(n_chunks):
+            yield chunk
+            await asyncio.sleep(0)  # as a network download would
+
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalStorage(root, "http://bench.local")
+
+        async def blocking() -> None:
+            data = chunk * n_chunks
+            with open(storage.path_for("blocking.mp4"), "wb") as f:
+                f.write(data)
+
+        async def buffered() -> None:
+            await storage.upload(chunk * n_chunks, "buffered.mp4", "video/mp4")
+
+        async def streamed() -> None:
+            await storage.upload_stream(stream(), "streamed.mp4", "video/mp4")
+
+        rows = []
+        for label, work in (("blocking", blocking), ("buffered", buffered), ("streamed", streamed)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            lag_ms = await _max_loop_lag(work)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows.append([label, round(elapsed * 1000, 1), round(lag_ms, 1), round(peak / 2**20, 1)])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--chunk-kb", type=int, default=512)
+    parser.add_argument("--max-lag-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.size_mb, args.chunk_kb))
+    print_table(
+        f"Storing a {args.size_mb} MiB video ({args.chunk_kb} KiB chunks)",
+        ["mode", "total ms", "max loop lag ms", "peak MiB"],
+        rows,
+    )
+    streamed_lag = rows[-1][2]
+    if streamed_lag > args.max_lag_ms:
+        print(f"\nFAIL: streamed upload stalled the loop for {streamed_lag} ms (> {args.max_lag_ms})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
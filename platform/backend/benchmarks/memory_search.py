@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Benchmark: dweller memory search latency at 100k episodes.
+
+Seeds one dweller (plus a neighbour, so per-dweller filtering is exercised)
+with --episodes memories built from a ~1.6k-word vocabulary, then times
+search_memories() directly against the database:
+
+- text:   tsvector/GIN full-text ranking only
+- hybrid: text + semantic recall (MEMORY_EMBEDDING_PROVIDER=local, with
+          embeddings seeded for every episode)
+
+Usage:
+    cd platform/backend
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.memory_search
+    python -m benchmarks.memory_search --episodes 20000 --repeat 50
+
+Exits 1 if text-search p50 exceeds --max-ms.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+from uuid import UUID
+
+from benchmarks.harness import (
+    bench_database,
+    create_world_with_dwellers,
+    measure,
+    print_table,
+)
+
+ROOTS = [
+    "tide", "glass", "salt", "copper", "ember", "moss", "reef", "spire", "drift", "vault",
+    "lumen", "brine", "cinder", "kelp", "quartz", "rust", "silt", "thorn", "vapor", "wick",
+    "anchor", "beacon", "cable", "delta", "ferro", "gale", "harbor", "iron", "jade", "keel",
+    "lattice", "mire", "nickel", "orbit", "pylon", "quill", "relay", "sable", "tern", "umber",
+]
+VOCABULARY = [a + b for a in ROOTS for b in ROOTS if a != b]
+WORDS_PER_EPISODE = 10
+
+
+async def seed(session_factory, dweller_ids: list[str], episodes: int) -> None:
+    """Insert `episodes` memories per dweller with random vocabulary and embeddings."""
+    from sqlalchemy import text
+
+    async with session_factory() as db:
+        for dweller_id in dweller_ids:
+            await db.execute(
+                text("""
+                    INSERT INTO platform_dweller_memories
+                        (id, dweller_id, memory_type, content, importance, extra, created_at, embedding)
+                    SELECT
+                        gen_random_uuid(), :dweller_id,
+                        CASE WHEN g % 20 = 0 THEN 'reflection' ELSE 'observe' END,
+                        (SELECT string_agg(
+                             (CAST(:vocab AS text[]))[1 + floor(random() * :vocab_size)::int], ' ')
+                         FROM generate_series(1, :words) WHERE g > 0),
+                        (g % 10) / 10.0,
+                        '{}'::jsonb,
+                        now() - make_interval(secs => :episodes - g),
+                        (SELECT array_agg(random() - 0.5) FROM generate_series(1, 256) WHERE g > 0)::vector
+                    FROM generate_series(1, :episodes) AS g
+                """),
+                {
+                    "dweller_id": UUID(dweller_id),
+                    "vocab": VOCABULARY,
+                    "vocab_size": len(VOCABULARY),
+                    "words": WORDS_PER_EPISODE,
+                    "episodes": episodes,
+                },
+            )
+        # Fold the GIN pending list into the index, as autovacuum would in production.
+        await db.execute(text("SELECT gin_clean_pending_list('dweller_memory_search_idx')"))
+        await db.execute(text("ANALYZE platform_dweller_memories"))
+        await db.commit()
+
+
+async def run(episodes: int, repeat: int, max_ms: float) -> int:
+    from utils.dweller_memory import search_memories
+
+    async with bench_database() as session_factory:
+        from db import User, UserType
+
+        async with session_factory() as db:
+            user = User(type=UserType.AGENT, username="bench-search", name="Bench Search")
+            db.add(user)
+            await db.commit()
+            creator_id = str(user.id)
+
+        _, dweller_ids = await create_world_with_dwellers(
+            session_factory, creator_id, ["Ilse Marrow", "Oren Vale"], inhabited_by=creator_id
+        )
+        await seed(session_factory, dweller_ids, episodes)
+        dweller_id = UUID(dweller_ids[0])
+
+        rng = random.Random(7)
+        queries = [" ".join(rng.sample(VOCABULARY, 2)) for _ in range(repeat + 2)]
+        rows = []
+        text_p50 = 0.0
+        for mode in ("text", "hybrid"):
+            if mode == "hybrid":
+                os.environ["MEMORY_EMBEDDING_PROVIDER"] = "local"
+            else:
+                os.environ.pop("MEMORY_EMBEDDING_PROVIDER", None)
+            query_iter = iter(queries)
+
+            async def search() -> None:
+                async with session_factory() as db:
+                    await search_memories(db, dweller_id, next(query_iter), limit=20)
+
+            timing = await measure(mode, search, repeat)
+            if mode == "text":
+                text_p50 = timing.p50
+            rows.append([mode, episodes, timing.p50, timing.p99])
+
+        async with session_factory() as db:
+            results, _ = await search_memories(db, dweller_id, queries[0], limit=20)
+
+        print_table(
+            "Memory search latency (ms)",
+            ["mode", "episodes", "p50", "p99"],
+            rows,
+        )
+        print(f"\nsample query {queries[0]!r}: {len(results)} results")
+
+    print(f"text p50 {text_p50:.2f}ms (limit {max_ms}ms)")
+    return 0 if text_p50 <= max_ms else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--max-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.episodes, args.repeat, args.max_ms)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark: dweller mention detection in a story versus world size.
+
+Finds which of N synthetic dweller names occur in a ~2,500-word story, two ways:
+
+    per-name   one re.search(r'\\b' + re.escape(name) + r'\\b', text) per
+               dweller (the only path before; O(N x text))
+    matcher    NameMatcher.find() over names indexed by first word; the
+               matcher is built once per world and cached
+
+and reports the median scan time, the one-off build time, and whether the
+two found the same dwellers.
+
+Usage:
+    cd platform/backend
+    python -m benchmarks.name_matcher
+    python -m benchmarks.name_matcher --sizes 1000 10000 --mentions 25
+
+Exits 1 if a matcher scan of the largest world takes longer than --max-ms.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+
+from benchmarks.harness import print_table
+from utils.name_matcher import NameMatcher
+
+_SYLLABLES = ["ka", "lo", "mi", "ren", "to", "sa", "vu", "ne", "ori", "da", "fe", "jun", "qui", "bel", "ash"]
+_FILLER = ("the canal lights flickered while traders argued over water credits and the tide rose "
+           "against the old sea wall as a courier ran past the market stalls").split()
+
+
+def _names(n: int, rng: random.Random) -> list[str]:
+    names: set[str] = set()
+    while len(names) < n:
+        first = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        last = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        names.add(first if rng.random() < 0.3 else f"{first} {last}")
+    return sorted(names)
+
+
+def _story(names: list[str], mentions: int, words: int, rng: random.Random) -> str:
+    tokens = [rng.choice(_FILLER) for _ in range(words)]
+    for name in rng.sample(names, mentions):
+        tokens.insert(rng.randrange(len(tokens)), name)
+    return " ".join(tokens) + "."
+
+
+def _per_name(names: list[str], text: str) -> list[str]:
+    text_lower = text.lower()
+    return [
+        name for name in names
+        if re.search(r"\b" + re.escape(name.lower()) + r"\b", text_lower)
+    ]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(sizes: list[int], mentions: int, words: int, repeat: int) -> list[list]:
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        names = _names(n, rng)
+        text = _story(names, min(mentions, n), words, rng)
+
+        start = time.perf_counter()
+        matcher = NameMatcher((name, name) for name in names)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        same = set(matcher.find(text)) == set(_per_name(names, text))
+        per_name_ms = _median_ms(lambda: _per_name(names, text), repeat)
+        matcher_ms = _median_ms(lambda: matcher.find(text), repeat)
+        rows.append([
+            n, round(per_name_ms, 2), round(matcher_ms, 2), round(build_ms, 2),
+            f"{per_name_ms / matcher_ms:.0f}x", "yes" if same else "NO",
+        ])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--mentions", type=int, default=12)
+    parser.add_argument("--words", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    rows = run(args.sizes, args.mentions, args.words, args.repeat)
+    print_table(
+        f"Mention detection, {args.words}-word story with {args.mentions} mentions",
+        ["dwellers", "per-name ms", "matcher ms", "build ms", "speedup", "same result"],
+        rows,
+    )
+    if any(row[5] != "yes" for row in rows):
+        print("\nFAIL: matcher and per-name search disagree")
+        sys.exit(1)
+    largest = rows[-1][2]
+    if largest > args.max_ms:
+        print(f"\nFAIL: {largest}ms to scan a story against {args.sizes[-1]} dwellers (> {args.max_ms})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
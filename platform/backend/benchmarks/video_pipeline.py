@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark: concurrent video jobs through the streaming media pipeline.
+
+Runs --jobs _store_video() calls at once against a mock xAI (httpx
+MockTransport: renders finish after --render-ticks status checks, downloads
+are --size-mb streamed lazily) into LocalStorage, and reports:
+
+- peak traced memory, total and per job (the old pipeline held each whole
+  video in memory, so this grew with --size-mb × --jobs)
+- poller ticks vs status checks: all jobs share one polling loop
+- wall time and throughput
+
+Usage:
+    cd platform/backend
+    python -m benchmarks.video_pipeline
+    python -m benchmarks.video_pipeline --jobs 32 --size-mb 64
+
+Exits 1 if peak memory per job exceeds --max-mb-per-job.
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import httpx
+
+import media.generator as generator
+from api.media import _store_video
+from benchmarks.harness import print_table
+from storage import LocalStorage, set_storage
+
+
+class MockXai:
+    def __init__(self, render_ticks: int, size_mb: int):
+        self.render_ticks = render_ticks
+        self.size_mb = size_mb
+        self.started = 0
+        self.status_checks = 0
+        self._checks: dict[str, int] = {}
+
+    async def _video(self):
+        chunk = b"\0" * (256 * 1024)
+        for _ in range(self.size_mb * 4):
+            yield chunk
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/videos/generations":
+            self.started += 1
+            return httpx.Response(200, json={"request_id": f"req-{self.started}"})
+        if path.startswith("/v1/videos/"):
+            self.status_checks += 1
+            request_id = path.rsplit("/", 1)[1]
+            self._checks[request_id] = self._checks.get(request_id, 0) + 1
+            if self._checks[request_id] < self.render_ticks:
+                return httpx.Response(202, json={"status": "pending"})
+            return httpx.Response(200, json={"video": {"url": f"https://vidgen.bench/{request_id}.mp4"}})
+        return httpx.Response(200, content=self._video())
+
+
+async def run(jobs: int, size_mb: int, render_ticks: int, poll_seconds: float) -> list[list]:
+    generator.XAI_VIDEO_POLL_SECONDS = poll_seconds
+    xai = MockXai(render_ticks, size_mb)
+    generator.set_xai_client(httpx.AsyncClient(transport=httpx.MockTransport(xai.handle)))
+
+    with tempfile.TemporaryDirectory() as root:
+        set_storage(LocalStorage(root, "http://bench.local"))
+        tracemalloc.start()
+        start = time.perf_counter()
+        stored = await asyncio.gather(*(
+            _store_video(f"prompt {i}", 10, f"media/story/{i}/video/clip.mp4") for i in range(jobs)
+        ))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        set_storage(None)
+
+    poller = generator.get_video_poller()
+    await generator.close_xai_client()
+    total_mb = sum(s.size for s in stored) / 2**20
+    return [[
+        jobs,
+        round(total_mb),
+        round(peak / 2**20, 1),
+        round(peak / 2**20 / jobs, 2),
+        poller.ticks,
+        xai.status_checks,
+        round(elapsed, 2),
+        round(total_mb / elapsed, 1),
+    ]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=16)
+    parser.add_argument("--size-mb", type=int, default=32)
+    parser.add_argument("--render-ticks", type=int, default=3)
+    parser.add_argument("--poll-seconds", type=float, default=0.05)
+    parser.add_argument("--max-mb-per-job", type=float, default=4.0)
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.jobs, args.size_mb, args.render_ticks, args.poll_seconds))
+    print_table(
+        f"{args.jobs} concurrent {args.size_mb} MiB video jobs",
+        ["jobs", "stored MiB", "peak MiB", "peak MiB/job", "poll ticks", "status checks", "seconds", "MiB/s"],
+        rows,
+    )
+    per_job = rows[0][3]
+    if per_job > args.max_mb_per_job:
+        print(f"\nFAIL: {per_job} MiB peak per job (> {args.max_mb_per_job})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Benchmark: webhook callback throughput against local mock receivers.
+
+Starts --hosts aiohttp receivers on 127.0.0.1 (one per agent, each answering
+after --latency ms), queues --notifications pending notifications spread
+across them, and drains the queue with process_pending_notifications at
+each --concurrency level. Reports deliveries per second and how many TCP
+connections the receivers saw: with the pooled client, connections stay
+near hosts × WEBHOOK_PER_HOST_CONCURRENCY however many callbacks go out.
+
+Usage:
+    cd platform/backend
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.webhook_delivery
+    python -m benchmarks.webhook_delivery --notifications 1000 --hosts 8 --latency 100
+
+Exits 1 if the highest concurrency level delivers less than --min-speedup ×
+the serial (concurrency 1) throughput.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from uuid import UUID
+
+from aiohttp import web
+
+from benchmarks.harness import bench_client, bench_database, print_table, register_agent
+
+
+class Receiver:
+    """Mock webhook endpoint with fixed latency that counts requests and connections."""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.requests = 0
+        self.peers: set[tuple[str, int]] = set()
+        self.runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(self.latency_s)
+        return web.Response(text="OK")
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/hook", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/hook"
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+
+
+async def seed_notifications(session_factory, user_ids: list[str], total: int) -> None:
+    from sqlalchemy import text
+
+    async with session_factory() as db:
+        await db.execute(
+            text("""
+                INSERT INTO platform_notifications
+                    (id, user_id, notification_type, data, status, retry_count, created_at)
+                SELECT gen_random_uuid(), (CAST(:user_ids AS uuid[]))[1 + g % :hosts],
+                       'bench_delivery', jsonb_build_object('n', g), 'PENDING', 0,
+                       now() - make_interval(secs => :total - g)
+                FROM generate_series(1, :total) AS g
+            """),
+            {"user_ids": [UUID(u) for u in user_ids], "hosts": len(user_ids), "total": total},
+        )
+        await db.commit()
+
+
+async def drain(session_factory, batch_size: int, concurrency: int) -> int:
+    from utils.notifications import process_pending_notifications
+
+    delivered = 0
+    while True:
+        async with session_factory() as db:
+            stats = await process_pending_notifications(db, batch_size=batch_size, concurrency=concurrency)
+        if stats["processed"] == 0:
+            return delivered
+        delivered += stats["sent"]
+
+
+async def run(
+    notifications: int, hosts: int, latency_ms: float, levels: list[int], batch_size: int, min_speedup: float
+) -> int:
+    from sqlalchemy import text
+
+    from utils.webhooks import WEBHOOK_PER_HOST_CONCURRENCY, close_webhook_client
+
+    receivers = [Receiver(latency_ms / 1000) for _ in range(hosts)]
+    for receiver in receivers:
+        await receiver.start()
+    try:
+        async with bench_database() as session_factory, bench_client(session_factory) as client:
+            user_ids = []
+            for i, receiver in enumerate(receivers):
+                agent = await register_agent(client, f"bench-hook-{i}")
+                user_ids.append(agent["user"]["id"])
+                async with session_factory() as db:
+                    await db.execute(
+                        text("UPDATE platform_users SET callback_url = :url WHERE id = :id"),
+                        {"url": receiver.url, "id": UUID(agent["user"]["id"])},
+                    )
+                    await db.commit()
+
+            rows = []
+            throughput: dict[int, float] = {}
+            for concurrency in levels:
+                for receiver in receivers:
+                    receiver.requests = 0
+                    receiver.peers.clear()
+                await seed_notifications(session_factory, user_ids, notifications)
+                # A fresh pool per level, so connection counts aren't carried over
+                await close_webhook_client()
+
+                started = time.perf_counter()
+                delivered = await drain(session_factory, batch_size, concurrency)
+                elapsed = time.perf_counter() - started
+
+                throughput[concurrency] = delivered / elapsed
+                connections = sum(len(r.peers) for r in receivers)
+                rows.append([concurrency, delivered, elapsed, throughput[concurrency], connections])
+            await close_webhook_client()
+    finally:
+        for receiver in receivers:
+            await receiver.stop()
+
+    print_table(
+        f"Webhook delivery: {notifications} callbacks, {hosts} hosts, {latency_ms:g} ms latency, "
+        f"{WEBHOOK_PER_HOST_CONCURRENCY}/host",
+        ["concurrency", "delivered", "seconds", "per second", "connections"],
+        rows,
+    )
+    print()
+
+    speedup = throughput[max(levels)] / throughput[min(levels)]
+    print(f"concurrency {max(levels)} vs {min(levels)}: {speedup:.1f}x (minimum {min_speedup}x)")
+    return 1 if speedup < min_speedup else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notifications", type=int, default=400)
+    parser.add_argument("--hosts", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=50, help="receiver latency (ms)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--min-speedup", type=float, default=4.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(
+        args.notifications, args.hosts, args.latency, sorted(args.concurrency), args.batch_size, args.min_speedup
+    )))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark: world map layout time and memory versus number of worlds.
+
+Lays out synthetic clustered 1536-dim premise embeddings two ways:
+
+    exact      metric MDS on the full n x n distance matrix + KMeans
+               (the only path before; O(n^2) memory, SMACOF iterations)
+    scalable   compute_layout(): exact below MAP_EXACT_LAYOUT_MAX worlds,
+               otherwise PCA -> landmark MDS + MiniBatchKMeans
+
+and reports wall time, peak traced memory, and how well the clusters
+recover the synthetic themes (adjusted Rand index). The exact path is
+skipped above --exact-max worlds.
+
+Both run in this process so tracemalloc sees their allocations; the app
+runs compute_layout() in a worker process.
+
+Usage:
+    cd platform/backend
+    python -m benchmarks.world_map_layout
+    python -m benchmarks.world_map_layout --sizes 1000 10000 20000 --exact-max 2000
+
+Exits 1 if the scalable layout of the largest size takes longer than
+--max-seconds.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score
+
+from benchmarks.harness import print_table
+from utils.map_service import _exact_mds, _unit_rows, compute_layout
+
+
+def _worlds(n: int, themes: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(themes, 1536))
+    labels = rng.integers(0, themes, n)
+    return (centers[labels] + 0.8 * rng.normal(size=(n, 1536))).astype(np.float32), labels
+
+
+def _exact(X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    unit = _unit_rows(X)
+    k = max(2, min(8, len(X) // 2))
+    return _exact_mds(unit), KMeans(n_clusters=k, random_state=42, n_init=10).fit_predict(unit)
+
+
+def _measure(fn, X: np.ndarray) -> tuple[float, float, np.ndarray]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    _, labels = fn(X)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, labels
+
+
+def run(sizes: list[int], exact_max: int, themes: int) -> list[list]:
+    rows = []
+    for n in sizes:
+        X, truth = _worlds(n, themes, seed=n)
+        for label, fn in (("exact", _exact), ("scalable", compute_layout)):
+            if label == "exact" and n > exact_max:
+                rows.append([n, label, "-", "-", "-"])
+                continue
+            elapsed, peak_mb, labels = _measure(fn, X)
+            rows.append([n, label, round(elapsed, 2), round(peak_mb, 1), round(adjusted_rand_score(truth, labels), 3)])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 5000, 10000])
+    parser.add_argument("--exact-max", type=int, default=1000)
+    parser.add_argument("--themes", type=int, default=8)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    # sklearn deprecation chatter from MDS would swamp the table
+    warnings.filterwarnings("ignore", category=FutureWarning)
+    rows = run(args.sizes, args.exact_max, args.themes)
+    print_table(
+        f"World map layout, {args.themes} synthetic themes",
+        ["worlds", "engine", "seconds", "peak MiB", "cluster ARI"],
+        rows,
+    )
+    largest = rows[-1][2]
+    if largest > args.max_seconds:
+        print(f"\nFAIL: {largest}s to lay out {args.sizes[-1]} worlds (> {args.max_seconds})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from .models import (
     AspectValidation,
     Dweller,
     DwellerAction,
+    DwellerMemory,
     DwellerProposal,
     DwellerValidation,
     SocialInteraction,
@@ -27,6 +28,8 @@ from .models import (
     Story,
     StoryArc,
     DwellerRelationship,
+    Conversation,
+    UserActivityCounters,
     StoryReview,
     Feedback,
     MediaGeneration,
@@ -34,6 +37,10 @@ from .models import (
     FeedbackItem,
     FeedbackResponse,
     ExternalFeedback,
+    ActivityEvent,
+    Job,
+    DeadJob,
+    WorldMapLayout,
     UserType,
     ProposalStatus,
     AspectStatus,
@@ -73,6 +80,7 @@ __all__ = [
     "AspectValidation",
     "Dweller",
     "DwellerAction",
+    "DwellerMemory",
     "DwellerProposal",
     "DwellerValidation",
     "SocialInteraction",
@@ -83,6 +91,8 @@ __all__ = [
     "Story",
     "StoryArc",
     "DwellerRelationship",
+    "Conversation",
+    "UserActivityCounters",
     "StoryReview",
     "Feedback",
     "MediaGeneration",
@@ -90,6 +100,10 @@ __all__ = [
     "FeedbackItem",
     "FeedbackResponse",
     "ExternalFeedback",
+    "ActivityEvent",
+    "Job",
+    "DeadJob",
+    "WorldMapLayout",
     "UserType",
     "ProposalStatus",
     "AspectStatus",
@@ -9,20 +9,24 @@ from utils.deterministic import deterministic_uuid4
 
 from sqlalchemy import (
     ARRAY,
+    BigInteger,
     Boolean,
     CheckConstraint,
+    Computed,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Identity,
     Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -603,8 +607,9 @@ class Dweller(Base):
     personality_blocks: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
 
     # Episodic memories: FULL history of all experiences (never truncated)
-    # [{id, timestamp, type, content, importance, target}, ...]
-    episodic_memories: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, default=list)
+    # Stored one row per episode in platform_dweller_memories (see DwellerMemory).
+    # The count is kept here so state/context reads never have to COUNT(*) the history.
+    episodic_memory_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     # Memory summaries: agent-created compressions of past periods
     # [{id, period, summary, key_events, emotional_arc, created_at, created_by}, ...]
@@ -656,9 +661,93 @@ class Dweller(Base):
         Index("dweller_created_by_idx", "created_by"),
         Index("dweller_inhabited_by_idx", "inhabited_by"),
         Index("dweller_available_idx", "is_available"),
+        # Names are unique per world regardless of case; SPEAK targets resolve
+        # through this index (migration 0034)
+        Index("dweller_world_name_lower_idx", "world_id", text("lower(name)"), unique=True),
     )
 
 
+class DwellerMemory(Base):
+    """One episodic memory of a dweller.
+
+    Append-only: every action, reflection and heartbeat action inserts a single
+    row, so recording episode 100,000 costs the same as recording episode 1.
+    Reads walk the (dweller_id, created_at) index from the newest end.
+
+    seq is a monotonically increasing tiebreaker so episodes recorded within the
+    same clock tick (e.g. under the simulated clock) keep their insertion order.
+    """
+
+    __tablename__ = "platform_dweller_memories"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=deterministic_uuid4
+    )
+    seq: Mapped[int] = mapped_column(BigInteger, Identity(), nullable=False)
+    dweller_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_dwellers.id", ondelete="CASCADE"), nullable=False
+    )
+    # Action that produced this memory (None for reflections)
+    action_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )  # No FK: memories outlive their actions
+
+    memory_type: Mapped[str] = mapped_column(String(50), nullable=False)  # speak, move, reflection, ...
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    target: Mapped[str | None] = mapped_column(String(255))
+    importance: Mapped[float] = mapped_column(Float, default=0.5, nullable=False)
+    # Type-specific fields, e.g. reflections: {topics, source_memory_ids}
+    extra: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict, nullable=False)
+
+    # Full-text search over content + target (generated by Postgres, GIN-indexed).
+    # Also carries a 'd<dweller hex>' lexeme so one GIN lookup can intersect
+    # "this dweller" with the query terms (see utils/dweller_memory.search_memories).
+    # Deferred: only memory search reads it.
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', 'd' || replace(dweller_id::text, '-', '')) || "
+            "to_tsvector('english', content || ' ' || coalesce(target, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Semantic recall (pgvector — added by migration 0027). Filled on write only
+    # when MEMORY_EMBEDDING_PROVIDER is set; see utils/memory_embeddings.py.
+    if PGVECTOR_AVAILABLE and Vector is not None:
+        embedding = mapped_column(Vector(256), nullable=True, deferred=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("dweller_memory_dweller_created_idx", "dweller_id", "created_at", "seq"),
+        Index("dweller_memory_search_idx", "search_vector", postgresql_using="gin"),
+        # Working memory keeps reflections preferentially; this finds a dweller's
+        # newest reflections without scanning past their ordinary episodes.
+        Index(
+            "dweller_memory_reflection_idx", "dweller_id", "created_at", "seq",
+            postgresql_where=text("memory_type = 'reflection'"),
+        ),
+    )
+
+    def to_episode(self) -> dict[str, Any]:
+        """Render as the episode dict the memory endpoints return."""
+        episode: dict[str, Any] = {"id": str(self.id)}
+        if self.action_id:
+            episode["action_id"] = str(self.action_id)
+        episode["timestamp"] = self.created_at.isoformat()
+        episode["type"] = self.memory_type
+        episode["content"] = self.content
+        if self.memory_type != "reflection":
+            episode["target"] = self.target
+        episode["importance"] = self.importance
+        episode.update(self.extra or {})
+        return episode
+
+
 class DwellerAction(Base):
     """Actions taken by inhabited dwellers.
 
@@ -678,6 +767,12 @@ class DwellerAction(Base):
     actor_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("platform_users.id"), nullable=False
     )  # The agent who took the action
+    # Denormalized from the dweller at write time (migration 0035) so world
+    # and region activity reads don't go through platform_dwellers
+    world_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_worlds.id", ondelete="CASCADE"), nullable=False
+    )
+    region: Mapped[str | None] = mapped_column(String(255))  # Actor's region once the action is taken
 
     # Action details
     action_type: Mapped[str] = mapped_column(String(50), nullable=False)  # speak, move, interact, decide
@@ -717,7 +812,10 @@ class DwellerAction(Base):
     # Note: escalated_event relationship is defined via WorldEvent.origin_action back_populates
 
     __table_args__ = (
-        Index("action_dweller_idx", "dweller_id"),
+        # Newest-first range scans per dweller, per world and per world region
+        Index("action_dweller_created_idx", "dweller_id", text("created_at DESC")),
+        Index("action_world_created_idx", "world_id", text("created_at DESC"), text("id DESC")),
+        Index("action_world_region_created_idx", "world_id", "region", text("created_at DESC")),
         Index("action_actor_idx", "actor_id"),
         Index("action_created_at_idx", "created_at"),
         Index("action_type_idx", "action_type"),
@@ -825,6 +923,8 @@ class Notification(Base):
     read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     retry_count: Mapped[int] = mapped_column(Integer, default=0)
     last_error: Mapped[str | None] = mapped_column(Text)
+    # Earliest time the next callback attempt may run (exponential backoff)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     # Relationships
     user: Mapped["User"] = relationship()
@@ -832,6 +932,7 @@ class Notification(Base):
     __table_args__ = (
         Index("notification_user_idx", "user_id"),
         Index("notification_status_idx", "status"),
+        Index("notification_due_idx", "status", "next_attempt_at"),
         Index("notification_type_idx", "notification_type"),
         Index("notification_created_at_idx", "created_at"),
         Index("notification_target_idx", "target_type", "target_id"),
@@ -1656,8 +1757,8 @@ class StoryArc(Base):
 
     Detection algorithm (assign_story_to_arc):
     - Compute content embedding for the new story
-    - Compare against centroids of existing arcs for this dweller
-    - Cosine similarity >= 0.75 → join the best-matching arc
+    - Find the nearest stored centroid among this dweller's arcs
+    - Cosine similarity >= 0.75 → join that arc, folding the story into its centroid
     - Below threshold → seed a new arc
     - No time window — arcs are purely semantic.
     """
@@ -1676,6 +1777,11 @@ class StoryArc(Base):
     )
     # Ordered list of story UUIDs in the arc
     story_ids: Mapped[list[str]] = mapped_column(JSONB, default=list, nullable=False)
+    # Running mean of member story embeddings, updated as stories join, and
+    # how many embeddings it averages (members without an embedding don't count)
+    if PGVECTOR_AVAILABLE and Vector is not None:
+        centroid = mapped_column(Vector(1536), nullable=True, deferred=True)
+    member_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -1698,8 +1804,11 @@ class StoryArc(Base):
 class DwellerRelationship(Base):
     """Pre-computed relationship score between two dwellers.
 
-    Populated on story write via update_relationships_for_story().
+    Populated on story write via update_relationships_for_story() and on SPEAK
+    actions via update_relationships_for_action(), as bulk upserts.
     dweller_a_id < dweller_b_id enforces canonical ordering (no duplicates).
+    raw_score is derived from the counts; readers normalize it against the
+    largest raw_score (see get_dweller_graph).
     """
 
     __tablename__ = "platform_dweller_relationships"
@@ -1719,7 +1828,6 @@ class DwellerRelationship(Base):
     )
     co_occurrence_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     semantic_similarity: Mapped[float | None] = mapped_column(Float, nullable=True)
-    combined_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     # JSONB list of story UUIDs (as strings) shared by this pair
     shared_story_ids: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
     # Directional interaction counts (added in migration 0024)
@@ -1728,6 +1836,17 @@ class DwellerRelationship(Base):
     story_mention_a_to_b: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     story_mention_b_to_a: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     thread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Weighted interaction total (migration 0033); speaks 3, mentions 2, threads
+    # and co-occurrences 1
+    raw_score: Mapped[float] = mapped_column(
+        Float,
+        Computed(
+            "3.0 * speak_count_a_to_b + 3.0 * speak_count_b_to_a"
+            " + 2.0 * story_mention_a_to_b + 2.0 * story_mention_b_to_a"
+            " + 1.0 * thread_count + 1.0 * co_occurrence_count",
+            persisted=True,
+        ),
+    )
     last_interaction_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
@@ -1744,7 +1863,94 @@ class DwellerRelationship(Base):
         CheckConstraint("dweller_a_id < dweller_b_id", name="ck_dweller_relationship_canonical_order"),
         Index("idx_dweller_rel_a", "dweller_a_id"),
         Index("idx_dweller_rel_b", "dweller_b_id"),
-        Index("idx_dweller_rel_score", "combined_score"),
+        # MAX(raw_score) for normalization is a single index probe
+        Index("idx_dweller_rel_raw_score", "raw_score"),
+    )
+
+
+class Conversation(Base):
+    """SPEAK exchange state between two dwellers.
+
+    One row per pair, maintained by utils.conversations.record_speak() on every
+    SPEAK that targets a dweller. dweller_a_id < dweller_b_id, as for
+    DwellerRelationship. unanswered_from_a holds A's speaks to B that have no
+    reply yet (action ids as strings, oldest first, at most
+    utils.conversations.UNANSWERED_SPEAKS_LIMIT); unanswered_from_b the
+    reverse. Reply enforcement and the action context read this row instead
+    of re-deriving threads from platform_dweller_actions.
+    """
+
+    __tablename__ = "platform_conversations"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=deterministic_uuid4
+    )
+    world_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_worlds.id", ondelete="CASCADE"), nullable=False
+    )
+    dweller_a_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_dwellers.id", ondelete="CASCADE"), nullable=False
+    )
+    dweller_b_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_dwellers.id", ondelete="CASCADE"), nullable=False
+    )
+    last_action_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_dweller_actions.id", ondelete="SET NULL")
+    )
+    last_speaker_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    # The dweller last spoken to
+    turn_dweller_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    unanswered_from_a: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    unanswered_from_b: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    speak_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_action_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint("dweller_a_id", "dweller_b_id", name="uq_conversation_pair"),
+        CheckConstraint("dweller_a_id < dweller_b_id", name="ck_conversation_canonical_order"),
+        Index("conversation_a_last_action_idx", "dweller_a_id", "last_action_at"),
+        Index("conversation_b_last_action_idx", "dweller_b_id", "last_action_at"),
+    )
+
+
+class UserActivityCounters(Base):
+    """Per-agent activity totals read by heartbeat, nudge and progression.
+
+    Incremented in the same transaction as each write it counts (see
+    utils.activity_counters.bump_activity_counters) and periodically
+    recomputed from the source tables by reconcile_activity_counters(), which
+    corrects drift from cascading deletes or rows written outside the API.
+    """
+
+    __tablename__ = "platform_user_activity_counters"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("platform_users.id", ondelete="CASCADE"), primary_key=True
+    )
+    stories_written: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    stories_reviewed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    proposals_validated: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    aspects_validated: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    dwellers_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    actions_taken: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    worlds_proposed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    aspects_proposed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    events_proposed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Reviews on this agent's stories the agent hasn't responded to
+    unresponded_reviews: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # This agent's escalation-eligible actions nobody has confirmed yet
+    escalation_eligible_actions: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    reconciled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
 
@@ -1794,3 +2000,139 @@ class ExternalFeedback(Base):
         Index("ext_feedback_created_at_idx", "created_at"),
         Index("ext_feedback_source_post_idx", "source", "source_post_id", unique=True),
     )
+
+
+class ActivityEvent(Base):
+    """One entry in the platform activity feed.
+
+    Append-only: mutation endpoints add the rendered feed item in the same
+    transaction as the write it describes (see utils/activity_events.py), so
+    GET /feed is a single range scan of the (sort_date, id) index instead of a
+    query per content table. Fields that change after the fact (cover images,
+    portraits, counters, proposal status) are refreshed when a page is read.
+    """
+
+    __tablename__ = "platform_activity_events"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=deterministic_uuid4
+    )
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)  # world_created, dweller_action, ...
+    sort_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # Row the event is about (world, proposal, action, story, ...). No FKs: the
+    # feed history outlives the rows it describes.
+    subject_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    world_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    actor_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    # The feed item as served, minus sort_date (taken from the column)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        # Keyset pagination: newest-first walk from any (sort_date, id) position
+        Index("activity_event_keyset_idx", "sort_date", "id"),
+        # One event per occurrence; lets the backfill re-run with ON CONFLICT DO NOTHING
+        Index("activity_event_occurrence_idx", "event_type", "subject_id", "sort_date", unique=True),
+    )
+
+
+class Job(Base):
+    """A unit of background work waiting for (or held by) a worker.
+
+    Enqueued in the same transaction as the write that needs it, claimed by
+    jobs/worker.py with SELECT ... FOR UPDATE SKIP LOCKED, and deleted once
+    its handler succeeds. A claim is a lease: a job whose worker died is
+    picked up again after locked_at + the lease timeout.
+    """
+
+    __tablename__ = "platform_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=deterministic_uuid4
+    )
+    queue: Mapped[str] = mapped_column(String(50), nullable=False)
+    kind: Mapped[str] = mapped_column(String(100), nullable=False)  # media.generate, story.graph, ...
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    # At most one queued job per key (e.g. one generation run per MediaGeneration)
+    dedupe_key: Mapped[str | None] = mapped_column(String(255))
+
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    locked_by: Mapped[str | None] = mapped_column(String(100))
+    last_error: Mapped[str | None] = mapped_column(Text)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        # Claim order within a queue
+        Index("job_queue_run_at_idx", "queue", "run_at"),
+        Index("job_dedupe_key_idx", "dedupe_key", unique=True),
+    )
+
+
+class DeadJob(Base):
+    """A job that exhausted its attempts, kept for inspection and replay."""
+
+    __tablename__ = "platform_dead_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    queue: Mapped[str] = mapped_column(String(50), nullable=False)
+    kind: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    failed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("dead_job_failed_at_idx", "failed_at"),
+    )
+
+
+class WorldMapLayout(Base):
+    """A computed semantic world map, one row per world-set version.
+
+    version_hash covers every laid-out world's id and premise embedding, so
+    GET /worlds/map reads the newest row instead of re-running MDS, KMeans and
+    cluster labelling per request. utils/map_service.refresh_world_map writes
+    new versions: worlds added since the last full layout are projected onto
+    it, and cluster labels carry over between versions.
+    """
+
+    __tablename__ = "platform_world_map_layouts"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=deterministic_uuid4
+    )
+    version_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # {world_id: {"x": float, "y": float, "cluster": int}}
+    positions: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    # {cluster_id: label}
+    cluster_labels: Mapped[dict[str, str]] = mapped_column(JSONB, nullable=False)
+    # Only needed to place new worlds: {world_id: embedding digest} and
+    # {cluster_id: unit mean embedding}
+    fingerprints: Mapped[dict[str, str]] = mapped_column(JSONB, nullable=False, deferred=True)
+    cluster_centroids: Mapped[dict[str, list[float]]] = mapped_column(JSONB, nullable=False, deferred=True)
+    # Worlds in the last full layout, and worlds projected onto it since
+    laid_out_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    placed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("world_map_layout_version_idx", "version_hash", unique=True),
+        Index("world_map_layout_created_at_idx", "created_at"),
+    )
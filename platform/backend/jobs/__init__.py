@@ -0,0 +1,28 @@
+"""Durable background jobs (see jobs/queue.py; worker: python scripts/job_worker.py)."""
+
+from .queue import JobPayload, claim, enqueue, handler, registered_queues, run_job
+from .handlers import (
+    EmbedDwellerMemories,
+    GenerateDwellerPortrait,
+    GenerateMedia,
+    PublishStoryToX,
+    ReconcileActivityCounters,
+    RefreshWorldMap,
+    UpdateStoryGraph,
+)
+
+__all__ = [
+    "JobPayload",
+    "claim",
+    "enqueue",
+    "handler",
+    "registered_queues",
+    "run_job",
+    "EmbedDwellerMemories",
+    "GenerateDwellerPortrait",
+    "GenerateMedia",
+    "PublishStoryToX",
+    "ReconcileActivityCounters",
+    "RefreshWorldMap",
+    "UpdateStoryGraph",
+]
@@ -0,0 +1,152 @@
+"""Job types and their handlers.
+
+Queues separate work by what it waits on, so each can get its own
+concurrency limit in the worker:
+
+- media:  xAI image/video generation + R2 upload (slow, costly, rate-limited)
+- graph:  relationship, arc and world map materialization, dweller memory
+          embeddings (database + embeddings)
+- social: publishing to X
+- maintenance: recomputing denormalized counters from their source tables
+"""
+
+from uuid import UUID
+
+from db import MediaType
+
+from .queue import JobPayload, handler
+
+
+class GenerateMedia(JobPayload):
+    kind = "media.generate"
+    queue = "media"
+    # _run_generation records its own failures on the MediaGeneration row
+    # (retried via /media/retry-stuck); job retries cover crashes around it
+    max_attempts = 3
+
+    generation_id: UUID
+    target_type: str
+    target_id: UUID
+    media_type: MediaType
+
+
+class GenerateDwellerPortrait(JobPayload):
+    kind = "dweller.portrait"
+    queue = "media"
+    max_attempts = 3
+
+    dweller_id: UUID
+    dweller_data: dict
+    world_data: dict
+    image_prompt: str | None = None
+
+
+class UpdateStoryGraph(JobPayload):
+    kind = "story.graph"
+    queue = "graph"
+
+    story_id: UUID
+
+
+class RefreshWorldMap(JobPayload):
+    kind = "world_map.refresh"
+    queue = "graph"
+
+
+class EmbedDwellerMemories(JobPayload):
+    kind = "dweller_memory.embed"
+    queue = "graph"
+
+    memory_ids: list[UUID]
+
+
+class PublishStoryToX(JobPayload):
+    kind = "story.publish_x"
+    queue = "social"
+
+    story_id: UUID
+
+
+class ReconcileActivityCounters(JobPayload):
+    kind = "activity_counters.reconcile"
+    queue = "maintenance"
+
+    # None reconciles every agent
+    user_ids: list[UUID] | None = None
+
+
+@handler(GenerateMedia)
+async def generate_media(job: GenerateMedia) -> None:
+    from api.media import _run_generation
+
+    await _run_generation(job.generation_id, job.target_type, job.target_id, job.media_type)
+
+
+@handler(GenerateDwellerPortrait)
+async def generate_dweller_portrait(job: GenerateDwellerPortrait) -> None:
+    from api.dwellers import _generate_portrait_background
+
+    await _generate_portrait_background(
+        dweller_id=str(job.dweller_id),
+        dweller_data=job.dweller_data,
+        world_data=job.world_data,
+        image_prompt=job.image_prompt,
+    )
+
+
+@handler(UpdateStoryGraph)
+async def update_story_graph(job: UpdateStoryGraph) -> None:
+    from api.stories import _update_graph_and_arcs
+
+    await _update_graph_and_arcs(job.story_id)
+
+
+@handler(RefreshWorldMap)
+async def refresh_world_map(job: RefreshWorldMap) -> None:
+    from db.database import SessionLocal
+    from utils.map_service import refresh_world_map
+
+    async with SessionLocal() as db:
+        await refresh_world_map(db)
+        await db.commit()
+
+
+@handler(EmbedDwellerMemories)
+async def embed_dweller_memories(job: EmbedDwellerMemories) -> None:
+    from sqlalchemy import select
+
+    from db import DwellerMemory
+    from db.database import SessionLocal
+    from utils.dweller_memory import embed_episodes
+
+    async with SessionLocal() as db:
+        # Already-embedded rows are skipped, so re-runs are safe
+        memories = (await db.scalars(
+            select(DwellerMemory).where(
+                DwellerMemory.id.in_(job.memory_ids),
+                DwellerMemory.embedding.is_(None),
+            )
+        )).all()
+        await embed_episodes(list(memories))
+        await db.commit()
+
+
+@handler(PublishStoryToX)
+async def publish_story(job: PublishStoryToX) -> None:
+    # No-op without credentials or once x_post_id is set, so re-runs are safe
+    from services.x_publisher import publish_story_to_x
+
+    await publish_story_to_x(job.story_id)
+
+
+@handler(ReconcileActivityCounters)
+async def reconcile_activity_counters(job: ReconcileActivityCounters) -> None:
+    from db.database import SessionLocal
+    from utils.activity_counters import reconcile_activity_counters, reconcile_all_activity_counters
+
+    async with SessionLocal() as db:
+        if job.user_ids is None:
+            await reconcile_all_activity_counters(db)
+        else:
+            await reconcile_activity_counters(db, job.user_ids)
+            await db.commit()
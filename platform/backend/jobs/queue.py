@@ -0,0 +1,217 @@
+"""Postgres-backed job queue.
+
+Work that used to run in-process after the response (FastAPI BackgroundTasks,
+asyncio.create_task) is enqueued as a platform_jobs row instead, in the same
+transaction as the write that needs it, and run by a worker
+(scripts/job_worker.py). Jobs survive restarts and deploys, run off the
+request event loop, and workers scale horizontally: claims use
+SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never take the same
+job.
+
+A job type is a JobPayload subclass naming its kind and queue, plus one
+handler registered for it:
+
+    class PublishStoryToX(JobPayload):
+        kind = "story.publish_x"
+        queue = "social"
+        story_id: UUID
+
+    @handler(PublishStoryToX)
+    async def publish_story_to_x(job: PublishStoryToX) -> None: ...
+
+    await enqueue(db, PublishStoryToX(story_id=story.id))   # then db.commit()
+
+A handler that raises is retried with exponential backoff until its
+max_attempts, then moved to platform_dead_jobs. A running job renews its
+lease every JOB_LEASE_SECONDS / 3, so only a worker that dies mid-job loses
+it (after JOB_LEASE_SECONDS). Delivery is at-least-once, so handlers must be
+safe to re-run.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any, ClassVar, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db import DeadJob, Job
+from utils.clock import now as utc_now
+from utils.deterministic import deterministic_uuid4
+
+logger = logging.getLogger(__name__)
+
+# A claimed job whose lease isn't renewed within this long is handed to another worker
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "900"))
+# Retry n waits BASE * 2^(n-1) seconds, capped at MAX
+JOB_RETRY_BASE_SECONDS = 30
+JOB_RETRY_MAX_SECONDS = 3600
+
+
+class JobPayload(BaseModel):
+    """Arguments of one job. Subclasses set kind (unique) and queue."""
+
+    kind: ClassVar[str]
+    queue: ClassVar[str] = "default"
+    max_attempts: ClassVar[int] = 5
+
+
+P = TypeVar("P", bound=JobPayload)
+Handler = Callable[[Any], Awaitable[None]]
+
+_handlers: dict[str, tuple[type[JobPayload], Handler]] = {}
+
+
+def handler(payload_type: type[P]) -> Callable[[Callable[[P], Awaitable[None]]], Callable[[P], Awaitable[None]]]:
+    """Register the function that runs jobs of payload_type."""
+    def register(fn: Callable[[P], Awaitable[None]]) -> Callable[[P], Awaitable[None]]:
+        if payload_type.kind in _handlers:
+            raise ValueError(f"Duplicate handler for job kind {payload_type.kind!r}")
+        _handlers[payload_type.kind] = (payload_type, fn)
+        return fn
+    return register
+
+
+def registered_queues() -> set[str]:
+    return {payload_type.queue for payload_type, _ in _handlers.values()}
+
+
+async def enqueue(
+    db: AsyncSession,
+    payload: JobPayload,
+    dedupe_key: str | None = None,
+    run_at: datetime | None = None,
+) -> None:
+    """Add a job to db's transaction; it becomes visible to workers on commit.
+
+    With a dedupe_key, nothing is added while a job with the same key is
+    still queued or running.
+    """
+    payload_type = type(payload)
+    stmt = pg_insert(Job).values(
+        id=deterministic_uuid4(),
+        queue=payload_type.queue,
+        kind=payload_type.kind,
+        payload=payload.model_dump(mode="json"),
+        dedupe_key=dedupe_key,
+        run_at=run_at or utc_now(),
+        attempts=0,
+        max_attempts=payload_type.max_attempts,
+    )
+    if dedupe_key is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["dedupe_key"])
+    await db.execute(stmt)
+
+
+async def claim(db: AsyncSession, queue: str, limit: int, worker_id: str) -> list[Job]:
+    """Lease up to limit due jobs from queue to worker_id and commit the lease."""
+    now = utc_now()
+    due = (
+        select(Job.id)
+        .where(
+            Job.queue == queue,
+            Job.run_at <= now,
+            or_(Job.locked_at == None, Job.locked_at < now - timedelta(seconds=JOB_LEASE_SECONDS)),
+        )
+        .order_by(Job.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.scalars(
+        update(Job)
+        .where(Job.id.in_(due.scalar_subquery()))
+        .values(locked_at=now, locked_by=worker_id, attempts=Job.attempts + 1)
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    jobs = list(result.all())
+    await db.commit()
+    return jobs
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), JOB_RETRY_MAX_SECONDS))
+
+
+async def _finish(db: AsyncSession, job: Job) -> None:
+    # Only the lease holder may finish the job; a stale worker's result is dropped
+    await db.execute(delete(Job).where(Job.id == job.id, Job.locked_by == job.locked_by))
+    await db.commit()
+
+
+async def _fail(db: AsyncSession, job: Job, error: str) -> None:
+    owned = (Job.id == job.id, Job.locked_by == job.locked_by)
+    if job.attempts >= job.max_attempts:
+        deleted = await db.execute(delete(Job).where(*owned))
+        if deleted.rowcount:
+            await db.execute(insert(DeadJob).values(
+                id=job.id,
+                queue=job.queue,
+                kind=job.kind,
+                payload=job.payload,
+                attempts=job.attempts,
+                last_error=error,
+                created_at=job.created_at,
+            ))
+        logger.error(f"Job {job.kind} {job.id} dead after {job.attempts} attempts: {error}")
+    else:
+        await db.execute(
+            update(Job).where(*owned).values(
+                run_at=utc_now() + retry_delay(job.attempts),
+                locked_at=None,
+                locked_by=None,
+                last_error=error,
+            )
+        )
+        logger.warning(f"Job {job.kind} {job.id} failed (attempt {job.attempts}/{job.max_attempts}): {error}")
+    await db.commit()
+
+
+async def _renew_lease(session_factory: async_sessionmaker[AsyncSession], job: Job) -> None:
+    """Keep a running job's lease fresh so slow handlers aren't handed to another worker."""
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        try:
+            async with session_factory() as db:
+                await db.execute(
+                    update(Job)
+                    .where(Job.id == job.id, Job.locked_by == job.locked_by)
+                    .values(locked_at=utc_now())
+                )
+                await db.commit()
+        except Exception:
+            logger.exception(f"Renewing lease of job {job.kind} {job.id} failed")
+
+
+async def run_job(session_factory: async_sessionmaker[AsyncSession], job: Job) -> bool:
+    """Run one claimed job and record the outcome. True if the handler succeeded."""
+    try:
+        if job.attempts > job.max_attempts:
+            # Its last lease expired (worker died mid-run); don't start another attempt
+            raise RuntimeError("Lease expired on final attempt")
+        entry = _handlers.get(job.kind)
+        if entry is None:
+            raise LookupError(f"No handler registered for job kind {job.kind!r}")
+        payload_type, fn = entry
+        renewal = asyncio.create_task(_renew_lease(session_factory, job))
+        try:
+            await fn(payload_type.model_validate(job.payload))
+        finally:
+            renewal.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await renewal
+    except Exception as e:
+        logger.exception(f"Job {job.kind} {job.id} raised")
+        async with session_factory() as db:
+            await _fail(db, job, f"{type(e).__name__}: {e}"[:2000])
+        return False
+
+    async with session_factory() as db:
+        await _finish(db, job)
+    return True
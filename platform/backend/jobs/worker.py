@@ -0,0 +1,119 @@
+"""Job worker: claims and runs jobs from platform_jobs.
+
+Started by scripts/job_worker.py, or inside the API process when
+JOB_WORKER_EMBEDDED is set (see main.py). Each queue runs its own claim loop
+with a concurrency limit, so slow media generation can't starve graph
+updates. Run as many workers as needed; they coordinate through row locks
+only. stop() ends claiming and waits for running jobs to finish.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+from typing import Any
+
+from jobs.queue import claim, registered_queues, run_job
+
+logger = logging.getLogger(__name__)
+
+# Per-queue concurrency, "queue=n,queue=n". Queues not listed get DEFAULT.
+JOB_QUEUES = os.getenv("JOB_QUEUES", "media=2,graph=2,social=1,maintenance=1")
+JOB_DEFAULT_CONCURRENCY = 2
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+
+
+def parse_queues(specs: list[str]) -> dict[str, int]:
+    """["media=4", "graph"] -> {"media": 4, "graph": JOB_DEFAULT_CONCURRENCY}"""
+    limits = {}
+    for spec in specs:
+        name, _, limit = spec.strip().partition("=")
+        if name:
+            limits[name] = int(limit) if limit else JOB_DEFAULT_CONCURRENCY
+    return limits
+
+
+def default_concurrency() -> dict[str, int]:
+    configured = parse_queues(JOB_QUEUES.split(","))
+    return {queue: configured.get(queue, JOB_DEFAULT_CONCURRENCY) for queue in sorted(registered_queues())}
+
+
+class Worker:
+    """Runs jobs from several queues, each with its own concurrency limit."""
+
+    def __init__(
+        self,
+        concurrency: dict[str, int] | None = None,
+        session_factory: Any = None,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+        worker_id: str | None = None,
+    ):
+        self.concurrency = concurrency or default_concurrency()
+        self._session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._stopping = asyncio.Event()
+
+    @property
+    def session_factory(self) -> Any:
+        if self._session_factory is not None:
+            return self._session_factory
+        from db.database import SessionLocal
+
+        return SessionLocal
+
+    async def _claim(self, queue: str, limit: int) -> list:
+        async with self.session_factory() as db:
+            return await claim(db, queue, limit, self.worker_id)
+
+    async def _run_queue(self, queue: str, limit: int) -> None:
+        running: set[asyncio.Task] = set()
+        while not self._stopping.is_set():
+            free = limit - len(running)
+            claimed = []
+            if free > 0:
+                try:
+                    claimed = await self._claim(queue, free)
+                except Exception:
+                    logger.exception(f"Claiming from queue {queue} failed")
+            for job in claimed:
+                task = asyncio.create_task(run_job(self.session_factory, job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if free > 0 and len(claimed) == free:
+                continue  # Filled every slot; more may be due
+
+            # Queue drained or slots full: wait for a slot or the next poll
+            if running:
+                await asyncio.wait(running, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+
+        if running:
+            await asyncio.wait(running)
+
+    async def run(self) -> None:
+        """Claim and run jobs until stop() is called."""
+        logger.info(f"Job worker {self.worker_id} started: {self.concurrency}")
+        await asyncio.gather(*(
+            self._run_queue(queue, limit) for queue, limit in self.concurrency.items()
+        ))
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def drain(self) -> int:
+        """Run jobs until none are due, then return how many ran."""
+        completed = 0
+        while True:
+            batches = await asyncio.gather(*(
+                self._claim(queue, limit) for queue, limit in self.concurrency.items()
+            ))
+            jobs = [job for batch in batches for job in batch]
+            if not jobs:
+                return completed
+            await asyncio.gather(*(run_job(self.session_factory, job) for job in jobs))
+            completed += len(jobs)
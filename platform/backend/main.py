@@ -3,6 +3,7 @@
 Multi-agent social platform for AI-created plausible sci-fi futures.
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -40,6 +41,10 @@ from slowapi.errors import RateLimitExceeded
 from api import auth_router, feed_router, worlds_router, social_router, proposals_router, dwellers_router, dweller_graph_router, dweller_proposals_router, aspects_router, agents_router, platform_router, suggestions_router, events_router, actions_router, notifications_router, heartbeat_router, stories_router, feedback_router, media_router, reviews_router, x_feedback_router, arcs_router
 from db import init_db, verify_schema_version
 from db import engine as db_engine
+from utils.webhooks import close_webhook_client
+from storage import close_storage
+from media.generator import close_xai_client
+from utils.map_service import shutdown_layout_executor
 instrument_sqlalchemy(db_engine.sync_engine)
 
 # =============================================================================
@@ -89,6 +94,18 @@ def render_doc_template(template: str) -> str:
 IS_TESTING = os.getenv("TESTING", "").lower() == "true"
 limiter = Limiter(key_func=get_remote_address, enabled=not IS_TESTING)
 
+# =============================================================================
+# Background Jobs
+# =============================================================================
+
+# Run a job worker inside this process. Off by default: deployments run
+# scripts/job_worker.py as its own service (Procfile "worker"; on Railway the
+# service configured by railway.worker.json, see DEPLOYMENT.md) so media and
+# graph jobs never share the API's event loop. Single-process dev sets it.
+JOB_WORKER_EMBEDDED = (
+    os.getenv("JOB_WORKER_EMBEDDED", "false").lower() == "true" and not IS_TESTING
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -101,10 +118,23 @@ async def lifespan(app: FastAPI):
     # Note: Scheduler disabled for crowdsourced model
     # External agents now drive content creation via proposals API
 
+    job_worker = None
+    if JOB_WORKER_EMBEDDED:
+        from jobs.worker import Worker
+        job_worker = Worker()
+        job_worker_task = asyncio.create_task(job_worker.run())
+
     yield
 
     # Shutdown
     logger.info("Shutting down Deep Sci-Fi Platform...")
+    if job_worker is not None:
+        job_worker.stop()
+        await job_worker_task
+    await close_webhook_client()
+    await close_storage()
+    await close_xai_client()
+    shutdown_layout_executor()
 
 
 # =============================================================================
@@ -618,7 +648,7 @@ app.add_middleware(
     allow_credentials=True,
     # Restrict methods and headers in production
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-API-Key", "X-Request-ID", "X-Idempotency-Key", "X-Skill-Version"],
+    allow_headers=["Content-Type", "Authorization", "X-API-Key", "X-Request-ID", "X-Idempotency-Key", "X-Skill-Version", "X-Agent-Context"],
 )
 
 # Idempotency middleware - safe retries after 502/timeout (runs first, before agent context)
@@ -1,9 +1,10 @@
-from .generator import generate_image, generate_video
+from .generator import generate_image, generate_video_url, stream_video
 from .cost_control import check_agent_limit, check_platform_budget, record_cost
 
 __all__ = [
     "generate_image",
-    "generate_video",
+    "generate_video_url",
+    "stream_video",
     "check_agent_limit",
     "check_platform_budget",
     "record_cost",
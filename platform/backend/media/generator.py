@@ -3,6 +3,13 @@
 Calls the xAI API for image and video generation.
 - Images: grok-imagine-image ($0.02/image)
 - Videos: grok-imagine-video ($0.05/sec)
+
+All calls share one pooled httpx client per event loop. Videos are rendered
+asynchronously by xAI: generate_video_url() starts a render and waits on the
+shared VideoPoller, which checks every in-flight render once per tick from a
+single loop (so N video jobs cost one polling task, not N), and the finished
+file is read with stream_video() in fixed-size chunks straight into storage
+instead of being held in memory.
 """
 
 import asyncio
@@ -10,6 +17,8 @@ import base64
 import logging
 import os
 import re
+import weakref
+from collections.abc import AsyncIterator
 
 import httpx
 
@@ -22,6 +31,59 @@ XAI_BASE_URL = "https://api.x.ai/v1"
 MAX_RETRIES = 2
 RETRY_BACKOFF_BASE = 2  # seconds
 
+XAI_MAX_CONNECTIONS = int(os.getenv("XAI_MAX_CONNECTIONS", "20"))
+# How often the poller checks in-flight video renders, and how many status
+# requests one tick may have open at once
+XAI_VIDEO_POLL_SECONDS = float(os.getenv("XAI_VIDEO_POLL_SECONDS", "5"))
+XAI_VIDEO_POLL_CONCURRENCY = 8
+# A render that isn't done by then is abandoned
+XAI_VIDEO_TIMEOUT_SECONDS = float(os.getenv("XAI_VIDEO_TIMEOUT_SECONDS", "900"))
+# Consecutive failed status checks tolerated before a render is given up
+XAI_VIDEO_POLL_MAX_ERRORS = 3
+VIDEO_DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+# asyncio primitives and pooled connections are bound to the loop that made
+# them; keying by loop keeps test loops (and worker processes) independent.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_pollers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, VideoPoller]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_xai_client() -> httpx.AsyncClient:
+    """This loop's pooled client for xAI API calls and media downloads."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=XAI_MAX_CONNECTIONS, max_keepalive_connections=XAI_MAX_CONNECTIONS),
+        )
+    return client
+
+
+def set_xai_client(client: httpx.AsyncClient) -> None:
+    """Use client for this loop's xAI calls (tests, benchmarks)."""
+    _clients[asyncio.get_running_loop()] = client
+
+
+async def close_xai_client() -> None:
+    """Close this loop's pooled client and stop its poller (app shutdown)."""
+    loop = asyncio.get_running_loop()
+    poller = _pollers.pop(loop, None)
+    if poller is not None:
+        await poller.close()
+    client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def _auth_headers() -> dict[str, str]:
+    return {"Authorization": f"Bearer {XAI_API_KEY}"}
+
 
 async def generate_image(prompt: str) -> bytes:
     """Generate an image using xAI Grok Imagine.
@@ -37,24 +99,20 @@ async def generate_image(prompt: str) -> bytes:
     """
     for attempt in range(MAX_RETRIES + 1):
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{XAI_BASE_URL}/images/generations",
-                    headers={
-                        "Authorization": f"Bearer {XAI_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "grok-imagine-image",
-                        "prompt": prompt,
-                        "n": 1,
-                        "response_format": "b64_json",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                image_b64 = data["data"][0]["b64_json"]
-                return base64.b64decode(image_b64)
+            response = await get_xai_client().post(
+                f"{XAI_BASE_URL}/images/generations",
+                headers=_auth_headers(),
+                json={
+                    "model": "grok-imagine-image",
+                    "prompt": prompt,
+                    "n": 1,
+                    "response_format": "b64_json",
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            image_b64 = data["data"][0]["b64_json"]
+            return base64.b64decode(image_b64)
 
         except (httpx.HTTPStatusError, httpx.TimeoutException, KeyError) as e:
             if attempt < MAX_RETRIES:
@@ -95,18 +153,101 @@ def sanitize_video_prompt(prompt: str) -> str:
     return prompt
 
 
-async def generate_video(prompt: str, duration: int = 10) -> bytes:
-    """Generate a video using xAI Grok Imagine.
+class VideoPoller:
+    """Tracks in-flight xAI video renders and polls them from one loop.
 
-    Args:
-        prompt: Text description of the video to generate
-        duration: Video duration in seconds (max 15)
+    Each tick checks every pending render (up to XAI_VIDEO_POLL_CONCURRENCY
+    status requests at once over the shared client) and resolves the waiters
+    of finished ones. The loop runs only while something is pending.
+    """
 
-    Returns:
-        Raw video bytes (MP4)
+    def __init__(self, interval: float | None = None, concurrency: int = XAI_VIDEO_POLL_CONCURRENCY):
+        self.interval = XAI_VIDEO_POLL_SECONDS if interval is None else interval
+        self._slots = asyncio.Semaphore(concurrency)
+        self._pending: dict[str, asyncio.Future[str]] = {}
+        self._errors: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+        self.ticks = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def wait(self, request_id: str, timeout: float | None = None) -> str:
+        """Wait for a render to finish and return its video URL."""
+        timeout = XAI_VIDEO_TIMEOUT_SECONDS if timeout is None else timeout
+        future = self._pending.get(request_id)
+        if future is None:
+            future = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Video generation {request_id} not finished after {timeout:.0f}s") from None
+        finally:
+            if self._pending.get(request_id) is future and not future.done():
+                future.cancel()
+            if future.done():
+                self._pending.pop(request_id, None)
+                self._errors.pop(request_id, None)
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.interval)
+            self.ticks += 1
+            waiting = [(rid, f) for rid, f in self._pending.items() if not f.done()]
+            await asyncio.gather(*(self._check(rid, f) for rid, f in waiting))
+            for rid in [rid for rid, f in self._pending.items() if f.done()]:
+                self._pending.pop(rid, None)
+                self._errors.pop(rid, None)
+
+    async def _check(self, request_id: str, future: asyncio.Future[str]) -> None:
+        try:
+            async with self._slots:
+                response = await get_xai_client().get(
+                    f"{XAI_BASE_URL}/videos/{request_id}", headers=_auth_headers()
+                )
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            errors = self._errors[request_id] = self._errors.get(request_id, 0) + 1
+            logger.warning(f"Video status check {request_id} failed ({errors}/{XAI_VIDEO_POLL_MAX_ERRORS}): {e}")
+            if errors >= XAI_VIDEO_POLL_MAX_ERRORS and not future.done():
+                future.set_exception(RuntimeError(f"Video status checks failing: {e}"))
+            return
+        self._errors.pop(request_id, None)
+        if future.done():
+            return
+        # xAI returns 202 while processing, 200 with video.url when done
+        if response.status_code == 200 and "video" in data:
+            future.set_result(data["video"]["url"])
+        elif data.get("status") == "expired":
+            future.set_exception(RuntimeError("Video generation expired before completion"))
+
+    async def close(self) -> None:
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+def get_video_poller() -> VideoPoller:
+    """This loop's shared VideoPoller."""
+    loop = asyncio.get_running_loop()
+    poller = _pollers.get(loop)
+    if poller is None:
+        poller = _pollers[loop] = VideoPoller()
+    return poller
+
+
+async def start_video(prompt: str, duration: int = 10) -> str:
+    """Start an xAI video render and return its request ID.
 
     Raises:
-        RuntimeError: If generation fails after retries
+        RuntimeError: If the request fails after retries
     """
     duration = min(duration, 15)  # Cap at 15 seconds
 
@@ -124,45 +265,19 @@ async def generate_video(prompt: str, duration: int = 10) -> bytes:
 
     for attempt in range(MAX_RETRIES + 1):
         try:
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                # Start generation
-                response = await client.post(
-                    f"{XAI_BASE_URL}/videos/generations",
-                    headers={
-                        "Authorization": f"Bearer {XAI_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "grok-imagine-video",
-                        "prompt": styled_prompt,
-                        "duration": duration,
-                        "aspect_ratio": "16:9",
-                        "resolution": "720p",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Poll for completion
-                request_id = data["request_id"]
-                while True:
-                    await asyncio.sleep(5)
-                    status_response = await client.get(
-                        f"{XAI_BASE_URL}/videos/{request_id}",
-                        headers={"Authorization": f"Bearer {XAI_API_KEY}"},
-                    )
-                    status_response.raise_for_status()
-                    status_data = status_response.json()
-
-                    # xAI returns 202 while processing, 200 with video.url when done
-                    if status_response.status_code == 200 and "video" in status_data:
-                        video_url = status_data["video"]["url"]
-                        video_response = await client.get(video_url)
-                        video_response.raise_for_status()
-                        return video_response.content
-
-                    if status_data.get("status") == "expired":
-                        raise RuntimeError("Video generation expired before completion")
+            response = await get_xai_client().post(
+                f"{XAI_BASE_URL}/videos/generations",
+                headers=_auth_headers(),
+                json={
+                    "model": "grok-imagine-video",
+                    "prompt": styled_prompt,
+                    "duration": duration,
+                    "aspect_ratio": "16:9",
+                    "resolution": "720p",
+                },
+            )
+            response.raise_for_status()
+            return response.json()["request_id"]
 
         except (httpx.HTTPStatusError, httpx.TimeoutException, KeyError) as e:
             if attempt < MAX_RETRIES:
@@ -171,3 +286,28 @@ async def generate_video(prompt: str, duration: int = 10) -> bytes:
                 await asyncio.sleep(wait)
             else:
                 raise RuntimeError(f"Video generation failed after {MAX_RETRIES + 1} attempts: {e}") from e
+
+
+async def generate_video_url(prompt: str, duration: int = 10) -> str:
+    """Generate a video using xAI Grok Imagine and return where to download it.
+
+    Args:
+        prompt: Text description of the video to generate
+        duration: Video duration in seconds (max 15)
+
+    Returns:
+        URL of the finished MP4 (read it with stream_video)
+
+    Raises:
+        RuntimeError: If generation fails, expires or times out
+    """
+    request_id = await start_video(prompt, duration)
+    return await get_video_poller().wait(request_id)
+
+
+async def stream_video(url: str, chunk_size: int = VIDEO_DOWNLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Download a finished video in chunks of about chunk_size bytes."""
+    async with get_xai_client().stream("GET", url, timeout=httpx.Timeout(60.0, connect=10.0)) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(chunk_size):
+            yield chunk
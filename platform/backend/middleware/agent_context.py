@@ -7,38 +7,77 @@ Two fields:
 
 import json
 import logging
+import re
 from typing import Any
-from sqlalchemy import select, func
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import selectinload
 
 from db import (
-    SessionLocal, User, ApiKey, Notification, NotificationStatus,
-    Proposal, ProposalStatus, Validation, World, Dweller,
+    User, Notification, NotificationStatus,
+    Proposal, ProposalStatus, World, Dweller,
     Aspect, AspectStatus, AspectValidation,
-    ReviewFeedback, FeedbackItem, FeedbackItemStatus, FeedbackResponse,
+    ReviewFeedback, FeedbackItem, FeedbackItemStatus,
     Story,
 )
-from api.auth import hash_api_key
+from utils.agent_context_cache import get_agent_context_cache, invalidate_agent_context
+from utils.principal import api_key_from_headers, get_request_user, resolve_principal
 
 
 MAX_ACTIVE_PROPOSALS = 3
 
 
-async def get_user_from_api_key(api_key: str) -> User | None:
-    """Get user from API key without modifying last_used timestamps."""
-    key_hash = hash_api_key(api_key)
+async def get_user_from_api_key(scope, api_key: str) -> User | None:
+    """Get the request's user without modifying last_used timestamps.
+
+    Reuses the User row get_current_user loaded for this request; only
+    endpoints that never authenticated fall back to a lookup.
+    """
+    user = get_request_user(scope)
+    if user is not None:
+        return user
+
+    principal = await resolve_principal(scope, api_key)
+    if not principal:
+        return None
+
+    from db.database import SessionLocal
 
     async with SessionLocal() as db:
-        key_query = select(ApiKey).where(ApiKey.key_hash == key_hash)
-        result = await db.execute(key_query)
-        api_key_record = result.scalar_one_or_none()
+        return await db.get(User, principal.user_id)
+
+
+def _has_items_with_status(status: FeedbackItemStatus):
+    return ReviewFeedback.id.in_(
+        select(FeedbackItem.review_feedback_id).where(FeedbackItem.status == status)
+    )
+
+
+# action_required lists feedback on proposals, then stories, then aspects
+_CONTENT_TYPE_ORDER = {"proposal": 0, "story": 1, "aspect": 2}
 
-        if not api_key_record or api_key_record.is_revoked:
-            return None
 
-        user_query = select(User).where(User.id == api_key_record.user_id)
-        user_result = await db.execute(user_query)
-        return user_result.scalar_one_or_none()
+async def _content_names(db, keys: set[tuple[str, Any]]) -> dict[tuple[str, Any], str]:
+    """Display names for (content_type, content_id) pairs, one query per content type."""
+    ids_by_type: dict[str, list] = {}
+    for content_type, content_id in keys:
+        ids_by_type.setdefault(content_type, []).append(content_id)
+
+    names: dict[tuple[str, Any], str] = {}
+    if ids := ids_by_type.get("proposal"):
+        rows = await db.execute(
+            select(Proposal.id, Proposal.name, Proposal.year_setting).where(Proposal.id.in_(ids))
+        )
+        for row in rows:
+            names[("proposal", row.id)] = row.name or f"Proposal {row.year_setting}"
+    if ids := ids_by_type.get("story"):
+        rows = await db.execute(select(Story.id, Story.title).where(Story.id.in_(ids)))
+        for row in rows:
+            names[("story", row.id)] = row.title
+    if ids := ids_by_type.get("aspect"):
+        rows = await db.execute(select(Aspect.id, Aspect.title).where(Aspect.id.in_(ids)))
+        for row in rows:
+            names[("aspect", row.id)] = row.title
+    return names
 
 
 async def _build_action_required(db, user_id, user_record) -> list[dict]:
@@ -61,50 +100,51 @@ async def _build_action_required(db, user_id, user_record) -> list[dict]:
             "interval_hours": 4,
         })
 
-    # Priority 1: Open feedback on YOUR content (you're the proposer, someone reviewed your stuff)
-    # Find all feedback items on content you own that are status=open (need your response)
+    # Priority 1: Open feedback on YOUR content (you're the proposer, someone reviewed your stuff).
+    # One query across proposals, stories and aspects, limited to reviews with open items.
     own_content_reviews = await db.execute(
         select(ReviewFeedback)
-        .options(selectinload(ReviewFeedback.items).selectinload(FeedbackItem.responses))
+        .options(selectinload(ReviewFeedback.items))
         .options(selectinload(ReviewFeedback.reviewer))
         .where(
-            ReviewFeedback.content_id.in_(
-                select(Proposal.id).where(Proposal.agent_id == user_id)
+            _has_items_with_status(FeedbackItemStatus.OPEN),
+            or_(
+                and_(
+                    ReviewFeedback.content_type == "proposal",
+                    ReviewFeedback.content_id.in_(select(Proposal.id).where(Proposal.agent_id == user_id)),
+                ),
+                and_(
+                    ReviewFeedback.content_type == "story",
+                    ReviewFeedback.content_id.in_(select(Story.id).where(Story.author_id == user_id)),
+                ),
+                and_(
+                    ReviewFeedback.content_type == "aspect",
+                    ReviewFeedback.content_id.in_(select(Aspect.id).where(Aspect.agent_id == user_id)),
+                ),
             ),
-            ReviewFeedback.content_type == "proposal",
         )
+        .order_by(ReviewFeedback.created_at, ReviewFeedback.id)
     )
-    proposal_reviews = own_content_reviews.scalars().all()
-
-    # Also check stories
-    own_story_reviews = await db.execute(
-        select(ReviewFeedback)
-        .options(selectinload(ReviewFeedback.items).selectinload(FeedbackItem.responses))
-        .options(selectinload(ReviewFeedback.reviewer))
-        .where(
-            ReviewFeedback.content_id.in_(
-                select(Story.id).where(Story.author_id == user_id)
-            ),
-            ReviewFeedback.content_type == "story",
-        )
+    all_reviews = sorted(
+        own_content_reviews.scalars().all(),
+        key=lambda review: _CONTENT_TYPE_ORDER.get(review.content_type, len(_CONTENT_TYPE_ORDER)),
     )
-    story_reviews = own_story_reviews.scalars().all()
 
-    # Also check aspects
-    own_aspect_reviews = await db.execute(
+    # Priority 2: Items YOU reviewed that are now "addressed" — need your resolution
+    my_reviews = await db.execute(
         select(ReviewFeedback)
         .options(selectinload(ReviewFeedback.items).selectinload(FeedbackItem.responses))
-        .options(selectinload(ReviewFeedback.reviewer))
         .where(
-            ReviewFeedback.content_id.in_(
-                select(Aspect.id).where(Aspect.agent_id == user_id)
-            ),
-            ReviewFeedback.content_type == "aspect",
+            ReviewFeedback.reviewer_id == user_id,
+            _has_items_with_status(FeedbackItemStatus.ADDRESSED),
         )
+        .order_by(ReviewFeedback.created_at, ReviewFeedback.id)
     )
-    aspect_reviews = own_aspect_reviews.scalars().all()
+    my_reviews_list = my_reviews.scalars().all()
 
-    all_reviews = proposal_reviews + story_reviews + aspect_reviews
+    names = await _content_names(
+        db, {(review.content_type, review.content_id) for review in [*all_reviews, *my_reviews_list]}
+    )
 
     # Group open items by content
     content_items: dict[str, dict] = {}
@@ -115,27 +155,12 @@ async def _build_action_required(db, user_id, user_record) -> list[dict]:
 
         content_key = f"{review.content_type}:{review.content_id}"
         if content_key not in content_items:
-            # Get content name
-            content_name = str(review.content_id)
-            if review.content_type == "proposal":
-                proposal = await db.get(Proposal, review.content_id)
-                if proposal:
-                    content_name = proposal.name or f"Proposal {proposal.year_setting}"
-            elif review.content_type == "story":
-                story = await db.get(Story, review.content_id)
-                if story:
-                    content_name = story.title
-            elif review.content_type == "aspect":
-                aspect = await db.get(Aspect, review.content_id)
-                if aspect:
-                    content_name = aspect.name
-
             content_items[content_key] = {
                 "type": "respond_to_feedback",
                 "priority": 1,
                 "content_type": review.content_type,
                 "content_id": str(review.content_id),
-                "content_name": content_name,
+                "content_name": names.get((review.content_type, review.content_id), str(review.content_id)),
                 "items": [],
             }
 
@@ -152,14 +177,6 @@ async def _build_action_required(db, user_id, user_record) -> list[dict]:
 
     actions.extend(content_items.values())
 
-    # Priority 2: Items YOU reviewed that are now "addressed" — need your resolution
-    my_reviews = await db.execute(
-        select(ReviewFeedback)
-        .options(selectinload(ReviewFeedback.items).selectinload(FeedbackItem.responses))
-        .where(ReviewFeedback.reviewer_id == user_id)
-    )
-    my_reviews_list = my_reviews.scalars().all()
-
     resolve_items: dict[str, dict] = {}
     for review in my_reviews_list:
         addressed_items = [item for item in review.items if item.status == FeedbackItemStatus.ADDRESSED]
@@ -168,22 +185,12 @@ async def _build_action_required(db, user_id, user_record) -> list[dict]:
 
         content_key = f"{review.content_type}:{review.content_id}"
         if content_key not in resolve_items:
-            content_name = str(review.content_id)
-            if review.content_type == "proposal":
-                proposal = await db.get(Proposal, review.content_id)
-                if proposal:
-                    content_name = proposal.name or f"Proposal {proposal.year_setting}"
-            elif review.content_type == "story":
-                story = await db.get(Story, review.content_id)
-                if story:
-                    content_name = story.title
-
             resolve_items[content_key] = {
                 "type": "resolve_feedback",
                 "priority": 2,
                 "content_type": review.content_type,
                 "content_id": str(review.content_id),
-                "content_name": content_name,
+                "content_name": names.get((review.content_type, review.content_id), str(review.content_id)),
                 "items": [],
             }
 
@@ -207,24 +214,9 @@ async def _build_action_required(db, user_id, user_record) -> list[dict]:
 
 
 async def _build_suggested_actions(db, user_id) -> list[dict]:
-    """Build generic menu of available actions with counts."""
-
-    # Proposals awaiting review (not yours, not already reviewed by you)
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == user_id)
-        .scalar_subquery()
-    )
-    proposals_awaiting = await db.scalar(
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != user_id,
-            Proposal.id.notin_(validated_subq),
-        )
-    ) or 0
+    """Build generic menu of available actions with counts (one round trip)."""
 
-    # Also count proposals needing critical review (not reviewed by you)
+    # Proposals needing critical review (not yours, not already reviewed by you)
     reviewed_subq = (
         select(ReviewFeedback.content_id)
         .where(
@@ -233,14 +225,15 @@ async def _build_suggested_actions(db, user_id) -> list[dict]:
         )
         .scalar_subquery()
     )
-    proposals_needing_review = await db.scalar(
+    proposals_needing_review = (
         select(func.count(Proposal.id))
         .where(
             Proposal.status == ProposalStatus.VALIDATING,
             Proposal.agent_id != user_id,
             Proposal.id.notin_(reviewed_subq),
         )
-    ) or 0
+        .scalar_subquery()
+    )
 
     # Aspects awaiting review
     validated_aspects_subq = (
@@ -248,46 +241,59 @@ async def _build_suggested_actions(db, user_id) -> list[dict]:
         .where(AspectValidation.agent_id == user_id)
         .scalar_subquery()
     )
-    aspects_awaiting = await db.scalar(
+    aspects_awaiting = (
         select(func.count(Aspect.id))
         .where(
             Aspect.status == AspectStatus.VALIDATING,
             Aspect.agent_id != user_id,
             Aspect.id.notin_(validated_aspects_subq),
         )
-    ) or 0
+        .scalar_subquery()
+    )
 
     # Your dwellers
-    dweller_count = await db.scalar(
-        select(func.count(Dweller.id)).where(Dweller.inhabited_by == user_id)
-    ) or 0
+    dweller_count = (
+        select(func.count(Dweller.id)).where(Dweller.inhabited_by == user_id).scalar_subquery()
+    )
 
     # Approved worlds
-    world_count = await db.scalar(select(func.count(World.id))) or 0
+    world_count = select(func.count(World.id)).scalar_subquery()
 
     # Your active proposals
-    own_proposals = await db.scalar(
+    own_proposals = (
         select(func.count(Proposal.id))
         .where(
             Proposal.agent_id == user_id,
             Proposal.status.in_([ProposalStatus.DRAFT, ProposalStatus.VALIDATING]),
         )
-    ) or 0
-    slots = MAX_ACTIVE_PROPOSALS - own_proposals
+        .scalar_subquery()
+    )
+
+    counts = (await db.execute(select(
+        proposals_needing_review.label("proposals_needing_review"),
+        aspects_awaiting.label("aspects_awaiting"),
+        dweller_count.label("dweller_count"),
+        world_count.label("world_count"),
+        own_proposals.label("own_proposals"),
+    ))).one()
+    slots = MAX_ACTIVE_PROPOSALS - (counts.own_proposals or 0)
 
     return [
-        {"action": "review_proposal", "count": proposals_needing_review, "endpoint": "/api/proposals?status=validating"},
-        {"action": "review_aspect", "count": aspects_awaiting, "endpoint": "/api/aspects?status=validating"},
-        {"action": "dweller_action", "count": dweller_count, "endpoint": "/api/dwellers/mine"},
+        {"action": "review_proposal", "count": counts.proposals_needing_review or 0, "endpoint": "/api/proposals?status=validating"},
+        {"action": "review_aspect", "count": counts.aspects_awaiting or 0, "endpoint": "/api/aspects?status=validating"},
+        {"action": "dweller_action", "count": counts.dweller_count or 0, "endpoint": "/api/dwellers/mine"},
         {"action": "write_story", "endpoint": "/api/stories"},
-        {"action": "add_aspect", "count": world_count, "endpoint": "/api/worlds"},
-        {"action": "create_dweller", "count": dweller_count, "endpoint": "/api/dwellers"},
+        {"action": "add_aspect", "count": counts.world_count or 0, "endpoint": "/api/worlds"},
+        {"action": "create_dweller", "count": counts.dweller_count or 0, "endpoint": "/api/dwellers"},
         {"action": "create_proposal", "count": slots, "endpoint": "/api/proposals"},
     ]
 
 
 async def build_agent_context(user_id, callback_url: str | None = None, user_record: Any = None) -> dict[str, Any]:
     """Build the two-field agent context."""
+    # Looked up at call time so a swapped session factory (tests, DST) applies
+    from db.database import SessionLocal
+
     async with SessionLocal() as db:
         action_required = await _build_action_required(db, user_id, user_record)
         suggested_actions = await _build_suggested_actions(db, user_id)
@@ -317,16 +323,86 @@ async def build_agent_context(user_id, callback_url: str | None = None, user_rec
         return context
 
 
+async def get_agent_context(user: User) -> dict[str, Any]:
+    """The user's agent context, from the per-user cache when it is still current.
+
+    Returns a copy the caller may add keys to (e.g. skill_update).
+    """
+    cache = get_agent_context_cache()
+    context = cache.get(user.id)
+    if context is None:
+        generation = cache.generation
+        context = await build_agent_context(user.id, callback_url=user.callback_url, user_record=user)
+        cache.put(user.id, generation, context)
+    return dict(context)
+
+
+def skip_agent_context(endpoint):
+    """Mark an endpoint whose responses never get _agent_context.
+
+    For hot endpoints where agents don't need the menu on every call
+    (POST /dwellers/{id}/act). Apply below the router decorator:
+
+        @router.post("/{dweller_id}/act")
+        @skip_agent_context
+        async def take_action(...): ...
+    """
+    endpoint._skip_agent_context = True
+    return endpoint
+
+
 def _get_skill_version() -> str:
     """Lazy import to avoid circular dependency at module load time."""
     from main import SKILL_VERSION
     return SKILL_VERSION
 
 
+def _skill_update(agent_skill_version: str | None) -> dict[str, Any] | None:
+    """skill_update notice for agents on a missing or outdated skill version."""
+    skill_ver = _get_skill_version()
+    if not agent_skill_version:
+        return {
+            "available": True,
+            "your_version": None,
+            "latest_version": skill_ver,
+            "message": f"Fetch GET /skill.md (version {skill_ver}), then include 'X-Skill-Version: {skill_ver}' in all future requests.",
+            "fetch_url": "/skill.md",
+        }
+    if agent_skill_version != skill_ver:
+        return {
+            "available": True,
+            "your_version": agent_skill_version,
+            "latest_version": skill_ver,
+            "message": f"Skill updated from {agent_skill_version} to {skill_ver}. Re-fetch GET /skill.md.",
+            "fetch_url": "/skill.md",
+        }
+    return None
+
+
+_EMPTY_OBJECT = re.compile(rb"\{\s*\}")
+
+
 class AgentContextMiddleware:
-    """Pure ASGI middleware to inject agent context into authenticated JSON responses."""
+    """Pure ASGI middleware to inject agent context into authenticated JSON responses.
+
+    Only JSON objects with a Content-Length of at most MAX_INJECT_BYTES are
+    touched. Their body (one chunk from JSONResponse) is held until complete
+    and the context is spliced in before the closing brace, without parsing
+    or re-serializing the payload. Streaming responses (SSE, anything without
+    a Content-Length), non-JSON bodies and large bodies pass through as they
+    are produced.
+
+    Agents opt out per request with `X-Agent-Context: off`; endpoints opt out
+    with @skip_agent_context. Contexts come from the per-user cache in
+    utils.agent_context_cache, which successful writes invalidate here.
+    """
 
     SKIP_PATHS = {"/", "/health", "/docs", "/openapi.json", "/skill.md", "/heartbeat.md"}
+    MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+    # Writes here change other agents' context (review queues, feedback on
+    # their content), so they invalidate every cached context.
+    SHARED_WRITE_PREFIXES = ("/api/proposals", "/api/aspects", "/api/review")
+    MAX_INJECT_BYTES = 1024 * 1024
 
     def __init__(self, app):
         self.app = app
@@ -342,102 +418,95 @@ class AgentContextMiddleware:
             return
 
         # Extract API key and skill version from headers
-        api_key = None
+        api_key = api_key_from_headers(scope.get("headers", []))
         agent_skill_version = None
+        opted_out = False
         for key, value in scope.get("headers", []):
-            if key == b"x-api-key":
-                api_key = value.decode()
-            elif key == b"authorization":
-                auth_value = value.decode()
-                if auth_value.lower().startswith("bearer "):
-                    api_key = auth_value[7:].strip()
-            elif key == b"x-skill-version":
+            if key == b"x-skill-version":
                 agent_skill_version = value.decode().strip()
+            elif key == b"x-agent-context":
+                opted_out = value.decode().strip().lower() == "off"
 
         if not api_key:
             await self.app(scope, receive, send)
             return
 
-        # Capture response
-        response_started = False
-        status_code = 200
-        response_headers = []
-        body_parts = []
+        held_start = None  # http.response.start, held while an injectable body arrives
+        body_parts: list[bytes] = []
 
-        async def capture_send(message):
-            nonlocal response_started, status_code, response_headers
+        async def inject_send(message):
+            nonlocal held_start
 
             if message["type"] == "http.response.start":
-                response_started = True
-                status_code = message.get("status", 200)
-                response_headers = list(message.get("headers", []))
-            elif message["type"] == "http.response.body":
+                self._invalidate_after_write(scope, message.get("status", 200))
+                if not opted_out and self._should_inject(scope, message):
+                    held_start = message
+                    return
+            elif message["type"] == "http.response.body" and held_start is not None:
                 body_parts.append(message.get("body", b""))
-
-        await self.app(scope, receive, capture_send)
-
-        body = b"".join(body_parts)
-
-        # Only modify successful JSON responses
-        content_type = ""
-        for key, value in response_headers:
+                if message.get("more_body", False):
+                    return
+                start, held_start = held_start, None
+                body = b"".join(body_parts)
+                body_parts.clear()
+                body = await self._splice_context(scope, api_key, agent_skill_version, body)
+                headers = [(k, v) for k, v in start.get("headers", []) if k != b"content-length"]
+                headers.append((b"content-length", str(len(body)).encode()))
+                await send({**start, "headers": headers})
+                await send({"type": "http.response.body", "body": body})
+                return
+            await send(message)
+
+        await self.app(scope, receive, inject_send)
+
+    def _should_inject(self, scope, start_message) -> bool:
+        """True for successful, size-bounded JSON responses from endpoints that want context."""
+        if start_message.get("status", 200) >= 400:
+            return False
+        # Endpoint-level switch (set by @skip_agent_context; routing fills scope["endpoint"])
+        if getattr(scope.get("endpoint"), "_skip_agent_context", False):
+            return False
+        content_type = b""
+        content_length = None
+        for key, value in start_message.get("headers", []):
             if key == b"content-type":
-                content_type = value.decode()
-                break
-
-        if status_code < 400 and "application/json" in content_type:
-            try:
-                data = json.loads(body)
-                if isinstance(data, dict):
-                    try:
-                        user = await get_user_from_api_key(api_key)
-                        if user:
-                            agent_context = await build_agent_context(
-                                user.id, callback_url=user.callback_url, user_record=user
-                            )
-                            # Skill update check
-                            skill_ver = _get_skill_version()
-                            if not agent_skill_version:
-                                agent_context["skill_update"] = {
-                                    "available": True,
-                                    "your_version": None,
-                                    "latest_version": skill_ver,
-                                    "message": f"Fetch GET /skill.md (version {skill_ver}), then include 'X-Skill-Version: {skill_ver}' in all future requests.",
-                                    "fetch_url": "/skill.md",
-                                }
-                            elif agent_skill_version != skill_ver:
-                                agent_context["skill_update"] = {
-                                    "available": True,
-                                    "your_version": agent_skill_version,
-                                    "latest_version": skill_ver,
-                                    "message": f"Skill updated from {agent_skill_version} to {skill_ver}. Re-fetch GET /skill.md.",
-                                    "fetch_url": "/skill.md",
-                                }
-                            data["_agent_context"] = agent_context
-                            body = json.dumps(data).encode()
-
-                            response_headers = [
-                                (k, v) for k, v in response_headers
-                                if k != b"content-length"
-                            ]
-                            response_headers.append(
-                                (b"content-length", str(len(body)).encode())
-                            )
-                    except Exception:
-                        logging.getLogger(__name__).debug(
-                            "Could not inject agent context (DB contention or session issue)"
-                        )
-            except json.JSONDecodeError:
-                pass
-            except Exception:
-                logging.getLogger(__name__).exception("Failed to inject agent context")
-
-        await send({
-            "type": "http.response.start",
-            "status": status_code,
-            "headers": response_headers,
-        })
-        await send({
-            "type": "http.response.body",
-            "body": body,
-        })
+                content_type = value
+            elif key == b"content-length":
+                content_length = int(value)
+        return (
+            b"application/json" in content_type
+            and content_length is not None
+            and content_length <= self.MAX_INJECT_BYTES
+        )
+
+    async def _splice_context(self, scope, api_key: str, agent_skill_version: str | None, body: bytes) -> bytes:
+        """Insert "_agent_context" as the last key of a JSON object body."""
+        body = body.rstrip()
+        if not (body.startswith(b"{") and body.endswith(b"}")):
+            return body
+        try:
+            user = await get_user_from_api_key(scope, api_key)
+            if not user:
+                return body
+            agent_context = await get_agent_context(user)
+            skill_update = _skill_update(agent_skill_version)
+            if skill_update:
+                agent_context["skill_update"] = skill_update
+        except Exception:
+            logging.getLogger(__name__).debug(
+                "Could not inject agent context (DB contention or session issue)"
+            )
+            return body
+        separator = b"" if _EMPTY_OBJECT.fullmatch(body) else b","
+        return body[:-1] + separator + b'"_agent_context":' + json.dumps(agent_context).encode() + b"}"
+
+    def _invalidate_after_write(self, scope, status_code: int) -> None:
+        """Drop cached contexts a successful write may have changed."""
+        if status_code >= 400 or scope.get("method") not in self.MUTATING_METHODS:
+            return
+        if scope.get("path", "").startswith(self.SHARED_WRITE_PREFIXES):
+            invalidate_agent_context()
+            return
+        user = get_request_user(scope)
+        if user is not None:
+            invalidate_agent_context(user.id)
@@ -19,6 +19,7 @@ from uuid import UUID
 from sqlalchemy import select, text
 
 from db import SessionLocal
+from utils.principal import api_key_from_headers, resolve_principal
 
 logger = logging.getLogger(__name__)
 
@@ -47,16 +48,10 @@ class IdempotencyMiddleware:
 
         # Extract idempotency key and API key from headers
         idempotency_key = None
-        api_key = None
         for key, value in scope.get("headers", []):
             if key == b"x-idempotency-key":
                 idempotency_key = value.decode().strip()
-            elif key == b"x-api-key":
-                api_key = value.decode()
-            elif key == b"authorization":
-                auth_value = value.decode()
-                if auth_value.lower().startswith("bearer "):
-                    api_key = auth_value[7:].strip()
+        api_key = api_key_from_headers(scope.get("headers", []))
 
         # No idempotency key? Pass through (backward compatible)
         if not idempotency_key:
@@ -83,11 +78,12 @@ class IdempotencyMiddleware:
             )
             return
 
-        # Get user_id from API key
-        user_id = await self._get_user_id_from_api_key(api_key)
-        if not user_id:
+        # Resolve the key (stored on the scope, so get_current_user reuses it)
+        principal = await resolve_principal(scope, api_key)
+        if not principal:
             await self._send_error(send, 401, {"error": "Invalid API key"})
             return
+        user_id = str(principal.user_id)
 
         # Check for existing idempotency key
         endpoint = scope.get("path", "")
@@ -172,20 +168,6 @@ class IdempotencyMiddleware:
             "body": body,
         })
 
-    async def _get_user_id_from_api_key(self, api_key: str) -> str | None:
-        """Get user_id from API key hash."""
-        from api.auth import hash_api_key
-
-        key_hash = hash_api_key(api_key)
-
-        async with SessionLocal() as db:
-            query = text(
-                "SELECT user_id FROM platform_api_keys WHERE key_hash = :key_hash AND is_revoked = false"
-            )
-            result = await db.execute(query, {"key_hash": key_hash})
-            row = result.fetchone()
-            return str(row[0]) if row else None
-
     async def _get_idempotency_record(self, key: str) -> dict[str, Any] | None:
         """Check if idempotency key exists."""
         async with SessionLocal() as db:
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""Backfill platform_activity_events from existing content tables.
+
+Usage:
+    cd platform/backend
+    source .venv/bin/activate
+    python scripts/backfill_activity_events.py [--before 2026-01-01T00:00:00+00:00]
+
+Requires:
+    DATABASE_URL    — PostgreSQL connection string
+
+The feed only reads the activity log, so history written before the log
+existed has to be loaded once after migration 0028 is deployed. The script:
+1. Picks a cutoff — --before, else the oldest event already in the log
+   (everything newer was written live), else now
+2. Walks each content table older than the cutoff in keyset batches
+3. Builds the same events the live endpoints write, dated at the original
+   timestamps
+4. Inserts them with ON CONFLICT DO NOTHING, so re-running is safe
+
+Only the latest revision of a proposal, aspect or story is recoverable
+(earlier last_revised_at values were overwritten), so history gets one
+revision event per revised item.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load .env from platform/
+load_dotenv(Path(__file__).parent.parent.parent / ".env")
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from db import (
+    ActivityEvent,
+    Aspect,
+    AspectStatus,
+    Dweller,
+    DwellerAction,
+    FeedbackItem,
+    FeedbackItemStatus,
+    Proposal,
+    ProposalStatus,
+    ReviewFeedback,
+    Story,
+    StoryReview,
+    User,
+    UserType,
+    Validation,
+    ValidationVerdict,
+    World,
+)
+from utils import activity_events
+from utils.clock import now as utc_now
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+async def _scan(
+    session: AsyncSession,
+    model: Any,
+    timestamp: Any,
+    before: datetime,
+    batch_size: int,
+    *conditions: Any,
+    options: tuple = (),
+) -> AsyncIterator[list[Any]]:
+    """Yield rows with timestamp < before in (timestamp, id) keyset batches."""
+    last_key = None
+    while True:
+        query = (
+            select(model)
+            .options(*options)
+            .where(timestamp.is_not(None), timestamp < before, *conditions)
+            .order_by(timestamp, model.id)
+            .limit(batch_size)
+        )
+        if last_key is not None:
+            query = query.where(tuple_(timestamp, model.id) > last_key)
+        rows = list((await session.execute(query)).scalars().all())
+        if not rows:
+            return
+        yield rows
+        last_key = (getattr(rows[-1], timestamp.key), rows[-1].id)
+
+
+async def _insert(session: AsyncSession, events: list[ActivityEvent]) -> int:
+    """Insert events, skipping occurrences already in the log. Returns rows inserted."""
+    if not events:
+        return 0
+    rows = [
+        {
+            "event_type": event.event_type,
+            "sort_date": event.sort_date,
+            "subject_id": event.subject_id,
+            "world_id": event.world_id,
+            "actor_id": event.actor_id,
+            "payload": event.payload,
+        }
+        for event in events
+    ]
+    result = await session.execute(
+        insert(ActivityEvent)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["event_type", "subject_id", "sort_date"])
+        .returning(ActivityEvent.id)
+    )
+    return len(result.all())
+
+
+def _aspect_timeline_entry(aspect: Aspect) -> dict | None:
+    """Timeline entry shown on an approved event aspect (approving validation's, else proposed)."""
+    if aspect.aspect_type != "event":
+        return None
+    for validation in aspect.validations:
+        if validation.verdict == ValidationVerdict.APPROVE and validation.approved_timeline_entry:
+            return validation.approved_timeline_entry
+    return aspect.proposed_timeline_entry
+
+
+async def backfill_activity_events(
+    session_factory: Any,
+    before: datetime | None = None,
+    batch_size: int = 500,
+) -> dict[str, int]:
+    """Load pre-log history into platform_activity_events in one transaction.
+
+    Returns the number of events inserted per source.
+    """
+    counts: dict[str, int] = {}
+
+    async with session_factory() as session:
+        if before is None:
+            before = await session.scalar(select(func.min(ActivityEvent.sort_date))) or utc_now()
+        logger.info(f"Backfilling activity events before {before.isoformat()}")
+
+        async def run(name: str, batches: AsyncIterator[list[Any]], build) -> None:
+            inserted = 0
+            async for rows in batches:
+                events: list[ActivityEvent] = []
+                for row in rows:
+                    events.extend(await build(row))
+                inserted += await _insert(session, events)
+            counts[name] = inserted
+            logger.info(f"  {name}: {inserted}")
+
+        def scan(model, timestamp, *conditions, options=()):
+            return _scan(session, model, timestamp, before, batch_size, *conditions, options=options)
+
+        async def world_events(world: World) -> list[ActivityEvent]:
+            proposal = await session.get(Proposal, world.proposal_id) if world.proposal_id else None
+            if proposal is None:
+                return [activity_events.world_created(world, world.creator, world.created_at)]
+            return await activity_events.world_created_events(
+                session, world, proposal, world.creator, world.created_at
+            )
+
+        await run(
+            "worlds",
+            scan(World, World.created_at, World.is_active == True,
+                 options=(selectinload(World.creator),)),
+            world_events,
+        )
+
+        async def proposal_events(proposal: Proposal) -> list[ActivityEvent]:
+            return [activity_events.proposal_submitted(
+                proposal, proposal.agent, len(proposal.validations), proposal.created_at
+            )]
+
+        await run(
+            "proposals",
+            scan(
+                Proposal, Proposal.created_at,
+                Proposal.status.in_([ProposalStatus.VALIDATING, ProposalStatus.APPROVED, ProposalStatus.REJECTED]),
+                options=(selectinload(Proposal.agent), selectinload(Proposal.validations)),
+            ),
+            proposal_events,
+        )
+
+        async def validation_events(validation: Validation) -> list[ActivityEvent]:
+            return [activity_events.proposal_validated(
+                validation, validation.proposal, validation.agent,
+                validation.proposal.agent, validation.created_at,
+            )]
+
+        await run(
+            "validations",
+            scan(Validation, Validation.created_at, options=(
+                selectinload(Validation.agent),
+                selectinload(Validation.proposal).selectinload(Proposal.agent),
+            )),
+            validation_events,
+        )
+
+        async def aspect_events(aspect: Aspect) -> list[ActivityEvent]:
+            if aspect.status == AspectStatus.VALIDATING:
+                return [activity_events.aspect_proposed(aspect, aspect.world, aspect.agent, aspect.created_at)]
+            return [activity_events.aspect_approved(
+                aspect, aspect.world, aspect.agent,
+                _aspect_timeline_entry(aspect), aspect.created_at,
+            )]
+
+        await run(
+            "aspects",
+            scan(
+                Aspect, Aspect.created_at,
+                Aspect.status.in_([AspectStatus.VALIDATING, AspectStatus.APPROVED]),
+                options=(
+                    selectinload(Aspect.agent),
+                    selectinload(Aspect.world),
+                    selectinload(Aspect.validations),
+                ),
+            ),
+            aspect_events,
+        )
+
+        async def action_events(action: DwellerAction) -> list[ActivityEvent]:
+            return [activity_events.dweller_action(
+                action, action.dweller, action.dweller.world, action.actor, action.created_at
+            )]
+
+        await run(
+            "dweller_actions",
+            scan(DwellerAction, DwellerAction.created_at, options=(
+                selectinload(DwellerAction.dweller).selectinload(Dweller.world),
+                selectinload(DwellerAction.actor),
+            )),
+            action_events,
+        )
+
+        async def dweller_events(dweller: Dweller) -> list[ActivityEvent]:
+            return [activity_events.dweller_created(dweller, dweller.world, dweller.creator, dweller.created_at)]
+
+        await run(
+            "dwellers",
+            scan(Dweller, Dweller.created_at, Dweller.is_active == True,
+                 options=(selectinload(Dweller.world), selectinload(Dweller.creator))),
+            dweller_events,
+        )
+
+        async def agent_events(user: User) -> list[ActivityEvent]:
+            return [activity_events.agent_registered(user, user.created_at)]
+
+        await run("agents", scan(User, User.created_at, User.type == UserType.AGENT), agent_events)
+
+        story_options = (
+            selectinload(Story.world),
+            selectinload(Story.author),
+            selectinload(Story.perspective_dweller),
+        )
+
+        async def story_events(story: Story) -> list[ActivityEvent]:
+            return [activity_events.story_created(
+                story, story.world, story.author, story.perspective_dweller, story.created_at
+            )]
+
+        await run("stories", scan(Story, Story.created_at, options=story_options), story_events)
+
+        async def story_revision_events(story: Story) -> list[ActivityEvent]:
+            return [activity_events.story_revised(story, story.world, story.author, story.last_revised_at)]
+
+        await run(
+            "story_revisions",
+            scan(Story, Story.last_revised_at, Story.revision_count > 0, options=story_options),
+            story_revision_events,
+        )
+
+        names: dict[tuple[str, Any], str] = {}
+
+        async def name_of(content_type: str, content_id: Any) -> str:
+            key = (content_type, content_id)
+            if key not in names:
+                names[key] = await activity_events.content_name(session, content_type, content_id)
+            return names[key]
+
+        async def review_events(review: ReviewFeedback) -> list[ActivityEvent]:
+            return [activity_events.review_submitted(
+                review, review.reviewer,
+                await name_of(review.content_type, review.content_id),
+                list(review.items), review.created_at,
+            )]
+
+        await run(
+            "reviews",
+            scan(ReviewFeedback, ReviewFeedback.created_at,
+                 options=(selectinload(ReviewFeedback.reviewer), selectinload(ReviewFeedback.items))),
+            review_events,
+        )
+
+        async def story_review_events(review: StoryReview) -> list[ActivityEvent]:
+            story = review.story
+            return [activity_events.story_reviewed(
+                review, review.reviewer, story, story.world if story else None, review.created_at
+            )]
+
+        await run(
+            "story_reviews",
+            scan(StoryReview, StoryReview.created_at, options=(
+                selectinload(StoryReview.reviewer),
+                selectinload(StoryReview.story).selectinload(Story.world),
+            )),
+            story_review_events,
+        )
+
+        async def resolution_events(item: FeedbackItem) -> list[ActivityEvent]:
+            review = item.review
+            remaining = sum(1 for other in review.items if other.status == FeedbackItemStatus.OPEN)
+            return [activity_events.feedback_resolved(
+                item, review, review.reviewer,
+                await name_of(review.content_type, review.content_id),
+                remaining, item.resolved_at,
+            )]
+
+        await run(
+            "feedback_resolutions",
+            scan(
+                FeedbackItem, FeedbackItem.resolved_at,
+                FeedbackItem.status == FeedbackItemStatus.RESOLVED,
+                options=(
+                    selectinload(FeedbackItem.review).selectinload(ReviewFeedback.reviewer),
+                    selectinload(FeedbackItem.review).selectinload(ReviewFeedback.items),
+                ),
+            ),
+            resolution_events,
+        )
+
+        async def proposal_revision_events(proposal: Proposal) -> list[ActivityEvent]:
+            return [activity_events.proposal_revised(proposal, proposal.agent, proposal.last_revised_at)]
+
+        await run(
+            "proposal_revisions",
+            scan(Proposal, Proposal.last_revised_at, options=(selectinload(Proposal.agent),)),
+            proposal_revision_events,
+        )
+
+        async def aspect_revision_events(aspect: Aspect) -> list[ActivityEvent]:
+            return [activity_events.aspect_revised(aspect, aspect.agent, aspect.last_revised_at)]
+
+        await run(
+            "aspect_revisions",
+            scan(Aspect, Aspect.last_revised_at, options=(selectinload(Aspect.agent),)),
+            aspect_revision_events,
+        )
+
+        await session.commit()
+
+    return counts
+
+
+async def main() -> None:
+    from db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Only backfill activity older than this ISO timestamp "
+             "(default: the oldest event already logged)",
+    )
+    args = parser.parse_args()
+
+    counts = await backfill_activity_events(SessionLocal, before=args.before)
+    logger.info(f"\nDone: {sum(counts.values())} events inserted.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -14,7 +14,8 @@ The script:
 1. Fetches all active worlds without a premise_embedding
 2. Generates text-embedding-3-small embeddings for each world
 3. Stores the embedding vector back to the database
-4. Prints a summary when done
+4. Refreshes the stored world map so the new worlds are placed on it
+5. Prints a summary when done
 """
 
 import asyncio
@@ -39,6 +40,7 @@ async def backfill() -> None:
     from sqlalchemy import text
     from db.database import SessionLocal as AsyncSessionLocal
     from utils.embeddings import generate_embedding, create_proposal_text_for_embedding
+    from utils.map_service import refresh_world_map
 
     async with AsyncSessionLocal() as db:
         # Find worlds without embeddings
@@ -108,6 +110,10 @@ async def backfill() -> None:
                 await db.rollback()
                 failed += 1
 
+        if success:
+            await refresh_world_map(db)
+            await db.commit()
+
         logger.info(
             f"\nDone: {success} succeeded, {failed} failed out of {len(rows)} worlds."
         )
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Run background jobs (media generation, graph updates, X publishing).
+
+Usage:
+    cd platform/backend
+    source .venv/bin/activate
+    python scripts/job_worker.py                           # all queues, JOB_QUEUES limits
+    python scripts/job_worker.py --queues media=4 graph=2  # only these queues
+    python scripts/job_worker.py --once                    # run what's due, then exit
+
+Requires:
+    DATABASE_URL    — PostgreSQL connection string
+
+API processes only enqueue jobs; this process runs them, so request latency
+doesn't depend on media or graph work. Start as many as needed. SIGTERM and
+SIGINT stop claiming new jobs and wait for running ones to finish.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load .env from platform/
+load_dotenv(Path(__file__).parent.parent.parent / ".env")
+
+from jobs.worker import Worker, parse_queues
+from media.generator import close_xai_client
+from storage import close_storage
+from utils.map_service import shutdown_layout_executor
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs from platform_jobs.")
+    parser.add_argument("--queues", nargs="+", help="queue=concurrency (default: every queue, JOB_QUEUES)")
+    parser.add_argument("--once", action="store_true", help="run jobs that are due, then exit")
+    args = parser.parse_args()
+
+    worker = Worker(parse_queues(args.queues) if args.queues else None)
+    try:
+        if args.once:
+            logger.info(f"Ran {await worker.drain()} jobs")
+            return
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+    finally:
+        await close_xai_client()
+        await close_storage()
+        shutdown_layout_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Recompute every agent's activity counters from the source tables.
+
+Usage:
+    cd platform/backend
+    source .venv/bin/activate
+    python scripts/reconcile_activity_counters.py [--batch-size 500]
+
+Requires:
+    DATABASE_URL    — PostgreSQL connection string
+
+platform_user_activity_counters is kept current by the write paths and each
+agent's row is re-derived once it is ACTIVITY_COUNTERS_RECONCILE_HOURS old.
+Run this after bulk changes that bypass the API (world deletes, imports,
+manual SQL) to correct every row at once. Agents are processed in keyset
+batches, one transaction per batch, so re-running is safe.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load .env from platform/
+load_dotenv(Path(__file__).parent.parent.parent / ".env")
+
+from utils.activity_counters import ACTIVITY_COUNTERS_RECONCILE_BATCH, reconcile_all_activity_counters
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    from db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ACTIVITY_COUNTERS_RECONCILE_BATCH,
+        help="Agents recomputed per transaction",
+    )
+    args = parser.parse_args()
+
+    async with SessionLocal() as session:
+        total = await reconcile_all_activity_counters(session, batch_size=args.batch_size)
+    logger.info(f"Reconciled activity counters for {total} agents.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
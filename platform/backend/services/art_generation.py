@@ -6,8 +6,6 @@ Uses XAI Grok Imagine (same pipeline as story covers) and stores in Cloudflare R
 Cost: ~$0.02/image (grok-imagine-image)
 """
 
-import asyncio
-import functools
 import logging
 import uuid
 
@@ -15,7 +13,7 @@ import anthropic
 import os
 
 from media.generator import generate_image
-from storage.r2 import upload_media
+from storage import upload_media
 
 logger = logging.getLogger(__name__)
 
@@ -109,11 +107,7 @@ async def generate_dweller_portrait(
         image_bytes = await generate_image(prompt)
 
         storage_key = f"media/dwellers/{dweller_id}/portrait/{uuid.uuid4()}.png"
-        # upload_media is synchronous (boto3); run in executor to avoid blocking the event loop
-        loop = asyncio.get_running_loop()
-        portrait_url = await loop.run_in_executor(
-            None, functools.partial(upload_media, image_bytes, storage_key, "image/png")
-        )
+        portrait_url = (await upload_media(image_bytes, storage_key, "image/png")).url
 
         logger.info(f"Portrait generated for dweller {dweller_id}: {portrait_url}")
         return portrait_url
@@ -1,3 +1,81 @@
-from .r2 import upload_media, get_public_url, delete_media
+"""Media storage with pluggable backends.
 
-__all__ = ["upload_media", "get_public_url", "delete_media"]
+Backends (MEDIA_STORAGE_BACKEND):
+    r2 (default) — Cloudflare R2 via boto3 on a thread pool
+    local        — files under LOCAL_MEDIA_ROOT (development, tests, benchmarks)
+
+Usage:
+    stored = await upload_media(image_bytes, key, "image/png")
+    stored = await upload_stream(response.aiter_bytes(), key, "video/mp4")
+"""
+
+import logging
+import os
+from collections.abc import AsyncIterable
+
+from .base import MediaStorage, StoredMedia
+from .local import LocalStorage
+from .r2 import R2Storage, get_public_url
+
+logger = logging.getLogger(__name__)
+
+_storage: MediaStorage | None = None
+
+
+def _create_storage() -> MediaStorage:
+    backend = os.getenv("MEDIA_STORAGE_BACKEND", "r2").strip().lower()
+    if backend == "local":
+        return LocalStorage()
+    if backend != "r2":
+        logger.warning(f"Unknown MEDIA_STORAGE_BACKEND={backend!r}; using r2")
+    return R2Storage()
+
+
+def get_storage() -> MediaStorage:
+    """Process-wide storage backend (chosen from the environment on first use)."""
+    global _storage
+    if _storage is None:
+        _storage = _create_storage()
+    return _storage
+
+
+def set_storage(storage: MediaStorage | None) -> None:
+    """Swap the process-wide backend (tests; None re-reads the environment)."""
+    global _storage
+    _storage = storage
+
+
+async def close_storage() -> None:
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
+
+
+async def upload_media(data: bytes, key: str, content_type: str) -> StoredMedia:
+    """Upload media bytes; returns the public URL and size."""
+    return await get_storage().upload(data, key, content_type)
+
+
+async def upload_stream(chunks: AsyncIterable[bytes], key: str, content_type: str) -> StoredMedia:
+    """Upload from an async byte stream without buffering the whole file."""
+    return await get_storage().upload_stream(chunks, key, content_type)
+
+
+async def delete_media(key: str) -> None:
+    await get_storage().delete(key)
+
+
+__all__ = [
+    "MediaStorage",
+    "StoredMedia",
+    "LocalStorage",
+    "R2Storage",
+    "get_storage",
+    "set_storage",
+    "close_storage",
+    "upload_media",
+    "upload_stream",
+    "delete_media",
+    "get_public_url",
+]
@@ -0,0 +1,33 @@
+"""Storage backend interface for generated media."""
+
+from collections.abc import AsyncIterable
+from typing import NamedTuple, Protocol
+
+
+class StoredMedia(NamedTuple):
+    """Where an upload landed and how many bytes it wrote."""
+
+    url: str
+    size: int
+
+
+class MediaStorage(Protocol):
+    """Async object store for media files.
+
+    Implementations must not block the event loop: uploads of large videos run
+    while the same process is serving requests and running other jobs.
+    """
+
+    async def upload(self, data: bytes, key: str, content_type: str) -> StoredMedia: ...
+
+    async def upload_stream(
+        self, chunks: AsyncIterable[bytes], key: str, content_type: str
+    ) -> StoredMedia:
+        """Upload from an async byte stream without holding the whole file in memory."""
+        ...
+
+    async def delete(self, key: str) -> None: ...
+
+    def public_url(self, key: str) -> str: ...
+
+    async def close(self) -> None: ...
@@ -0,0 +1,74 @@
+"""Local filesystem storage for development, tests and benchmarks.
+
+Files go under LOCAL_MEDIA_ROOT, laid out by storage key, and are served from
+LOCAL_MEDIA_PUBLIC_URL (defaults to a file:// URL of the root). Writes run on
+worker threads and land via rename, so readers never see a partial file.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterable
+from pathlib import Path
+
+from .base import StoredMedia
+
+logger = logging.getLogger(__name__)
+
+LOCAL_MEDIA_ROOT = os.getenv("LOCAL_MEDIA_ROOT", "media_storage")
+LOCAL_MEDIA_PUBLIC_URL = os.getenv("LOCAL_MEDIA_PUBLIC_URL", "")
+
+
+class LocalStorage:
+    """Directory on disk behind the async MediaStorage interface."""
+
+    def __init__(self, root: str | Path = LOCAL_MEDIA_ROOT, public_base_url: str = LOCAL_MEDIA_PUBLIC_URL):
+        self.root = Path(root).resolve()
+        self.public_base_url = (public_base_url or self.root.as_uri()).rstrip("/")
+
+    def path_for(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Storage key escapes the media root: {key!r}")
+        return path
+
+    def public_url(self, key: str) -> str:
+        return f"{self.public_base_url}/{key}"
+
+    async def upload(self, data: bytes, key: str, content_type: str) -> StoredMedia:
+        async def one_chunk():
+            yield data
+
+        return await self.upload_stream(one_chunk(), key, content_type)
+
+    async def upload_stream(
+        self, chunks: AsyncIterable[bytes], key: str, content_type: str
+    ) -> StoredMedia:
+        path = self.path_for(key)
+        partial = path.with_name(f"{path.name}.partial")
+
+        def open_partial():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return open(partial, "wb")
+
+        f = await asyncio.to_thread(open_partial)
+        size = 0
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                size += len(chunk)
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(os.replace, partial, path)
+        except BaseException:
+            f.close()
+            partial.unlink(missing_ok=True)
+            raise
+
+        logger.info(f"Stored {size} bytes locally: {key}")
+        return StoredMedia(self.public_url(key), size)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.path_for(key).unlink, missing_ok=True)
+
+    async def close(self) -> None:
+        pass
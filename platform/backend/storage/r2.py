@@ -2,14 +2,31 @@
 
 Uses boto3 S3-compatible API to upload/download from Cloudflare R2.
 Zero egress fees make this ideal for serving media publicly.
+
+boto3 is synchronous, so every call runs on a dedicated thread pool sized to
+the client's connection pool; the event loop only awaits the result. One
+client is built per R2Storage and reused (boto3 clients are thread-safe), so
+uploads share pooled TLS connections instead of paying client construction
+and a handshake each time.
+
+upload_stream() sends anything larger than one part as a multipart upload,
+holding at most one part (R2_MULTIPART_PART_SIZE) in memory.
 """
 
+import asyncio
+import functools
 import logging
 import os
+import threading
+from collections.abc import AsyncIterable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 
 import boto3
 from botocore.config import Config
 
+from .base import StoredMedia
+
 logger = logging.getLogger(__name__)
 
 R2_ACCOUNT_ID = os.getenv("R2_ACCOUNT_ID", "")
@@ -18,8 +35,20 @@ R2_SECRET_ACCESS_KEY = os.getenv("R2_SECRET_ACCESS_KEY", "")
 R2_BUCKET_NAME = os.getenv("R2_BUCKET_NAME", "deep-sci-fi-media")
 R2_PUBLIC_URL = os.getenv("R2_PUBLIC_URL", "https://media.deep-sci-fi.world")
 
+# Concurrent R2 calls per process (threads and pooled connections)
+R2_MAX_CONCURRENCY = int(os.getenv("R2_MAX_CONCURRENCY", "8"))
+# R2 requires every part but the last to be the same size, and >= 5 MiB
+R2_MULTIPART_PART_SIZE = max(int(os.getenv("R2_MULTIPART_PART_SIZE", str(5 * 1024 * 1024))), 5 * 1024 * 1024)
+
+T = TypeVar("T")
+
+
+def get_public_url(key: str) -> str:
+    """Construct the public CDN URL for a storage key."""
+    return f"{R2_PUBLIC_URL.rstrip('/')}/{key}"
 
-def _get_client():
+
+def _create_client(max_connections: int) -> Any:
     """Create a boto3 S3 client configured for Cloudflare R2."""
     return boto3.client(
         "s3",
@@ -29,40 +58,127 @@ def _get_client():
         config=Config(
             retries={"max_attempts": 3, "mode": "adaptive"},
             signature_version="s3v4",
+            max_pool_connections=max_connections,
         ),
         region_name="auto",
     )
 
 
-def upload_media(data: bytes, key: str, content_type: str) -> str:
-    """Upload media bytes to R2 and return the public URL.
+class R2Storage:
+    """R2 bucket behind the async MediaStorage interface."""
 
-    Args:
-        data: Raw file bytes
-        key: Storage key (e.g., media/world/{id}/cover_image/{uuid}.png)
-        content_type: MIME type (e.g., image/png, video/mp4)
+    def __init__(
+        self,
+        bucket: str = R2_BUCKET_NAME,
+        max_concurrency: int = R2_MAX_CONCURRENCY,
+        part_size: int = R2_MULTIPART_PART_SIZE,
+        client: Any = None,
+    ):
+        self.bucket = bucket
+        self.part_size = part_size
+        self._max_concurrency = max_concurrency
+        self._client = client
+        self._client_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="r2")
 
-    Returns:
-        Public URL for the uploaded file
-    """
-    client = _get_client()
-    client.put_object(
-        Bucket=R2_BUCKET_NAME,
-        Key=key,
-        Body=data,
-        ContentType=content_type,
-    )
-    logger.info(f"Uploaded {len(data)} bytes to R2: {key}")
-    return get_public_url(key)
+    def _get_client(self) -> Any:
+        # Built lazily on a pool thread: client construction loads botocore
+        # service models, which is too slow for the event loop
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = _create_client(self._max_concurrency)
+        return self._client
 
+    async def _call(self, method: str, **kwargs: Any) -> Any:
+        def run() -> Any:
+            return getattr(self._get_client(), method)(**kwargs)
 
-def get_public_url(key: str) -> str:
-    """Construct the public CDN URL for a storage key."""
-    return f"{R2_PUBLIC_URL.rstrip('/')}/{key}"
+        return await self._run(run)
+
+    async def _run(self, fn: Callable[[], T]) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn)
+
+    def public_url(self, key: str) -> str:
+        return get_public_url(key)
+
+    async def upload(self, data: bytes, key: str, content_type: str) -> StoredMedia:
+        """Upload media bytes to R2 and return the public URL and size.
+
+        Args:
+            data: Raw file bytes
+            key: Storage key (e.g., media/world/{id}/cover_image/{uuid}.png)
+            content_type: MIME type (e.g., image/png, video/mp4)
+        """
+        await self._call("put_object", Bucket=self.bucket, Key=key, Body=data, ContentType=content_type)
+        logger.info(f"Uploaded {len(data)} bytes to R2: {key}")
+        return StoredMedia(self.public_url(key), len(data))
+
+    async def upload_stream(
+        self, chunks: AsyncIterable[bytes], key: str, content_type: str
+    ) -> StoredMedia:
+        """Upload from an async byte stream, as a multipart upload past one part."""
+        buffer = bytearray()
+        upload_id: str | None = None
+        parts: list[dict[str, Any]] = []
+        size = 0
+
+        async def send_part(data: bytes) -> None:
+            response = await self._call(
+                "upload_part",
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                PartNumber=len(parts) + 1, Body=data,
+            )
+            parts.append({"PartNumber": len(parts) + 1, "ETag": response["ETag"]})
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                while len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        created = await self._call(
+                            "create_multipart_upload", Bucket=self.bucket, Key=key, ContentType=content_type
+                        )
+                        upload_id = created["UploadId"]
+                    part = bytes(buffer[:self.part_size])
+                    del buffer[:self.part_size]
+                    await send_part(part)
+
+            if upload_id is None:
+                # Fits in one part: a plain PUT is one round trip instead of three
+                await self._call(
+                    "put_object", Bucket=self.bucket, Key=key, Body=bytes(buffer), ContentType=content_type
+                )
+            else:
+                if buffer or not parts:
+                    await send_part(bytes(buffer))
+                await self._call(
+                    "complete_multipart_upload",
+                    Bucket=self.bucket, Key=key, UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            if upload_id is not None:
+                # Unfinished parts are billed storage until aborted
+                try:
+                    await asyncio.shield(self._call(
+                        "abort_multipart_upload", Bucket=self.bucket, Key=key, UploadId=upload_id
+                    ))
+                except Exception:
+                    logger.exception(f"Failed to abort multipart upload {upload_id} for {key}")
+            raise
+
+        logger.info(f"Uploaded {size} bytes to R2 in {max(len(parts), 1)} part(s): {key}")
+        return StoredMedia(self.public_url(key), size)
 
+    async def delete(self, key: str) -> None:
+        """Delete a media file from R2."""
+        await self._call("delete_object", Bucket=self.bucket, Key=key)
+        logger.info(f"Deleted from R2: {key}")
 
-def delete_media(key: str) -> None:
-    """Delete a media file from R2."""
-    client = _get_client()
-    client.delete_object(Bucket=R2_BUCKET_NAME, Key=key)
-    logger.info(f"Deleted from R2: {key}")
+    async def close(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True)
+        )
@@ -178,6 +178,15 @@ async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
     db_database_module.SessionLocal = session_factory
     db_module.SessionLocal = session_factory
 
+    # Each test gets a fresh database, so pages cached by an earlier test are stale
+    from utils.feed_cache import set_feed_cache
+    set_feed_cache(None)
+    # Deterministic API keys repeat across tests, so cached principals are too
+    from utils.principal import reset_principal_cache
+    reset_principal_cache()
+    from utils.agent_context_cache import reset_agent_context_cache
+    reset_agent_context_cache()
+
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
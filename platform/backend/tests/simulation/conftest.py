@@ -96,10 +96,12 @@ os.environ["DEDUP_WINDOW_OVERRIDE_SECONDS"] = "0"
 os.environ["DST_SIMULATION"] = "true"
 # DO NOT set DSF_TEST_MODE_ENABLED — no self-validation shortcuts
 
-# Force reimport after env setup
+# Force reimport after env setup. Packages go too, not just their submodules:
+# api/__init__.py re-exports the routers, so a surviving `api` package would
+# hand main the handlers bound to the pre-simulation clock.
 import sys
 for mod_name in list(sys.modules.keys()):
-    if mod_name.startswith(("main", "api.", "db.", "utils.", "middleware.", "guidance", "media.", "storage.")):
+    if mod_name.split(".")[0] in ("main", "api", "db", "utils", "middleware", "guidance", "media", "storage", "jobs"):
         del sys.modules[mod_name]
 
 from db.database import Base
@@ -208,6 +210,11 @@ def create_dst_engine_and_client():
         db_module.SessionLocal = original_session_local
         reset_clock()
         reset_simulation()
+        # Seeded runs regenerate the same API keys against a fresh database
+        from utils.principal import reset_principal_cache
+        reset_principal_cache()
+        from utils.agent_context_cache import reset_agent_context_cache
+        reset_agent_context_cache()
         # Teardown DB inside the same portal/event loop
         try:
             client.portal.call(_teardown_db, engine)
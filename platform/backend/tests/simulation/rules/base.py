@@ -3,6 +3,7 @@
 All domain-specific rule mixins inherit from this.
 """
 
+import json
 from datetime import timedelta
 
 from hypothesis import strategies as st
@@ -25,6 +26,25 @@ TIME_JUMPS = [
 ]
 
 
+def parse_sse_feed(text: str) -> dict:
+    """Parse a /api/feed/stream response into {"items": [...], "next_cursor": ...}."""
+    items = []
+    next_cursor = None
+    for chunk in text.split("\n\n"):
+        event_name = None
+        event_data = None
+        for line in chunk.strip().split("\n"):
+            if line.startswith("event:"):
+                event_name = line[6:].strip()
+            elif line.startswith("data:"):
+                event_data = json.loads(line[5:].strip())
+        if event_name == "feed_items" and event_data:
+            items.extend(event_data.get("items", []))
+        elif event_name == "feed_complete" and event_data:
+            next_cursor = event_data.get("next_cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+
 class DeepSciFiBaseRules(RuleBasedStateMachine):
     """Base state machine with setup, helpers, and time advancement."""
 
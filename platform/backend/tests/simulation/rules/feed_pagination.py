@@ -9,14 +9,38 @@ These tests verify:
 3. No item ID overlap between pages
 4. Chronological ordering preserved across pages (intra-page and cross-page)
 5. Edge case: cursor past all results returns 200 with empty items
-6. Cursor is a valid ISO timestamp
+6. Cursor is an opaque token the server decodes back to a feed position
+7. Completeness: paging while activity is being written serves every item
+   that existed when paging started, exactly once
 """
 
 from datetime import datetime
 
 from hypothesis.stateful import rule
 
+from main import app
+from tests.simulation import strategies as strat
+from tests.simulation.concurrent import run_concurrent_requests
 from tests.simulation.rules.base import parse_sse_feed
+from utils.activity_events import decode_cursor
+
+# Safety valve for the completeness walk; a 30-step run stays far below this.
+MAX_FEED_PAGES = 200
+
+
+def _feed_item_keys(item: dict) -> list[tuple]:
+    """Identity of the activity an item shows.
+
+    Conversations and activity groups fold several actions into one item, and
+    where a page boundary splits them depends on the page size, so they are
+    keyed per action. Grouped feedback resolutions only surface their newest
+    member, so they are keyed by reviewer and content.
+    """
+    if item["type"] in ("conversation", "activity_group"):
+        return [("dweller_action", action["id"]) for action in item["actions"]]
+    if item["type"] == "feedback_resolved":
+        return [("feedback_resolved", item["reviewer_id"], item["content_id"])]
+    return [(item["type"], item["id"])]
 
 
 class FeedPaginationRulesMixin:
@@ -127,7 +151,7 @@ class FeedPaginationRulesMixin:
 
     @rule()
     def feed_pagination_cursor_format(self):
-        """Cursor returned by feed is a valid ISO timestamp."""
+        """Cursor returned by feed decodes to a (timestamp, event id) position."""
         resp = self.client.get("/api/feed/stream?limit=5")
         self._track_response(resp, "feed cursor format")
 
@@ -141,8 +165,81 @@ class FeedPaginationRulesMixin:
             return  # No cursor when fewer than limit items exist
 
         try:
-            datetime.fromisoformat(cursor.replace("Z", "+00:00"))
+            _, event_id = decode_cursor(cursor)
         except (ValueError, AttributeError):
-            raise AssertionError(
-                f"Feed cursor is not a valid ISO timestamp: {cursor}"
+            raise AssertionError(f"Feed cursor is not a valid feed position: {cursor}")
+        assert event_id is not None, (
+            f"Feed cursor {cursor} is timestamp-only; items sharing that timestamp would be skipped"
+        )
+
+    @rule()
+    def feed_pagination_complete_under_concurrent_inserts(self):
+        """Paging while new activity lands never skips or repeats older items.
+
+        Takes a snapshot of the whole feed, then pages through it again two
+        items at a time while an agent registration (a new feed event) runs
+        concurrently with every page request. New events are newer than any
+        cursor handed out, so every snapshot item must still be served, and
+        no event may be served twice.
+        """
+        snapshot = self._walk_feed(limit=50)
+        if snapshot is None:
+            return
+
+        served: list[tuple] = []
+        cursor = None
+        for page in range(MAX_FEED_PAGES):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            resp, write = self.client.portal.call(
+                run_concurrent_requests,
+                app,
+                [
+                    {"method": "GET", "url": "/api/feed/stream", "params": params},
+                    {"method": "POST", "url": "/api/auth/agent", "json": strat.agent_registration_data()},
+                ],
             )
+            self._track_response(resp, f"feed page {page} during inserts")
+            self._track_response(write, "register agent during feed paging")
+            if resp.status_code != 200:
+                return
+
+            data = parse_sse_feed(resp.text)
+            for item in data["items"]:
+                served.extend(_feed_item_keys(item))
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        else:
+            return
+
+        per_event = [key for key in served if key[0] != "feedback_resolved"]
+        duplicates = {key for key in per_event if per_event.count(key) > 1}
+        assert not duplicates, f"Feed served the same activity on more than one page: {duplicates}"
+
+        missing = snapshot - set(served)
+        assert not missing, (
+            f"Feed pagination skipped {len(missing)} item(s) that existed before paging "
+            f"started: {sorted(missing)[:5]}"
+        )
+
+    def _walk_feed(self, limit: int) -> set[tuple] | None:
+        """Keys of every item in the feed, or None if the walk could not finish."""
+        keys: set[tuple] = set()
+        cursor = None
+        for page in range(MAX_FEED_PAGES):
+            params = {"limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            resp = self.client.get("/api/feed/stream", params=params)
+            self._track_response(resp, f"feed snapshot page {page}")
+            if resp.status_code != 200:
+                return None
+            data = parse_sse_feed(resp.text)
+            for item in data["items"]:
+                keys.update(_feed_item_keys(item))
+            cursor = data["next_cursor"]
+            if not cursor:
+                return keys
+        return None
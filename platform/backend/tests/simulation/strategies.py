@@ -557,12 +557,22 @@ def dweller_proposal_validation_data(verdict: str = "approve") -> dict:
     return base
 
 
+def agent_registration_data() -> dict:
+    n = _next_id()
+    return {
+        "name": f"DST Late Agent {n}",
+        "username": f"dst-late-agent-{n}",
+        "description": f"Agent {n} registered mid-simulation",
+    }
+
+
 # ---------------------------------------------------------------------------
 # Schema registry: maps generator -> (module_path, Pydantic model name)
 # Used by conftest.py to detect schema drift at test startup.
 # ---------------------------------------------------------------------------
 
 STRATEGY_SCHEMA_MAP = {
+    "agent_registration_data": ("api.auth", "AgentRegistrationRequest"),
     "proposal_data": ("api.proposals", "ProposalCreateRequest"),
     "validation_data": ("api.proposals", "ValidationCreateRequest"),
     "region_data": ("api.dwellers", "RegionCreateRequest"),
@@ -0,0 +1,244 @@
+"""Tests for per-agent activity counters (utils/activity_counters.py).
+
+Tests:
+1. First read computes the row from the source tables
+2. Bumps accumulate; reconcile restores the source counts
+3. A row due for reconciliation queues one reconcile job
+4. Completion tracking reads the row in a single statement
+5. Story, review and response keep heartbeat counts current for both agents
+"""
+
+import os
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import SAMPLE_CAUSAL_CHAIN, approve_proposal
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+@requires_postgres
+class TestActivityCounters:
+
+    @pytest.fixture
+    async def agent_with_actions(self, db_session):
+        """An agent with one dweller and three actions, one escalation-eligible."""
+        from db.models import User, UserType, World, Dweller, DwellerAction
+
+        user = User(type=UserType.AGENT, username=f"counters-{uuid4().hex[:8]}", name="Counter Agent")
+        db_session.add(user)
+        await db_session.flush()
+
+        world = World(
+            name="Counter World",
+            premise="A world for testing activity counters " * 5,
+            scientific_basis="Based on science " * 10,
+            year_setting=2100,
+            created_by=user.id,
+            regions=[{"name": "Test Quarter"}],
+        )
+        db_session.add(world)
+        await db_session.flush()
+
+        dweller = Dweller(
+            world_id=world.id,
+            created_by=user.id,
+            name="Counter Dweller",
+            origin_region="Test Quarter",
+            generation="First-gen",
+            name_context="Named in the test quarter",
+            cultural_identity="Test Quarter native",
+            age=30,
+            role="Record keeper",
+            personality="Meticulous and patient " * 5,
+            background="Keeps the quarter's ledgers " * 5,
+        )
+        db_session.add(dweller)
+        await db_session.flush()
+
+        for importance in (0.2, 0.5, 0.9):
+            db_session.add(DwellerAction(
+                dweller_id=dweller.id,
+                world_id=world.id,
+                actor_id=user.id,
+                action_type="observe",
+                content="Counts the crates arriving at the quay",
+                importance=importance,
+                escalation_eligible=importance >= 0.8,
+            ))
+        await db_session.flush()
+        return user
+
+    @pytest.mark.asyncio
+    async def test_first_read_computes_from_sources(self, db_session, agent_with_actions):
+        from utils.activity_counters import get_activity_counters
+
+        counts = await get_activity_counters(db_session, agent_with_actions.id)
+
+        assert counts["dwellers_created"] == 1
+        assert counts["actions_taken"] == 3
+        assert counts["escalation_eligible_actions"] == 1
+        assert counts["stories_written"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reconcile_corrects_drift(self, db_session, agent_with_actions):
+        from utils.activity_counters import (
+            bump_activity_counters, get_activity_counters, reconcile_activity_counters,
+        )
+
+        user_id = agent_with_actions.id
+        await get_activity_counters(db_session, user_id)
+        await bump_activity_counters(db_session, user_id, actions_taken=2, stories_written=-1)
+
+        drifted = await get_activity_counters(db_session, user_id)
+        assert drifted["actions_taken"] == 5
+        assert drifted["stories_written"] == 0  # never below zero
+
+        assert await reconcile_activity_counters(db_session, [user_id]) == 1
+        assert (await get_activity_counters(db_session, user_id))["actions_taken"] == 3
+
+    @pytest.mark.asyncio
+    async def test_due_row_queues_one_reconcile_job(self, db_session, agent_with_actions):
+        from sqlalchemy import func, select, update
+        from db.models import Job, UserActivityCounters
+        from jobs import ReconcileActivityCounters
+        from utils.activity_counters import ACTIVITY_COUNTERS_RECONCILE_HOURS, get_activity_counters
+        from utils.clock import now as utc_now
+
+        user_id = agent_with_actions.id
+        await get_activity_counters(db_session, user_id)
+        jobs = select(func.count(Job.id)).where(Job.kind == ReconcileActivityCounters.kind)
+        assert await db_session.scalar(jobs) == 0
+
+        await db_session.execute(
+            update(UserActivityCounters)
+            .where(UserActivityCounters.user_id == user_id)
+            .values(reconciled_at=utc_now() - timedelta(hours=ACTIVITY_COUNTERS_RECONCILE_HOURS + 1))
+        )
+        await get_activity_counters(db_session, user_id)
+        await get_activity_counters(db_session, user_id)
+        assert await db_session.scalar(jobs) == 1
+
+    @pytest.mark.asyncio
+    async def test_completion_tracking_is_one_statement(self, db_session, db_engine, agent_with_actions):
+        from sqlalchemy import event
+        from utils.activity_counters import get_activity_counters
+        from utils.progression import build_completion_tracking
+
+        await get_activity_counters(db_session, agent_with_actions.id)
+
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            completion = await build_completion_tracking(db_session, agent_with_actions.id)
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", count)
+
+        assert len(statements) == 1
+        assert "never_written_story" in completion["never_done"]
+        assert "never_taken_action" not in completion["never_done"]
+
+
+STORY_CONTENT = (
+    "The ledgers arrived at dawn, salt-stained from the crossing. Ines counted every crate "
+    "twice, because the quay had learned the hard way that fusion made energy cheap but never "
+    "made people honest. By noon the numbers matched, and for the first time in a decade the "
+    "harbourmaster signed the manifest without a second look at the seals or the clerks."
+)
+
+REVIEW = {
+    "recommend_acclaim": True,
+    "improvements": ["Add more detail"],
+    "canon_notes": "Canon is consistent with the world's established timeline and technology",
+    "event_notes": "Events are accurate and match world history as established",
+    "style_notes": "Style is good with consistent voice and perspective throughout",
+}
+
+
+@requires_postgres
+class TestActivityCountersAPI:
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_counts_follow_reviews(self, client: AsyncClient) -> None:
+        """Story, review and response keep both agents' heartbeat counts current."""
+        keys = []
+        for role in ("author", "reviewer"):
+            response = await client.post(
+                "/api/auth/agent",
+                json={"name": f"Counter {role}", "username": f"counter-{role}-{uuid4().hex[:8]}"},
+            )
+            keys.append(response.json()["api_key"]["key"])
+        author_key, reviewer_key = keys
+
+        response = await client.post(
+            "/api/proposals",
+            headers={"X-API-Key": author_key},
+            json={
+                "name": "Counter Harbour",
+                "premise": "A harbour city where fusion made shipping cheap and ledgers honest",
+                "year_setting": 2090,
+                "causal_chain": SAMPLE_CAUSAL_CHAIN,
+                "scientific_basis": (
+                    "Based on current fusion research progress from ITER and private companies. "
+                    "Cost curves follow historical patterns of energy technology deployment."
+                ),
+                "image_prompt": (
+                    "Cinematic wide shot of a futuristic harbour at golden hour. "
+                    "Advanced technological infrastructure with dramatic lighting. "
+                    "Photorealistic, sense of scale and scientific wonder."
+                ),
+            },
+        )
+        assert response.status_code == 200, response.json()
+        world_id = (await approve_proposal(client, response.json()["id"], author_key))["world_created"]["id"]
+
+        async def counts(key: str) -> dict:
+            response = await client.get("/api/heartbeat", headers={"X-API-Key": key})
+            assert response.status_code == 200, response.json()
+            return response.json()["completion"]["counts"]
+
+        assert (await counts(author_key))["worlds_proposed"] == 1
+
+        response = await client.post(
+            "/api/stories",
+            headers={"X-API-Key": author_key},
+            json={
+                "world_id": world_id,
+                "title": "The Honest Ledger",
+                "content": STORY_CONTENT,
+                "perspective": "first_person_agent",
+                "video_prompt": (
+                    "Slow dolly along a salt-stained quay at dawn as a clerk counts crates "
+                    "beneath humming fusion-lit cranes."
+                ),
+            },
+        )
+        assert response.status_code == 200, response.json()
+        story_id = response.json()["story"]["id"]
+        assert (await counts(author_key))["stories_written"] == 1
+
+        response = await client.post(
+            f"/api/stories/{story_id}/review", headers={"X-API-Key": reviewer_key}, json=REVIEW
+        )
+        assert response.status_code == 200, response.json()
+        review_id = response.json()["review"]["id"]
+        assert (await counts(author_key))["unresponded_reviews"] == 1
+        assert (await counts(reviewer_key))["stories_reviewed"] == 1
+
+        response = await client.post(
+            f"/api/stories/{story_id}/reviews/{review_id}/respond",
+            headers={"X-API-Key": author_key},
+            json={"response": "Thank you for the feedback! I've added more detail to the quay scene."},
+        )
+        assert response.status_code == 200, response.json()
+        assert (await counts(author_key))["unresponded_reviews"] == 0
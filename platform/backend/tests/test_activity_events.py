@@ -0,0 +1,246 @@
+"""Tests for the activity event log behind the feed (utils/activity_events.py).
+
+Covers:
+1. Write paths append events that the feed serves
+2. Composite cursor pagination visits every event exactly once, including
+   events sharing a timestamp and events written between pages
+3. Replies fold into conversations and solo actions into activity groups
+4. Mutable fields (world counts, proposal status) are read live
+5. The backfill script loads history once and is safe to re-run
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db import ActivityEvent
+from tests.conftest import approve_proposal
+from utils.activity_events import decode_cursor, encode_cursor, read_feed_page
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+BASE_TIME = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _agent_event(at: datetime) -> ActivityEvent:
+    user_id = uuid4()
+    return ActivityEvent(
+        event_type="agent_registered",
+        sort_date=at,
+        subject_id=user_id,
+        actor_id=user_id,
+        payload={
+            "type": "agent_registered",
+            "id": str(user_id),
+            "created_at": at.isoformat(),
+            "agent": {"id": str(user_id), "username": "@agent", "name": "Agent"},
+        },
+    )
+
+
+def _action_event(at: datetime, dweller_id: str, in_reply_to: str | None = None) -> ActivityEvent:
+    action_id = uuid4()
+    return ActivityEvent(
+        event_type="dweller_action",
+        sort_date=at,
+        subject_id=action_id,
+        payload={
+            "type": "dweller_action",
+            "id": str(action_id),
+            "created_at": at.isoformat(),
+            "action": {
+                "type": "speak",
+                "content": "Hello",
+                "dialogue": None,
+                "stage_direction": None,
+                "target": None,
+                "in_reply_to": in_reply_to,
+            },
+            "dweller": {"id": dweller_id, "name": "Kai", "role": "Engineer", "portrait_url": None},
+            "world": {"id": str(uuid4()), "name": "World", "year_setting": 2060},
+            "agent": None,
+        },
+    )
+
+
+async def _walk_feed(db: AsyncSession, limit: int, cursor=None) -> list[dict]:
+    items: list[dict] = []
+    while True:
+        page = await read_feed_page(db, cursor, limit)
+        items.extend(page["items"])
+        if page["next_cursor"] is None:
+            return items
+        cursor = decode_cursor(page["next_cursor"])
+
+
+@requires_postgres
+class TestReadFeedPage:
+
+    async def test_pagination_visits_every_event_once(self, db_session: AsyncSession) -> None:
+        # Pairs of events share a timestamp so a page boundary lands on a tie
+        events = [_agent_event(BASE_TIME - timedelta(minutes=i // 2)) for i in range(25)]
+        db_session.add_all(events)
+        await db_session.flush()
+
+        items = await _walk_feed(db_session, limit=4)
+
+        ids = [item["id"] for item in items]
+        assert sorted(ids) == sorted(str(event.subject_id) for event in events)
+        assert len(ids) == len(set(ids))
+        sort_dates = [item["sort_date"] for item in items]
+        assert sort_dates == sorted(sort_dates, reverse=True)
+
+    async def test_events_written_between_pages_do_not_shift_pages(
+        self, db_session: AsyncSession
+    ) -> None:
+        events = [_agent_event(BASE_TIME) for _ in range(6)]
+        db_session.add_all(events)
+        await db_session.flush()
+
+        first = await read_feed_page(db_session, None, 3)
+        # Written mid-pagination, including at the instant the cursor sits on
+        db_session.add_all([_agent_event(BASE_TIME), _agent_event(BASE_TIME + timedelta(seconds=1))])
+        await db_session.flush()
+        rest = await _walk_feed(db_session, 3, decode_cursor(first["next_cursor"]))
+
+        seen = [item["id"] for item in first["items"] + rest]
+        assert len(seen) == len(set(seen))
+        assert {str(event.subject_id) for event in events} <= set(seen)
+
+    async def test_legacy_timestamp_cursor(self, db_session: AsyncSession) -> None:
+        old = _agent_event(BASE_TIME - timedelta(hours=1))
+        db_session.add_all([_agent_event(BASE_TIME), old])
+        await db_session.flush()
+
+        page = await read_feed_page(db_session, decode_cursor(BASE_TIME.isoformat()), 20)
+
+        assert [item["id"] for item in page["items"]] == [str(old.subject_id)]
+
+    def test_cursor_round_trip(self) -> None:
+        event_id = uuid4()
+        assert decode_cursor(encode_cursor(BASE_TIME, event_id)) == (BASE_TIME, event_id)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    async def test_empty_log(self, db_session: AsyncSession) -> None:
+        assert await read_feed_page(db_session, None, 20) == {"items": [], "next_cursor": None}
+
+    async def test_replies_fold_into_conversation(self, db_session: AsyncSession) -> None:
+        kai, ana = str(uuid4()), str(uuid4())
+        root = _action_event(BASE_TIME, kai)
+        reply = _action_event(BASE_TIME + timedelta(minutes=5), ana, in_reply_to=str(root.subject_id))
+        answer = _action_event(BASE_TIME + timedelta(minutes=9), kai, in_reply_to=str(reply.subject_id))
+        db_session.add_all([root, reply, answer])
+        await db_session.flush()
+
+        page = await read_feed_page(db_session, None, 20)
+
+        assert len(page["items"]) == 1
+        conversation = page["items"][0]
+        assert conversation["type"] == "conversation"
+        assert conversation["action_count"] == 3
+        assert [a["id"] for a in conversation["actions"]] == [
+            str(root.subject_id), str(reply.subject_id), str(answer.subject_id)
+        ]
+
+    async def test_solo_actions_group_within_window(self, db_session: AsyncSession) -> None:
+        kai = str(uuid4())
+        db_session.add_all([
+            _action_event(BASE_TIME, kai),
+            _action_event(BASE_TIME + timedelta(minutes=10), kai),
+            _action_event(BASE_TIME + timedelta(minutes=20), kai),
+            # Outside the window of the group above
+            _action_event(BASE_TIME - timedelta(hours=2), kai),
+        ])
+        await db_session.flush()
+
+        page = await read_feed_page(db_session, None, 20)
+
+        assert [item["type"] for item in page["items"]] == ["activity_group", "dweller_action"]
+        assert page["items"][0]["action_count"] == 3
+
+
+@requires_postgres
+class TestWritePaths:
+
+    async def test_registration_and_graduation_are_logged(
+        self, client: AsyncClient, test_agent: dict
+    ) -> None:
+        from tests.test_e2e_feed import SAMPLE_CAUSAL_CHAIN
+
+        response = await client.post(
+            "/api/proposals",
+            headers={"X-API-Key": test_agent["api_key"]},
+            json={
+                "name": "Activity Log World",
+                "premise": "Desalination megaplants turn the Sahara coast into an agricultural belt by mid-century",
+                "year_setting": 2065,
+                "causal_chain": SAMPLE_CAUSAL_CHAIN,
+                "scientific_basis": (
+                    "Reverse osmosis energy costs and solar deployment curves make coastal "
+                    "desalination for irrigation viable at continental scale within decades."
+                ),
+                "image_prompt": (
+                    "Cinematic wide shot of green fields meeting desert dunes beside a vast "
+                    "desalination plant. Photorealistic, golden hour, sense of scale."
+                ),
+            },
+        )
+        assert response.status_code == 200, response.json()
+        world = await approve_proposal(client, response.json()["id"], test_agent["api_key"])
+        world_id = world["world_created"]["id"]
+
+        feed = (await client.get("/api/feed")).json()
+        types = {item["type"] for item in feed["items"]}
+        assert {"agent_registered", "proposal_submitted", "world_created"} <= types
+
+        # Counts on the world card are read live, not frozen at creation
+        world_items = [i for i in feed["items"] if i["type"] == "world_created"]
+        assert world_items[0]["world"]["id"] == world_id
+        proposal_items = [i for i in feed["items"] if i["type"] == "proposal_submitted"]
+        assert proposal_items[0]["proposal"]["status"] == "approved"
+
+
+@requires_postgres
+class TestFeedCursorParam:
+
+    async def test_invalid_cursor_is_rejected(self, client: AsyncClient) -> None:
+        response = await client.get("/api/feed?cursor=not-a-cursor")
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "Invalid cursor"
+
+
+@requires_postgres
+class TestBackfill:
+
+    async def test_backfill_is_idempotent(
+        self, client: AsyncClient, db_engine, test_agent: dict
+    ) -> None:
+        from scripts.backfill_activity_events import backfill_activity_events
+
+        session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            live = (await session.execute(
+                select(ActivityEvent.event_type, ActivityEvent.subject_id, ActivityEvent.sort_date)
+            )).all()
+            assert live, "registration should have written an event"
+            # Simulate history written before the log existed
+            await session.execute(delete(ActivityEvent))
+            await session.commit()
+
+        first = await backfill_activity_events(session_factory)
+        second = await backfill_activity_events(session_factory, before=datetime.now(timezone.utc))
+
+        assert first["agents"] == 1
+        assert sum(second.values()) == 0
+        async with session_factory() as session:
+            assert await session.scalar(select(func.count(ActivityEvent.id))) == sum(first.values())
@@ -0,0 +1,342 @@
+"""Tests for _agent_context injection (middleware/agent_context.py).
+
+Covers:
+1. Contexts are cached per user and dropped by invalidation and TTL; a
+   context built across an invalidation is never stored
+2. A warm context costs no builder queries
+3. Writes that touch another agent's context invalidate it; feedback on any
+   content type (including aspects) is named in action_required
+4. The X-Agent-Context opt-out header and the /act endpoint switch
+5. Injection splices into small JSON objects; streaming and large responses
+   pass through untouched
+"""
+
+import json
+import os
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from db.models import Proposal, ProposalStatus, ReviewSystemType
+from middleware.agent_context import AgentContextMiddleware
+from utils.agent_context_cache import AgentContextCache, get_agent_context_cache
+from utils.clock import SimulatedClock, reset_clock, set_clock
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+class _ReviewQueries:
+    """Counts statements against platform_review_feedback (only the builder reads it on /auth/me)."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.count = 0
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if "platform_review_feedback" in statement:
+            self.count += 1
+
+    def __enter__(self) -> "_ReviewQueries":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+class TestAgentContextCache:
+
+    def teardown_method(self) -> None:
+        reset_clock()
+
+    def test_user_invalidation(self) -> None:
+        cache = AgentContextCache()
+        alice, bob = uuid4(), uuid4()
+        cache.put(alice, cache.generation, {"action_required": []})
+        cache.put(bob, cache.generation, {"action_required": []})
+
+        cache.invalidate(alice)
+
+        assert cache.get(alice) is None
+        assert cache.get(bob) is not None
+
+    def test_context_built_across_user_invalidation_is_not_stored(self) -> None:
+        cache = AgentContextCache()
+        alice, bob = uuid4(), uuid4()
+        generation = cache.generation  # builds start
+
+        cache.invalidate(alice)  # a write lands mid-build
+
+        cache.put(alice, generation, {"stale": True})
+        cache.put(bob, generation, {"stale": False})
+        assert cache.get(alice) is None
+        assert cache.get(bob) == {"stale": False}
+
+        cache.put(alice, cache.generation, {"stale": False})
+        assert cache.get(alice) == {"stale": False}
+
+    def test_forgotten_invalidations_stay_conservative(self) -> None:
+        cache = AgentContextCache(max_entries=1)
+        alice, bob = uuid4(), uuid4()
+        generation = cache.generation
+
+        cache.invalidate(alice)
+        cache.invalidate(bob)  # evicts alice's invalidation record
+
+        cache.put(alice, generation, {})
+        assert cache.get(alice) is None
+
+    def test_generation_bump_drops_everyone(self) -> None:
+        cache = AgentContextCache()
+        user_id = uuid4()
+        generation = cache.generation
+        cache.put(user_id, generation, {})
+
+        cache.invalidate()
+
+        assert cache.get(user_id) is None
+        # A context built before the bump is not stored afterwards
+        cache.put(user_id, generation, {})
+        assert cache.get(user_id) is None
+
+    def test_entries_expire_after_ttl(self) -> None:
+        clock = SimulatedClock()
+        set_clock(clock)
+        cache = AgentContextCache(ttl_seconds=60)
+        user_id = uuid4()
+        cache.put(user_id, cache.generation, {})
+
+        clock.advance(seconds=61)
+
+        assert cache.get(user_id) is None
+
+    def test_act_endpoint_skips_context(self) -> None:
+        from api.dwellers import take_action
+
+        assert take_action._skip_agent_context is True
+
+
+def _response_app(content_type: bytes, chunks: list[bytes], content_length: bool = True):
+    """ASGI app that sends `chunks` as one response, recording when each went out."""
+    events: list[str] = []
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type)]
+        if content_length:
+            headers.append((b"content-length", str(sum(map(len, chunks))).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i, chunk in enumerate(chunks):
+            events.append(f"produced {i}")
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+
+    return app, events
+
+
+async def _call(middleware, events: list[str] | None = None) -> tuple[dict, list[bytes]]:
+    """Run one GET through the middleware for a user whose context is already cached."""
+    user = SimpleNamespace(id=uuid4(), callback_url=None)
+    get_agent_context_cache().put(user.id, get_agent_context_cache().generation, {"action_required": []})
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/things",
+        "headers": [(b"x-api-key", b"dsf_test"), (b"x-skill-version", b"0")],
+        "state": {"user": user},
+    }
+    start: dict = {}
+    bodies: list[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        else:
+            bodies.append(message["body"])
+            if events is not None:
+                events.append(f"sent {len(bodies) - 1}")
+
+    await middleware(scope, receive, send)
+    return start, bodies
+
+
+class TestInjectionTransport:
+
+    async def test_context_spliced_into_object(self) -> None:
+        app, _ = _response_app(b"application/json", [b'{"id":"a",', b'"n":[1,2]}'])
+
+        start, bodies = await _call(AgentContextMiddleware(app))
+
+        body = b"".join(bodies)
+        data = json.loads(body)
+        assert data["id"] == "a" and data["n"] == [1, 2]
+        assert data["_agent_context"]["action_required"] == []
+        assert data["_agent_context"]["skill_update"]["your_version"] == "0"
+        assert dict(start["headers"])[b"content-length"] == str(len(body)).encode()
+
+    async def test_empty_object_and_non_objects(self) -> None:
+        app, _ = _response_app(b"application/json", [b"{}"])
+        _, bodies = await _call(AgentContextMiddleware(app))
+        assert list(json.loads(b"".join(bodies))) == ["_agent_context"]
+
+        app, _ = _response_app(b"application/json", [b"[1,2]"])
+        _, bodies = await _call(AgentContextMiddleware(app))
+        assert b"".join(bodies) == b"[1,2]"
+
+    async def test_large_body_passes_through(self) -> None:
+        middleware = AgentContextMiddleware(None)
+        middleware.MAX_INJECT_BYTES = 8
+        chunks = [b'{"payload":', b'"0123456789"}']
+        middleware.app, events = _response_app(b"application/json", chunks)
+
+        _, bodies = await _call(middleware, events)
+
+        assert bodies == chunks
+        # Forwarded as produced, not collected first
+        assert events == ["produced 0", "sent 0", "produced 1", "sent 1"]
+
+    async def test_stream_without_length_passes_through(self) -> None:
+        chunks = [b"event: feed_items\ndata: {}\n\n", b"event: feed_complete\ndata: {}\n\n"]
+        app, events = _response_app(b"text/event-stream", chunks, content_length=False)
+
+        _, bodies = await _call(AgentContextMiddleware(app), events)
+
+        assert bodies == chunks
+        assert events == ["produced 0", "sent 0", "produced 1", "sent 1"]
+
+
+@requires_postgres
+class TestAgentContextInjection:
+
+    async def test_warm_context_skips_builder(
+        self, client: AsyncClient, db_engine, test_agent: dict
+    ) -> None:
+        headers = {"X-API-Key": test_agent["api_key"]}
+
+        with _ReviewQueries(db_engine) as cold:
+            first = (await client.get("/api/auth/me", headers=headers)).json()
+        with _ReviewQueries(db_engine) as warm:
+            second = (await client.get("/api/auth/me", headers=headers)).json()
+
+        assert "suggested_actions" in first["_agent_context"]
+        assert second["_agent_context"] == first["_agent_context"]
+        assert cold.count > 0
+        assert warm.count == 0
+
+    async def test_review_reaches_content_owner(
+        self, client: AsyncClient, db_session, test_agent: dict, second_agent: dict
+    ) -> None:
+        proposal = Proposal(
+            id=uuid4(),
+            agent_id=UUID(test_agent["user"]["id"]),
+            name="Tidal Commons",
+            premise="Test future premise",
+            year_setting=2100,
+            causal_chain=[],
+            scientific_basis="Test basis",
+            status=ProposalStatus.VALIDATING,
+            review_system=ReviewSystemType.CRITICAL_REVIEW,
+        )
+        db_session.add(proposal)
+        await db_session.commit()
+        headers = {"X-API-Key": test_agent["api_key"]}
+        before = (await client.get("/api/auth/me", headers=headers)).json()["_agent_context"]
+        assert not any(a["type"] == "respond_to_feedback" for a in before["action_required"])
+
+        response = await client.post(
+            f"/api/review/proposal/{proposal.id}/feedback",
+            json={"feedback_items": [{
+                "category": "causal_gap",
+                "description": "Missing causal link between 2050 and 2100",
+                "severity": "important",
+            }]},
+            headers={"X-API-Key": second_agent["api_key"]},
+        )
+        assert response.status_code == 200, response.json()
+
+        after = (await client.get("/api/auth/me", headers=headers)).json()["_agent_context"]
+        feedback = [a for a in after["action_required"] if a["type"] == "respond_to_feedback"]
+        assert len(feedback) == 1
+        assert feedback[0]["content_name"] == "Tidal Commons"
+        assert len(feedback[0]["items"]) == 1
+
+    async def test_addressed_aspect_feedback_reaches_reviewer(
+        self, client: AsyncClient, db_session, test_agent: dict, second_agent: dict
+    ) -> None:
+        from db.models import (
+            Aspect, AspectStatus, FeedbackItem, FeedbackItemStatus, FeedbackSeverity,
+            ReviewFeedback, ReviewFeedbackCategory, World,
+        )
+
+        world = World(
+            name="Tidal Commons",
+            premise="Test future premise",
+            year_setting=2100,
+            causal_chain=[],
+            scientific_basis="Test basis",
+            created_by=UUID(second_agent["user"]["id"]),
+        )
+        db_session.add(world)
+        await db_session.flush()
+        aspect = Aspect(
+            world_id=world.id,
+            agent_id=UUID(second_agent["user"]["id"]),
+            aspect_type="technology",
+            title="Tide Ledgers",
+            premise="Ledgers that settle with the tide",
+            content={},
+            canon_justification="Follows from the harbour economy",
+            status=AspectStatus.VALIDATING,
+        )
+        db_session.add(aspect)
+        await db_session.flush()
+        review = ReviewFeedback(
+            content_type="aspect",
+            content_id=aspect.id,
+            reviewer_id=UUID(test_agent["user"]["id"]),
+        )
+        db_session.add(review)
+        await db_session.flush()
+        db_session.add(FeedbackItem(
+            review_feedback_id=review.id,
+            category=ReviewFeedbackCategory.OTHER,
+            description="Explain who audits the ledgers",
+            severity=FeedbackSeverity.MINOR,
+            status=FeedbackItemStatus.ADDRESSED,
+        ))
+        await db_session.commit()
+
+        response = await client.get("/api/auth/me", headers={"X-API-Key": test_agent["api_key"]})
+
+        assert response.status_code == 200
+        context = response.json()["_agent_context"]
+        resolve = [a for a in context["action_required"] if a["type"] == "resolve_feedback"]
+        assert len(resolve) == 1
+        assert resolve[0]["content_name"] == "Tide Ledgers"
+
+    async def test_opt_out_header(self, client: AsyncClient, test_agent: dict) -> None:
+        response = await client.get(
+            "/api/auth/me",
+            headers={"X-API-Key": test_agent["api_key"], "X-Agent-Context": "off"},
+        )
+
+        assert response.status_code == 200
+        assert "_agent_context" not in response.json()
+
+    async def test_feed_stream_with_key_is_untouched(self, client: AsyncClient, test_agent: dict) -> None:
+        from tests.test_e2e_feed import _parse_sse_feed
+
+        response = await client.get("/api/feed/stream", headers={"X-API-Key": test_agent["api_key"]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "_agent_context" not in response.text
+        assert any(item["type"] == "agent_registered" for item in _parse_sse_feed(response.text)["items"])
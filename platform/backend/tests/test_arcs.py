@@ -6,6 +6,7 @@ Tests:
 3. Dissimilar story → new arc created
 4. NO time-window dependency
 5. GET /api/arcs → returns data from table (not computed)
+6. detect_arcs → batched re-clustering with stable arc ids
 """
 
 import os
@@ -47,23 +48,33 @@ class TestAssignStoryToArc:
     @pytest.fixture
     async def world_and_dweller(self, db_session):
         """Create a world and a dweller for arc testing."""
-        from db.models import World, Dweller
+        from db.models import User, UserType, World, Dweller
+
+        user = User(type=UserType.AGENT, username=f"arc-{uuid4().hex[:8]}", name="Arc Author")
+        db_session.add(user)
+        await db_session.flush()
 
         world = World(
             name="Arc Test World",
             premise="A world where stories form arcs " * 5,
             scientific_basis="Narrative science " * 10,
             year_setting=2150,
-            created_by=uuid4(),
-            status="approved",
+            created_by=user.id,
+            regions=[{"name": "Arc Quarter"}],
         )
         db_session.add(world)
         await db_session.flush()
 
         dweller = Dweller(
             world_id=world.id,
+            created_by=user.id,
             name="Arc Dweller",
+            origin_region="Arc Quarter",
+            generation="First-gen",
+            name_context="Named for the arcs",
+            cultural_identity="Arc Quarter native",
             role="Protagonist",
+            age=30,
             personality="Thoughtful and curious " * 5,
             background="Lives in the arc test world " * 5,
             is_active=True,
@@ -79,7 +90,7 @@ class TestAssignStoryToArc:
 
         story = Story(
             world_id=world.id,
-            author_id=uuid4(),
+            author_id=world.created_by,
             title=title,
             content=content,
             perspective=StoryPerspective.FIRST_PERSON_DWELLER,
@@ -237,6 +248,123 @@ class TestAssignStoryToArc:
         assert str(story1.id) in arc.story_ids
         assert str(story2.id) in arc.story_ids
 
+    async def test_join_updates_running_centroid(self, db_session, world_and_dweller):
+        """Joining folds the story into the arc's stored centroid and member count."""
+        import numpy as np
+        from db.models import StoryArc
+        from utils.arc_service import assign_story_to_arc
+        from sqlalchemy import select
+        from sqlalchemy.orm import undefer
+
+        world, dweller = world_and_dweller
+        embs = [
+            _make_embedding(hot_indices=[20, 21, 22]),
+            _make_embedding(hot_indices=[20, 21, 22, 23]),
+            _make_embedding(hot_indices=[20, 21, 23]),
+        ]
+        for i, emb in enumerate(embs):
+            story = await self._make_story(
+                db_session, world, dweller,
+                title=f"Episode {i}",
+                content=f"Episode {i} of the long harbour story in the arc test world " * 5,
+                embedding=emb,
+            )
+            await assign_story_to_arc(db_session, story)
+
+        arc = (await db_session.execute(
+            select(StoryArc).options(undefer(StoryArc.centroid)).where(StoryArc.dweller_id == dweller.id)
+        )).scalar_one()
+        assert arc.member_count == 3
+        assert len(arc.story_ids) == 3
+        assert np.allclose(arc.centroid, np.mean(embs, axis=0), atol=1e-6)
+
+    async def test_story_joins_nearest_of_several_arcs(self, db_session, world_and_dweller):
+        """With several candidate arcs, the story joins the one with the nearest centroid."""
+        from db.models import StoryArc
+        from utils.arc_service import assign_story_to_arc
+        from sqlalchemy import select
+
+        world, dweller = world_and_dweller
+        seeds = {}
+        for name, hot in (("North", [300, 301]), ("South", [600, 601]), ("East", [900, 901])):
+            story = await self._make_story(
+                db_session, world, dweller,
+                title=name,
+                content=f"I travelled {name.lower()} across the arc test world " * 5,
+                embedding=_make_embedding(hot_indices=hot),
+            )
+            await assign_story_to_arc(db_session, story)
+            seeds[name] = str(story.id)
+
+        follow_up = await self._make_story(
+            db_session, world, dweller,
+            title="South Again",
+            content="I returned south across the arc test world " * 5,
+            embedding=_make_embedding(hot_indices=[600, 601, 602]),
+        )
+        await assign_story_to_arc(db_session, follow_up)
+
+        arcs = (await db_session.execute(
+            select(StoryArc).where(StoryArc.dweller_id == dweller.id)
+        )).scalars().all()
+        assert len(arcs) == 3
+        south = next(arc for arc in arcs if seeds["South"] in arc.story_ids)
+        assert str(follow_up.id) in south.story_ids
+        assert south.member_count == 2
+
+    async def test_detect_arcs_rebuilds_with_stable_ids(self, db_session, world_and_dweller, monkeypatch):
+        """detect_arcs clusters stories, embeds missing ones in batches, and keeps arc ids on re-runs."""
+        import numpy as np
+        import utils.embeddings
+        from db.models import StoryArc
+        from utils.arc_service import detect_arcs
+        from sqlalchemy import select, text
+        from sqlalchemy.orm import undefer
+
+        world, dweller = world_and_dweller
+        embs = [
+            _make_embedding(hot_indices=[40, 41, 42]),
+            _make_embedding(hot_indices=[500]),
+            _make_embedding(hot_indices=[40, 41, 42, 43]),
+        ]
+        stories = []
+        for i, emb in enumerate(embs):
+            stories.append(await self._make_story(
+                db_session, world, dweller,
+                title=f"Detect {i}",
+                content=f"Detected episode {i} in the arc test world " * 5,
+                embedding=emb,
+            ))
+        # The last story has no embedding yet; detect_arcs embeds it in a batch
+        await db_session.execute(
+            text("UPDATE platform_stories SET content_embedding = NULL WHERE id = :sid"),
+            {"sid": str(stories[2].id)},
+        )
+        batches = []
+
+        async def fake_generate_embeddings(texts, dimensions=None):
+            batches.append(len(texts))
+            return [embs[2] for _ in texts]
+
+        monkeypatch.setattr(utils.embeddings, "generate_embeddings", fake_generate_embeddings)
+
+        first = await detect_arcs(db_session)
+        assert first["stats"]["embedded"] == sum(batches) >= 1
+        arcs = (await db_session.execute(
+            select(StoryArc).options(undefer(StoryArc.centroid)).where(StoryArc.dweller_id == dweller.id)
+        )).scalars().all()
+        assert sorted(len(arc.story_ids) for arc in arcs) == [1, 2]
+        pair = next(arc for arc in arcs if len(arc.story_ids) == 2)
+        assert set(pair.story_ids) == {str(stories[0].id), str(stories[2].id)}
+        assert pair.member_count == 2
+        assert np.allclose(pair.centroid, np.mean([embs[0], embs[2]], axis=0), atol=1e-6)
+
+        arc_ids = {str(arc.id) for arc in arcs}
+        second = await detect_arcs(db_session)
+        rerun = [a for a in second["arcs"] if a["id"] in arc_ids]
+        assert len(rerun) == 2
+        assert all(a["action"] == "updated" for a in rerun)
+
 
 # ---------------------------------------------------------------------------
 # API integration tests
@@ -267,3 +395,28 @@ class TestArcsAPI:
         data = response.json()
         assert data["arcs"] == []
         assert data["count"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Clustering (no database)
+# ---------------------------------------------------------------------------
+
+def test_cluster_embeddings_matches_incremental_rule():
+    """cluster_embeddings joins the nearest running centroid above threshold, like assign_story_to_arc."""
+    import numpy as np
+    from utils.arc_service import cluster_embeddings
+
+    embs = np.array([
+        _make_embedding(hot_indices=[0, 1, 2]),
+        _make_embedding(hot_indices=[768, 769, 770]),
+        _make_embedding(hot_indices=[0, 1, 2, 3]),
+        _make_embedding(hot_indices=[768, 769]),
+        _make_embedding(hot_indices=[1200]),
+    ])
+
+    labels, centroids, counts = cluster_embeddings(embs)
+
+    assert labels.tolist() == [0, 1, 0, 1, 2]
+    assert counts.tolist() == [2, 2, 1]
+    assert np.allclose(centroids[0], embs[[0, 2]].mean(axis=0))
+    assert np.allclose(centroids[2], embs[4])
@@ -9,6 +9,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from storage import StoredMedia
+
 
 DWELLER = {
     "name": "Kai Sorensen",
@@ -26,6 +28,7 @@ WORLD = {
 }
 
 PORTRAIT_URL = "https://cdn.example.com/portraits/kai.png"
+STORED = StoredMedia(PORTRAIT_URL, len(b"fake-png-bytes"))
 
 
 @pytest.mark.asyncio
@@ -36,7 +39,7 @@ async def test_generate_dweller_portrait_uses_image_prompt_directly():
     with (
         patch("services.art_generation._build_portrait_prompt") as mock_build,
         patch("services.art_generation.generate_image", new_callable=AsyncMock) as mock_generate,
-        patch("services.art_generation.upload_media", return_value=PORTRAIT_URL),
+        patch("services.art_generation.upload_media", new_callable=AsyncMock, return_value=STORED),
     ):
         mock_generate.return_value = b"fake-png-bytes"
 
@@ -68,7 +71,7 @@ async def test_generate_dweller_portrait_falls_back_to_anthropic_when_no_image_p
             return_value=built_prompt,
         ) as mock_build,
         patch("services.art_generation.generate_image", new_callable=AsyncMock) as mock_generate,
-        patch("services.art_generation.upload_media", return_value=PORTRAIT_URL),
+        patch("services.art_generation.upload_media", new_callable=AsyncMock, return_value=STORED),
     ):
         mock_generate.return_value = b"fake-png-bytes"
 
@@ -100,7 +103,7 @@ async def test_generate_dweller_portrait_empty_string_falls_back_to_anthropic():
             return_value=built_prompt,
         ) as mock_build,
         patch("services.art_generation.generate_image", new_callable=AsyncMock) as mock_generate,
-        patch("services.art_generation.upload_media", return_value=PORTRAIT_URL),
+        patch("services.art_generation.upload_media", new_callable=AsyncMock, return_value=STORED),
     ):
         mock_generate.return_value = b"fake-png-bytes"
 
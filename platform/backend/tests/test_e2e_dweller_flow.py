@@ -14,6 +14,11 @@ This tests:
 import os
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db import Dweller
+from jobs.worker import Worker
 from tests.conftest import approve_proposal, act_with_context
 
 
@@ -334,6 +339,61 @@ class TestDwellerFlow:
         )
         assert response.status_code == 400
 
+    @pytest.mark.asyncio
+    async def test_dweller_name_unique_in_world(
+        self, client: AsyncClient, world_with_creator: dict
+    ) -> None:
+        """Test that a world can't have two dwellers with the same name, ignoring case."""
+
+        world_id = world_with_creator["world_id"]
+        creator_key = world_with_creator["creator_key"]
+
+        await client.post(
+            f"/api/dwellers/worlds/{world_id}/regions",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_REGION
+        )
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_DWELLER
+        )
+        assert response.status_code == 200
+        first_id = response.json()["dweller"]["id"]
+
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json={**SAMPLE_DWELLER, "name": SAMPLE_DWELLER["name"].upper()}
+        )
+        assert response.status_code == 409
+        detail = response.json()["detail"]
+        assert detail["context"]["existing_dweller_id"] == first_id
+        assert "even among retired dwellers" in detail["error"]
+        assert f"/api/dwellers/{first_id}/claim" in detail["how_to_fix"]
+
+        # Once inhabited, the existing dweller is no longer offered for claiming
+        response = await client.post(
+            "/api/auth/agent",
+            json={"name": "Name Claimer", "username": "name-claimer"}
+        )
+        claimer_key = response.json()["api_key"]["key"]
+        response = await client.post(
+            f"/api/dwellers/{first_id}/claim",
+            headers={"X-API-Key": claimer_key}
+        )
+        assert response.status_code == 200
+
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_DWELLER
+        )
+        assert response.status_code == 409
+        detail = response.json()["detail"]
+        assert "/claim" not in detail["how_to_fix"]
+        assert detail["context"]["existing_dweller_claimable"] is False
+
     @pytest.mark.asyncio
     async def test_cannot_claim_inhabited_dweller(
         self, client: AsyncClient, world_with_creator: dict
@@ -480,6 +540,64 @@ class TestDwellerFlow:
         # Implementation may vary - at minimum should not crash
         assert response.status_code in [200, 400]
 
+    @pytest.mark.asyncio
+    async def test_actions_record_world_and_region(
+        self, client: AsyncClient, db_session: AsyncSession, world_with_creator: dict
+    ) -> None:
+        """Actions carry their world and the actor's region, and world activity reads them."""
+        from sqlalchemy import select
+        from db import DwellerAction
+
+        world_id = world_with_creator["world_id"]
+        creator_key = world_with_creator["creator_key"]
+
+        for region in (SAMPLE_REGION, {**SAMPLE_REGION, "name": "Kelp Terraces"}):
+            await client.post(
+                f"/api/dwellers/worlds/{world_id}/regions",
+                headers={"X-API-Key": creator_key},
+                json=region
+            )
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json={**SAMPLE_DWELLER, "current_region": "New Shanghai"}
+        )
+        dweller_id = response.json()["dweller"]["id"]
+        response = await client.post(
+            "/api/auth/agent",
+            json={"name": "Walker", "username": "region-walker"}
+        )
+        agent_key = response.json()["api_key"]["key"]
+        await client.post(f"/api/dwellers/{dweller_id}/claim", headers={"X-API-Key": agent_key})
+
+        response = await act_with_context(
+            client, dweller_id, agent_key,
+            action_type="observe",
+            content="The desalination queue stretches past the pier again.",
+        )
+        assert response.status_code == 200, response.json()
+        response = await act_with_context(
+            client, dweller_id, agent_key,
+            action_type="move",
+            target="Kelp Terraces",
+            content="Heading up to the terraces to check the intake filters.",
+        )
+        assert response.status_code == 200, response.json()
+
+        rows = (await db_session.execute(
+            select(DwellerAction.action_type, DwellerAction.world_id, DwellerAction.region)
+            .where(DwellerAction.dweller_id == dweller_id)
+        )).all()
+        assert {(r.action_type, str(r.world_id), r.region) for r in rows} == {
+            ("observe", world_id, "New Shanghai"),
+            # A move is recorded in its destination
+            ("move", world_id, "Kelp Terraces"),
+        }
+
+        response = await client.get(f"/api/dwellers/worlds/{world_id}/activity")
+        assert response.status_code == 200
+        assert {a["action_type"] for a in response.json()["activity"]} == {"observe", "move"}
+
     @pytest.mark.asyncio
     async def test_cannot_act_if_not_inhabiting(
         self, client: AsyncClient, world_with_creator: dict
@@ -518,6 +636,275 @@ class TestDwellerFlow:
         )
         assert response.status_code in [400, 403]
 
+    @pytest.mark.asyncio
+    async def test_episodic_memory_history(
+        self, client: AsyncClient, world_with_creator: dict
+    ) -> None:
+        """Actions and reflections append episodes; reads return them in order."""
+
+        world_id = world_with_creator["world_id"]
+        creator_key = world_with_creator["creator_key"]
+
+        await client.post(
+            f"/api/dwellers/worlds/{world_id}/regions",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_REGION
+        )
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_DWELLER
+        )
+        dweller_id = response.json()["dweller"]["id"]
+
+        response = await client.post(
+            "/api/auth/agent",
+            json={"name": "Episode Tester", "username": "episode-test-agent"}
+        )
+        agent_key = response.json()["api_key"]["key"]
+        await client.post(
+            f"/api/dwellers/{dweller_id}/claim",
+            headers={"X-API-Key": agent_key}
+        )
+
+        contents = [
+            "The desalination pumps on the east ring are running hot again.",
+            "I traded two ration chits for a spool of copper wire at the market.",
+        ]
+        for content in contents:
+            response = await act_with_context(
+                client, dweller_id, agent_key,
+                action_type="observe",
+                content=content,
+            )
+            assert response.status_code == 200, f"Action failed: {response.json()}"
+
+        response = await client.post(
+            f"/api/dwellers/{dweller_id}/memory/reflect",
+            headers={"X-API-Key": agent_key},
+            json={
+                "content": "The pumps fail whenever the market is busiest. Not a coincidence.",
+                "topics": ["infrastructure"],
+            }
+        )
+        assert response.status_code == 200, f"Reflect failed: {response.json()}"
+        assert response.json()["total_memories"] == 3
+
+        response = await client.get(
+            f"/api/dwellers/{dweller_id}/memory",
+            headers={"X-API-Key": agent_key}
+        )
+        assert response.status_code == 200
+        memory = response.json()["memory"]
+        assert memory["total_episodes"] == 3
+        episodes = memory["episodic_memories"]
+        assert [e["type"] for e in episodes] == ["observe", "observe", "reflection"]
+        assert [e["content"] for e in episodes[:2]] == contents
+        assert all(e.get("action_id") for e in episodes[:2])
+        assert episodes[2]["topics"] == ["infrastructure"]
+
+        # episode_limit returns the newest episodes, still oldest-first
+        response = await client.get(
+            f"/api/dwellers/{dweller_id}/memory",
+            headers={"X-API-Key": agent_key},
+            params={"episode_limit": 2}
+        )
+        limited = response.json()["memory"]["episodic_memories"]
+        assert [e["id"] for e in limited] == [e["id"] for e in episodes[1:]]
+
+        response = await client.get(
+            f"/api/dwellers/{dweller_id}/memory/search",
+            headers={"X-API-Key": agent_key},
+            params={"q": "copper"}
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["content"] for r in results] == [contents[1]]
+
+    @pytest.mark.asyncio
+    async def test_episode_count_survives_concurrent_appends(
+        self, client: AsyncClient, world_with_creator: dict, db_engine
+    ) -> None:
+        """Two sessions holding the same dweller both count their episode."""
+        from utils.dweller_memory import append_episode
+
+        world_id = world_with_creator["world_id"]
+        creator_key = world_with_creator["creator_key"]
+
+        await client.post(
+            f"/api/dwellers/worlds/{world_id}/regions",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_REGION
+        )
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_DWELLER
+        )
+        dweller_id = response.json()["dweller"]["id"]
+
+        sessions = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+        async with sessions() as first, sessions() as second:
+            first_dweller = await first.get(Dweller, dweller_id)
+            second_dweller = await second.get(Dweller, dweller_id)
+
+            await append_episode(first, first_dweller, "observe", "The east ring pumps are quiet.")
+            await first.commit()
+            # second_dweller was loaded before the first append committed
+            await append_episode(second, second_dweller, "observe", "The market is busier than usual.")
+            await second.commit()
+
+            assert second_dweller.episodic_memory_count == 2
+            await first.refresh(first_dweller)
+            assert first_dweller.episodic_memory_count == 2
+
+    @pytest.mark.asyncio
+    async def test_working_memory_keeps_reflections(
+        self, client: AsyncClient, db_session: AsyncSession, world_with_creator: dict
+    ) -> None:
+        """Act context keeps reflections over older episodes, newest window otherwise."""
+
+        world_id = world_with_creator["world_id"]
+        creator_key = world_with_creator["creator_key"]
+
+        await client.post(
+            f"/api/dwellers/worlds/{world_id}/regions",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_REGION
+        )
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_DWELLER
+        )
+        dweller_id = response.json()["dweller"]["id"]
+
+        response = await client.post(
+            "/api/auth/agent",
+            json={"name": "Working Memory Tester", "username": "working-memory-agent"}
+        )
+        agent_key = response.json()["api_key"]["key"]
+        await client.post(
+            f"/api/dwellers/{dweller_id}/claim",
+            headers={"X-API-Key": agent_key}
+        )
+
+        response = await client.post(
+            f"/api/dwellers/{dweller_id}/memory/reflect",
+            headers={"X-API-Key": agent_key},
+            json={"content": "Every storm season the council rations the fresh water first."}
+        )
+        assert response.status_code == 200
+        observations = [f"Observation {i}: the tide gauge reads {i} metres." for i in range(4)]
+        for content in observations:
+            response = await act_with_context(
+                client, dweller_id, agent_key, action_type="observe", content=content,
+            )
+            assert response.status_code == 200, f"Action failed: {response.json()}"
+
+        await db_session.execute(
+            update(Dweller).where(Dweller.id == dweller_id).values(working_memory_size=3)
+        )
+        await db_session.commit()
+
+        response = await client.post(
+            f"/api/dwellers/{dweller_id}/act/context",
+            headers={"X-API-Key": agent_key},
+        )
+        assert response.status_code == 200
+        episodes = response.json()["memory"]["recent_episodes"]
+        assert [e["type"] for e in episodes] == ["reflection", "observe", "observe"]
+        assert [e["content"] for e in episodes[1:]] == observations[-2:]
+
+    @pytest.mark.asyncio
+    async def test_memory_search_ranking_and_pagination(
+        self, client: AsyncClient, world_with_creator: dict, db_engine, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Memory search is stemmed, filtered by importance, paginated, and blends semantic matches."""
+
+        world_id = world_with_creator["world_id"]
+        creator_key = world_with_creator["creator_key"]
+
+        await client.post(
+            f"/api/dwellers/worlds/{world_id}/regions",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_REGION
+        )
+        response = await client.post(
+            f"/api/dwellers/worlds/{world_id}/dwellers",
+            headers={"X-API-Key": creator_key},
+            json=SAMPLE_DWELLER
+        )
+        dweller_id = response.json()["dweller"]["id"]
+
+        response = await client.post(
+            "/api/auth/agent",
+            json={"name": "Search Tester", "username": "memory-search-agent"}
+        )
+        agent_key = response.json()["api_key"]["key"]
+        await client.post(
+            f"/api/dwellers/{dweller_id}/claim",
+            headers={"X-API-Key": agent_key}
+        )
+
+        monkeypatch.setenv("MEMORY_EMBEDDING_PROVIDER", "local")
+        episodes = [
+            ("Traded copper wire for salt at the night market.", 0.9),
+            ("Copper prices doubled after the storm closed the port.", 0.3),
+            ("The coppersmith on Dock Row fixed my still.", 0.6),
+            ("The desalination pumps on the east ring are running hot again.", 0.5),
+        ]
+        for content, importance in episodes:
+            response = await act_with_context(
+                client, dweller_id, agent_key,
+                action_type="observe", content=content, importance=importance,
+            )
+            assert response.status_code == 200, f"Action failed: {response.json()}"
+
+        # Each action queues its episode's embedding for the job worker
+        sessions = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+        assert await Worker({"graph": 1}, sessions).drain() == len(episodes)
+
+        async def search(**params) -> dict:
+            response = await client.get(
+                f"/api/dwellers/{dweller_id}/memory/search",
+                headers={"X-API-Key": agent_key},
+                params=params,
+            )
+            assert response.status_code == 200, response.json()
+            return response.json()
+
+        # Stemmed: "trading" matches "Traded"
+        data = await search(q="trading")
+        assert data["results"][0]["content"] == episodes[0][0]
+
+        # Text matches rank first; "coppersmith" comes only from semantic recall
+        data = await search(q="copper")
+        contents = [r["content"] for r in data["results"]]
+        assert set(contents[:2]) == {episodes[0][0], episodes[1][0]}
+        assert contents[2:] == [episodes[2][0]]
+
+        filtered = await search(q="copper", importance_min=0.5)
+        assert {r["content"] for r in filtered["results"]} == {episodes[0][0], episodes[2][0]}
+
+        first = await search(q="copper", limit=2)
+        assert first["pagination"]["has_more"] is True
+        second = await search(q="copper", limit=2, offset=2)
+        assert second["pagination"]["has_more"] is False
+        assert [r["id"] for r in first["results"] + second["results"]] == [
+            r["id"] for r in data["results"]
+        ]
+
+        # Stopwords alone have no lexemes, so they match nothing
+        data = await search(q="the and it")
+        assert data["results"] == []
+        assert data["returned"] == 0
+
+        # Without an embedding provider only text matches are returned
+        monkeypatch.delenv("MEMORY_EMBEDDING_PROVIDER")
+        data = await search(q="copper")
+        assert [r["content"] for r in data["results"]] == [episodes[0][0], episodes[1][0]]
+
     @pytest.mark.asyncio
     async def test_memory_operations(
         self, client: AsyncClient, world_with_creator: dict
@@ -0,0 +1,301 @@
+"""Tests for the feed cache (utils/feed_cache.py).
+
+Covers:
+1. In-process LRU bound and TTL expiry; its pages expire quickly
+2. Generation bump makes every cached page unreachable
+3. Single-flight: concurrent misses run one build
+4. Build failures and cancellation don't poison waiters
+5. Redis backend over a minimal fake client
+6. Write paths invalidate the feed (E2E)
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from utils.clock import SimulatedClock, reset_clock, set_clock
+from utils.feed_cache import (
+    FEED_CACHE_MEMORY_TTL_SECONDS,
+    FeedCache,
+    InProcessFeedCache,
+    RedisFeedCache,
+    get_feed_cache,
+    set_feed_cache,
+)
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for RedisFeedCache."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.expiries: dict[str, int] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.values[key] = value
+        if ex is not None:
+            self.expiries[key] = ex
+
+    async def incr(self, key: str) -> int:
+        value = int(self.values.get(key, 0)) + 1
+        self.values[key] = str(value)
+        return value
+
+
+def _page(label: str) -> dict:
+    return {"items": [{"type": "world_created", "id": label}], "next_cursor": None}
+
+
+@pytest.fixture
+def clock():
+    clock = SimulatedClock(datetime(2030, 1, 1, tzinfo=timezone.utc))
+    set_clock(clock)
+    yield clock
+    reset_clock()
+
+
+class TestInProcessBackend:
+
+    async def test_lru_evicts_least_recently_used(self):
+        backend = InProcessFeedCache(max_entries=2)
+        await backend.set("a", _page("a"), 60)
+        await backend.set("b", _page("b"), 60)
+        # Touch "a" so "b" is the eviction candidate
+        assert await backend.get("a") is not None
+        await backend.set("c", _page("c"), 60)
+
+        assert len(backend) == 2
+        assert await backend.get("b") is None
+        assert await backend.get("a") == _page("a")
+        assert await backend.get("c") == _page("c")
+
+    async def test_entries_expire_after_ttl(self, clock):
+        backend = InProcessFeedCache()
+        await backend.set("a", _page("a"), 30)
+
+        clock.advance(seconds=29)
+        assert await backend.get("a") is not None
+        clock.advance(seconds=1)
+        assert await backend.get("a") is None
+        assert len(backend) == 0
+
+
+class TestFeedCache:
+
+    async def test_default_cache_uses_short_memory_ttl(self, monkeypatch, caplog):
+        """Other processes never see a memory-backed invalidation, so pages must expire fast."""
+        monkeypatch.setenv("FEED_CACHE_BACKEND", "memory")
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        set_feed_cache(None)
+        try:
+            cache = get_feed_cache()
+        finally:
+            set_feed_cache(None)
+
+        assert isinstance(cache.backend, InProcessFeedCache)
+        assert cache.ttl_seconds == FEED_CACHE_MEMORY_TTL_SECONDS <= 5
+        assert "4 workers" in caplog.text
+
+    async def test_invalidate_bumps_generation(self):
+        cache = FeedCache(InProcessFeedCache())
+        builds = 0
+
+        async def build():
+            nonlocal builds
+            builds += 1
+            return _page(f"build-{builds}")
+
+        first = await cache.get_or_build(None, 20, build)
+        assert await cache.get_or_build(None, 20, build) == first
+        assert builds == 1
+
+        await cache.invalidate()
+        second = await cache.get_or_build(None, 20, build)
+        assert builds == 2
+        assert second != first
+
+    async def test_cursor_and_limit_are_separate_pages(self):
+        cache = FeedCache(InProcessFeedCache())
+        cursor = "eyJ0IjoiMjAzMC0wMS0wMVQwMDowMDowMCswMDowMCJ9"
+        await cache.get_or_build(None, 20, lambda: _async(_page("head")))
+        await cache.get_or_build(cursor, 20, lambda: _async(_page("older")))
+        await cache.get_or_build(None, 50, lambda: _async(_page("wide")))
+
+        assert (await cache.lookup(None, 20))[1] == _page("head")
+        assert (await cache.lookup(cursor, 20))[1] == _page("older")
+        assert (await cache.lookup(None, 50))[1] == _page("wide")
+
+    async def test_page_built_across_invalidation_is_not_served(self):
+        """A build that started before a write must not be cached as fresh."""
+        cache = FeedCache(InProcessFeedCache())
+        release = asyncio.Event()
+
+        async def slow_build():
+            await release.wait()
+            return _page("stale")
+
+        task = asyncio.create_task(cache.get_or_build(None, 20, slow_build))
+        await asyncio.sleep(0)
+        await cache.invalidate()
+        release.set()
+        assert await task == _page("stale")
+
+        _, cached = await cache.lookup(None, 20)
+        assert cached is None
+
+    async def test_concurrent_misses_build_once(self):
+        cache = FeedCache(InProcessFeedCache())
+        builds = 0
+        release = asyncio.Event()
+
+        async def build():
+            nonlocal builds
+            builds += 1
+            await release.wait()
+            return _page("shared")
+
+        tasks = [asyncio.create_task(cache.get_or_build(None, 20, build)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert builds == 1
+        assert all(result == _page("shared") for result in results)
+
+    async def test_build_error_reaches_waiters_and_is_not_cached(self):
+        cache = FeedCache(InProcessFeedCache())
+        release = asyncio.Event()
+
+        async def failing_build():
+            await release.wait()
+            raise RuntimeError("feed query failed")
+
+        tasks = [asyncio.create_task(cache.get_or_build(None, 20, failing_build)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        # The next request rebuilds
+        assert await cache.get_or_build(None, 20, lambda: _async(_page("ok"))) == _page("ok")
+
+    async def test_cancelled_builder_hands_off_to_waiter(self):
+        cache = FeedCache(InProcessFeedCache())
+        started = asyncio.Event()
+
+        async def hanging_build():
+            started.set()
+            await asyncio.Event().wait()
+
+        builder = asyncio.create_task(cache.get_or_build(None, 20, hanging_build))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_build(None, 20, lambda: _async(_page("retry"))))
+        await asyncio.sleep(0)
+
+        builder.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await builder
+        assert await waiter == _page("retry")
+
+    async def test_backend_errors_degrade_to_uncached(self):
+        class BrokenBackend(InProcessFeedCache):
+            async def get(self, key):
+                raise ConnectionError("cache down")
+
+            async def set(self, key, value, ttl_seconds):
+                raise ConnectionError("cache down")
+
+            async def bump_generation(self):
+                raise ConnectionError("cache down")
+
+        cache = FeedCache(BrokenBackend())
+        assert await cache.get_or_build(None, 20, lambda: _async(_page("live"))) == _page("live")
+        await cache.invalidate()
+
+
+class TestRedisBackend:
+
+    async def test_round_trip_and_ttl(self):
+        fake = FakeRedis()
+        cache = FeedCache(RedisFeedCache(fake), ttl_seconds=120)
+        await cache.get_or_build(None, 20, lambda: _async(_page("a")))
+
+        key, cached = await cache.lookup(None, 20)
+        assert cached == _page("a")
+        assert fake.expiries[key] == 120
+
+    async def test_generation_is_shared_between_instances(self):
+        """Two processes over the same Redis see each other's invalidations."""
+        fake = FakeRedis()
+        process_a = FeedCache(RedisFeedCache(fake))
+        process_b = FeedCache(RedisFeedCache(fake))
+
+        await process_a.get_or_build(None, 20, lambda: _async(_page("a")))
+        assert (await process_b.lookup(None, 20))[1] == _page("a")
+
+        await process_b.invalidate()
+        assert (await process_a.lookup(None, 20))[1] is None
+
+
+@requires_postgres
+class TestFeedInvalidation:
+
+    async def test_proposal_submission_invalidates_feed(
+        self, client: AsyncClient, test_agent: dict
+    ) -> None:
+        """A cached feed page must not hide a write that happened after it."""
+        from tests.test_e2e_feed import SAMPLE_CAUSAL_CHAIN, _parse_sse_feed
+
+        response = await client.post(
+            "/api/proposals",
+            headers={"X-API-Key": test_agent["api_key"]},
+            json={
+                "name": "Cache Invalidation World",
+                "premise": "Tidal arrays power every coastal city after a decade of grid-scale storage breakthroughs",
+                "year_setting": 2060,
+                "causal_chain": SAMPLE_CAUSAL_CHAIN,
+                "scientific_basis": (
+                    "Tidal energy capacity factors and storage cost declines support coastal "
+                    "grids running on marine power within three decades of sustained deployment."
+                ),
+                "image_prompt": (
+                    "Cinematic wide shot of a coastal city ringed by tidal turbines at dusk. "
+                    "Photorealistic, dramatic lighting, sense of scale."
+                ),
+            },
+        )
+        assert response.status_code == 200, response.json()
+        proposal_id = response.json()["id"]
+
+        # Warm the cache before the write
+        before = _parse_sse_feed((await client.get("/api/feed/stream")).text)
+        assert proposal_id not in {item["proposal"]["id"] for item in before["items"] if "proposal" in item}
+
+        response = await client.post(
+            f"/api/proposals/{proposal_id}/submit",
+            headers={"X-API-Key": test_agent["api_key"]},
+        )
+        assert response.status_code == 200, response.json()
+
+        after = _parse_sse_feed((await client.get("/api/feed/stream")).text)
+        submitted = [
+            item for item in after["items"]
+            if item["type"] == "proposal_submitted" and item["proposal"]["id"] == proposal_id
+        ]
+        assert len(submitted) == 1
+
+
+async def _async(value):
+    return value
@@ -5,6 +5,7 @@ Tests the heartbeat endpoint and activity tracking:
 - Returns notifications
 - Returns activity status
 - Activity restrictions work
+- GET and POST render one snapshot in a bounded number of statements
 """
 
 import os
@@ -269,6 +270,127 @@ class TestHeartbeatEndpoint:
             assert priorities == sorted(priorities), "Actions should be sorted by priority"
 
 
+# Upper bound on SQL statements per heartbeat request, whatever the agent has to report:
+# auth 1, timestamps 1, snapshot 5, notifications marked read 1, the nudge's story
+# lookup 1, a reconcile job 1 and the _agent_context rebuild 4. POST adds world
+# signals: the agent's worlds plus four grouped aggregates.
+HEARTBEAT_MAX_STATEMENTS = {"get": 14, "post": 19}
+
+
+@requires_postgres
+class TestHeartbeatSnapshot:
+    """GET and POST /heartbeat render one snapshot loaded in a fixed number of statements."""
+
+    async def _proposer_and_validator(self, client: AsyncClient) -> tuple[str, str]:
+        keys = []
+        for username in ("snapshot-proposer", "snapshot-validator"):
+            response = await client.post(
+                "/api/auth/agent",
+                json={"name": username, "username": username},
+            )
+            keys.append(response.json()["api_key"]["key"])
+        proposer_key, validator_key = keys
+
+        response = await client.post(
+            "/api/proposals",
+            headers={"X-API-Key": proposer_key},
+            json={
+                "name": "Snapshot Harbour",
+                "premise": "A harbour city where fusion made shipping cheap and tides predictable",
+                "year_setting": 2090,
+                "causal_chain": SAMPLE_CAUSAL_CHAIN,
+                "scientific_basis": (
+                    "Based on current fusion research progress from ITER and private companies. "
+                    "Cost curves follow historical patterns of energy technology deployment."
+                ),
+                "image_prompt": (
+                    "Cinematic wide shot of a futuristic harbour at golden hour. "
+                    "Advanced technological infrastructure with dramatic lighting. "
+                    "Photorealistic, sense of scale and scientific wonder."
+                ),
+            },
+        )
+        assert response.status_code == 200, response.json()
+        response = await client.post(
+            f"/api/proposals/{response.json()['id']}/submit",
+            headers={"X-API-Key": proposer_key},
+        )
+        assert response.status_code == 200, response.json()
+        return proposer_key, validator_key
+
+    @pytest.mark.asyncio
+    async def test_snapshot_feeds_both_endpoints(self, client: AsyncClient) -> None:
+        """Status breakdown, validation counts and review suggestions come from the snapshot."""
+        proposer_key, validator_key = await self._proposer_and_validator(client)
+
+        response = await client.get("/api/heartbeat", headers={"X-API-Key": proposer_key})
+        assert response.status_code == 200
+        your_work = response.json()["your_work"]
+        assert your_work["proposals_by_status"] == {"validating": 1}
+        assert your_work["active_proposals"] == 1
+
+        for method in ("get", "post"):
+            kwargs = {"json": {}} if method == "post" else {}
+            response = await getattr(client, method)(
+                "/api/heartbeat", headers={"X-API-Key": validator_key}, **kwargs
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["community_needs"]["proposals_awaiting_validation"] == 1
+            # The digest only covers what arrived since the previous heartbeat
+            assert data["activity_digest"]["new_proposals_to_validate"] == (method == "get")
+            assert "review_proposal" in [a["action"] for a in data["suggested_actions"]]
+            assert data["nudge"]["action"] == "validate"
+
+    @pytest.mark.asyncio
+    async def test_statement_count_is_bounded(
+        self, client: AsyncClient, db_engine, db_session: AsyncSession
+    ) -> None:
+        """A heartbeat issues the same few statements however much there is to report."""
+        from sqlalchemy import event, select
+        from db.models import Notification, User
+
+        _, validator_key = await self._proposer_and_validator(client)
+        headers = {"X-API-Key": validator_key}
+        await client.get("/api/heartbeat", headers=headers)
+        user_id = await db_session.scalar(select(User.id).where(User.username == "snapshot-validator"))
+
+        async def notify(total: int) -> None:
+            db_session.add_all([
+                Notification(
+                    user_id=user_id,
+                    notification_type="proposal_validated",
+                    target_type="world",
+                    data={"n": i},
+                )
+                for i in range(total)
+            ])
+            await db_session.commit()
+
+        async def count_statements(method: str) -> int:
+            statements = []
+
+            def count(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            kwargs = {"json": {}} if method == "post" else {}
+            event.listen(db_engine.sync_engine, "before_cursor_execute", count)
+            try:
+                response = await getattr(client, method)("/api/heartbeat", headers=headers, **kwargs)
+            finally:
+                event.remove(db_engine.sync_engine, "before_cursor_execute", count)
+            assert response.status_code == 200
+            return len(statements)
+
+        for method in ("get", "post"):
+            await notify(1)
+            baseline = await count_statements(method)
+            assert baseline <= HEARTBEAT_MAX_STATEMENTS[method]
+
+            await notify(20)
+            assert await count_statements(method) == baseline
+
+
 @requires_postgres
 class TestHeartbeatMdEndpoint:
     """Test the heartbeat.md file endpoint."""
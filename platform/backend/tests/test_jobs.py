@@ -0,0 +1,314 @@
+"""Tests for the Postgres job queue (jobs/).
+
+Covers:
+1. Jobs run once and are removed; dedupe keys collapse repeat enqueues
+2. Failures are retried with backoff, then moved to platform_dead_jobs
+3. Concurrent claims never hand out the same job; running jobs keep their lease
+4. The worker honours per-queue concurrency limits
+5. Endpoints enqueue their follow-up work instead of running it in-process
+6. A re-delivered media job never renders a finished or in-flight generation again
+"""
+
+import asyncio
+import os
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db import DeadJob, Job, MediaGeneration, MediaGenerationStatus
+from jobs import JobPayload, claim, enqueue, handler, run_job
+from jobs.worker import Worker, parse_queues
+from utils.clock import SimulatedClock, now as utc_now, reset_clock, set_clock
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+class Record(JobPayload):
+    kind = "test.record"
+    queue = "test"
+    max_attempts = 2
+
+    label: str
+    fail: bool = False
+    hold_seconds: float = 0
+
+
+class _Calls:
+    """What the test.record handler saw."""
+
+    def __init__(self):
+        self.labels: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+
+calls = _Calls()
+
+
+@handler(Record)
+async def record(job: Record) -> None:
+    calls.in_flight += 1
+    calls.peak = max(calls.peak, calls.in_flight)
+    try:
+        await asyncio.sleep(job.hold_seconds)
+        calls.labels.append(job.label)
+        if job.fail:
+            raise RuntimeError(f"{job.label} failed")
+    finally:
+        calls.in_flight -= 1
+
+
+@pytest.fixture
+def sessions(db_engine) -> async_sessionmaker[AsyncSession]:
+    global calls
+    calls = _Calls()
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _count(session_factory, model) -> int:
+    async with session_factory() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+def test_parse_queues() -> None:
+    assert parse_queues(["media=4", "graph"]) == {"media": 4, "graph": 2}
+
+
+@requires_postgres
+class TestJobQueue:
+
+    def teardown_method(self) -> None:
+        reset_clock()
+
+    async def test_job_runs_once_and_is_removed(self, sessions) -> None:
+        async with sessions() as db:
+            await enqueue(db, Record(label="a"), dedupe_key="record:a")
+            await enqueue(db, Record(label="a"), dedupe_key="record:a")
+            await enqueue(db, Record(label="b"))
+            await db.commit()
+
+        assert await Worker({"test": 4}, sessions).drain() == 2
+        assert sorted(calls.labels) == ["a", "b"]
+        assert await _count(sessions, Job) == 0
+
+    async def test_failure_backs_off_then_dead_letters(self, sessions) -> None:
+        clock = SimulatedClock(start=utc_now())
+        set_clock(clock)
+        worker = Worker({"test": 1}, sessions)
+        async with sessions() as db:
+            await enqueue(db, Record(label="flaky", fail=True))
+            await db.commit()
+
+        assert await worker.drain() == 1
+        async with sessions() as db:
+            job = await db.scalar(select(Job))
+        assert job.attempts == 1
+        assert job.locked_by is None
+        assert job.run_at > clock.now()
+        assert "flaky failed" in job.last_error
+
+        # Not due yet
+        assert await worker.drain() == 0
+
+        clock.advance(seconds=(job.run_at - clock.now()).total_seconds() + 1)
+        assert await worker.drain() == 1
+        assert calls.labels == ["flaky", "flaky"]
+        assert await _count(sessions, Job) == 0
+        async with sessions() as db:
+            dead = await db.scalar(select(DeadJob))
+        assert (dead.id, dead.kind, dead.attempts) == (job.id, "test.record", 2)
+        assert dead.payload["label"] == "flaky"
+
+    async def test_concurrent_claims_are_disjoint(self, sessions) -> None:
+        async with sessions() as db:
+            for i in range(10):
+                await enqueue(db, Record(label=str(i)))
+            await db.commit()
+
+        async def take(worker_id: str) -> list[Job]:
+            async with sessions() as db:
+                return await claim(db, "test", 4, worker_id)
+
+        batches = await asyncio.gather(*(take(f"w{i}") for i in range(3)))
+
+        ids = [job.id for batch in batches for job in batch]
+        assert len(ids) == len(set(ids)) == 10
+        assert all(job.locked_by == f"w{i}" for i, batch in enumerate(batches) for job in batch)
+
+    async def test_expired_lease_is_reclaimed(self, sessions) -> None:
+        clock = SimulatedClock(start=utc_now())
+        set_clock(clock)
+        async with sessions() as db:
+            await enqueue(db, Record(label="orphan"))
+            await db.commit()
+        async with sessions() as db:
+            (crashed,) = await claim(db, "test", 1, "crashed-worker")
+
+        assert await Worker({"test": 1}, sessions).drain() == 0
+        clock.advance(hours=1)
+        async with sessions() as db:
+            (reclaimed,) = await claim(db, "test", 1, "healthy-worker")
+            assert reclaimed.id == crashed.id
+            assert reclaimed.attempts == 2
+
+        # The crashed worker's late result is ignored
+        assert await run_job(sessions, crashed)
+        assert await _count(sessions, Job) == 1
+
+    async def test_running_job_renews_its_lease(self, sessions, monkeypatch) -> None:
+        import jobs.queue
+
+        monkeypatch.setattr(jobs.queue, "JOB_LEASE_SECONDS", 0.3)
+        async with sessions() as db:
+            await enqueue(db, Record(label="slow", hold_seconds=1.0))
+            await db.commit()
+        async with sessions() as db:
+            (job,) = await claim(db, "test", 1, "busy-worker")
+
+        running = asyncio.create_task(run_job(sessions, job))
+        await asyncio.sleep(0.7)
+        # Well past the lease, but the running job keeps renewing it
+        async with sessions() as db:
+            assert await claim(db, "test", 1, "other-worker") == []
+        assert await running
+        assert calls.labels == ["slow"]
+        assert await _count(sessions, Job) == 0
+
+    async def test_worker_respects_queue_concurrency(self, sessions) -> None:
+        async with sessions() as db:
+            for i in range(6):
+                await enqueue(db, Record(label=str(i), hold_seconds=0.05))
+            await db.commit()
+
+        worker = Worker({"test": 2}, sessions, poll_interval=0.01)
+        task = asyncio.create_task(worker.run())
+        while len(calls.labels) < 6:
+            await asyncio.sleep(0.01)
+        worker.stop()
+        await task
+
+        assert calls.peak == 2
+        assert await _count(sessions, Job) == 0
+
+
+async def _create_world(client: AsyncClient, api_key: str) -> dict:
+    from tests.conftest import SAMPLE_CAUSAL_CHAIN, approve_proposal
+
+    proposal = await client.post("/api/proposals", headers={"X-API-Key": api_key}, json={
+        "name": "Queue Test World",
+        "premise": "A world built to check that cover image generation is queued and run by the job worker rather than inside the request.",
+        "image_prompt": "A cinematic harbour city at dusk, cranes lit against the sky, wide shot",
+        "year_setting": 2087,
+        "causal_chain": SAMPLE_CAUSAL_CHAIN,
+        "scientific_basis": "Durable queues in relational databases are a well understood way to move slow work out of request handlers.",
+    })
+    return (await approve_proposal(client, proposal.json()["id"], api_key))["world_created"]
+
+
+async def _job_kinds(db_engine) -> list[str]:
+    sessions = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        return sorted((await db.scalars(select(Job.kind))).all())
+
+
+@requires_postgres
+class TestEnqueuedWork:
+
+    async def test_story_creation_enqueues_follow_up_jobs(
+        self, client: AsyncClient, db_engine, test_agent: dict
+    ) -> None:
+        from tests.conftest import SAMPLE_DWELLER, SAMPLE_REGION
+
+        headers = {"X-API-Key": test_agent["api_key"]}
+        world = await _create_world(client, test_agent["api_key"])
+        # Graduation queues the world's cover image
+        assert await _job_kinds(db_engine) == ["media.generate"]
+        await client.post(f"/api/dwellers/worlds/{world['id']}/regions", headers=headers, json=SAMPLE_REGION)
+        dweller = await client.post(f"/api/dwellers/worlds/{world['id']}/dwellers", headers=headers, json=SAMPLE_DWELLER)
+        assert await _job_kinds(db_engine) == ["dweller.portrait", "media.generate"]
+
+        response = await client.post("/api/stories", headers=headers, json={
+            "world_id": world["id"],
+            "title": "Queue Test Story",
+            "content": "A story long enough to pass validation, about the night the harbour cranes stopped and the dock crews rebuilt the schedule by hand from memory.",
+            "perspective": "first_person_dweller",
+            "perspective_dweller_id": dweller.json()["dweller"]["id"],
+            "video_prompt": "Slow push-in on idle harbour cranes at night, crews with lanterns gathering below.",
+        })
+        assert response.status_code == 200, response.json()
+
+        assert await _job_kinds(db_engine) == [
+            "dweller.portrait", "media.generate", "media.generate", "story.graph", "story.publish_x",
+        ]
+
+    async def test_cover_image_job_completes_generation(
+        self, client: AsyncClient, db_engine, test_agent: dict, monkeypatch
+    ) -> None:
+        headers = {"X-API-Key": test_agent["api_key"]}
+        world = await _create_world(client, test_agent["api_key"])
+
+        response = await client.post(
+            f"/api/media/worlds/{world['id']}/cover-image",
+            headers=headers,
+            json={"image_prompt": "A cinematic harbour city at dusk, wide shot"},
+        )
+        generation_id = response.json()["generation_id"]
+        assert await _job_kinds(db_engine) == ["media.generate", "media.generate"]
+        assert (await client.get(f"/api/media/{generation_id}/status")).json()["status"].upper() == "PENDING"
+
+        # Skip the real xAI/R2 calls, as in simulation
+        monkeypatch.setenv("DST_SIMULATION", "true")
+        sessions = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+        assert await Worker({"media": 2}, sessions).drain() == 2
+
+        async with sessions() as db:
+            generation = await db.get(MediaGeneration, generation_id)
+        assert generation.status == MediaGenerationStatus.COMPLETED
+        assert await _job_kinds(db_engine) == []
+
+    async def test_media_job_skips_finished_and_in_flight_generations(
+        self, client: AsyncClient, db_engine, test_agent: dict, monkeypatch
+    ) -> None:
+        import media.generator
+        from api.media import _run_generation
+        from db import MediaType
+
+        async def paid_render(prompt: str) -> bytes:
+            raise AssertionError("generation rendered twice")
+
+        monkeypatch.setattr(media.generator, "generate_image", paid_render)
+        world = await _create_world(client, test_agent["api_key"])
+
+        sessions = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+        started = utc_now()
+        async with sessions() as db:
+            generations = [
+                MediaGeneration(
+                    requested_by=test_agent["user"]["id"],
+                    target_type="world",
+                    target_id=world["id"],
+                    media_type=MediaType.COVER_IMAGE,
+                    prompt="A cinematic harbour city at dusk, wide shot",
+                    provider="grok_imagine_image",
+                    status=status,
+                    started_at=started,
+                )
+                for status in (MediaGenerationStatus.COMPLETED, MediaGenerationStatus.GENERATING)
+            ]
+            db.add_all(generations)
+            await db.commit()
+
+        for generation in generations:
+            await _run_generation(generation.id, "world", generation.target_id, MediaType.COVER_IMAGE)
+
+        async with sessions() as db:
+            for generation in generations:
+                stored = await db.get(MediaGeneration, generation.id)
+                assert stored.status == generation.status
+                assert stored.started_at == started
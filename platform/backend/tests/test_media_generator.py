@@ -0,0 +1,123 @@
+"""Tests for the streaming video pipeline (media/generator.py, api/media.py).
+
+xAI is replaced with an httpx.MockTransport on the shared client.
+
+Covers:
+1. Concurrent renders share one poller, one status check per render per tick
+2. Expired renders and persistently failing status checks raise
+3. Finished videos stream into storage in bounded chunks
+4. A dropped download is retried without starting a new render
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import media.generator as generator
+from api.media import _store_video
+from media.generator import generate_video_url, get_video_poller, set_xai_client, stream_video
+from storage import LocalStorage, set_storage
+
+
+class FakeXai:
+    """Minimal xAI video API: each render finishes after `ticks` status checks."""
+
+    def __init__(self, ticks: int = 2, video: bytes = b"", status: str | None = None, drop_downloads: int = 0):
+        self.ticks = ticks
+        self.video = video
+        self.status = status
+        self.drop_downloads = drop_downloads
+        self.started = 0
+        self.checks: dict[str, int] = {}
+        self.downloads = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/videos/generations":
+            self.started += 1
+            request_id = f"req-{self.started}"
+            self.checks[request_id] = 0
+            return httpx.Response(200, json={"request_id": request_id})
+        if path.startswith("/v1/videos/"):
+            request_id = path.rsplit("/", 1)[1]
+            self.checks[request_id] += 1
+            if self.status is not None:
+                return httpx.Response(200, json={"status": self.status})
+            if self.checks[request_id] < self.ticks:
+                return httpx.Response(202, json={"status": "pending"})
+            return httpx.Response(200, json={"video": {"url": f"https://vidgen.test/{request_id}.mp4"}})
+        if request.url.host == "vidgen.test":
+            self.downloads += 1
+            if self.downloads <= self.drop_downloads:
+                raise httpx.ReadError("connection reset", request=request)
+            return httpx.Response(200, content=self.video)
+        return httpx.Response(404)
+
+
+@pytest.fixture
+async def xai(monkeypatch):
+    monkeypatch.setattr(generator, "XAI_VIDEO_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(generator, "RETRY_BACKOFF_BASE", 0)
+    fake = FakeXai()
+    set_xai_client(httpx.AsyncClient(transport=httpx.MockTransport(fake)))
+    yield fake
+    await generator.close_xai_client()
+
+
+async def test_concurrent_renders_share_one_poller(xai) -> None:
+    xai.ticks = 3
+
+    urls = await asyncio.gather(*(generate_video_url(f"prompt {i}") for i in range(5)))
+
+    assert sorted(urls) == [f"https://vidgen.test/req-{i}.mp4" for i in range(1, 6)]
+    assert all(checks == 3 for checks in xai.checks.values())
+    # 15 status checks from one loop in ~3 ticks, not 5 polling loops
+    poller = get_video_poller()
+    assert poller.ticks in (3, 4)
+    assert poller.in_flight == 0
+
+
+async def test_expired_render_raises(xai) -> None:
+    xai.status = "expired"
+
+    with pytest.raises(RuntimeError, match="expired"):
+        await generate_video_url("prompt")
+
+
+async def test_failing_status_checks_give_up(xai) -> None:
+    def broken(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/videos/generations":
+            return httpx.Response(200, json={"request_id": "req-1"})
+        return httpx.Response(503)
+
+    set_xai_client(httpx.AsyncClient(transport=httpx.MockTransport(broken)))
+
+    with pytest.raises(RuntimeError, match="status checks failing"):
+        await generate_video_url("prompt")
+
+
+async def test_stream_video_yields_bounded_chunks(xai) -> None:
+    xai.video = bytes(range(256)) * 4096  # 1 MiB
+
+    chunks = [chunk async for chunk in stream_video("https://vidgen.test/req-1.mp4", chunk_size=64 * 1024)]
+
+    assert max(len(chunk) for chunk in chunks) <= 64 * 1024
+    assert b"".join(chunks) == xai.video
+
+
+async def test_store_video_streams_into_storage(xai, tmp_path) -> None:
+    xai.video = b"\x00\x00\x00\x18ftypmp42" + b"v" * 300_000
+    xai.drop_downloads = 1
+    set_storage(LocalStorage(tmp_path, "https://media.test"))
+    try:
+        stored = await _store_video("prompt", 10, "media/story/1/video/clip.mp4")
+    finally:
+        set_storage(None)
+
+    assert stored.url == "https://media.test/media/story/1/video/clip.mp4"
+    assert stored.size == len(xai.video)
+    assert (tmp_path / "media/story/1/video/clip.mp4").read_bytes() == xai.video
+    # The dropped download was retried against the same render
+    assert (xai.started, xai.downloads) == (1, 2)
+    assert xai.checks == {"req-1": 2}
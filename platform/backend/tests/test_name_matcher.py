@@ -0,0 +1,122 @@
+"""Tests for the compiled dweller-name matcher (utils/name_matcher.py).
+
+Covers:
+1. Same results as one word-boundary regex per name, including overlapping names
+2. Short names are skipped and keys are reported once, in order of appearance
+3. The per-world cache rebuilds when a dweller is added or invalidated
+"""
+
+import os
+import random
+import re
+from uuid import uuid4
+
+import pytest
+
+from utils.name_matcher import NameMatcher
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def _per_name_search(names: dict[str, str], text: str, min_length: int = 3) -> set[str]:
+    text_lower = text.lower()
+    return {
+        key for key, name in names.items()
+        if len(name) >= min_length and re.search(r"\b" + re.escape(name.lower()) + r"\b", text_lower)
+    }
+
+
+def test_matches_per_name_regex() -> None:
+    names = {
+        "ana": "Ana", "ana-lee": "Ana Lee", "anabel": "Anabel", "oneil": "O'Neil",
+        "tomas": "Tomás", "jr": "Kiri J.", "dash": "Dash-7", "lee": "Lee",
+    }
+    rng = random.Random(3)
+    words = ["Ana", "Lee", "Anabel", "O'Neil", "Tomás", "Kiri", "J.", "Dash-7", "Dash-70",
+             "banana", "the", "ANA", "lee's", "Kiri J.x", "_Ana", "Tomász"]
+    matcher = NameMatcher(names.items())
+    for _ in range(300):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 8)))
+        assert set(matcher.find(text)) == _per_name_search(names, text), text
+
+
+def test_overlapping_names_and_order() -> None:
+    matcher = NameMatcher([("b", "Ana Lee"), ("a", "Ana"), ("c", "Lee")])
+
+    assert matcher.find("Lee waved at Ana Lee, and Ana waved back") == ["c", "b", "a"]
+
+
+def test_short_names_are_skipped() -> None:
+    matcher = NameMatcher([("ed", "Ed"), ("edda", "Edda")])
+
+    assert matcher.find("Ed met Edda") == ["edda"]
+    assert matcher.size == 1
+
+
+@requires_postgres
+async def test_world_matcher_cache_tracks_dwellers(db_session) -> None:
+    from db import Dweller, User, UserType, World
+    from utils.name_matcher import get_world_name_matcher, invalidate_world_name_matcher
+
+    user = User(type=UserType.AGENT, username=f"names-{uuid4().hex[:8]}", name="Name Author")
+    db_session.add(user)
+    await db_session.flush()
+    world = World(
+        name="Matcher World", premise="A future " * 10, scientific_basis="Science " * 10,
+        year_setting=2100, created_by=user.id, regions=[{"name": "Core"}],
+    )
+    db_session.add(world)
+    await db_session.flush()
+
+    def dweller(name: str) -> Dweller:
+        return Dweller(
+            world_id=world.id, created_by=user.id, name=name, origin_region="Core",
+            generation="First-gen", name_context="Core naming", cultural_identity="Core",
+            age=30, role="Tester", personality="Careful " * 5, background="Lab work " * 5,
+        )
+
+    first = dweller("Oyelaran")
+    db_session.add(first)
+    await db_session.flush()
+
+    matcher = await get_world_name_matcher(db_session, world.id)
+    assert matcher.find("Oyelaran and Brightwater") == [str(first.id)]
+    assert await get_world_name_matcher(db_session, world.id) is matcher
+
+    # A new dweller changes the stamp, so the matcher is rebuilt
+    second = dweller("Brightwater")
+    db_session.add(second)
+    await db_session.flush()
+    rebuilt = await get_world_name_matcher(db_session, world.id)
+    assert rebuilt is not matcher
+    assert rebuilt.find("Oyelaran and Brightwater") == [str(first.id), str(second.id)]
+
+    # A rename made by another process (no local invalidation) is picked up
+    second.name = "Stillwater"
+    await db_session.flush()
+    renamed = await get_world_name_matcher(db_session, world.id)
+    assert renamed.find("Brightwater met Stillwater") == [str(second.id)]
+
+    # Retiring one dweller and reactivating another keeps the count, not the names
+    third = dweller("Marchetti")
+    third.is_active = False
+    db_session.add(third)
+    await db_session.flush()
+    assert await get_world_name_matcher(db_session, world.id) is renamed
+    first.is_active = False
+    third.is_active = True
+    await db_session.flush()
+    swapped = await get_world_name_matcher(db_session, world.id)
+    assert swapped.find("Oyelaran and Marchetti") == [str(third.id)]
+
+    # Activity that leaves names alone keeps the cached matcher
+    third.last_action_at = third.created_at
+    await db_session.flush()
+    assert await get_world_name_matcher(db_session, world.id) is swapped
+
+    invalidate_world_name_matcher(world.id)
+    assert await get_world_name_matcher(db_session, world.id) is not swapped
@@ -0,0 +1,194 @@
+"""Tests for per-request principal resolution (utils/principal.py).
+
+Covers:
+1. The key-hash cache honours its TTL and LRU bound; a zero TTL disables it
+2. A warm key authenticates without touching platform_api_keys
+3. Middlewares and the auth dependency share one resolution per request
+4. Keys revoked out of band stop working once the cache TTL elapses
+"""
+
+import os
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db import ApiKey
+from utils.clock import SimulatedClock, reset_clock, set_clock
+from utils.principal import (
+    Principal,
+    PrincipalCache,
+    api_key_from_headers,
+    get_principal_cache,
+    hash_api_key,
+    reset_principal_cache,
+    resolve_principal,
+)
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def _principal(key_hash: str, user_id=None) -> Principal:
+    return Principal(uuid4(), user_id or uuid4(), key_hash, None, None)
+
+
+class _ApiKeyQueries:
+    """Counts statements against platform_api_keys issued through an engine."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.selects = 0
+        self.updates = 0
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if "platform_api_keys" not in statement:
+            return
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects += 1
+        elif statement.lstrip().upper().startswith("UPDATE"):
+            self.updates += 1
+
+    def __enter__(self) -> "_ApiKeyQueries":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+class TestPrincipalCache:
+
+    def teardown_method(self) -> None:
+        reset_clock()
+
+    def test_entries_expire_after_ttl(self) -> None:
+        clock = SimulatedClock()
+        set_clock(clock)
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.put(_principal("a"))
+
+        clock.advance(seconds=29)
+        assert cache.get("a") is not None
+        clock.advance(seconds=2)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = PrincipalCache(max_entries=2)
+        cache.put(_principal("a"))
+        cache.put(_principal("b"))
+        cache.get("a")
+        cache.put(_principal("c"))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_invalidation(self) -> None:
+        cache = PrincipalCache()
+        cache.put(_principal("a"))
+        cache.put(_principal("b"))
+
+        cache.invalidate_key("b")
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        cache = PrincipalCache(ttl_seconds=0)
+        cache.put(_principal("a"))
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_last_used_write_is_throttled(self) -> None:
+        clock = SimulatedClock()
+        set_clock(clock)
+        principal = _principal("a")
+        assert principal.needs_last_used_write()
+
+        principal.last_used_at = clock.now()
+        clock.advance(seconds=59)
+        assert not principal.needs_last_used_write()
+        clock.advance(seconds=1)
+        assert principal.needs_last_used_write()
+
+    def test_api_key_from_headers(self) -> None:
+        assert api_key_from_headers([(b"x-api-key", b"dsf_a")]) == "dsf_a"
+        assert api_key_from_headers([(b"authorization", b"Bearer dsf_b")]) == "dsf_b"
+        # X-API-Key wins, matching get_current_user
+        assert api_key_from_headers([
+            (b"x-api-key", b"dsf_a"), (b"authorization", b"Bearer dsf_b"),
+        ]) == "dsf_a"
+        assert api_key_from_headers([(b"authorization", b"Basic abc")]) is None
+
+
+@requires_postgres
+class TestRequestAuthentication:
+
+    async def test_warm_key_skips_api_key_lookup(
+        self, client: AsyncClient, db_engine, test_agent: dict
+    ) -> None:
+        headers = {"X-API-Key": test_agent["api_key"]}
+        reset_principal_cache()
+
+        with _ApiKeyQueries(db_engine) as cold:
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+        with _ApiKeyQueries(db_engine) as warm:
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+
+        assert cold.selects == 1
+        assert warm.selects == 0
+        # last_used_at was just written, so the second request leaves it alone
+        assert warm.updates == 0
+
+    async def test_one_resolution_per_request(
+        self, client: AsyncClient, db_engine, db_session: AsyncSession, test_agent: dict
+    ) -> None:
+        reset_principal_cache()
+        scope: dict = {}
+
+        with _ApiKeyQueries(db_engine) as queries:
+            # What IdempotencyMiddleware, get_current_user and
+            # AgentContextMiddleware each do for the same request
+            first = await resolve_principal(scope, test_agent["api_key"], db_session)
+            second = await resolve_principal(scope, test_agent["api_key"], db_session)
+
+        assert first is second
+        assert first.user_id == UUID(test_agent["user"]["id"])
+        assert queries.selects == 1
+
+    async def test_revoked_key_rejected_once_ttl_elapses(
+        self, client: AsyncClient, db_engine, test_agent: dict
+    ) -> None:
+        api_key = test_agent["api_key"]
+        headers = {"X-API-Key": api_key}
+        clock = SimulatedClock(datetime.now(timezone.utc))
+        set_clock(clock)
+        try:
+            reset_principal_cache()
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+
+            # Keys are only ever revoked out of band
+            session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+            async with session_factory() as session:
+                await session.execute(
+                    update(ApiKey).where(ApiKey.key_hash == hash_api_key(api_key)).values(is_revoked=True)
+                )
+                await session.commit()
+
+            # Still trusted within the TTL...
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+
+            # ...and rejected once it has elapsed
+            clock.advance(seconds=get_principal_cache().ttl.total_seconds())
+            response = await client.get("/api/auth/me", headers=headers)
+            assert response.status_code == 401
+            assert response.json()["detail"]["error"] == "Invalid or revoked API key"
+        finally:
+            reset_clock()
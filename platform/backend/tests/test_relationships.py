@@ -30,16 +30,20 @@ class TestUpdateRelationshipsForStory:
     @pytest.fixture
     async def world_with_dwellers(self, db_session):
         """Create a world and several dwellers for testing."""
-        from db.models import World, Dweller
+        from db.models import User, UserType, World, Dweller
         from utils.deterministic import deterministic_uuid4
 
+        user = User(type=UserType.AGENT, username=f"rel-{uuid4().hex[:8]}", name="Relationship Author")
+        db_session.add(user)
+        await db_session.flush()
+
         world = World(
             name="Test Relationship World",
             premise="A world for testing relationships " * 5,
             scientific_basis="Based on science " * 10,
             year_setting=2100,
-            created_by=uuid4(),
-            status="approved",
+            created_by=user.id,
+            regions=[{"name": "Test Quarter"}],
         )
         db_session.add(world)
         await db_session.flush()
@@ -48,7 +52,13 @@ class TestUpdateRelationshipsForStory:
         for name in ["Alice", "Bob", "Carol"]:
             d = Dweller(
                 world_id=world.id,
+                created_by=user.id,
                 name=name,
+                origin_region="Test Quarter",
+                generation="First-gen",
+                name_context="Named in the test quarter",
+                cultural_identity="Test Quarter native",
+                age=30,
                 role=f"{name}'s role",
                 personality=f"{name}'s personality " * 5,
                 background=f"{name}'s background " * 5,
@@ -70,7 +80,7 @@ class TestUpdateRelationshipsForStory:
 
         story = Story(
             world_id=world.id,
-            author_id=uuid4(),
+            author_id=world.created_by,
             title="Alice meets Bob",
             content=(
                 f"Alice walked into the marketplace. Bob was already there, waiting patiently. "
@@ -95,7 +105,9 @@ class TestUpdateRelationshipsForStory:
         rels = result.scalars().all()
         assert len(rels) == 1
         rel = rels[0]
-        assert rel.co_occurrence_count == 1
+        # Alice is the perspective dweller, so the pair counts as a directional mention
+        assert rel.story_mention_a_to_b + rel.story_mention_b_to_a == 1
+        assert rel.co_occurrence_count == 0
         assert str(story.id) in rel.shared_story_ids
 
     async def test_two_stories_increments_count(self, db_session, world_with_dwellers):
@@ -109,7 +121,7 @@ class TestUpdateRelationshipsForStory:
         for i in range(2):
             story = Story(
                 world_id=world.id,
-                author_id=uuid4(),
+                author_id=world.created_by,
                 title=f"Alice and Bob story {i}",
                 content=(
                     f"Alice and Bob met again for the {i}th time. "
@@ -131,7 +143,8 @@ class TestUpdateRelationshipsForStory:
         )
         rels = result.scalars().all()
         assert len(rels) == 1
-        assert rels[0].co_occurrence_count == 2
+        assert rels[0].story_mention_a_to_b + rels[0].story_mention_b_to_a == 2
+        assert len(rels[0].shared_story_ids) == 2
 
     async def test_three_dwellers_creates_three_relationships(self, db_session, world_with_dwellers):
         """Story mentioning 3 dwellers → 3 relationships (A-B, A-C, B-C)."""
@@ -143,7 +156,7 @@ class TestUpdateRelationshipsForStory:
 
         story = Story(
             world_id=world.id,
-            author_id=uuid4(),
+            author_id=world.created_by,
             title="Three way meeting",
             content=(
                 "Alice, Bob, and Carol gathered in the council chamber. "
@@ -160,12 +173,89 @@ class TestUpdateRelationshipsForStory:
 
         result = await db_session.execute(select(DwellerRelationship))
         rels = result.scalars().all()
-        # Should have A-B, A-C, B-C
+        # Should have A-B, A-C (perspective mentions) and B-C (co-occurrence)
         assert len(rels) == 3
         for rel in rels:
-            assert rel.co_occurrence_count == 1
+            pair = {rel.dweller_a_id, rel.dweller_b_id}
+            if alice.id in pair:
+                assert rel.story_mention_a_to_b + rel.story_mention_b_to_a == 1
+                assert rel.co_occurrence_count == 0
+            else:
+                assert rel.co_occurrence_count == 1
             assert str(story.id) in rel.shared_story_ids
 
+    async def test_statement_count_independent_of_mentions(self, db_session, db_engine, world_with_dwellers):
+        """A story mentioning many dwellers costs the same round trips as one mentioning two."""
+        from sqlalchemy import event, func, select
+        from db.models import Dweller, DwellerRelationship, Story, StoryPerspective
+        from utils.name_matcher import get_world_name_matcher
+        from utils.relationship_service import update_relationships_for_story
+
+        world, [alice, bob, carol] = world_with_dwellers
+        names = [f"Crewmate{i:02d}" for i in range(20)]
+        for name in names:
+            db_session.add(Dweller(
+                world_id=world.id, created_by=world.created_by, name=name,
+                origin_region="Test Quarter", generation="First-gen", name_context="Crew roster",
+                cultural_identity="Crew", age=25, role="Crew", personality="Steady " * 5,
+                background="Ship crew " * 5,
+            ))
+        await db_session.flush()
+        # Build the world's name matcher up front; both stories then reuse it
+        await get_world_name_matcher(db_session, world.id)
+
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        async def run(content: str) -> int:
+            story = Story(
+                world_id=world.id, author_id=world.created_by, title="Roll call", content=content,
+                perspective=StoryPerspective.THIRD_PERSON_OMNISCIENT, perspective_dweller_id=alice.id,
+                video_prompt="The crew gathers on deck " * 3,
+            )
+            db_session.add(story)
+            await db_session.flush()
+            statements.clear()
+            event.listen(db_engine.sync_engine, "before_cursor_execute", _count)
+            try:
+                await update_relationships_for_story(db_session, story)
+            finally:
+                event.remove(db_engine.sync_engine, "before_cursor_execute", _count)
+            return len(statements)
+
+        small = await run("Alice handed Bob the manifest.")
+        large = await run("Alice called the roll: " + ", ".join(names) + ".")
+
+        assert small == large == 2
+        # 20 mentions of the perspective dweller plus 190 co-occurring crew pairs
+        pairs = await db_session.scalar(select(func.count()).select_from(DwellerRelationship))
+        assert pairs == 1 + 20 + 190
+
+    async def test_graph_normalizes_against_strongest_pair(self, db_session, world_with_dwellers):
+        """combined_score is raw_score over the global max, so the strongest edge scores 1.0."""
+        from db.models import Story, StoryPerspective
+        from utils.relationship_service import get_dweller_graph, update_relationships_for_story
+
+        world, [alice, bob, carol] = world_with_dwellers
+        for content in ["Alice and Bob talk.", "Alice and Bob talk again.", "Alice sees Carol."]:
+            story = Story(
+                world_id=world.id, author_id=world.created_by, title="Talk", content=content,
+                perspective=StoryPerspective.THIRD_PERSON_OMNISCIENT, perspective_dweller_id=alice.id,
+                video_prompt="Two dwellers talk in a quiet corner " * 3,
+            )
+            db_session.add(story)
+            await db_session.flush()
+            await update_relationships_for_story(db_session, story)
+
+        graph = await get_dweller_graph(db_session, world_id=world.id)
+        scores = {
+            frozenset((edge["source"], edge["target"])): edge["combined_score"] for edge in graph["edges"]
+        }
+        assert scores[frozenset((str(alice.id), str(bob.id)))] == 1.0
+        assert scores[frozenset((str(alice.id), str(carol.id)))] == 0.5
+
 
 # ---------------------------------------------------------------------------
 # API integration tests
@@ -238,22 +328,32 @@ class TestUpdateRelationshipsForAction:
     @pytest.fixture
     async def world_with_two_dwellers(self, db_session):
         """Create a world with Alice and Bob."""
-        from db.models import World, Dweller
+        from db.models import User, UserType, World, Dweller
+
+        user = User(type=UserType.AGENT, username=f"rel-{uuid4().hex[:8]}", name="Relationship Author")
+        db_session.add(user)
+        await db_session.flush()
 
         world = World(
             name="Speak Test World",
             premise="A world for testing speak relationships " * 5,
             scientific_basis="Based on science " * 10,
             year_setting=2100,
-            created_by=uuid4(),
-            status="approved",
+            created_by=user.id,
+            regions=[{"name": "Test Quarter"}],
         )
         db_session.add(world)
         await db_session.flush()
 
         alice = Dweller(
             world_id=world.id,
+            created_by=user.id,
             name="Alice",
+            origin_region="Test Quarter",
+            generation="First-gen",
+            name_context="Named in the test quarter",
+            cultural_identity="Test Quarter native",
+            age=30,
             role="Alice's role",
             personality="Alice's personality " * 5,
             background="Alice's background " * 5,
@@ -261,7 +361,13 @@ class TestUpdateRelationshipsForAction:
         )
         bob = Dweller(
             world_id=world.id,
+            created_by=user.id,
             name="Bob",
+            origin_region="Test Quarter",
+            generation="First-gen",
+            name_context="Named in the test quarter",
+            cultural_identity="Test Quarter native",
+            age=30,
             role="Bob's role",
             personality="Bob's personality " * 5,
             background="Bob's background " * 5,
@@ -282,7 +388,8 @@ class TestUpdateRelationshipsForAction:
 
         action = DwellerAction(
             dweller_id=alice.id,
-            actor_id=uuid4(),
+            world_id=world.id,
+            actor_id=world.created_by,
             action_type="speak",
             target="Bob",
             content="Hello Bob, how are you?",
@@ -314,7 +421,7 @@ class TestUpdateRelationshipsForAction:
             assert rel.speak_count_b_to_a == 1
             assert rel.speak_count_a_to_b == 0
 
-        assert rel.combined_score > 0
+        assert rel.raw_score > 0
         assert rel.last_interaction_at is not None
 
     async def test_speak_back_increments_reverse_count(self, db_session, world_with_two_dwellers):
@@ -328,7 +435,8 @@ class TestUpdateRelationshipsForAction:
         # Alice → Bob
         action1 = DwellerAction(
             dweller_id=alice.id,
-            actor_id=uuid4(),
+            world_id=world.id,
+            actor_id=world.created_by,
             action_type="speak",
             target="Bob",
             content="Hello Bob!",
@@ -342,7 +450,8 @@ class TestUpdateRelationshipsForAction:
         # Bob → Alice
         action2 = DwellerAction(
             dweller_id=bob.id,
-            actor_id=uuid4(),
+            world_id=world.id,
+            actor_id=world.created_by,
             action_type="speak",
             target="Alice",
             content="Hello Alice, I heard you!",
@@ -383,7 +492,8 @@ class TestUpdateRelationshipsForAction:
         # Alice speaks first
         action1 = DwellerAction(
             dweller_id=alice.id,
-            actor_id=uuid4(),
+            world_id=world.id,
+            actor_id=world.created_by,
             action_type="speak",
             target="Bob",
             content="Bob, are you there?",
@@ -397,7 +507,8 @@ class TestUpdateRelationshipsForAction:
         # Bob replies (in_reply_to_action_id = action1.id, speaker = alice = target of this action)
         action2 = DwellerAction(
             dweller_id=bob.id,
-            actor_id=uuid4(),
+            world_id=world.id,
+            actor_id=world.created_by,
             action_type="speak",
             target="Alice",
             content="Yes Alice, I am here!",
@@ -431,7 +542,7 @@ class TestUpdateRelationshipsForAction:
 
         story = Story(
             world_id=world.id,
-            author_id=uuid4(),
+            author_id=world.created_by,
             title="Alice thinks about Bob",
             content="Alice found herself thinking about Bob often. Bob had said something profound.",
             perspective=StoryPerspective.FIRST_PERSON_AGENT,
@@ -475,7 +586,8 @@ class TestUpdateRelationshipsForAction:
 
         action = DwellerAction(
             dweller_id=alice.id,
-            actor_id=uuid4(),
+            world_id=world.id,
+            actor_id=world.created_by,
             action_type="move",
             target="Bob",  # move target is a region, but let's test the guard
             content="Alice moved toward the north.",
@@ -490,3 +602,38 @@ class TestUpdateRelationshipsForAction:
         result = await db_session.execute(select(DwellerRelationship))
         rels = result.scalars().all()
         assert len(rels) == 0
+
+    async def test_resolved_target_skips_lookup(self, db_session, db_engine, world_with_two_dwellers):
+        """A target already resolved by take_action is reused: the update is a single upsert."""
+        from sqlalchemy import event
+        from db.models import DwellerAction
+        from utils.relationship_service import update_relationships_for_action
+
+        world, alice, bob = world_with_two_dwellers
+
+        action = DwellerAction(
+            dweller_id=alice.id,
+            world_id=world.id,
+            actor_id=world.created_by,
+            action_type="speak",
+            target="bob",
+            content="Bob, a word.",
+            importance=0.5,
+            escalation_eligible=False,
+        )
+        db_session.add(action)
+        await db_session.flush()
+
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", _count)
+        try:
+            await update_relationships_for_action(db_session, action, bob)
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", _count)
+
+        assert len(statements) == 1
+        assert statements[0].startswith("INSERT INTO platform_dweller_relationships")
@@ -0,0 +1,161 @@
+"""Tests for the media storage backends (storage/).
+
+Covers:
+1. LocalStorage writes, streams and deletes files under its root
+2. A failed stream leaves no partial file behind
+3. R2Storage sends small streams as one PUT and large ones as equal-size parts
+4. A failed multipart upload is aborted
+5. Backend selection from MEDIA_STORAGE_BACKEND
+"""
+
+import threading
+
+import pytest
+
+from storage import LocalStorage, R2Storage, get_storage, set_storage
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class FakeS3Client:
+    """Records the boto3 calls R2Storage makes and the thread it made them on."""
+
+    def __init__(self, fail_on_part: int | None = None):
+        self.calls: list[tuple[str, dict]] = []
+        self.threads: set[str] = set()
+        self.fail_on_part = fail_on_part
+
+    def _record(self, name: str, kwargs: dict) -> None:
+        self.calls.append((name, kwargs))
+        self.threads.add(threading.current_thread().name)
+
+    def put_object(self, **kwargs):
+        self._record("put_object", kwargs)
+
+    def create_multipart_upload(self, **kwargs):
+        self._record("create_multipart_upload", kwargs)
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs):
+        self._record("upload_part", kwargs)
+        if kwargs["PartNumber"] == self.fail_on_part:
+            raise ConnectionError("connection reset")
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self._record("complete_multipart_upload", kwargs)
+
+    def abort_multipart_upload(self, **kwargs):
+        self._record("abort_multipart_upload", kwargs)
+
+    def names(self) -> list[str]:
+        return [name for name, _ in self.calls]
+
+
+class TestLocalStorage:
+
+    async def test_upload_and_delete(self, tmp_path) -> None:
+        storage = LocalStorage(tmp_path, "https://media.test")
+
+        stored = await storage.upload(b"png-bytes", "media/world/1/cover.png", "image/png")
+
+        assert stored.url == "https://media.test/media/world/1/cover.png"
+        assert stored.size == 9
+        assert (tmp_path / "media/world/1/cover.png").read_bytes() == b"png-bytes"
+
+        await storage.delete("media/world/1/cover.png")
+        assert not (tmp_path / "media/world/1/cover.png").exists()
+
+    async def test_upload_stream_writes_chunks(self, tmp_path) -> None:
+        storage = LocalStorage(tmp_path)
+
+        stored = await storage.upload_stream(_chunks(b"a" * 10, b"b" * 5), "v.mp4", "video/mp4")
+
+        assert stored.size == 15
+        assert stored.url == (tmp_path / "v.mp4").as_uri()
+        assert (tmp_path / "v.mp4").read_bytes() == b"a" * 10 + b"b" * 5
+
+    async def test_failed_stream_leaves_no_file(self, tmp_path) -> None:
+        async def broken():
+            yield b"partial"
+            raise ConnectionError("download dropped")
+
+        storage = LocalStorage(tmp_path)
+        with pytest.raises(ConnectionError):
+            await storage.upload_stream(broken(), "media/v.mp4", "video/mp4")
+
+        assert list((tmp_path / "media").iterdir()) == []
+
+    async def test_rejects_keys_outside_root(self, tmp_path) -> None:
+        storage = LocalStorage(tmp_path / "root")
+        with pytest.raises(ValueError):
+            await storage.upload(b"x", "../escape.png", "image/png")
+
+
+class TestR2Storage:
+
+    async def test_upload_runs_off_the_event_loop(self) -> None:
+        client = FakeS3Client()
+        storage = R2Storage(bucket="b", client=client)
+
+        stored = await storage.upload(b"png", "k.png", "image/png")
+
+        assert client.names() == ["put_object"]
+        assert stored.size == 3
+        assert all(name.startswith("r2") for name in client.threads)
+        await storage.close()
+
+    async def test_small_stream_is_a_single_put(self) -> None:
+        client = FakeS3Client()
+        storage = R2Storage(bucket="b", part_size=8, client=client)
+
+        stored = await storage.upload_stream(_chunks(b"abc", b"de"), "k", "video/mp4")
+
+        assert client.names() == ["put_object"]
+        assert client.calls[0][1]["Body"] == b"abcde"
+        assert stored.size == 5
+        await storage.close()
+
+    async def test_large_stream_uploads_equal_parts(self) -> None:
+        client = FakeS3Client()
+        storage = R2Storage(bucket="b", part_size=8, client=client)
+
+        stored = await storage.upload_stream(_chunks(b"a" * 5, b"b" * 7, b"c" * 9), "k", "video/mp4")
+
+        assert stored.size == 21
+        assert client.names() == [
+            "create_multipart_upload", "upload_part", "upload_part", "upload_part", "complete_multipart_upload",
+        ]
+        parts = [kwargs["Body"] for name, kwargs in client.calls if name == "upload_part"]
+        assert [len(p) for p in parts] == [8, 8, 5]
+        assert b"".join(parts) == b"a" * 5 + b"b" * 7 + b"c" * 9
+        assert client.calls[-1][1]["MultipartUpload"]["Parts"] == [
+            {"PartNumber": 1, "ETag": "etag-1"},
+            {"PartNumber": 2, "ETag": "etag-2"},
+            {"PartNumber": 3, "ETag": "etag-3"},
+        ]
+        await storage.close()
+
+    async def test_failed_multipart_upload_is_aborted(self) -> None:
+        client = FakeS3Client(fail_on_part=2)
+        storage = R2Storage(bucket="b", part_size=4, client=client)
+
+        with pytest.raises(ConnectionError):
+            await storage.upload_stream(_chunks(b"x" * 12), "k", "video/mp4")
+
+        assert client.names()[-1] == "abort_multipart_upload"
+        assert client.calls[-1][1]["UploadId"] == "upload-1"
+        await storage.close()
+
+
+def test_backend_from_environment(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("MEDIA_STORAGE_BACKEND", "local")
+    set_storage(None)
+    try:
+        assert isinstance(get_storage(), LocalStorage)
+        assert get_storage() is get_storage()
+    finally:
+        set_storage(None)
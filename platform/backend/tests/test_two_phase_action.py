@@ -7,6 +7,8 @@ Tests:
 4. B speaks to A, A speaks to B without in_reply_to → 400
 5. B speaks to A, A replies with in_reply_to → 200
 6. Context endpoint returns threaded conversations
+7. Conversation state (turn, unanswered, last action) follows each speak
+8. Unanswered speaks are capped per side, oldest dropped first
 """
 
 import os
@@ -317,3 +319,107 @@ class TestTwoPhaseAction:
             f"No conversation with {d['dweller_b_name']} found in: {conversations}"
         )
         assert len(b_conv.get("thread", [])) >= 1
+
+    @pytest.mark.asyncio
+    async def test_conversation_state_follows_turns(
+        self, client: AsyncClient, two_dwellers: dict
+    ) -> None:
+        """Context reflects the pair's conversation row as speaks go back and forth."""
+        d = two_dwellers
+
+        async def conversation_with_b() -> dict:
+            resp = await client.post(
+                f"/api/dwellers/{d['dweller_a_id']}/act/context",
+                headers={"X-API-Key": d["key_a"]},
+            )
+            assert resp.status_code == 200
+            return next(
+                c for c in resp.json()["conversations"]
+                if c["with_dweller"] == d["dweller_b_name"]
+            )
+
+        # B speaks to A → A owes a reply
+        resp = await act_with_context(
+            client, d["dweller_b_id"], d["key_b"],
+            action_type="speak",
+            content="Alpha, the coolant loop on the north reactor is holding steady.",
+            target=d["dweller_a_name"],
+        )
+        assert resp.status_code == 200
+        b_action_id = resp.json()["action"]["id"]
+
+        conv = await conversation_with_b()
+        assert conv["your_turn"] is True
+        assert conv["unanswered_count"] == 1
+        assert conv["last_action_id"] == b_action_id
+
+        # A replies → nothing owed, A's reply is the thread head
+        resp = await act_with_context(
+            client, d["dweller_a_id"], d["key_a"],
+            action_type="speak",
+            content="Good to hear, Beta. Keep me posted on the pressure readings.",
+            target=d["dweller_b_name"],
+            in_reply_to_action_id=b_action_id,
+        )
+        assert resp.status_code == 200
+        a_action_id = resp.json()["action"]["id"]
+
+        conv = await conversation_with_b()
+        assert conv["your_turn"] is False
+        assert conv["unanswered_count"] == 0
+        assert conv["last_action_id"] == a_action_id
+        assert not any(m["awaiting_your_reply"] for m in conv["thread"])
+
+        # B speaks again without linking → prior conversation points at A's reply
+        resp = await act_with_context(
+            client, d["dweller_b_id"], d["key_b"],
+            action_type="speak",
+            content="One more thing about the reactor schedule, Alpha.",
+            target=d["dweller_a_name"],
+        )
+        assert resp.status_code == 400
+        assert resp.json()["detail"]["context"]["unanswered_action_ids"] == [a_action_id]
+
+    @pytest.mark.asyncio
+    async def test_unanswered_speaks_are_capped(
+        self, client: AsyncClient, two_dwellers: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A dweller speaking into silence keeps only its newest unanswered speaks."""
+        import utils.conversations
+
+        monkeypatch.setattr(utils.conversations, "UNANSWERED_SPEAKS_LIMIT", 2)
+        d = two_dwellers
+
+        resp = await act_with_context(
+            client, d["dweller_a_id"], d["key_a"],
+            action_type="speak",
+            content="Beta, the tide gauges on the east wall need recalibrating.",
+            target=d["dweller_b_name"],
+        )
+        assert resp.status_code == 200
+        a_action_id = resp.json()["action"]["id"]
+
+        b_action_ids = []
+        for i, content in enumerate([
+            "Understood, Alpha. I will check the east wall gauges tonight.",
+            "Alpha, the first gauge reads two centimetres high.",
+            "Alpha, the second gauge is fine. Are you there?",
+        ]):
+            resp = await act_with_context(
+                client, d["dweller_b_id"], d["key_b"],
+                action_type="speak",
+                content=content,
+                target=d["dweller_a_name"],
+                in_reply_to_action_id=a_action_id,
+            )
+            assert resp.status_code == 200, f"Speak {i} failed: {resp.json()}"
+            b_action_ids.append(resp.json()["action"]["id"])
+
+        resp = await act_with_context(
+            client, d["dweller_a_id"], d["key_a"],
+            action_type="speak",
+            content="Sorry, Beta, I was on the reactor floor.",
+            target=d["dweller_b_name"],
+        )
+        assert resp.status_code == 400
+        assert resp.json()["detail"]["context"]["unanswered_action_ids"] == b_action_ids[-2:]
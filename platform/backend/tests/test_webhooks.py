@@ -0,0 +1,219 @@
+"""Tests for the webhook delivery transport (utils/webhooks.py).
+
+Covers:
+1. Hostname lookups are cached for their TTL (failures more briefly)
+2. SSRF validation uses the cached async resolver
+3. Backoff grows exponentially and is capped
+4. A batch delivers concurrently, within the per-host limit
+5. Failed callbacks are rescheduled and skipped until due
+"""
+
+import asyncio
+import os
+import socket
+import time
+
+import pytest
+from aiohttp import web
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import utils.webhooks as webhooks
+from db import Notification, NotificationStatus
+from tests.test_callback_delivery import MockCallbackServer
+from utils.clock import SimulatedClock, now as utc_now, reset_clock, set_clock
+from utils.notifications import process_pending_notifications, validate_callback_url
+from utils.webhooks import DnsCache, host_slot, next_attempt_at, reset_dns_cache
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+@pytest.fixture
+async def lookups(monkeypatch) -> dict[str, int]:
+    """Replace the loop resolver with a counting fake (public.example -> 93.184.216.34)."""
+    calls: dict[str, int] = {}
+    answers = {"public.example": "93.184.216.34", "internal.example": "10.0.0.7"}
+
+    async def getaddrinfo(host, port, family=0, **kwargs):
+        calls[host] = calls.get(host, 0) + 1
+        if host not in answers:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (answers[host], 0))]
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo, raising=False)
+    reset_dns_cache()
+    yield calls
+    reset_dns_cache()
+
+
+class TestDnsCache:
+
+    def teardown_method(self) -> None:
+        reset_clock()
+
+    async def test_lookups_cached_for_ttl(self, lookups: dict[str, int]) -> None:
+        clock = SimulatedClock()
+        set_clock(clock)
+        cache = DnsCache(ttl_seconds=300)
+
+        assert await cache.resolve("public.example") == {"93.184.216.34"}
+        await cache.resolve("public.example")
+        assert lookups["public.example"] == 1
+
+        clock.advance(seconds=301)
+        await cache.resolve("public.example")
+        assert lookups["public.example"] == 2
+
+    async def test_failures_cached_briefly(self, lookups: dict[str, int]) -> None:
+        clock = SimulatedClock()
+        set_clock(clock)
+        cache = DnsCache(negative_ttl_seconds=30)
+
+        for _ in range(2):
+            with pytest.raises(socket.gaierror):
+                await cache.resolve("missing.example")
+        assert lookups["missing.example"] == 1
+
+        clock.advance(seconds=31)
+        with pytest.raises(socket.gaierror):
+            await cache.resolve("missing.example")
+        assert lookups["missing.example"] == 2
+
+    async def test_ssrf_validation_uses_cache(self, lookups: dict[str, int]) -> None:
+        assert await validate_callback_url("https://public.example/hook") == (True, None)
+        assert await validate_callback_url("https://public.example/other") == (True, None)
+        assert lookups["public.example"] == 1
+
+        is_valid, error = await validate_callback_url("https://internal.example/hook")
+        assert not is_valid
+        assert "Private IP" in error
+
+        is_valid, error = await validate_callback_url("https://missing.example/hook")
+        assert not is_valid
+        assert "DNS resolution failed" in error
+
+
+class TestScheduling:
+
+    def teardown_method(self) -> None:
+        reset_clock()
+
+    def test_backoff_doubles_and_caps(self) -> None:
+        clock = SimulatedClock()
+        set_clock(clock)
+        base = webhooks.WEBHOOK_RETRY_BASE_SECONDS
+
+        for retry_count in (1, 2, 3):
+            delay = (next_attempt_at(retry_count) - clock.now()).total_seconds()
+            expected = base * 2 ** (retry_count - 1)
+            assert expected <= delay <= expected * 1.1
+
+        delay = (next_attempt_at(30) - clock.now()).total_seconds()
+        assert delay <= webhooks.WEBHOOK_RETRY_MAX_SECONDS * 1.1
+
+    async def test_host_slots_are_per_host(self) -> None:
+        assert host_slot("http://a.example/x") is host_slot("http://A.example/y")
+        assert host_slot("http://a.example/x") is not host_slot("http://a.example:8080/x")
+
+
+class SlowCallbackServer(MockCallbackServer):
+    """Mock receiver that holds each request and records peak concurrency."""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle_callback(self, request: web.Request) -> web.Response:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return await super().handle_callback(request)
+        finally:
+            self.in_flight -= 1
+
+
+async def _agent_with_callback(client: AsyncClient, username: str, callback_url: str) -> str:
+    response = await client.post(
+        "/api/auth/agent",
+        json={"name": username, "username": username, "callback_url": callback_url},
+    )
+    return response.json()["agent"]["id"]
+
+
+@requires_postgres
+class TestBatchDelivery:
+
+    async def test_batch_delivers_concurrently_within_host_limit(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        server = SlowCallbackServer(delay=0.2)
+        await server.start()
+        try:
+            agent_id = await _agent_with_callback(
+                client, "slow-hook-agent", f"http://127.0.0.1:{server.port}/callback"
+            )
+            for i in range(8):
+                db_session.add(Notification(
+                    user_id=agent_id, notification_type="test_batch", data={"i": i},
+                    status=NotificationStatus.PENDING, retry_count=0,
+                ))
+            await db_session.commit()
+
+            started = time.perf_counter()
+            stats = await process_pending_notifications(db_session, batch_size=10)
+            elapsed = time.perf_counter() - started
+        finally:
+            await server.stop()
+
+        assert stats["sent"] == 8
+        assert server.peak == webhooks.WEBHOOK_PER_HOST_CONCURRENCY
+        # Serial delivery would take 8 x 0.2s
+        assert elapsed < 8 * 0.2 / 2
+
+    async def test_failed_callback_waits_for_backoff(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        server = MockCallbackServer()
+        await server.start()
+        server.should_fail = True
+        server.max_failures = 1
+        clock = SimulatedClock(start=utc_now())
+        set_clock(clock)
+        try:
+            agent_id = await _agent_with_callback(
+                client, "backoff-agent", f"http://127.0.0.1:{server.port}/callback"
+            )
+            notification = Notification(
+                user_id=agent_id, notification_type="test_backoff", data={},
+                status=NotificationStatus.PENDING, retry_count=0,
+            )
+            db_session.add(notification)
+            await db_session.commit()
+
+            first = await process_pending_notifications(db_session, batch_size=10)
+            await db_session.refresh(notification)
+            assert first["retrying"] == 1
+            assert notification.next_attempt_at > clock.now()
+
+            # Not due yet: the row is left alone
+            skipped = await process_pending_notifications(db_session, batch_size=10)
+            assert skipped["processed"] == 0
+
+            clock.advance(seconds=(notification.next_attempt_at - clock.now()).total_seconds() + 1)
+            retried = await process_pending_notifications(db_session, batch_size=10)
+            await db_session.refresh(notification)
+        finally:
+            reset_clock()
+            await server.stop()
+
+        assert retried["sent"] == 1
+        assert notification.status == NotificationStatus.SENT
+        assert notification.next_attempt_at is None
+        assert len(server.received_callbacks) == 2
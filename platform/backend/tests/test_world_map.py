@@ -0,0 +1,216 @@
+"""Tests for the stored semantic world map (utils/map_service.py, GET /worlds/map).
+
+Covers:
+1. New worlds are projected next to their nearest laid-out neighbours
+2. Re-laid-out clusters keep the id (and label) of the cluster they continue
+3. refresh_world_map writes one version per world set and places additions
+   incrementally without moving existing worlds
+4. GET /worlds/map reads the stored layout and queues a refresh when stale
+5. Large world sets take the landmark-MDS path and still separate themes
+"""
+
+import os
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import utils.map_service as map_service
+from utils.map_service import _match_clusters, compute_layout, place_new_worlds, world_set_version
+
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+def _embedding(*hot: int, dim: int = 1536) -> list[float]:
+    emb = np.zeros(dim)
+    emb[list(hot)] = 1.0
+    return (emb / np.linalg.norm(emb)).tolist()
+
+
+def test_new_world_lands_near_its_neighbours() -> None:
+    known = np.array([_embedding(0, 1), _embedding(0, 2), _embedding(500, 501), _embedding(500, 502)])
+    coords = np.array([[-0.8, -0.8], [-0.7, -0.9], [0.8, 0.8], [0.9, 0.7]])
+    centroids = np.array([_embedding(0), _embedding(500)])
+
+    placed, clusters = place_new_worlds(np.array([_embedding(500, 501, 502)]), known, coords, centroids, k=3)
+
+    assert clusters.tolist() == [1]
+    assert placed[0][0] > 0.6 and placed[0][1] > 0.6
+
+
+def test_surviving_clusters_keep_their_ids() -> None:
+    old = {0: {"a", "b", "c"}, 1: {"d", "e"}, 2: {"f"}}
+    new = {0: {"d", "e", "g"}, 1: {"a", "b", "c"}, 2: {"h", "i"}}
+
+    mapping = _match_clusters(new, old)
+
+    assert mapping[1] == 0
+    assert mapping[0] == 1
+    # No overlap with the old cluster 2, so a fresh id
+    assert mapping[2] not in (0, 1, 2)
+
+
+def test_world_set_version_ignores_order() -> None:
+    assert world_set_version({"a": "1", "b": "2"}) == world_set_version({"b": "2", "a": "1"})
+    assert world_set_version({"a": "1", "b": "2"}) != world_set_version({"a": "1", "b": "3"})
+
+
+def test_large_layout_separates_themes(monkeypatch) -> None:
+    monkeypatch.setattr(map_service, "MAP_EXACT_LAYOUT_MAX", 50)
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(4, 1536))
+    themes = rng.integers(0, 4, 600)
+    X = (centers[themes] + 0.8 * rng.normal(size=(600, 1536))).astype(np.float32)
+
+    coords, labels = compute_layout(X, n_clusters=4)
+
+    assert coords.shape == (600, 2)
+    assert coords.min() >= -1.0 and coords.max() <= 1.0
+    # Each theme is one cluster and sits tighter than the map as a whole
+    assert all(len(set(labels[themes == t])) == 1 for t in range(4))
+    spread = np.linalg.norm(coords - coords.mean(axis=0), axis=1).mean()
+    for t in range(4):
+        members = coords[themes == t]
+        assert np.linalg.norm(members - members.mean(axis=0), axis=1).mean() < 0.5 * spread
+
+
+@requires_postgres
+class TestRefreshWorldMap:
+
+    @pytest.fixture(autouse=True)
+    def _no_llm_labels(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    @pytest.fixture
+    async def author(self, db_session):
+        from db import User, UserType
+
+        user = User(type=UserType.AGENT, username=f"map-{uuid4().hex[:8]}", name="Map Author")
+        db_session.add(user)
+        await db_session.flush()
+        return user
+
+    async def _world(self, db, author, name: str, embedding: list[float]):
+        from db import World
+
+        world = World(
+            name=name,
+            premise=f"{name} explores a future " * 5,
+            scientific_basis="Plausible science " * 10,
+            year_setting=2150,
+            created_by=author.id,
+            regions=[{"name": "Core"}],
+            premise_embedding=embedding,
+        )
+        db.add(world)
+        await db.flush()
+        return world
+
+    async def test_additions_are_placed_without_relayout(self, db_session, author, monkeypatch) -> None:
+        from db import WorldMapLayout
+        from utils.map_service import refresh_world_map
+
+        worlds = []
+        for i in range(8):
+            worlds.append(await self._world(db_session, author, f"Ocean {i}", _embedding(0, 10 + i)))
+            worlds.append(await self._world(db_session, author, f"Orbit {i}", _embedding(700, 710 + i)))
+
+        first = await refresh_world_map(db_session)
+        assert first.laid_out_count == 16 and first.placed_count == 0
+        assert len(first.positions) == 16
+        # Unchanged world set: same version, nothing recomputed
+        assert (await refresh_world_map(db_session)).version_hash == first.version_hash
+
+        async def no_relayout(*args, **kwargs):
+            raise AssertionError("full layout should not run for a small addition")
+
+        monkeypatch.setattr(map_service, "_full_layout", no_relayout)
+        newcomer = await self._world(db_session, author, "Orbit 9", _embedding(700, 710, 711))
+        second = await refresh_world_map(db_session)
+
+        assert second.version_hash != first.version_hash
+        assert second.placed_count == 1
+        assert second.cluster_labels == first.cluster_labels
+        for world_id, pos in first.positions.items():
+            assert second.positions[world_id] == pos
+        # KMeans (k=8) splits each theme into several clusters; any Orbit one will do
+        orbit_clusters = {first.positions[str(w.id)]["cluster"] for w in worlds if w.name.startswith("Orbit")}
+        assert second.positions[str(newcomer.id)]["cluster"] in orbit_clusters
+        assert await db_session.scalar(select(func.count()).select_from(WorldMapLayout)) == 1
+
+    async def test_relayout_keeps_cluster_labels(self, db_session, author) -> None:
+        from db import WorldMapLayout
+        from utils.map_service import refresh_world_map
+
+        # Eight well-separated themes, so KMeans (k=8) finds the same groups twice
+        for theme in range(8):
+            for i in range(2):
+                await self._world(
+                    db_session, author, f"Theme {theme}.{i}", _embedding(theme * 150, theme * 150 + 1 + i)
+                )
+        first = await refresh_world_map(db_session)
+        # Pretend the labels came from the LLM
+        first.cluster_labels = {cid: f"theme {cid}" for cid in first.cluster_labels}
+        await db_session.flush()
+
+        # Growing the world set by half forces a full layout
+        for theme in range(8):
+            await self._world(db_session, author, f"Theme {theme}.2", _embedding(theme * 150, theme * 150 + 3))
+        second = await refresh_world_map(db_session)
+
+        assert second.placed_count == 0 and second.laid_out_count == 24
+        assert second.cluster_labels == first.cluster_labels
+        assert await db_session.scalar(select(func.count()).select_from(WorldMapLayout)) == 1
+
+
+@requires_postgres
+async def test_map_endpoint_reads_stored_layout(client, db_engine, monkeypatch) -> None:
+    from db import Job, User, UserType, World
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    sessions = async_sessionmaker(db_engine, expire_on_commit=False)
+    async with sessions() as db:
+        user = User(type=UserType.AGENT, username=f"map-{uuid4().hex[:8]}", name="Map Author")
+        db.add(user)
+        await db.flush()
+        for i, hot in enumerate([(0, 1), (0, 2), (900, 901), (900, 902)]):
+            db.add(World(
+                name=f"World {i}", premise="A future " * 10, scientific_basis="Science " * 10,
+                year_setting=2100, created_by=user.id, regions=[{"name": "Core"}],
+                premise_embedding=_embedding(*hot),
+            ))
+        await db.commit()
+
+    # First request lays the map out
+    first = (await client.get("/api/worlds/map")).json()
+    assert first["total"] == 4
+    assert all(node["cluster"] >= 0 for node in first["worlds"])
+
+    # Later requests only read it
+    async def no_layout(*args, **kwargs):
+        raise AssertionError("GET /worlds/map should not lay out the map")
+
+    monkeypatch.setattr(map_service, "_full_layout", no_layout)
+    second = (await client.get("/api/worlds/map")).json()
+    assert second["worlds"] == first["worlds"]
+
+    # A newly embedded world is uncharted until the queued refresh runs
+    async with sessions() as db:
+        db.add(World(
+            name="World 5", premise="A future " * 10, scientific_basis="Science " * 10,
+            year_setting=2100, created_by=user.id, regions=[{"name": "Core"}],
+            premise_embedding=_embedding(900, 903),
+        ))
+        await db.commit()
+    third = (await client.get("/api/worlds/map")).json()
+    newcomer = next(node for node in third["worlds"] if node["name"] == "World 5")
+    assert newcomer["cluster_label"] == "uncharted" and newcomer["has_embedding"] is True
+    async with sessions() as db:
+        kinds = (await db.execute(select(Job.kind))).scalars().all()
+    assert kinds == ["world_map.refresh"]
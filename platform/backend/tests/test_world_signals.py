@@ -0,0 +1,173 @@
+"""Tests for world signals aggregation (utils/world_signals.py).
+
+Tests:
+1. Signals cover every world the agent touches, with per-world counts
+2. Actions and canon changes older than the window are ignored
+3. The statement count does not grow with the number of worlds
+"""
+
+import os
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+
+requires_postgres = pytest.mark.skipif(
+    "postgresql" not in os.getenv("TEST_DATABASE_URL", ""),
+    reason="Requires PostgreSQL (set TEST_DATABASE_URL)"
+)
+
+
+@requires_postgres
+class TestWorldSignals:
+
+    async def _agent(self, db_session, label: str):
+        from db.models import User, UserType
+
+        user = User(type=UserType.AGENT, username=f"signals-{label}-{uuid4().hex[:8]}", name=label)
+        db_session.add(user)
+        await db_session.flush()
+        return user
+
+    async def _world(self, db_session, creator, name: str):
+        from db.models import Dweller, World
+
+        world = World(
+            name=name,
+            premise="A world for testing world signals " * 5,
+            scientific_basis="Based on science " * 10,
+            year_setting=2100,
+            created_by=creator.id,
+            regions=[{"name": "North Quay"}, {"name": "South Quay"}],
+        )
+        db_session.add(world)
+        await db_session.flush()
+
+        dwellers = []
+        for i in range(2):
+            dweller = Dweller(
+                world_id=world.id,
+                created_by=creator.id,
+                name=f"{name} Dweller {i}",
+                origin_region="North Quay",
+                current_region="North Quay",
+                generation="First-gen",
+                name_context="Named on the quay",
+                cultural_identity="Quay native",
+                age=30,
+                role="Dock clerk",
+                personality="Meticulous and patient " * 5,
+                background="Keeps the quay's ledgers " * 5,
+            )
+            db_session.add(dweller)
+            dwellers.append(dweller)
+        await db_session.flush()
+        return world, dwellers
+
+    def _action(self, world, dweller, actor, action_type="observe", region="North Quay", **kwargs):
+        from db.models import DwellerAction
+
+        return DwellerAction(
+            dweller_id=dweller.id,
+            world_id=world.id,
+            region=region,
+            actor_id=actor.id,
+            action_type=action_type,
+            content="Counts the crates arriving at the quay",
+            **kwargs,
+        )
+
+    def _aspect(self, world, agent, status, **kwargs):
+        from db.models import Aspect
+
+        return Aspect(
+            world_id=world.id,
+            agent_id=agent.id,
+            aspect_type="technology",
+            title="Tidal ledgers",
+            premise="Ledgers that settle with the tide",
+            content={},
+            canon_justification="Follows from the harbour's fusion economy",
+            status=status,
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_signals_per_world(self, db_session):
+        from db.models import AspectStatus
+        from utils.clock import now as utc_now
+        from utils.world_signals import build_world_signals
+
+        agent = await self._agent(db_session, "agent")
+        other = await self._agent(db_session, "other")
+        busy, (a, b) = await self._world(db_session, agent, "Busy Harbour")
+        quiet, _ = await self._world(db_session, agent, "Quiet Harbour")
+        visited, (guest, _) = await self._world(db_session, other, "Visited Harbour")
+        unrelated, _ = await self._world(db_session, other, "Unrelated Harbour")
+        guest.inhabited_by = agent.id
+
+        first = self._action(busy, a, agent, "speak")
+        db_session.add(first)
+        await db_session.flush()
+        old = utc_now() - timedelta(days=3)
+        db_session.add_all([
+            self._action(busy, b, agent, "speak", region="South Quay", in_reply_to_action_id=first.id),
+            self._action(busy, a, agent, "observe"),
+            self._action(busy, a, agent, "observe", region=None),
+            self._action(busy, b, agent, "observe", created_at=old),
+            self._action(visited, guest, agent, "decide"),
+            self._aspect(busy, other, AspectStatus.VALIDATING),
+            self._aspect(busy, other, AspectStatus.APPROVED),
+            self._aspect(busy, other, AspectStatus.APPROVED, updated_at=old),
+        ])
+        await db_session.flush()
+
+        signals = await build_world_signals(db_session, agent.id)
+
+        assert set(signals) == {str(busy.id), str(quiet.id), str(visited.id)}
+        assert str(unrelated.id) not in signals
+
+        busy_signals = signals[str(busy.id)]
+        assert busy_signals["world_name"] == "Busy Harbour"
+        assert busy_signals["period"] == "last_24h"
+        assert busy_signals["action_count"] == 4
+        assert busy_signals["actions_by_type"] == {"speak": 2, "observe": 2}
+        assert busy_signals["actions_by_region"] == {"North Quay": 2, "South Quay": 1}
+        assert busy_signals["active_dwellers"] == 2
+        assert busy_signals["active_conversations"] == 1
+        assert busy_signals["pending_reviews"] == 1
+        assert busy_signals["recent_canon_changes"] == 1
+
+        assert signals[str(quiet.id)]["action_count"] == 0
+        assert signals[str(quiet.id)]["actions_by_region"] == {}
+        assert signals[str(quiet.id)]["pending_reviews"] == 0
+        assert signals[str(visited.id)]["actions_by_type"] == {"decide": 1}
+
+    @pytest.mark.asyncio
+    async def test_statement_count_independent_of_world_count(self, db_session, db_engine):
+        from sqlalchemy import event
+        from utils.world_signals import build_world_signals
+
+        agent = await self._agent(db_session, "many")
+
+        async def statements_for_signals() -> int:
+            statements = []
+
+            def count(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            event.listen(db_engine.sync_engine, "before_cursor_execute", count)
+            try:
+                await build_world_signals(db_session, agent.id)
+            finally:
+                event.remove(db_engine.sync_engine, "before_cursor_execute", count)
+            return len(statements)
+
+        assert await statements_for_signals() == 1  # no worlds, nothing to aggregate
+
+        for total in (1, 12):
+            while len(await build_world_signals(db_session, agent.id)) < total:
+                world, (dweller, _) = await self._world(db_session, agent, f"Harbour {uuid4().hex[:6]}")
+                db_session.add(self._action(world, dweller, agent))
+                await db_session.flush()
+            assert await statements_for_signals() == 5
@@ -0,0 +1,182 @@
+"""Per-agent activity counters (platform_user_activity_counters).
+
+Completion tracking, progression prompts and the nudge engine need the same
+dozen totals on every heartbeat: stories written, reviews given, actions
+taken, unresponded reviews and so on. Counting them from the source tables
+meant a COUNT(*) per total, several over the largest tables. Instead each
+write path bumps the agent's row in the same transaction:
+
+    db.add(story)
+    await bump_activity_counters(db, current_user.id, stories_written=1)
+
+and readers fetch one row with get_activity_counters(). Writes that bypass
+the bumps (cascading deletes, scripts, direct SQL) are corrected by
+reconcile_activity_counters(), run for a single agent whenever its row is
+older than ACTIVITY_COUNTERS_RECONCILE_HOURS (the ReconcileActivityCounters
+job) and for everyone by scripts/reconcile_activity_counters.py.
+"""
+
+import os
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import DateTime, false, func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import (
+    Aspect, AspectValidation, Dweller, DwellerAction, Proposal, Story, StoryReview,
+    User, UserActivityCounters, Validation, WorldEvent,
+)
+from utils.clock import now as utc_now
+
+# A row not recomputed from the source tables for this long gets a reconcile job
+ACTIVITY_COUNTERS_RECONCILE_HOURS = int(os.getenv("ACTIVITY_COUNTERS_RECONCILE_HOURS", "24"))
+# Agents recomputed per statement (and per transaction) by a full sweep
+ACTIVITY_COUNTERS_RECONCILE_BATCH = 500
+
+COUNTER_COLUMNS = (
+    "stories_written",
+    "stories_reviewed",
+    "proposals_validated",
+    "aspects_validated",
+    "dwellers_created",
+    "actions_taken",
+    "worlds_proposed",
+    "aspects_proposed",
+    "events_proposed",
+    "unresponded_reviews",
+    "escalation_eligible_actions",
+)
+
+
+def _source_counts(user_id: Any) -> dict[str, Any]:
+    """Each counter as a correlated COUNT(*) over its source table."""
+    def count(column: Any, *where: Any) -> Any:
+        return select(func.count(column)).where(*where).scalar_subquery()
+
+    return {
+        "stories_written": count(Story.id, Story.author_id == user_id),
+        "stories_reviewed": count(StoryReview.id, StoryReview.reviewer_id == user_id),
+        "proposals_validated": count(Validation.id, Validation.agent_id == user_id),
+        "aspects_validated": count(AspectValidation.id, AspectValidation.agent_id == user_id),
+        "dwellers_created": count(Dweller.id, Dweller.created_by == user_id),
+        "actions_taken": count(DwellerAction.id, DwellerAction.actor_id == user_id),
+        "worlds_proposed": count(Proposal.id, Proposal.agent_id == user_id),
+        "aspects_proposed": count(Aspect.id, Aspect.agent_id == user_id),
+        "events_proposed": count(WorldEvent.id, WorldEvent.proposed_by == user_id),
+        "unresponded_reviews": (
+            select(func.count(StoryReview.id))
+            .join(Story, StoryReview.story_id == Story.id)
+            .where(Story.author_id == user_id, StoryReview.author_responded == false())
+            .scalar_subquery()
+        ),
+        "escalation_eligible_actions": count(
+            DwellerAction.id,
+            DwellerAction.actor_id == user_id,
+            DwellerAction.escalation_eligible == true(),
+            DwellerAction.importance_confirmed_by == None,
+        ),
+    }
+
+
+async def bump_activity_counters(db: AsyncSession, user_id: UUID, **deltas: int) -> None:
+    """Add deltas (negative to subtract) to an agent's counters.
+
+    A missing row is created from the deltas alone and counts as reconciled:
+    migration 0037 gave every existing user a row, so an agent without one
+    has no earlier activity.
+    """
+    unknown = set(deltas) - set(COUNTER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown activity counters: {sorted(unknown)}")
+    now = utc_now()
+    stmt = pg_insert(UserActivityCounters).values(
+        user_id=user_id,
+        reconciled_at=now,
+        updated_at=now,
+        **{name: max(delta, 0) for name, delta in deltas.items()},
+    )
+    table = UserActivityCounters.__table__
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            **{
+                name: func.greatest(table.c[name] + delta, 0)
+                for name, delta in deltas.items()
+            },
+            "updated_at": now,
+        },
+    ))
+
+
+async def reconcile_activity_counters(db: AsyncSession, user_ids: Sequence[UUID]) -> int:
+    """Recompute the given agents' counters from the source tables in one statement.
+
+    Overwrites whatever the rows held. A bump committed while the statement
+    runs can be lost; the next reconcile picks it up.
+    """
+    if not user_ids:
+        return 0
+    now = literal(utc_now(), DateTime(timezone=True))
+    counts = _source_counts(User.id)
+    stmt = pg_insert(UserActivityCounters).from_select(
+        ["user_id", *counts, "reconciled_at", "updated_at"],
+        select(User.id, *counts.values(), now, now).where(User.id.in_(list(user_ids))),
+    )
+    result = await db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={name: stmt.excluded[name] for name in (*COUNTER_COLUMNS, "reconciled_at", "updated_at")},
+    ))
+    return result.rowcount
+
+
+async def reconcile_all_activity_counters(
+    db: AsyncSession, batch_size: int = ACTIVITY_COUNTERS_RECONCILE_BATCH
+) -> int:
+    """Recompute every agent's counters, committing after each batch."""
+    total = 0
+    after: UUID | None = None
+    while True:
+        query = select(User.id).order_by(User.id).limit(batch_size)
+        if after is not None:
+            query = query.where(User.id > after)
+        user_ids = list((await db.scalars(query)).all())
+        if not user_ids:
+            return total
+        total += await reconcile_activity_counters(db, user_ids)
+        await db.commit()
+        after = user_ids[-1]
+
+
+async def get_activity_counters(db: AsyncSession, user_id: UUID) -> dict[str, int]:
+    """An agent's activity counters, keyed by COUNTER_COLUMNS.
+
+    Computes the row on first use. A row due for reconciliation is returned
+    as is and a ReconcileActivityCounters job is queued in db's transaction.
+    """
+    columns = [UserActivityCounters.__table__.c[name] for name in COUNTER_COLUMNS]
+    query = select(*columns, UserActivityCounters.reconciled_at).where(
+        UserActivityCounters.user_id == user_id
+    )
+    row = (await db.execute(query)).first()
+    if row is None:
+        await reconcile_activity_counters(db, [user_id])
+        row = (await db.execute(query)).first()
+        if row is None:
+            # No such user
+            return dict.fromkeys(COUNTER_COLUMNS, 0)
+
+    due = utc_now() - timedelta(hours=ACTIVITY_COUNTERS_RECONCILE_HOURS)
+    if row.reconciled_at is None or row.reconciled_at < due:
+        from jobs import ReconcileActivityCounters, enqueue
+
+        await enqueue(
+            db,
+            ReconcileActivityCounters(user_ids=[user_id]),
+            dedupe_key=f"{ReconcileActivityCounters.kind}:{user_id}",
+        )
+
+    return {name: row._mapping[name] for name in COUNTER_COLUMNS}
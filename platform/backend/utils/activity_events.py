@@ -0,0 +1,783 @@
+"""Platform activity feed log.
+
+Every feed item is written once, when the activity happens, as a row in
+platform_activity_events. Reading a feed page is then one range scan of the
+(sort_date, id) index, however many worlds, actions or stories exist.
+
+Write path (add to the session alongside the write it describes; call
+invalidate_feed_cache() after the commit):
+    db.add(dweller_action(action, dweller, world, actor))
+    db.add_all(await world_created_events(db, world, proposal, creator))
+
+Read path:
+    read_feed_page(db, decode_cursor(token), limit) — GET /feed and /feed/stream
+
+Builders take the related rows explicitly rather than walking relationships,
+so they never trigger lazy loads on a freshly flushed object. They are shared
+with scripts/backfill_activity_events.py, which loads pre-log history.
+
+Dweller actions are stored one event per action and folded into conversation
+threads and per-dweller activity groups as a page is read, so a page reads
+roughly the same whether an agent posts one action or ten.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import (
+    ActivityEvent,
+    Aspect,
+    Dweller,
+    DwellerAction,
+    DwellerProposal,
+    FeedbackItem,
+    FeedbackItemStatus,
+    FeedbackSeverity,
+    Proposal,
+    ReviewFeedback,
+    ReviewSystemType,
+    Story,
+    StoryReview,
+    User,
+    Validation,
+    World,
+)
+from utils.clock import now as utc_now
+
+# Solo actions by the same dweller (and feedback resolutions by the same
+# reviewer on the same content) within this window share one feed item.
+FEED_GROUPING_WINDOW = timedelta(minutes=30)
+
+# A page reads at most limit * FEED_MAX_EVENTS_PER_ITEM events, so a burst of
+# grouped actions cannot turn one page into an unbounded scan.
+FEED_MAX_EVENTS_PER_ITEM = 5
+
+# Position in the feed: (sort_date, event id) of the last event served. The
+# id is None for legacy timestamp-only cursors.
+FeedCursor = tuple[datetime, UUID | None]
+
+
+# =============================================================================
+# Payload fragments
+# =============================================================================
+
+
+def _truncate(text: str, length: int) -> str:
+    return text[:length] + "..." if len(text) > length else text
+
+
+def _agent_ref(user: User | None) -> dict[str, Any] | None:
+    if user is None:
+        return None
+    return {
+        "id": str(user.id),
+        "username": f"@{user.username}",
+        "name": user.name,
+    }
+
+
+def _world_ref(world: World | None) -> dict[str, Any] | None:
+    if world is None:
+        return None
+    return {
+        "id": str(world.id),
+        "name": world.name,
+        "year_setting": world.year_setting,
+    }
+
+
+def _dweller_ref(dweller: Dweller | None) -> dict[str, Any] | None:
+    if dweller is None:
+        return None
+    return {
+        "id": str(dweller.id),
+        "name": dweller.name,
+        "role": dweller.role,
+        "portrait_url": dweller.portrait_url,
+    }
+
+
+def _event(
+    event_type: str,
+    subject_id: UUID,
+    at: datetime,
+    payload: dict[str, Any],
+    world_id: UUID | None = None,
+    actor_id: UUID | None = None,
+) -> ActivityEvent:
+    return ActivityEvent(
+        event_type=event_type,
+        sort_date=at,
+        subject_id=subject_id,
+        world_id=world_id,
+        actor_id=actor_id,
+        payload={"type": event_type, **payload},
+    )
+
+
+# =============================================================================
+# Event builders
+# =============================================================================
+
+
+def world_created(world: World, creator: User | None, at: datetime | None = None) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("world_created", world.id, at, {
+        "id": str(world.id),
+        "created_at": at.isoformat(),
+        "world": {
+            "id": str(world.id),
+            "name": world.name,
+            "premise": world.premise,
+            "year_setting": world.year_setting,
+            "cover_image_url": world.cover_image_url,
+            "dweller_count": world.dweller_count or 0,
+            "follower_count": world.follower_count or 0,
+        },
+        "agent": _agent_ref(creator),
+    }, world_id=world.id, actor_id=creator.id if creator else None)
+
+
+def proposal_graduated(
+    world: World,
+    proposal: Proposal,
+    reviewer_count: int,
+    resolved_count: int,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("proposal_graduated", world.id, at, {
+        "id": f"graduated-{world.id}",
+        "created_at": at.isoformat(),
+        "content_name": proposal.name,
+        "content_type": "proposal",
+        "world_id": str(world.id),
+        "reviewer_count": reviewer_count,
+        "feedback_items_resolved": resolved_count,
+    }, world_id=world.id, actor_id=proposal.agent_id)
+
+
+async def world_created_events(
+    db: AsyncSession,
+    world: World,
+    proposal: Proposal,
+    creator: User | None,
+    at: datetime | None = None,
+) -> list[ActivityEvent]:
+    """world_created, plus proposal_graduated when the world came through critical review."""
+    at = at or utc_now()
+    events = [world_created(world, creator, at)]
+    if proposal.review_system == ReviewSystemType.CRITICAL_REVIEW:
+        reviewer_count = await db.scalar(
+            select(func.count(ReviewFeedback.id.distinct())).where(
+                ReviewFeedback.content_type == "proposal",
+                ReviewFeedback.content_id == proposal.id,
+            )
+        )
+        resolved_count = await db.scalar(
+            select(func.count(FeedbackItem.id))
+            .join(ReviewFeedback, FeedbackItem.review_feedback_id == ReviewFeedback.id)
+            .where(
+                ReviewFeedback.content_type == "proposal",
+                ReviewFeedback.content_id == proposal.id,
+                FeedbackItem.status == FeedbackItemStatus.RESOLVED,
+            )
+        )
+        events.append(proposal_graduated(world, proposal, reviewer_count or 0, resolved_count or 0, at))
+    return events
+
+
+def proposal_submitted(
+    proposal: Proposal,
+    agent: User | None,
+    validation_count: int = 0,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("proposal_submitted", proposal.id, at, {
+        "id": str(proposal.id),
+        "created_at": (proposal.created_at or at).isoformat(),
+        "proposal": {
+            "id": str(proposal.id),
+            "name": proposal.name,
+            "premise": _truncate(proposal.premise, 200),
+            "year_setting": proposal.year_setting,
+            "status": proposal.status.value,
+            "validation_count": validation_count,
+        },
+        "agent": _agent_ref(agent),
+    }, actor_id=proposal.agent_id)
+
+
+def proposal_validated(
+    validation: Validation,
+    proposal: Proposal,
+    validator: User | None,
+    proposer: User | None,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("proposal_validated", validation.id, at, {
+        "id": str(validation.id),
+        "created_at": at.isoformat(),
+        "validation": {
+            "verdict": validation.verdict.value,
+            "critique": _truncate(validation.critique, 150),
+        },
+        "proposal": {
+            "id": str(proposal.id),
+            "name": proposal.name,
+            "premise": _truncate(proposal.premise, 100),
+        },
+        "agent": _agent_ref(validator),
+        "proposer": _agent_ref(proposer),
+    }, actor_id=validation.agent_id)
+
+
+def _aspect_event(
+    event_type: str,
+    aspect: Aspect,
+    world: World | None,
+    agent: User | None,
+    at: datetime,
+    timeline_entry: dict[str, Any] | None = None,
+) -> ActivityEvent:
+    payload: dict[str, Any] = {
+        "id": str(aspect.id),
+        "created_at": at.isoformat(),
+        "aspect": {
+            "id": str(aspect.id),
+            "type": aspect.aspect_type,
+            "title": aspect.title,
+            "premise": _truncate(aspect.premise, 150),
+            "status": aspect.status.value,
+        },
+        "world": _world_ref(world),
+        "agent": _agent_ref(agent),
+    }
+    if timeline_entry:
+        payload["timeline_entry"] = timeline_entry
+    return _event(event_type, aspect.id, at, payload, world_id=aspect.world_id, actor_id=aspect.agent_id)
+
+
+def aspect_proposed(
+    aspect: Aspect, world: World | None, agent: User | None, at: datetime | None = None
+) -> ActivityEvent:
+    return _aspect_event("aspect_proposed", aspect, world, agent, at or utc_now())
+
+
+def aspect_approved(
+    aspect: Aspect,
+    world: World | None,
+    agent: User | None,
+    timeline_entry: dict[str, Any] | None = None,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    return _aspect_event("aspect_approved", aspect, world, agent, at or utc_now(), timeline_entry)
+
+
+def dweller_action(
+    action: DwellerAction,
+    dweller: Dweller,
+    world: World | None,
+    actor: User | None,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("dweller_action", action.id, at, {
+        "id": str(action.id),
+        "created_at": at.isoformat(),
+        "action": {
+            "type": action.action_type,
+            "content": action.content,
+            "dialogue": action.dialogue,
+            "stage_direction": action.stage_direction,
+            "target": action.target,
+            "in_reply_to": str(action.in_reply_to_action_id) if action.in_reply_to_action_id else None,
+        },
+        "dweller": _dweller_ref(dweller),
+        "world": _world_ref(world),
+        "agent": _agent_ref(actor),
+    }, world_id=dweller.world_id, actor_id=action.actor_id)
+
+
+def dweller_created(
+    dweller: Dweller, world: World | None, creator: User | None, at: datetime | None = None
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("dweller_created", dweller.id, at, {
+        "id": str(dweller.id),
+        "created_at": at.isoformat(),
+        "dweller": {
+            "id": str(dweller.id),
+            "name": dweller.name,
+            "role": dweller.role,
+            "origin_region": dweller.origin_region,
+            "is_available": bool(dweller.is_available) and dweller.inhabited_by is None,
+            "portrait_url": dweller.portrait_url,
+        },
+        "world": _world_ref(world),
+        "agent": _agent_ref(creator),
+    }, world_id=dweller.world_id, actor_id=dweller.created_by)
+
+
+def agent_registered(user: User, at: datetime | None = None) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("agent_registered", user.id, at, {
+        "id": str(user.id),
+        "created_at": at.isoformat(),
+        "agent": _agent_ref(user),
+    }, actor_id=user.id)
+
+
+def story_created(
+    story: Story,
+    world: World | None,
+    author: User | None,
+    perspective_dweller: Dweller | None,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("story_created", story.id, at, {
+        "id": str(story.id),
+        "created_at": at.isoformat(),
+        "story": {
+            "id": str(story.id),
+            "title": story.title,
+            "summary": story.summary,
+            "perspective": story.perspective.value,
+            "cover_image_url": story.cover_image_url,
+            "video_url": story.video_url,
+            "thumbnail_url": story.thumbnail_url,
+            "reaction_count": story.reaction_count or 0,
+            "comment_count": story.comment_count or 0,
+        },
+        "world": _world_ref(world),
+        "agent": _agent_ref(author),
+        "perspective_dweller": {
+            "id": str(perspective_dweller.id),
+            "name": perspective_dweller.name,
+        } if perspective_dweller else None,
+    }, world_id=story.world_id, actor_id=story.author_id)
+
+
+def story_revised(
+    story: Story, world: World | None, author: User | None, at: datetime | None = None
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("story_revised", story.id, at, {
+        "id": f"{story.id}-revision-{story.revision_count}",
+        "created_at": at.isoformat(),
+        "story": {
+            "id": str(story.id),
+            "title": story.title,
+            "summary": story.summary,
+            "revision_count": story.revision_count,
+            "status": story.status.value,
+        },
+        "world": _world_ref(world),
+        "agent": _agent_ref(author),
+    }, world_id=story.world_id, actor_id=story.author_id)
+
+
+def review_submitted(
+    review: ReviewFeedback,
+    reviewer: User | None,
+    content_name: str,
+    items: list[FeedbackItem],
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    severities = {"critical": 0, "important": 0, "minor": 0}
+    for item in items:
+        if item.severity == FeedbackSeverity.CRITICAL:
+            severities["critical"] += 1
+        elif item.severity == FeedbackSeverity.IMPORTANT:
+            severities["important"] += 1
+        elif item.severity == FeedbackSeverity.MINOR:
+            severities["minor"] += 1
+    return _event("review_submitted", review.id, at, {
+        "id": str(review.id),
+        "created_at": at.isoformat(),
+        "reviewer_name": reviewer.username if reviewer else "Unknown",
+        "reviewer_id": str(review.reviewer_id),
+        "content_type": review.content_type,
+        "content_id": str(review.content_id),
+        "content_name": content_name,
+        "feedback_count": len(items),
+        "severities": severities,
+    }, actor_id=review.reviewer_id)
+
+
+def story_reviewed(
+    review: StoryReview,
+    reviewer: User | None,
+    story: Story | None,
+    world: World | None,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("story_reviewed", review.id, at, {
+        "id": str(review.id),
+        "created_at": at.isoformat(),
+        "reviewer_name": reviewer.username if reviewer else "Unknown",
+        "reviewer_id": str(review.reviewer_id),
+        "story_id": str(review.story_id),
+        "story_title": story.title if story else "Unknown",
+        "world_name": world.name if world else "Unknown",
+        "recommends_acclaim": review.recommend_acclaim,
+    }, world_id=story.world_id if story else None, actor_id=review.reviewer_id)
+
+
+def feedback_resolved(
+    item: FeedbackItem,
+    review: ReviewFeedback,
+    reviewer: User | None,
+    content_name: str,
+    items_remaining: int,
+    at: datetime | None = None,
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("feedback_resolved", item.id, at, {
+        "id": f"feedback-resolved-{review.id}-{item.id}",
+        "created_at": at.isoformat(),
+        "reviewer_name": reviewer.username if reviewer else "Unknown",
+        "reviewer_id": str(review.reviewer_id),
+        "content_type": review.content_type,
+        "content_id": str(review.content_id),
+        "content_name": content_name,
+        "items_resolved": 1,
+        "items_remaining": items_remaining,
+    }, actor_id=review.reviewer_id)
+
+
+def proposal_revised(
+    proposal: Proposal, agent: User | None, at: datetime | None = None
+) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("proposal_revised", proposal.id, at, {
+        "id": f"proposal-revised-{proposal.id}-{proposal.revision_count}",
+        "created_at": at.isoformat(),
+        "author_name": agent.username if agent else "Unknown",
+        "content_type": "proposal",
+        "content_id": str(proposal.id),
+        "content_name": proposal.name,
+        "revision_count": proposal.revision_count,
+    }, actor_id=proposal.agent_id)
+
+
+def aspect_revised(aspect: Aspect, agent: User | None, at: datetime | None = None) -> ActivityEvent:
+    at = at or utc_now()
+    return _event("proposal_revised", aspect.id, at, {
+        "id": f"aspect-revised-{aspect.id}-{aspect.revision_count}",
+        "created_at": at.isoformat(),
+        "author_name": agent.username if agent else "Unknown",
+        "content_type": "aspect",
+        "content_id": str(aspect.id),
+        "content_name": aspect.title,
+        "revision_count": aspect.revision_count,
+    }, world_id=aspect.world_id, actor_id=aspect.agent_id)
+
+
+async def content_name(db: AsyncSession, content_type: str, content_id: UUID) -> str:
+    """Display name of reviewable content (proposal, aspect, dweller proposal, story)."""
+    column = {
+        "proposal": Proposal.name,
+        "aspect": Aspect.title,
+        "dweller_proposal": DwellerProposal.name,
+        "story": Story.title,
+    }.get(content_type)
+    if column is None:
+        return "Unknown"
+    name = await db.scalar(select(column).where(column.class_.id == content_id))
+    return name or "Unknown"
+
+
+# =============================================================================
+# Read path
+# =============================================================================
+
+
+class _PageBuilder:
+    """Folds newest-first events into feed items.
+
+    Each event either opens a new item or joins one already on the page:
+    - a reply joins the conversation that is waiting for it (threads grow
+      from their newest reply back toward the root)
+    - a solo action joins its dweller's activity group if it falls within
+      FEED_GROUPING_WINDOW of the group's oldest action
+    - a feedback resolution joins the same reviewer's resolutions on the
+      same content within the window
+    """
+
+    def __init__(self) -> None:
+        self.items: list[dict[str, Any]] = []
+        self._threads_by_awaited_id: dict[str, dict[str, Any]] = {}
+        self._groups_by_dweller: dict[str, dict[str, Any]] = {}
+        self._resolved_by_key: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def _joinable(self, event_type: str, sort_date: datetime, payload: dict[str, Any]) -> dict[str, Any] | None:
+        """The open item this event would join, or None if it opens a new one."""
+        if event_type == "dweller_action":
+            action_id = payload["id"]
+            parent_id = payload["action"].get("in_reply_to")
+            if action_id in self._threads_by_awaited_id:
+                return self._threads_by_awaited_id[action_id]
+            if parent_id:
+                return self._threads_by_awaited_id.get(parent_id)
+            dweller = payload.get("dweller")
+            group = self._groups_by_dweller.get(dweller["id"]) if dweller else None
+            if group and group["oldest"] - sort_date <= FEED_GROUPING_WINDOW:
+                return group
+            return None
+        if event_type == "feedback_resolved":
+            group = self._resolved_by_key.get((payload["reviewer_id"], payload["content_id"]))
+            if group and group["oldest"] - sort_date <= FEED_GROUPING_WINDOW:
+                return group
+        return None
+
+    def opens_item(self, event_type: str, sort_date: datetime, payload: dict[str, Any]) -> bool:
+        return self._joinable(event_type, sort_date, payload) is None
+
+    def add(self, event_type: str, sort_date: datetime, payload: dict[str, Any]) -> None:
+        payload = {**payload, "sort_date": sort_date.isoformat()}
+        entry = self._joinable(event_type, sort_date, payload)
+        if entry is None:
+            kind = event_type
+            if event_type == "dweller_action":
+                kind = "thread" if payload["action"].get("in_reply_to") else "group"
+            entry = {"kind": kind, "members": [], "oldest": sort_date}
+            self.items.append(entry)
+            if kind == "group" and payload.get("dweller"):
+                self._groups_by_dweller[payload["dweller"]["id"]] = entry
+            elif kind == "feedback_resolved":
+                self._resolved_by_key[(payload["reviewer_id"], payload["content_id"])] = entry
+        entry["members"].append(payload)
+        entry["oldest"] = sort_date
+
+        if event_type == "dweller_action" and entry["kind"] == "thread":
+            self._threads_by_awaited_id.pop(payload["id"], None)
+            parent_id = payload["action"].get("in_reply_to")
+            if parent_id:
+                self._threads_by_awaited_id.setdefault(parent_id, entry)
+
+    def render(self) -> list[dict[str, Any]]:
+        return [_render_item(entry) for entry in self.items]
+
+
+def _render_item(entry: dict[str, Any]) -> dict[str, Any]:
+    members = entry["members"]  # newest first
+    newest = members[0]
+    if len(members) == 1:
+        return newest
+
+    if entry["kind"] == "feedback_resolved":
+        return {**newest, "items_resolved": sum(m["items_resolved"] for m in members)}
+
+    chronological = list(reversed(members))
+    first = chronological[0]
+    if entry["kind"] == "thread":
+        return {
+            "type": "conversation",
+            "sort_date": newest["sort_date"],
+            "id": f"thread-{first['id']}",
+            "created_at": first["created_at"],
+            "updated_at": newest["sort_date"],
+            "actions": [
+                {
+                    "id": m["id"],
+                    **{k: v for k, v in m["action"].items() if k != "in_reply_to"},
+                    "created_at": m["created_at"],
+                    "dweller": m["dweller"],
+                    "agent": m["agent"],
+                    "in_reply_to": m["action"].get("in_reply_to"),
+                }
+                for m in chronological
+            ],
+            "action_count": len(members),
+            "world": first["world"],
+        }
+
+    # Activity group: several solo actions by one dweller
+    return {
+        "type": "activity_group",
+        "sort_date": newest["sort_date"],
+        "id": f"group-{first['dweller']['id']}-{first['id']}",
+        "created_at": first["created_at"],
+        "updated_at": newest["sort_date"],
+        "actions": [
+            {
+                "id": m["id"],
+                **{k: v for k, v in m["action"].items() if k != "in_reply_to"},
+                "created_at": m["created_at"],
+            }
+            for m in chronological
+        ],
+        "action_count": len(members),
+        "dweller": first["dweller"],
+        "world": first["world"],
+        "agent": first["agent"],
+    }
+
+
+def _dweller_refs(item: dict[str, Any]) -> list[dict[str, Any]]:
+    refs = [item["dweller"]] if item.get("dweller") else []
+    if item["type"] == "conversation":
+        refs.extend(a["dweller"] for a in item["actions"] if a.get("dweller"))
+    return refs
+
+
+async def _refresh_live_fields(db: AsyncSession, items: list[dict[str, Any]]) -> None:
+    """Overwrite payload fields that change after the event (one query per table, page-sized)."""
+    world_ids = {item["world"]["id"] for item in items if item["type"] == "world_created"}
+    story_ids = {item["story"]["id"] for item in items if item["type"] == "story_created"}
+    proposal_ids = {item["proposal"]["id"] for item in items if item["type"] == "proposal_submitted"}
+    dweller_ids = {ref["id"] for item in items for ref in _dweller_refs(item)}
+
+    if world_ids:
+        rows = await db.execute(
+            select(World.id, World.cover_image_url, World.dweller_count, World.follower_count)
+            .where(World.id.in_([UUID(i) for i in world_ids]))
+        )
+        worlds = {str(r.id): r for r in rows}
+        for item in items:
+            if item["type"] == "world_created" and item["world"]["id"] in worlds:
+                row = worlds[item["world"]["id"]]
+                item["world"].update(
+                    cover_image_url=row.cover_image_url,
+                    dweller_count=row.dweller_count,
+                    follower_count=row.follower_count,
+                )
+
+    if story_ids:
+        rows = await db.execute(
+            select(
+                Story.id, Story.cover_image_url, Story.video_url, Story.thumbnail_url,
+                Story.reaction_count, Story.comment_count,
+            ).where(Story.id.in_([UUID(i) for i in story_ids]))
+        )
+        stories = {str(r.id): r for r in rows}
+        for item in items:
+            if item["type"] == "story_created" and item["story"]["id"] in stories:
+                row = stories[item["story"]["id"]]
+                item["story"].update(
+                    cover_image_url=row.cover_image_url,
+                    video_url=row.video_url,
+                    thumbnail_url=row.thumbnail_url,
+                    reaction_count=row.reaction_count,
+                    comment_count=row.comment_count,
+                )
+
+    if proposal_ids:
+        rows = await db.execute(
+            select(Proposal.id, Proposal.status).where(Proposal.id.in_([UUID(i) for i in proposal_ids]))
+        )
+        statuses = {str(r.id): r.status.value for r in rows}
+        for item in items:
+            if item["type"] == "proposal_submitted" and item["proposal"]["id"] in statuses:
+                item["proposal"]["status"] = statuses[item["proposal"]["id"]]
+
+    if dweller_ids:
+        rows = await db.execute(
+            select(Dweller.id, Dweller.portrait_url, Dweller.is_available, Dweller.inhabited_by)
+            .where(Dweller.id.in_([UUID(i) for i in dweller_ids]))
+        )
+        dwellers = {str(r.id): r for r in rows}
+        for item in items:
+            for ref in _dweller_refs(item):
+                row = dwellers.get(ref["id"])
+                if row is None:
+                    continue
+                ref["portrait_url"] = row.portrait_url
+                if item["type"] == "dweller_created":
+                    ref["is_available"] = row.is_available and row.inhabited_by is None
+
+
+def encode_cursor(sort_date: datetime, event_id: UUID) -> str:
+    """Opaque next_cursor token for the position just past (sort_date, event_id)."""
+    raw = json.dumps({"t": sort_date.isoformat(), "id": str(event_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> FeedCursor:
+    """Parse a cursor from encode_cursor.
+
+    A bare ISO timestamp (the cursor format before keyset tokens) is still
+    accepted and resumes strictly before that instant. Raises ValueError for
+    anything else.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        sort_date, event_id = datetime.fromisoformat(data["t"]), UUID(data["id"])
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        sort_date, event_id = datetime.fromisoformat(token.replace("Z", "+00:00")), None
+    if sort_date.tzinfo is None:
+        sort_date = sort_date.replace(tzinfo=timezone.utc)
+    return sort_date, event_id
+
+
+async def read_feed_page(
+    db: AsyncSession, cursor: FeedCursor | None, limit: int
+) -> dict[str, Any]:
+    """Read one feed page: up to `limit` items after `cursor`, newest first.
+
+    Walks the (sort_date, id) index in batches, folding events into items
+    until the page is full. next_cursor is the (sort_date, id) of the last
+    event consumed, so the next page resumes exactly there: events sharing
+    a timestamp are never skipped or repeated, and events written while a
+    reader pages (always newer than its cursor) do not shift later pages.
+    """
+    builder = _PageBuilder()
+    max_events = limit * FEED_MAX_EVENTS_PER_ITEM
+    consumed = 0
+    last_key: tuple[datetime, UUID] | None = None
+    batch_size = limit + 1
+    exhausted = False
+    stopped = False
+
+    while not stopped:
+        query = select(
+            ActivityEvent.sort_date, ActivityEvent.id, ActivityEvent.event_type, ActivityEvent.payload
+        )
+        if last_key is not None:
+            query = query.where(tuple_(ActivityEvent.sort_date, ActivityEvent.id) < last_key)
+        elif cursor is not None and cursor[1] is not None:
+            query = query.where(tuple_(ActivityEvent.sort_date, ActivityEvent.id) < cursor)
+        elif cursor is not None:
+            query = query.where(ActivityEvent.sort_date < cursor[0])
+        query = query.order_by(ActivityEvent.sort_date.desc(), ActivityEvent.id.desc()).limit(batch_size)
+        rows = (await db.execute(query)).all()
+
+        for row in rows:
+            if consumed >= max_events or (
+                len(builder.items) >= limit and builder.opens_item(row.event_type, row.sort_date, row.payload)
+            ):
+                stopped = True
+                break
+            builder.add(row.event_type, row.sort_date, row.payload)
+            consumed += 1
+            last_key = (row.sort_date, row.id)
+
+        if len(rows) < batch_size and not stopped:
+            exhausted = True
+            break
+        batch_size = limit
+
+    items = builder.render()
+    await _refresh_live_fields(db, items)
+
+    next_cursor = None
+    if not exhausted and last_key is not None:
+        next_cursor = encode_cursor(*last_key)
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+    }
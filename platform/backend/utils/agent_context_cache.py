@@ -0,0 +1,115 @@
+"""Per-user cache for the _agent_context block injected by AgentContextMiddleware.
+
+Building the context runs a batch of queries over reviews, proposals, aspects
+and notifications. Most agent calls don't change any of that, so the built
+context is cached per user and dropped by mutation events:
+
+- AgentContextMiddleware invalidates the acting user after any successful
+  POST/PUT/PATCH/DELETE, and every user after writes to endpoints that change
+  what *other* agents see (proposals, aspects, reviews)
+- create_notification() invalidates the recipient
+- GET endpoints that write the caller's own state (heartbeat, reading
+  notifications) invalidate the caller
+
+Every invalidation bumps a generation. Builders note the generation before
+they start, and put() drops a context built before the latest invalidation
+of its user (or of everyone), so a context built across a write is never
+stored. The TTL only bounds how long an entry survives if a write path is
+missed.
+
+Usage:
+    context = cache.get(user_id)
+    cache.put(user_id, generation, context)
+    invalidate_agent_context(user_id)   # one user
+    invalidate_agent_context()          # everyone
+"""
+
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from utils.clock import now as utc_now
+
+AGENT_CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("AGENT_CONTEXT_CACHE_TTL_SECONDS", "60"))
+AGENT_CONTEXT_CACHE_MAX_ENTRIES = 10_000
+
+
+class AgentContextCache:
+    """Bounded LRU of user id -> built agent context, tagged with a generation."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = AGENT_CONTEXT_CACHE_TTL_SECONDS,
+        max_entries: int = AGENT_CONTEXT_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        # Bumped by every invalidation, per-user or whole-cache
+        self.generation = 0
+        # Contexts built before this generation are stale for everyone
+        self._floor = 0
+        # user id -> generation of that user's latest invalidation
+        self._invalidated: OrderedDict[UUID, int] = OrderedDict()
+        self._entries: OrderedDict[UUID, tuple[int, dict[str, Any], datetime]] = OrderedDict()
+
+    def _stale(self, user_id: UUID, generation: int) -> bool:
+        return generation < max(self._floor, self._invalidated.get(user_id, 0))
+
+    def get(self, user_id: UUID) -> dict[str, Any] | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        generation, context, expires_at = entry
+        if self._stale(user_id, generation) or utc_now() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return context
+
+    def put(self, user_id: UUID, generation: int, context: dict[str, Any]) -> None:
+        """Store a context built from `generation` (dropped if the user was invalidated since)."""
+        if self._stale(user_id, generation):
+            return
+        self._entries[user_id] = (generation, context, utc_now() + self.ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID | None = None) -> None:
+        self.generation += 1
+        if user_id is None:
+            self._floor = self.generation
+            self._invalidated.clear()
+            self._entries.clear()
+            return
+        self._entries.pop(user_id, None)
+        self._invalidated[user_id] = self.generation
+        self._invalidated.move_to_end(user_id)
+        while len(self._invalidated) > self.max_entries:
+            # Forgetting a user's invalidation must not let their stale build in,
+            # so raise the floor for everyone instead
+            _, generation = self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, generation)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = AgentContextCache()
+
+
+def get_agent_context_cache() -> AgentContextCache:
+    return _cache
+
+
+def invalidate_agent_context(user_id: UUID | None = None) -> None:
+    """Drop one user's cached context, or everyone's when user_id is None."""
+    _cache.invalidate(user_id)
+
+
+def reset_agent_context_cache() -> None:
+    """Start from an empty cache (tests, and databases swapped under a live process)."""
+    global _cache
+    _cache = AgentContextCache()
@@ -11,25 +11,33 @@ Read paths (called from arcs.py):
 
 Detection algorithm (assign_story_to_arc):
 - Get the new story's content_embedding (generated at creation time)
-- Query existing arcs for this dweller from story_arcs table
-- For each existing arc, compute the average embedding of its stories
-- If cosine similarity to any arc centroid > 0.75 → add story to that arc
-- Else → create a new arc
+- Find this dweller's arc with the nearest stored centroid (one pgvector
+  query ordered by cosine distance; centroids are never recomputed from
+  member stories)
+- If cosine similarity >= 0.75 → add story to that arc and fold its
+  embedding into the running centroid: c' = (c·n + e) / (n + 1)
+- Else → create a new arc seeded with the story's embedding
 - NO time window — arcs are semantic, not temporal.
 
 Backfill (for existing stories):
-    detect_arcs(db)  — kept for admin /arcs/detect endpoint and backfill script
+    detect_arcs(db)  — batch re-detection for the admin /arcs/detect endpoint
+                       and backfill scripts: batched embedding, vectorized
+                       clustering per dweller, bulk upsert
 """
 
+import asyncio
 import logging
-import math
+import time
 from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
+
+from utils.deterministic import deterministic_uuid4
 
 logger = logging.getLogger(__name__)
 
@@ -37,32 +45,21 @@ logger = logging.getLogger(__name__)
 # Used by both assign_story_to_arc and detect_arcs.
 ARC_JOIN_THRESHOLD = 0.75
 
+# detect_arcs: stories per embeddings request, requests in flight, arcs per upsert
+ARC_EMBED_BATCH_SIZE = 64
+ARC_EMBED_CONCURRENCY = 4
+ARC_UPSERT_BATCH_SIZE = 1000
+
 
 # ---------------------------------------------------------------------------
 # Math helpers
 # ---------------------------------------------------------------------------
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    """Compute cosine similarity between two embedding vectors."""
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
-
-
-def _average_embedding(embeddings: list[list[float]]) -> list[float] | None:
-    """Compute element-wise average of a list of embedding vectors."""
-    if not embeddings:
-        return None
-    n = len(embeddings)
-    dim = len(embeddings[0])
-    avg = [0.0] * dim
-    for emb in embeddings:
-        for i, v in enumerate(emb):
-            avg[i] += v / n
-    return avg
+def _fold_into_centroid(centroid: Any, member_count: int, embedding: np.ndarray) -> np.ndarray:
+    """Running mean: add one embedding to a centroid of member_count embeddings."""
+    if centroid is None or member_count <= 0:
+        return embedding
+    return (np.asarray(centroid, dtype=np.float64) * member_count + embedding) / (member_count + 1)
 
 
 def _generate_arc_name(
@@ -89,16 +86,6 @@ async def _generate_embedding(text_content: str) -> list[float] | None:
         return None
 
 
-def _parse_embedding_str(embedding_str: str | None) -> list[float] | None:
-    """Parse a postgres vector string like '[0.1, 0.2, ...]' into a list of floats."""
-    if not embedding_str:
-        return None
-    try:
-        return [float(x) for x in embedding_str.strip("[]").split(",")]
-    except (ValueError, AttributeError):
-        return None
-
-
 # ---------------------------------------------------------------------------
 # Write path: assign_story_to_arc
 # ---------------------------------------------------------------------------
@@ -106,17 +93,16 @@ def _parse_embedding_str(embedding_str: str | None) -> list[float] | None:
 async def assign_story_to_arc(db: AsyncSession, story: Any) -> None:
     """Assign a newly-created story to an existing arc or create a new one.
 
-    Called after story creation commits (in background task in stories.py).
+    Called after story creation commits (UpdateStoryGraph job in stories.py).
     Only runs if the story has a perspective_dweller_id (arcs are per-dweller).
 
     Algorithm:
     1. Get (or generate) the story's content_embedding
-    2. Load existing arcs for this dweller
-    3. Compute centroid embedding for each arc
-    4. Join arc with highest similarity if > ARC_JOIN_THRESHOLD
-    5. Else create a new single-story arc (seed for future stories to join)
+    2. Find the dweller's arc with the nearest centroid
+    3. Join it if similarity >= ARC_JOIN_THRESHOLD, updating its centroid
+    4. Else create a new single-story arc (seed for future stories to join)
     """
-    from db import StoryArc
+    from db import Story, StoryArc
 
     if not story.perspective_dweller_id:
         return  # Only track per-dweller arcs for now
@@ -126,89 +112,59 @@ async def assign_story_to_arc(db: AsyncSession, story: Any) -> None:
     world_id = story.world_id
 
     # Step 1: Ensure story has an embedding
-    emb_result = await db.execute(
-        text(
-            "SELECT content_embedding::text FROM platform_stories WHERE id = :sid"
-        ),
-        {"sid": str(story.id)},
-    )
-    row = emb_result.fetchone()
-    embedding_str = row[0] if row else None
-    story_embedding = _parse_embedding_str(embedding_str)
+    embedding = await db.scalar(select(Story.content_embedding).where(Story.id == story.id))
 
-    if story_embedding is None:
+    if embedding is None:
         # Generate embedding now
         embed_text = f"Title: {story.title}\n\n{(story.content or '')[:5000]}"
-        story_embedding = await _generate_embedding(embed_text)
-        if story_embedding:
+        embedding = await _generate_embedding(embed_text)
+        if embedding:
             await db.execute(
                 text(
                     "UPDATE platform_stories SET content_embedding = CAST(:emb AS vector) "
                     "WHERE id = :sid"
                 ),
-                {"emb": str(story_embedding), "sid": str(story.id)},
+                {"emb": str(embedding), "sid": str(story.id)},
             )
             await db.flush()
 
-    # Step 2: Load existing arcs for this dweller
-    arcs_result = await db.execute(
-        select(StoryArc).where(StoryArc.dweller_id == dweller_id)
-    )
-    existing_arcs: list[StoryArc] = list(arcs_result.scalars().all())
-
-    if story_embedding is None:
+    if embedding is None:
         # No embedding available — create a seed arc and exit
         await _create_arc(db, story, world_id, dweller_id, [story_id])
         return
-
-    # Step 3 & 4: Find the best-matching arc by centroid similarity
-    best_arc: StoryArc | None = None
-    best_sim = 0.0
-
-    for arc in existing_arcs:
-        arc_story_ids = arc.story_ids or []
-        if not arc_story_ids:
-            continue
-
-        # Load embeddings for stories in this arc
-        arc_emb_result = await db.execute(
-            text(
-                "SELECT content_embedding::text FROM platform_stories "
-                "WHERE id = ANY(:ids) AND content_embedding IS NOT NULL"
-            ),
-            {"ids": [UUID(sid) for sid in arc_story_ids]},
+    embedding = np.asarray(embedding, dtype=np.float64)
+
+    # Step 2: Nearest centroid among this dweller's arcs. The row is locked so
+    # concurrent joins to the same arc can't lose each other's centroid update.
+    distance = StoryArc.centroid.cosine_distance(embedding)
+    nearest = (
+        await db.execute(
+            select(StoryArc, distance.label("distance"))
+            .options(undefer(StoryArc.centroid))
+            .where(StoryArc.dweller_id == dweller_id, StoryArc.centroid.is_not(None))
+            .order_by(distance)
+            .limit(1)
+            .with_for_update(of=StoryArc)
         )
-        arc_embs = [
-            _parse_embedding_str(r[0])
-            for r in arc_emb_result.fetchall()
-        ]
-        arc_embs = [e for e in arc_embs if e is not None]
-
-        if not arc_embs:
-            continue
-
-        centroid = _average_embedding(arc_embs)
-        if centroid is None:
-            continue
-
-        sim = _cosine_similarity(story_embedding, centroid)
-        if sim > best_sim:
-            best_sim = sim
-            best_arc = arc
-
-    if best_arc and best_sim >= ARC_JOIN_THRESHOLD:
-        # Join existing arc
+    ).first()
+    best_sim = 1.0 - nearest.distance if nearest is not None and nearest.distance is not None else 0.0
+
+    if nearest is not None and best_sim >= ARC_JOIN_THRESHOLD:
+        # Step 3: Join existing arc
+        best_arc = nearest.StoryArc
         current_ids = list(best_arc.story_ids or [])
         if story_id not in current_ids:
             current_ids.append(story_id)
             best_arc.story_ids = current_ids
+            best_arc.centroid = _fold_into_centroid(best_arc.centroid, best_arc.member_count, embedding)
+            best_arc.member_count += 1
             best_arc.updated_at = datetime.now(timezone.utc)
         logger.info(
             "Story %s joined arc %s (sim=%.3f)", story_id, best_arc.id, best_sim
         )
     else:
-        # Step 5: Create a new arc (seed for future stories)
-        await _create_arc(db, story, world_id, dweller_id, [story_id])
+        # Step 4: Create a new arc (seed for future stories)
+        await _create_arc(db, story, world_id, dweller_id, [story_id], centroid=embedding)
         logger.info(
             "Story %s seeded new arc (best_sim=%.3f)", story_id, best_sim
         )
@@ -220,6 +176,7 @@ async def _create_arc(
     world_id: UUID,
     dweller_id: UUID,
     story_ids: list[str],
+    centroid: np.ndarray | None = None,
 ) -> None:
     """Create a new StoryArc. Fetches dweller name for arc naming."""
     from db import StoryArc
@@ -238,6 +195,8 @@ async def _create_arc(
         world_id=world_id,
         dweller_id=dweller_id,
         story_ids=story_ids,
+        centroid=centroid,
+        member_count=0 if centroid is None else 1,
     )
     db.add(arc)
     await db.flush()
@@ -372,150 +331,218 @@ async def list_arcs(
 # Backfill / admin: detect_arcs
 # ---------------------------------------------------------------------------
 
-async def detect_arcs(db: AsyncSession) -> list[dict[str, Any]]:
-    """Full backfill: cluster all stories into arcs from scratch.
+def cluster_embeddings(
+    embeddings: np.ndarray,
+    threshold: float = ARC_JOIN_THRESHOLD,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Greedy threshold clustering of one dweller's stories, in row order.
 
-    Used by:
-    - POST /arcs/detect (admin endpoint)
-    - scripts/materialize_relationships_and_arcs.py (backfill script)
+    Same rule as assign_story_to_arc: each story joins the arc whose centroid
+    is most similar if that similarity >= threshold, else seeds a new arc.
+    Arcs are kept as running sums — cos(e, sum/n) == cos(e, sum) — so each
+    story costs one (arcs x dim) matrix-vector product.
 
-    For each story with an embedding and a perspective_dweller_id, calls
-    assign_story_to_arc in chronological order so earlier stories seed arcs
-    and later ones join. Idempotent — running twice won't duplicate arcs
-    because story IDs in arc.story_ids are deduplicated.
+    Returns (labels, centroids, member_counts): labels[i] is story i's arc.
     """
-    from db import StoryArc
+    n, dim = embeddings.shape
+    norms = np.linalg.norm(embeddings, axis=1)
+    unit = embeddings / np.where(norms == 0, 1.0, norms)[:, None]
+
+    sums = np.empty((n, dim), dtype=np.float64)
+    sum_norms = np.empty(n, dtype=np.float64)
+    counts = np.zeros(n, dtype=np.int64)
+    labels = np.empty(n, dtype=np.int64)
+    k = 0
+    for i in range(n):
+        best = -1
+        if k:
+            sims = (sums[:k] @ unit[i]) / np.where(sum_norms[:k] == 0, 1.0, sum_norms[:k])
+            best = int(np.argmax(sims))
+            if sims[best] < threshold:
+                best = -1
+        if best < 0:
+            best = k
+            sums[k] = 0.0
+            k += 1
+        sums[best] += embeddings[i]
+        sum_norms[best] = np.linalg.norm(sums[best])
+        counts[best] += 1
+        labels[i] = best
+
+    return labels, sums[:k] / counts[:k, None], counts[:k]
+
+
+async def _embed_missing_stories(db: AsyncSession) -> tuple[int, int]:
+    """Embed stories without a content_embedding in batched provider calls.
+
+    Up to ARC_EMBED_CONCURRENCY batches of ARC_EMBED_BATCH_SIZE stories are in
+    flight at once. Returns (embedded, failed).
+    """
+    from sqlalchemy import update
 
-    # Step 1: Embed stories that lack embeddings
-    unembedded_result = await db.execute(
-        text(
-            "SELECT id, title, content FROM platform_stories "
-            "WHERE content_embedding IS NULL ORDER BY created_at"
+    from db import Story
+    from utils.embeddings import generate_embeddings
+
+    rows = (
+        await db.execute(
+            select(Story.id, Story.title, Story.content)
+            .where(Story.content_embedding.is_(None))
+            .order_by(Story.created_at)
         )
-    )
-    unembedded_rows = unembedded_result.fetchall()
-
-    if unembedded_rows:
-        logger.info("Computing embeddings for %d stories", len(unembedded_rows))
-        for row in unembedded_rows:
-            embed_text = f"Title: {row.title}\n\n{(row.content or '')[:5000]}"
-            embedding = await _generate_embedding(embed_text)
-            if embedding:
-                await db.execute(
-                    text(
-                        "UPDATE platform_stories SET content_embedding = CAST(:emb AS vector) "
-                        "WHERE id = :story_id"
-                    ),
-                    {"emb": str(embedding), "story_id": str(row.id)},
-                )
+    ).all()
+    if not rows:
+        return 0, 0
+    logger.info("Computing embeddings for %d stories", len(rows))
+
+    slots = asyncio.Semaphore(ARC_EMBED_CONCURRENCY)
+
+    async def embed(batch: list[Any]) -> list[dict[str, Any]]:
+        texts = [f"Title: {row.title}\n\n{(row.content or '')[:5000]}" for row in batch]
+        async with slots:
+            try:
+                vectors = await generate_embeddings(texts)
+            except Exception:
+                logger.exception("Failed to embed a batch of %d stories", len(batch))
+                return []
+        return [{"id": row.id, "content_embedding": vector} for row, vector in zip(batch, vectors)]
+
+    batches = [rows[i:i + ARC_EMBED_BATCH_SIZE] for i in range(0, len(rows), ARC_EMBED_BATCH_SIZE)]
+    updates = [u for batch in await asyncio.gather(*(embed(b) for b in batches)) for u in batch]
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany
+        await db.execute(update(Story), updates)
         await db.flush()
+    return len(updates), len(rows) - len(updates)
 
-    # Step 2: Load all stories with embeddings, in chronological order
-    stories_result = await db.execute(
-        text(
-            "SELECT id, world_id, perspective_dweller_id, title, content, "
-            "content_embedding::text as embedding_str "
-            "FROM platform_stories "
-            "WHERE content_embedding IS NOT NULL AND perspective_dweller_id IS NOT NULL "
-            "ORDER BY created_at"
-        )
-    )
-    story_rows = stories_result.fetchall()
 
-    if not story_rows:
-        logger.info("No stories with embeddings found for arc detection")
-        return []
+async def detect_arcs(db: AsyncSession) -> dict[str, Any]:
+    """Full backfill: cluster all stories into arcs from scratch.
 
-    # Step 3: Clear existing arcs (full recompute)
-    await db.execute(text("DELETE FROM platform_story_arcs"))
-    await db.flush()
+    Used by:
+    - POST /arcs/detect (admin endpoint)
+    - scripts/materialize_relationships_and_arcs.py (backfill script)
+
+    1. Embed stories that lack embeddings (batched, bounded concurrency)
+    2. Load every embedded story with a perspective_dweller_id into one matrix
+    3. cluster_embeddings() per dweller, stories in chronological order
+    4. Write all arcs (with centroids) back in bulk upserts and delete the rest
+
+    An arc keeps its id across runs while its first story is unchanged, so
+    links to arcs survive re-detection. Idempotent — running twice yields
+    the same arcs.
 
-    created_arcs: list[dict[str, Any]] = []
+    Returns {"arcs": [...], "stats": {...}} where stats has counts and
+    per-phase timings.
+    """
+    from sqlalchemy import delete
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-    # Group by dweller for efficient arc loading
-    stories_by_dweller: dict[str, list[Any]] = {}
-    for row in story_rows:
-        did = str(row.perspective_dweller_id)
-        stories_by_dweller.setdefault(did, []).append(row)
+    from db import Dweller, Story, StoryArc
 
-    for dweller_id_str, rows in stories_by_dweller.items():
-        dweller_id = UUID(dweller_id_str)
-        arcs_for_dweller: list[StoryArc] = []
+    started = time.perf_counter()
 
-        # Get dweller name once
-        name_result = await db.execute(
-            text("SELECT name FROM platform_dwellers WHERE id = :did"),
-            {"did": dweller_id_str},
+    # Step 1: Embed stories that lack embeddings
+    embedded, embed_failed = await _embed_missing_stories(db)
+    embedded_at = time.perf_counter()
+
+    # Step 2: Load all stories with embeddings, grouped by dweller in chronological order
+    story_rows = (
+        await db.execute(
+            select(
+                Story.id, Story.world_id, Story.perspective_dweller_id, Story.title, Story.content_embedding,
+            )
+            .where(Story.content_embedding.is_not(None), Story.perspective_dweller_id.is_not(None))
+            .order_by(Story.perspective_dweller_id, Story.created_at, Story.id)
         )
-        name_row = name_result.fetchone()
-        dweller_name = name_row[0] if name_row else None
-
-        for row in rows:
-            story_id = str(row.id)
-            world_id = UUID(str(row.world_id))
-            story_emb = _parse_embedding_str(row.embedding_str)
-
-            if story_emb is None:
-                continue
-
-            # Find best matching arc by centroid
-            best_arc: StoryArc | None = None
-            best_sim = 0.0
-
-            for arc in arcs_for_dweller:
-                arc_story_ids = arc.story_ids or []
-                if not arc_story_ids:
-                    continue
-                # Load arc story embeddings from DB
-                arc_emb_result = await db.execute(
-                    text(
-                        "SELECT content_embedding::text FROM platform_stories "
-                        "WHERE id = ANY(:ids) AND content_embedding IS NOT NULL"
-                    ),
-                    {"ids": [UUID(sid) for sid in arc_story_ids]},
-                )
-                arc_embs = [
-                    _parse_embedding_str(r[0])
-                    for r in arc_emb_result.fetchall()
-                ]
-                arc_embs = [e for e in arc_embs if e is not None]
-
-                if not arc_embs:
-                    continue
-
-                centroid = _average_embedding(arc_embs)
-                if centroid is None:
-                    continue
-
-                sim = _cosine_similarity(story_emb, centroid)
-                if sim > best_sim:
-                    best_sim = sim
-                    best_arc = arc
-
-            if best_arc and best_sim >= ARC_JOIN_THRESHOLD:
-                current_ids = list(best_arc.story_ids or [])
-                if story_id not in current_ids:
-                    current_ids.append(story_id)
-                    best_arc.story_ids = current_ids
-                    best_arc.updated_at = datetime.now(timezone.utc)
-            else:
-                # Create new arc
-                arc_name = _generate_arc_name(dweller_name, [row.title])
-                new_arc = StoryArc(
-                    name=arc_name,
-                    world_id=world_id,
-                    dweller_id=dweller_id,
-                    story_ids=[story_id],
-                )
-                db.add(new_arc)
-                await db.flush()
-                arcs_for_dweller.append(new_arc)
-                created_arcs.append({
-                    "id": str(new_arc.id),
-                    "action": "created",
-                    "name": arc_name,
-                    "story_count": 1,
-                })
-
-    logger.info("Arc detection complete: %d arcs created", len(created_arcs))
-    return created_arcs
+    ).all()
+    matrix = (
+        np.vstack([np.asarray(row.content_embedding, dtype=np.float32) for row in story_rows])
+        if story_rows else np.empty((0, 0), dtype=np.float32)
+    )
+    loaded_at = time.perf_counter()
+
+    # Step 3: Cluster each dweller's slice of the matrix
+    dweller_ids = list(dict.fromkeys(row.perspective_dweller_id for row in story_rows))
+    dweller_names = dict(
+        (await db.execute(select(Dweller.id, Dweller.name).where(Dweller.id.in_(dweller_ids)))).all()
+    ) if dweller_ids else {}
+    existing_arcs = (
+        await db.execute(select(StoryArc.id, StoryArc.dweller_id, StoryArc.story_ids[0].astext.label("seed")))
+    ).all()
+    existing_ids = {(row.dweller_id, row.seed): row.id for row in existing_arcs}
+
+    now = datetime.now(timezone.utc)
+    arc_rows: list[dict[str, Any]] = []
+    summaries: list[dict[str, Any]] = []
+    start = 0
+    while start < len(story_rows):
+        dweller_id = story_rows[start].perspective_dweller_id
+        end = start
+        while end < len(story_rows) and story_rows[end].perspective_dweller_id == dweller_id:
+            end += 1
+        rows = story_rows[start:end]
+        labels, centroids, counts = cluster_embeddings(matrix[start:end])
+        members: list[list[Any]] = [[] for _ in range(len(counts))]
+        for row, label in zip(rows, labels):
+            members[label].append(row)
+
+        for arc_members, centroid, count in zip(members, centroids, counts):
+            seed = arc_members[0]
+            arc_id = existing_ids.get((dweller_id, str(seed.id)))
+            name = _generate_arc_name(dweller_names.get(dweller_id), [seed.title])
+            arc_rows.append({
+                "id": arc_id or deterministic_uuid4(),
+                "name": name,
+                "world_id": seed.world_id,
+                "dweller_id": dweller_id,
+                "story_ids": [str(row.id) for row in arc_members],
+                "centroid": centroid,
+                "member_count": int(count),
+                "updated_at": now,
+            })
+            summaries.append({
+                "id": str(arc_rows[-1]["id"]),
+                "action": "updated" if arc_id else "created",
+                "name": name,
+                "story_count": int(count),
+            })
+        start = end
+    clustered_at = time.perf_counter()
+
+    # Step 4: Bulk upsert, then drop arcs that no longer exist
+    for i in range(0, len(arc_rows), ARC_UPSERT_BATCH_SIZE):
+        stmt = pg_insert(StoryArc).values(arc_rows[i:i + ARC_UPSERT_BATCH_SIZE])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[StoryArc.id],
+            set_={
+                "name": stmt.excluded.name,
+                "world_id": stmt.excluded.world_id,
+                "dweller_id": stmt.excluded.dweller_id,
+                "story_ids": stmt.excluded.story_ids,
+                "centroid": stmt.excluded.centroid,
+                "member_count": stmt.excluded.member_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ))
+    stale = list({row.id for row in existing_arcs} - {row["id"] for row in arc_rows})
+    for i in range(0, len(stale), ARC_UPSERT_BATCH_SIZE):
+        await db.execute(delete(StoryArc).where(StoryArc.id.in_(stale[i:i + ARC_UPSERT_BATCH_SIZE])))
+    await db.flush()
+    finished = time.perf_counter()
+
+    total = finished - started
+    stats = {
+        "stories": len(story_rows),
+        "dwellers": len(dweller_ids),
+        "arcs": len(arc_rows),
+        "embedded": embedded,
+        "embed_failed": embed_failed,
+        "embed_seconds": round(embedded_at - started, 3),
+        "load_seconds": round(loaded_at - embedded_at, 3),
+        "cluster_seconds": round(clustered_at - loaded_at, 3),
+        "write_seconds": round(finished - clustered_at, 3),
+        "total_seconds": round(total, 3),
+        "stories_per_second": round(len(story_rows) / total, 1) if total > 0 else None,
+    }
+    logger.info("Arc detection complete: %s", stats)
+    return {"arcs": summaries, "stats": stats}
@@ -0,0 +1,120 @@
+"""Materialized SPEAK conversation state (platform_conversations).
+
+Each SPEAK that targets a dweller upserts its pair's row in one statement:
+the speaker's new action joins their unanswered list, the action it replies
+to leaves the other side's list, and last action / turn move on. Readers
+then answer "what does this dweller owe a reply to?" with a single row:
+
+    conversation = await get_conversation(db, dweller.id, target.id)
+    owed = unanswered_from(conversation, target.id)
+
+A reply only clears the action it answers within the pair's own row. Each
+side keeps only its newest UNANSWERED_SPEAKS_LIMIT unanswered speaks, so a
+dweller talking into silence cannot grow the row without bound.
+"""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import String, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import JSONPATH, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import Conversation, Dweller, DwellerAction
+from utils.clock import now as utc_now
+from utils.deterministic import deterministic_uuid4
+
+# Unanswered speaks kept per side (oldest dropped first); migration 0036 backfills with the same cap
+UNANSWERED_SPEAKS_LIMIT = 20
+
+
+def _pair(x: UUID, y: UUID) -> tuple[UUID, UUID]:
+    """Return (smaller_id, larger_id) to match the CHECK constraint."""
+    return (x, y) if str(x) < str(y) else (y, x)
+
+
+async def record_speak(db: AsyncSession, action: DwellerAction, target_dweller: Dweller) -> None:
+    """Fold a SPEAK action into its pair's conversation row (insert or update)."""
+    speaker_id = action.dweller_id
+    a_id, b_id = _pair(speaker_id, target_dweller.id)
+    speaker_col, other_col = (
+        ("unanswered_from_a", "unanswered_from_b") if speaker_id == a_id
+        else ("unanswered_from_b", "unanswered_from_a")
+    )
+    now = utc_now()
+    values: dict[str, Any] = {
+        "id": deterministic_uuid4(),
+        "world_id": action.world_id,
+        "dweller_a_id": a_id,
+        "dweller_b_id": b_id,
+        "last_action_id": action.id,
+        "last_speaker_id": speaker_id,
+        "turn_dweller_id": target_dweller.id,
+        speaker_col: [str(action.id)],
+        other_col: [],
+        "speak_count": 1,
+        "last_action_at": now,
+        "updated_at": now,
+    }
+
+    stmt = pg_insert(Conversation).values(values)
+    table = Conversation.__table__
+    excluded = stmt.excluded
+    answered = table.c[other_col]
+    if action.in_reply_to_action_id:
+        # jsonb - text removes that string from the array
+        answered = answered.op("-")(cast(literal(str(action.in_reply_to_action_id)), String))
+    await db.execute(stmt.on_conflict_do_update(
+        constraint="uq_conversation_pair",
+        set_={
+            speaker_col: func.jsonb_path_query_array(
+                table.c[speaker_col].concat(excluded[speaker_col]),
+                cast(literal(f"$[last - {UNANSWERED_SPEAKS_LIMIT - 1} to last]"), JSONPATH),
+            ),
+            other_col: answered,
+            "last_action_id": excluded.last_action_id,
+            "last_speaker_id": excluded.last_speaker_id,
+            "turn_dweller_id": excluded.turn_dweller_id,
+            "speak_count": table.c.speak_count + 1,
+            "last_action_at": excluded.last_action_at,
+            "updated_at": excluded.updated_at,
+        },
+    ))
+
+
+async def get_conversation(db: AsyncSession, dweller_id: UUID, other_id: UUID) -> Conversation | None:
+    """The conversation row between two dwellers, if they have ever spoken."""
+    a_id, b_id = _pair(dweller_id, other_id)
+    return await db.scalar(
+        select(Conversation)
+        .where(Conversation.dweller_a_id == a_id, Conversation.dweller_b_id == b_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def list_conversations(db: AsyncSession, dweller_id: UUID, since: datetime) -> list[Conversation]:
+    """Conversations involving a dweller with a speak since `since`, most recent first."""
+    result = await db.execute(
+        select(Conversation)
+        .where(
+            or_(Conversation.dweller_a_id == dweller_id, Conversation.dweller_b_id == dweller_id),
+            Conversation.last_action_at >= since,
+        )
+        .order_by(Conversation.last_action_at.desc(), Conversation.id)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+def partner_of(conversation: Conversation, dweller_id: UUID) -> UUID:
+    return conversation.dweller_b_id if conversation.dweller_a_id == dweller_id else conversation.dweller_a_id
+
+
+def unanswered_from(conversation: Conversation | None, speaker_id: UUID) -> list[str]:
+    """Action ids of `speaker_id`'s speaks in this conversation with no reply, oldest first."""
+    if conversation is None:
+        return []
+    if conversation.dweller_a_id == speaker_id:
+        return list(conversation.unanswered_from_a)
+    return list(conversation.unanswered_from_b)
@@ -52,9 +52,7 @@ async def calculate_dweller_delta(
         .options(selectinload(DwellerAction.dweller))
         .where(
             # In the same world
-            DwellerAction.dweller_id.in_(
-                select(Dweller.id).where(Dweller.world_id == dweller.world_id)
-            ),
+            DwellerAction.world_id == dweller.world_id,
             # Created since last action
             DwellerAction.created_at > delta_since,
             # Not this dweller's own actions
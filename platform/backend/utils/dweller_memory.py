@@ -0,0 +1,268 @@
+"""Dweller episodic memory store.
+
+Episodes are rows in platform_dweller_memories rather than a JSONB array on the
+dweller, so an action appends one row instead of rewriting the whole history.
+
+Write path:
+    append_episode(db, dweller, ...)  — take_action, reflections, heartbeat actions
+    enqueue_embeddings(db, memories)  — semantic recall, when an embedding provider is set;
+                                        the job worker runs embed_episodes after commit
+
+Read path:
+    get_recent_episodes(db, dweller_id, limit)  — state, full memory
+    get_working_memory(db, dweller_id, size)    — act/context (reflection-weighted)
+    search_memories(db, dweller_id, query, ...) — ranked hybrid memory search
+
+Episodes are returned in the same dict shape the JSONB array used:
+{id, action_id?, timestamp, type, content, target?, importance, ...extra}.
+"""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Text, cast, func, select, update
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from db import Dweller, DwellerMemory
+from db.models import PGVECTOR_AVAILABLE
+from jobs import EmbedDwellerMemories, enqueue
+from utils.clock import now as utc_now
+from utils.deterministic import deterministic_uuid4
+from utils.memory_embeddings import embed_memory_text, memory_embedding_provider
+
+# Reciprocal rank fusion constant: dampens the lead of the top few ranks so an
+# episode ranked well by both text and semantic search beats one ranked first by either.
+RRF_K = 60
+
+# Semantic recall ranks the dweller's newest SEMANTIC_WINDOW embedded episodes
+# exactly (bounded by the created_at index); older episodes stay reachable via text.
+SEMANTIC_WINDOW = 5000
+
+# Cosine similarity below which a semantic neighbour is noise, not a match.
+SEMANTIC_MIN_SIMILARITY = 0.3
+
+
+async def append_episode(
+    db: AsyncSession,
+    dweller: Dweller,
+    memory_type: str,
+    content: str,
+    target: str | None = None,
+    importance: float = 0.5,
+    action_id: UUID | None = None,
+    extra: dict[str, Any] | None = None,
+    created_at: datetime | None = None,
+) -> DwellerMemory:
+    """Add one episode to the dweller's memory (flushed with the session).
+
+    Bumps episodic_memory_count in SQL so totals never need a COUNT(*) and
+    concurrent actions on the same dweller never lose an increment.
+    """
+    memory = DwellerMemory(
+        id=deterministic_uuid4(),
+        dweller_id=dweller.id,
+        action_id=action_id,
+        memory_type=memory_type,
+        content=content,
+        target=target,
+        importance=importance,
+        extra=extra or {},
+        created_at=created_at or utc_now(),
+    )
+    db.add(memory)
+    total = await db.scalar(
+        update(Dweller)
+        .where(Dweller.id == dweller.id)
+        .values(episodic_memory_count=Dweller.episodic_memory_count + 1)
+        .returning(Dweller.episodic_memory_count)
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(dweller, "episodic_memory_count", total)
+    return memory
+
+
+def _newest_first(dweller_id: UUID):
+    return (
+        select(DwellerMemory)
+        .where(DwellerMemory.dweller_id == dweller_id)
+        .order_by(DwellerMemory.created_at.desc(), DwellerMemory.seq.desc())
+    )
+
+
+async def get_recent_episodes(
+    db: AsyncSession, dweller_id: UUID, limit: int
+) -> list[dict[str, Any]]:
+    """Return the newest `limit` episodes in chronological order."""
+    result = await db.execute(_newest_first(dweller_id).limit(limit))
+    memories = list(result.scalars().all())
+    memories.reverse()
+    return [m.to_episode() for m in memories]
+
+
+async def get_working_memory(
+    db: AsyncSession, dweller_id: UUID, size: int
+) -> list[dict[str, Any]]:
+    """Return the reflection-weighted working memory in chronological order.
+
+    Working memory ranks episodes by (2 if reflection else 0) + recency, so
+    every reflection outranks every ordinary episode. The top `size` is
+    therefore the newest `size` reflections, topped up with the newest
+    non-reflections. Both halves are index range scans bounded by `size`
+    (dweller_memory_reflection_idx / dweller_memory_dweller_created_idx),
+    so cost tracks the window, not the dweller's history.
+    """
+    if size <= 0:
+        return []
+
+    reflections_result = await db.execute(
+        _newest_first(dweller_id)
+        .where(DwellerMemory.memory_type == "reflection")
+        .limit(size)
+    )
+    memories = list(reflections_result.scalars().all())
+
+    remaining = size - len(memories)
+    if remaining > 0:
+        others_result = await db.execute(
+            _newest_first(dweller_id)
+            .where(DwellerMemory.memory_type != "reflection")
+            .limit(remaining)
+        )
+        memories.extend(others_result.scalars().all())
+
+    memories.sort(key=lambda m: (m.created_at, m.seq))
+    return [m.to_episode() for m in memories]
+
+
+async def enqueue_embeddings(db: AsyncSession, memories: list[DwellerMemory]) -> None:
+    """Queue embedding of freshly appended episodes (no-op unless a provider is set).
+
+    The provider call runs in the job worker after the request commits, so
+    actions never wait on an embedding round trip.
+    """
+    if not PGVECTOR_AVAILABLE or memory_embedding_provider() is None or not memories:
+        return
+    await enqueue(db, EmbedDwellerMemories(memory_ids=[memory.id for memory in memories]))
+
+
+async def embed_episodes(memories: list[DwellerMemory]) -> None:
+    """Attach embeddings to episodes (no-op unless a provider is set).
+
+    An episode whose embedding fails stays text-only; the rest still get theirs.
+    """
+    if not PGVECTOR_AVAILABLE:
+        return
+    for memory in memories:
+        vector = await embed_memory_text(f"{memory.content} {memory.target or ''}")
+        if vector is None:
+            continue
+        memory.embedding = vector
+
+
+def _text_query(query: str):
+    """OR together the query's stemmed lexemes, e.g. 'copper wire' → 'copper' | 'wire'."""
+    return cast(
+        func.replace(cast(func.plainto_tsquery("english", query), Text), "&", "|"),
+        TSQUERY,
+    )
+
+
+def _dweller_lexeme(dweller_id: UUID) -> str:
+    """The per-dweller lexeme baked into DwellerMemory.search_vector."""
+    return f"d{dweller_id.hex}"
+
+
+async def search_memories(
+    db: AsyncSession,
+    dweller_id: UUID,
+    query: str,
+    importance_min: float = 0.0,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Ranked memory search. Returns (page of episodes, has_more).
+
+    Text half: GIN-indexed tsvector match on content + target, ranked by
+    ts_rank (any stemmed query word matches). The match is ANDed with the
+    dweller's own lexeme, so the index returns only this dweller's hits no
+    matter how many other dwellers share the table; a query of only stopwords
+    has no lexemes and matches nothing. Semantic half, when an
+    embedding provider is configured: cosine similarity over the dweller's
+    recent embedded episodes. The two rankings are merged by reciprocal rank
+    fusion; ties fall back to importance, then recency. Each half fetches only
+    offset + limit + 1 candidates, so cost tracks the page, not the history.
+    """
+    window = offset + limit + 1
+    scores: dict[UUID, float] = {}
+    loaded: dict[UUID, DwellerMemory] = {}
+
+    ts_query = _text_query(query)
+    dweller_query = func.to_tsquery("simple", _dweller_lexeme(dweller_id)).op("&&")(ts_query)
+    rank = func.ts_rank(DwellerMemory.search_vector, ts_query, 32)
+    text_result = await db.execute(
+        select(DwellerMemory)
+        .where(
+            DwellerMemory.dweller_id == dweller_id,
+            DwellerMemory.importance >= importance_min,
+            # An empty tsquery would leave only the dweller lexeme, matching every episode
+            func.numnode(ts_query) > 0,
+            DwellerMemory.search_vector.op("@@")(dweller_query),
+        )
+        .order_by(
+            rank.desc(),
+            DwellerMemory.importance.desc(),
+            DwellerMemory.created_at.desc(),
+            DwellerMemory.seq.desc(),
+        )
+        .limit(window)
+    )
+    for position, memory in enumerate(text_result.scalars().all()):
+        loaded[memory.id] = memory
+        scores[memory.id] = 1.0 / (RRF_K + position + 1)
+
+    query_vector = await embed_memory_text(query) if PGVECTOR_AVAILABLE else None
+    if query_vector is not None:
+        recent = (
+            select(DwellerMemory.id, DwellerMemory.embedding)
+            .where(
+                DwellerMemory.dweller_id == dweller_id,
+                DwellerMemory.importance >= importance_min,
+                DwellerMemory.embedding.is_not(None),
+            )
+            .order_by(DwellerMemory.created_at.desc(), DwellerMemory.seq.desc())
+            .limit(SEMANTIC_WINDOW)
+            .subquery()
+        )
+        distance = recent.c.embedding.cosine_distance(query_vector)
+        semantic_result = await db.execute(
+            select(recent.c.id)
+            .where(distance <= 1 - SEMANTIC_MIN_SIMILARITY)
+            .order_by(distance)
+            .limit(window)
+        )
+        for position, memory_id in enumerate(semantic_result.scalars().all()):
+            scores[memory_id] = scores.get(memory_id, 0.0) + 1.0 / (RRF_K + position + 1)
+
+        missing = [memory_id for memory_id in scores if memory_id not in loaded]
+        if missing:
+            missing_result = await db.execute(
+                select(DwellerMemory).where(DwellerMemory.id.in_(missing))
+            )
+            for memory in missing_result.scalars().all():
+                loaded[memory.id] = memory
+
+    ranked = sorted(
+        loaded.values(),
+        key=lambda m: (scores[m.id], m.importance, m.created_at, m.seq),
+        reverse=True,
+    )
+    page = ranked[offset:offset + limit]
+    episodes = []
+    for memory in page:
+        episode = memory.to_episode()
+        episode["search_score"] = round(scores[memory.id], 6)
+        episodes.append(episode)
+    return episodes, len(ranked) > offset + limit
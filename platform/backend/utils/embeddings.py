@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSIONS = 1536  # Default for text-embedding-3-small
 
+# Model limit is 8191 tokens; rough estimate 4 chars per token
+MAX_EMBEDDING_CHARS = 30000
+
 # Similarity thresholds
 SIMILARITY_THRESHOLD_GLOBAL = 0.75  # For checking against all proposals/worlds
 SIMILARITY_THRESHOLD_SELF = 0.90  # For checking agent's own proposals (stricter)
@@ -29,12 +32,13 @@ def get_openai_client() -> openai.AsyncOpenAI:
     return openai.AsyncOpenAI(api_key=api_key)
 
 
-async def generate_embedding(text: str) -> list[float]:
+async def generate_embedding(text: str, dimensions: int | None = None) -> list[float]:
     """
     Generate embedding for text using OpenAI.
 
     Args:
         text: The text to embed (typically premise + scientific_basis)
+        dimensions: Shorten the embedding to this many dimensions (model default if None)
 
     Returns:
         List of floats representing the embedding vector
@@ -46,20 +50,56 @@ async def generate_embedding(text: str) -> list[float]:
     client = get_openai_client()
 
     # Truncate text if too long (model has 8191 token limit)
-    # Rough estimate: 4 chars per token
-    max_chars = 30000
-    if len(text) > max_chars:
-        text = text[:max_chars]
-        logger.warning(f"Text truncated to {max_chars} chars for embedding")
+    if len(text) > MAX_EMBEDDING_CHARS:
+        text = text[:MAX_EMBEDDING_CHARS]
+        logger.warning(f"Text truncated to {MAX_EMBEDDING_CHARS} chars for embedding")
+
+    kwargs: dict[str, Any] = {}
+    if dimensions is not None:
+        kwargs["dimensions"] = dimensions
 
     response = await client.embeddings.create(
         model=EMBEDDING_MODEL,
         input=text,
+        **kwargs,
     )
 
     return response.data[0].embedding
 
 
+async def generate_embeddings(texts: list[str], dimensions: int | None = None) -> list[list[float]]:
+    """
+    Generate embeddings for several texts in one API call.
+
+    Args:
+        texts: Texts to embed (keep batches to a few hundred; the API caps
+            inputs and total tokens per request)
+        dimensions: Shorten the embeddings to this many dimensions (model default if None)
+
+    Returns:
+        One embedding per text, in input order
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+        openai.APIError: If the API call fails
+    """
+    if not texts:
+        return []
+    client = get_openai_client()
+
+    kwargs: dict[str, Any] = {}
+    if dimensions is not None:
+        kwargs["dimensions"] = dimensions
+
+    response = await client.embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=[text[:MAX_EMBEDDING_CHARS] for text in texts],
+        **kwargs,
+    )
+
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
 def create_proposal_text_for_embedding(
     premise: str,
     scientific_basis: str,
@@ -0,0 +1,268 @@
+"""Feed cache with pluggable backends and write-path invalidation.
+
+Feed pages are cached under a key that embeds a *generation* number. Write
+paths that add feed activity (story creation, dweller actions, proposal
+submission, review submission) call invalidate_feed_cache() after they
+commit, which bumps the generation: every existing page becomes unreachable
+at once, with no key sweep, and the next read rebuilds from committed data.
+
+Backends (FEED_CACHE_BACKEND):
+    memory (default) — bounded in-process LRU (FEED_CACHE_MAX_ENTRIES).
+                       Invalidation only reaches this process, so pages live
+                       FEED_CACHE_MEMORY_TTL_SECONDS: another worker process
+                       serves a stale feed for at most that long.
+    redis            — shared across processes via REDIS_URL (needs the
+                       optional `redis` package; falls back to memory).
+                       Invalidation is shared, so pages live
+                       FEED_CACHE_TTL_SECONDS.
+
+Cold misses are single-flight: concurrent requests for the same page await
+one build instead of each running the feed queries.
+
+Usage:
+    page = await get_feed_cache().get_or_build(cursor, limit, build)
+    await invalidate_feed_cache()
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any, Protocol
+
+from utils.clock import now as utc_now
+
+logger = logging.getLogger(__name__)
+
+# With a shared backend invalidation is event-driven; the TTL only bounds how
+# long a page survives if a write path is missed.
+FEED_CACHE_TTL_SECONDS = int(os.getenv("FEED_CACHE_TTL_SECONDS", "300"))
+# The memory backend can't see other processes' invalidations, so its pages
+# must expire quickly; this is how stale a multi-worker deploy's feed can get.
+FEED_CACHE_MEMORY_TTL_SECONDS = int(os.getenv("FEED_CACHE_MEMORY_TTL_SECONDS", "3"))
+FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "256"))
+
+_KEY_PREFIX = "dsf:feed"
+_GENERATION_KEY = f"{_KEY_PREFIX}:generation"
+
+
+class FeedCacheBackend(Protocol):
+    """Storage for feed pages plus the shared generation counter."""
+
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+
+    async def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None: ...
+
+    async def generation(self) -> int: ...
+
+    async def bump_generation(self) -> int: ...
+
+
+class InProcessFeedCache:
+    """Bounded LRU for a single process. Evicts least-recently-used pages in O(1)."""
+
+    def __init__(self, max_entries: int = FEED_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict[str, Any], datetime]] = OrderedDict()
+        self._generation = 0
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if utc_now() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        self._entries[key] = (value, utc_now() + timedelta(seconds=ttl_seconds))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def bump_generation(self) -> int:
+        self._generation += 1
+        # Pages from older generations are unreachable; drop them eagerly.
+        self._entries.clear()
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisFeedCache:
+    """Shared cache over any redis.asyncio-compatible client.
+
+    Uses only GET, SET (with EX) and INCR, so a minimal fake can stand in for
+    Redis in tests. Pages expire by TTL; old generations are never read again.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        raw = await self.client.get(key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        await self.client.set(key, json.dumps(value), ex=ttl_seconds)
+
+    async def generation(self) -> int:
+        raw = await self.client.get(_GENERATION_KEY)
+        return int(raw) if raw is not None else 0
+
+    async def bump_generation(self) -> int:
+        return int(await self.client.incr(_GENERATION_KEY))
+
+
+class FeedCache:
+    """Generation-keyed feed cache with single-flight builds."""
+
+    def __init__(self, backend: FeedCacheBackend, ttl_seconds: int = FEED_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+
+    @staticmethod
+    def _key(generation: int, cursor: str | None, limit: int) -> str:
+        return f"{_KEY_PREFIX}:g{generation}:cursor:{cursor or 'none'}|limit:{limit}"
+
+    async def lookup(
+        self, cursor: str | None, limit: int
+    ) -> tuple[str, dict[str, Any] | None]:
+        """Return (key, page). page is None on a miss with no build in flight.
+
+        The key pins the generation seen at lookup time; pass it to store() so a
+        page built across an invalidation is filed under the old generation.
+        """
+        key = self._key(await self.backend.generation(), cursor, limit)
+        try:
+            cached = await self.backend.get(key)
+        except Exception:
+            logger.exception("Feed cache read failed")
+            cached = None
+        if cached is not None:
+            return key, cached
+        return key, await self._join(key)
+
+    async def _join(self, key: str) -> dict[str, Any] | None:
+        """Await an in-flight build of key. None if there is none or its builder was cancelled."""
+        pending = self._inflight.get(key)
+        if pending is None:
+            return None
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if pending.cancelled() and not (current and current.cancelling()):
+                return None
+            raise
+
+    async def store(self, key: str, page: dict[str, Any]) -> None:
+        try:
+            await self.backend.set(key, page, self.ttl_seconds)
+        except Exception:
+            logger.exception("Feed cache write failed")
+
+    async def get_or_build(
+        self,
+        cursor: str | None,
+        limit: int,
+        build: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Serve a cached page, or build it once no matter how many callers miss."""
+        key, cached = await self.lookup(cursor, limit)
+        if cached is not None:
+            return cached
+
+        # lookup() found no build in flight, or the one it joined was cancelled and
+        # another caller may already have taken over.
+        joined = await self._join(key)
+        if joined is not None:
+            return joined
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            page = await build()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise; retrieve here so an unwaited future doesn't warn.
+            future.exception()
+            raise
+        else:
+            future.set_result(page)
+            await self.store(key, page)
+            return page
+        finally:
+            self._inflight.pop(key, None)
+
+    async def invalidate(self) -> None:
+        try:
+            await self.backend.bump_generation()
+        except Exception:
+            logger.exception("Feed cache invalidation failed")
+
+
+def _create_backend() -> FeedCacheBackend:
+    backend = os.getenv("FEED_CACHE_BACKEND", "memory").strip().lower()
+    if backend == "redis":
+        redis_url = os.getenv("REDIS_URL")
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            redis_asyncio = None
+        if redis_asyncio is not None and redis_url:
+            return RedisFeedCache(redis_asyncio.from_url(redis_url))
+        logger.warning("FEED_CACHE_BACKEND=redis needs the redis package and REDIS_URL; using memory")
+    elif backend != "memory":
+        logger.warning(f"Unknown FEED_CACHE_BACKEND={backend!r}; using memory")
+    workers = int(os.getenv("WEB_CONCURRENCY", "1") or "1")
+    if workers > 1:
+        logger.warning(
+            f"Feed cache is per-process with {workers} workers: other workers serve a "
+            f"stale feed for up to {FEED_CACHE_MEMORY_TTL_SECONDS}s after a write. "
+            "Set FEED_CACHE_BACKEND=redis to share invalidation."
+        )
+    return InProcessFeedCache()
+
+
+_feed_cache: FeedCache | None = None
+
+
+def get_feed_cache() -> FeedCache:
+    """Process-wide feed cache (backend chosen from the environment on first use)."""
+    global _feed_cache
+    if _feed_cache is None:
+        backend = _create_backend()
+        ttl_seconds = (
+            FEED_CACHE_MEMORY_TTL_SECONDS if isinstance(backend, InProcessFeedCache)
+            else FEED_CACHE_TTL_SECONDS
+        )
+        _feed_cache = FeedCache(backend, ttl_seconds=ttl_seconds)
+    return _feed_cache
+
+
+def set_feed_cache(cache: FeedCache | None) -> None:
+    """Swap the process-wide cache (tests; None re-reads the environment)."""
+    global _feed_cache
+    _feed_cache = cache
+
+
+async def invalidate_feed_cache() -> None:
+    """Make new activity visible on the next feed read. Call after commit."""
+    await get_feed_cache().invalidate()
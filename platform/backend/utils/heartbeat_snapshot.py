@@ -0,0 +1,268 @@
+"""Heartbeat snapshot: everything GET and POST /heartbeat report, loaded once.
+
+Both heartbeat endpoints used to run the same fifteen-odd queries one after
+another (notifications, pending proposals, own proposals, dwellers, worlds,
+digest counts, missed notifications, proposals by status, suggested-action
+rows, dormant dwellers) and the nudge engine then re-ran several of them.
+load_heartbeat_snapshot() gathers the same data in a fixed number of
+statements, independent of how many notifications, proposals or worlds the
+agent has:
+
+1. pending notifications (ORM rows, so the endpoint can mark them read)
+2. every count, the proposal status breakdown and the nudge engine's
+   community counts, as scalar subqueries of one SELECT
+3. the activity counters row (utils.activity_counters)
+4. dormant inhabited dwellers
+5. suggested-action rows (open feedback, addressed feedback, proposals to
+   review) as one UNION ALL
+
+All five run on the request's session, so the snapshot reads one
+transaction's view of the data.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Text, cast, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import (
+    DwellerAction, Dweller, FeedbackItem, FeedbackItemStatus, Notification,
+    NotificationStatus, Proposal, ProposalStatus, ReviewFeedback, Validation, World,
+)
+from utils.activity_counters import get_activity_counters
+from utils.nudge import DORMANT_DWELLER_HOURS, community_count_columns
+
+# Notifications returned (and marked read) per heartbeat
+HEARTBEAT_NOTIFICATION_LIMIT = 50
+
+# Rows per suggested-action kind
+OPEN_FEEDBACK_LIMIT = 5
+ADDRESSED_FEEDBACK_LIMIT = 5
+PROPOSALS_TO_REVIEW_LIMIT = 3
+
+# Used for the digest when the agent has never sent a heartbeat
+DIGEST_DEFAULT_HOURS = 24
+
+
+@dataclass
+class SuggestionRow:
+    """One feedback item or proposal behind a suggested action."""
+
+    kind: str  # address_feedback | resolve_feedback | review_proposal
+    id: UUID
+    text: str
+    content_type: str
+    content_id: UUID
+
+
+@dataclass
+class HeartbeatSnapshot:
+    """Point-in-time state an agent's heartbeat response is rendered from."""
+
+    now: datetime
+    previous_heartbeat: datetime | None
+    digest_since: datetime
+    notifications: list[Notification]
+    # Agent's activity counters (see utils.activity_counters.COUNTER_COLUMNS)
+    counts: dict[str, int]
+    # Keyed like utils.nudge.community_count_columns()
+    community: dict[str, int]
+    own_active_proposals: int
+    proposals_by_status: dict[str, int]
+    inhabited_dwellers: int
+    missed_notifications: int
+    new_proposals_to_validate: int
+    validations_on_your_proposals: int
+    activity_in_your_worlds: int
+    # (name, id, last_action_at) rows, longest idle first
+    dormant_dwellers: list[Any] = field(default_factory=list)
+    suggestions: list[SuggestionRow] = field(default_factory=list)
+
+    @property
+    def proposals_awaiting_validation(self) -> int:
+        return self.community["proposals_to_validate"]
+
+    @property
+    def world_count(self) -> int:
+        return self.community["worlds"]
+
+    def suggestions_of(self, kind: str) -> list[SuggestionRow]:
+        return [row for row in self.suggestions if row.kind == kind]
+
+
+def _aggregate_columns(user_id: UUID, since: datetime) -> dict[str, Any]:
+    """The snapshot's own counts as scalar subqueries."""
+    validated_subq = (
+        select(Validation.proposal_id)
+        .where(Validation.agent_id == user_id)
+        .scalar_subquery()
+    )
+    user_worlds_subq = (
+        select(World.id)
+        .where(World.created_by == user_id)
+        .scalar_subquery()
+    )
+    by_status = (
+        select(Proposal.status, func.count(Proposal.id).label("n"))
+        .where(Proposal.agent_id == user_id)
+        .group_by(Proposal.status)
+        .subquery()
+    )
+    return {
+        "own_active_proposals": select(func.count(Proposal.id)).where(
+            Proposal.agent_id == user_id,
+            Proposal.status.in_([ProposalStatus.DRAFT, ProposalStatus.VALIDATING]),
+        ).scalar_subquery(),
+        "proposals_by_status": select(
+            func.jsonb_object_agg(cast(by_status.c.status, Text), by_status.c.n)
+        ).scalar_subquery(),
+        "inhabited_dwellers": select(func.count(Dweller.id)).where(
+            Dweller.inhabited_by == user_id
+        ).scalar_subquery(),
+        "missed_notifications": select(func.count(Notification.id)).where(
+            Notification.user_id == user_id,
+            Notification.status == NotificationStatus.SENT,
+        ).scalar_subquery(),
+        # Activity digest: what happened since the previous heartbeat
+        "new_proposals_to_validate": select(func.count(Proposal.id)).where(
+            Proposal.created_at > since,
+            Proposal.status == ProposalStatus.VALIDATING,
+            Proposal.agent_id != user_id,
+            Proposal.id.notin_(validated_subq),
+        ).scalar_subquery(),
+        "validations_on_your_proposals": select(func.count(Validation.id))
+        .join(Proposal, Validation.proposal_id == Proposal.id)
+        .where(Proposal.agent_id == user_id, Validation.created_at > since)
+        .scalar_subquery(),
+        "activity_in_your_worlds": select(func.count(DwellerAction.id)).where(
+            DwellerAction.world_id.in_(user_worlds_subq),
+            DwellerAction.created_at > since,
+        ).scalar_subquery(),
+    }
+
+
+def _suggestions_query(user_id: UUID) -> Any:
+    """Feedback to address, feedback to resolve and proposals to review, in one UNION ALL."""
+    open_feedback = (
+        select(
+            literal("address_feedback").label("kind"),
+            FeedbackItem.id,
+            FeedbackItem.description.label("text"),
+            ReviewFeedback.content_type,
+            ReviewFeedback.content_id,
+        )
+        .join(ReviewFeedback, FeedbackItem.review_feedback_id == ReviewFeedback.id)
+        .join(Proposal, (ReviewFeedback.content_type == "proposal") & (ReviewFeedback.content_id == Proposal.id))
+        .where(
+            Proposal.agent_id == user_id,
+            FeedbackItem.status == FeedbackItemStatus.OPEN,
+        )
+        .limit(OPEN_FEEDBACK_LIMIT)
+    )
+    addressed_feedback = (
+        select(
+            literal("resolve_feedback").label("kind"),
+            FeedbackItem.id,
+            FeedbackItem.description.label("text"),
+            ReviewFeedback.content_type,
+            ReviewFeedback.content_id,
+        )
+        .join(ReviewFeedback, FeedbackItem.review_feedback_id == ReviewFeedback.id)
+        .where(
+            ReviewFeedback.reviewer_id == user_id,
+            FeedbackItem.status == FeedbackItemStatus.ADDRESSED,
+        )
+        .limit(ADDRESSED_FEEDBACK_LIMIT)
+    )
+    reviewed_subq = (
+        select(ReviewFeedback.content_id)
+        .where(ReviewFeedback.reviewer_id == user_id, ReviewFeedback.content_type == "proposal")
+        .scalar_subquery()
+    )
+    proposals_to_review = (
+        select(
+            literal("review_proposal").label("kind"),
+            Proposal.id,
+            cast(Proposal.name, Text).label("text"),
+            literal("proposal").label("content_type"),
+            Proposal.id.label("content_id"),
+        )
+        .where(
+            Proposal.status == ProposalStatus.VALIDATING,
+            Proposal.agent_id != user_id,
+            Proposal.id.notin_(reviewed_subq),
+        )
+        .limit(PROPOSALS_TO_REVIEW_LIMIT)
+    )
+    return union_all(
+        open_feedback.subquery().select(),
+        addressed_feedback.subquery().select(),
+        proposals_to_review.subquery().select(),
+    )
+
+
+async def load_heartbeat_snapshot(
+    db: AsyncSession, user_id: UUID, previous_heartbeat: datetime | None, now: datetime
+) -> HeartbeatSnapshot:
+    """Load everything a heartbeat response needs in five statements."""
+    digest_since = previous_heartbeat or now - timedelta(hours=DIGEST_DEFAULT_HOURS)
+
+    notifications = (await db.scalars(
+        select(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.status.in_([NotificationStatus.PENDING, NotificationStatus.SENT]),
+        )
+        .order_by(Notification.created_at.desc(), Notification.id.desc())
+        .limit(HEARTBEAT_NOTIFICATION_LIMIT)
+    )).all()
+
+    community_columns = community_count_columns(user_id)
+    columns = {**community_columns, **_aggregate_columns(user_id, digest_since)}
+    aggregates = (await db.execute(
+        select(*(column.label(name) for name, column in columns.items()))
+    )).one()._mapping
+
+    counts = await get_activity_counters(db, user_id)
+
+    dormant_cutoff = now - timedelta(hours=DORMANT_DWELLER_HOURS)
+    dormant_dwellers = (await db.execute(
+        select(Dweller.name, Dweller.id, Dweller.last_action_at)
+        .where(
+            Dweller.inhabited_by == user_id,
+            Dweller.is_active == True,
+            Dweller.last_action_at != None,
+            Dweller.last_action_at < dormant_cutoff,
+        )
+        .order_by(Dweller.last_action_at.asc(), Dweller.id.asc())
+    )).all()
+
+    suggestions = [
+        SuggestionRow(**row._mapping)
+        for row in await db.execute(_suggestions_query(user_id))
+    ]
+
+    return HeartbeatSnapshot(
+        now=now,
+        previous_heartbeat=previous_heartbeat,
+        digest_since=digest_since,
+        notifications=list(notifications),
+        counts=counts,
+        community={name: aggregates[name] or 0 for name in community_columns},
+        own_active_proposals=aggregates["own_active_proposals"] or 0,
+        # jsonb keys are the enum labels as stored (member names)
+        proposals_by_status={
+            ProposalStatus[name].value: n
+            for name, n in (aggregates["proposals_by_status"] or {}).items()
+        },
+        inhabited_dwellers=aggregates["inhabited_dwellers"] or 0,
+        missed_notifications=aggregates["missed_notifications"] or 0,
+        new_proposals_to_validate=aggregates["new_proposals_to_validate"] or 0,
+        validations_on_your_proposals=aggregates["validations_on_your_proposals"] or 0,
+        activity_in_your_worlds=aggregates["activity_in_your_worlds"] or 0,
+        dormant_dwellers=list(dormant_dwellers),
+        suggestions=suggestions,
+    )
@@ -2,15 +2,37 @@
 
 Generates 2D coordinates and cluster labels for world nodes on the semantic map.
 Uses embeddings stored in the database to compute semantic similarity layout.
+
+Layouts are stored in platform_world_map_layouts, one row per world-set
+version (a hash of world ids and premise embeddings). refresh_world_map()
+writes new versions in the background (RefreshWorldMap job):
+
+- Worlds added since the last full layout are projected onto it from their
+  nearest laid-out neighbours, without moving anything else.
+- Once projected worlds exceed MAP_RELAYOUT_FRACTION of the layout, MDS and
+  KMeans run again; clusters that keep most of their members keep their id
+  and label, so only genuinely new clusters cost an LLM call.
+
+GET /worlds/map only reads the newest layout (build_world_map).
 """
 
 import asyncio
+import hashlib
 import logging
 import math
+import multiprocessing
 import os
 import random
 from typing import Any
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from utils.deterministic import deterministic_uuid4
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +48,70 @@ CLUSTER_COLORS = [
     "#C0FF00",  # acid-yellow
 ]
 
-# Single shared executor for CPU-bound ML work
-_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="map-ml")
+# Neighbours a new world's position is interpolated from
+MAP_PLACEMENT_NEIGHBORS = 5
+# Re-run the full layout once this fraction of worlds has been projected onto it
+MAP_RELAYOUT_FRACTION = 0.25
+# A re-laid-out cluster keeps an old cluster's id and label above this overlap
+MAP_LABEL_REUSE_JACCARD = 0.5
+# Dedupe key for the background refresh job
+MAP_REFRESH_JOB_KEY = "world_map.refresh"
+
+# Up to this many worlds, metric MDS runs on the full pairwise distance matrix;
+# above it, landmark MDS on a PCA-reduced space (memory O(n * landmarks))
+MAP_EXACT_LAYOUT_MAX = 200
+MAP_PCA_DIMS = 64
+MAP_LANDMARKS = 400
+# Worker processes for layouts (MDS/KMeans hold the GIL for much of their run)
+MAP_LAYOUT_PROCESSES = int(os.getenv("MAP_LAYOUT_PROCESSES", "1"))
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that runs an event loop and DB pools is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=MAP_LAYOUT_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
 
+def shutdown_layout_executor() -> None:
+    """Stop the layout worker processes (app / worker shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
-def _run_mds(dist_matrix: Any) -> Any:
-    """Run MDS on a precomputed distance matrix (called in thread executor).
 
-    MDS directly optimizes for preserving pairwise distances in 2D,
-    which is exactly what we want for a small number of points (n<50).
-    Unlike t-SNE, it produces stable, deterministic layouts.
+def _stretch(dist: np.ndarray, d_min: float, d_max: float) -> np.ndarray:
+    """Contrast-stretch cosine distances into [0, 1].
+
+    Sci-fi premises sit in a narrow similarity range (0.36–0.75), so the
+    observed range is rescaled and square-rooted: similar worlds cluster
+    tightly and dissimilar ones spread apart.
+    """
+    if d_max <= d_min:
+        return dist
+    return np.sqrt(np.clip((dist - d_min) / (d_max - d_min), 0.0, 1.0))
+
+
+def _exact_mds(X: np.ndarray) -> np.ndarray:
+    """Metric MDS on all pairwise (stretched) distances.
+
+    MDS directly optimizes for preserving pairwise distances in 2D — unlike
+    t-SNE it's stable, deterministic, and works well with small n.
     """
     from sklearn.manifold import MDS
 
+    dist = np.clip(1.0 - X @ X.T, 0.0, 2.0).astype(np.float64)
+    positive = dist[dist > 1e-9]
+    if positive.size:
+        dist = _stretch(dist, positive.min(), positive.max())
+    np.fill_diagonal(dist, 0.0)
+
     mds = MDS(
         n_components=2,
         dissimilarity="precomputed",
@@ -46,112 +119,105 @@ def _run_mds(dist_matrix: Any) -> Any:
         max_iter=1000,
         normalized_stress="auto",
     )
-    return mds.fit_transform(dist_matrix)
+    return mds.fit_transform(dist)
 
 
-def _run_kmeans(X: Any, k: int) -> Any:
-    """Run KMeans synchronously (called in thread executor)."""
-    from sklearn.cluster import KMeans
-
-    km = KMeans(n_clusters=k, random_state=42, n_init=10)
-    return km.fit_predict(X)
-
-
-async def _reduce_to_2d(embeddings: list[list[float]]) -> list[tuple[float, float]]:
-    """Project high-dimensional embeddings to 2D using t-SNE or PCA fallback."""
+def _landmark_mds(X: np.ndarray, n_landmarks: int) -> np.ndarray:
+    """Landmark MDS (de Silva & Tenenbaum): classical MDS on a random subset,
+    then every point is triangulated from its distances to the landmarks.
+    """
+    n = len(X)
+    rng = np.random.default_rng(42)
+    landmarks = np.sort(rng.choice(n, size=min(n_landmarks, n), replace=False))
+
+    to_landmarks = np.clip(1.0 - X @ X[landmarks].T, 0.0, 2.0)  # n x L
+    between = to_landmarks[landmarks]
+    positive = between[between > 1e-9]
+    if positive.size:
+        to_landmarks = _stretch(to_landmarks, positive.min(), positive.max())
+        between = to_landmarks[landmarks]
+    np.fill_diagonal(between, 0.0)
+
+    # Classical MDS on the landmarks
+    sq = between.astype(np.float64) ** 2
+    centering = np.eye(len(landmarks)) - 1.0 / len(landmarks)
+    eigvals, eigvecs = np.linalg.eigh(-0.5 * centering @ sq @ centering)
+    top = np.argsort(eigvals)[::-1][:2]
+    eigvals = np.maximum(eigvals[top], 1e-12)
+    pinv = (eigvecs[:, top] / np.sqrt(eigvals)).T  # 2 x L
+
+    # Triangulate everything (landmarks included) from squared distances
+    return (-0.5 * (to_landmarks.astype(np.float64) ** 2 - sq.mean(axis=0)) @ pinv.T)
+
+
+def _normalize_coords(coords: np.ndarray) -> np.ndarray:
+    """Scale each axis to [-1, 1], jittering degenerate (near-1D) layouts."""
+    for i in range(2):
+        col = coords[:, i]
+        span = col.max() - col.min()
+        if span > 0:
+            coords[:, i] = 2.0 * (col - col.min()) / span - 1.0
+
+    # Detect degenerate layouts: if any axis has near-zero spread, add jitter.
+    # This happens with very small n (< ~15) where MDS collapses to ~1D.
+    rng_np = np.random.RandomState(42)
+    for i in range(2):
+        col = coords[:, i]
+        spread = col.max() - col.min()
+        if spread < 0.5:
+            # Apply jitter — more jitter when spread is smaller (more degenerate)
+            jitter_scale = min(1.0, 0.5 / (spread + 0.01))
+            coords[:, i] = col + rng_np.uniform(-jitter_scale, jitter_scale, size=len(col))
+            # Re-normalize after jitter
+            col2 = coords[:, i]
+            span2 = col2.max() - col2.min()
+            if span2 > 0:
+                coords[:, i] = 2.0 * (col2 - col2.min()) / span2 - 1.0
+    return coords
+
+
+def compute_layout(embeddings: np.ndarray, n_clusters: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """2D coordinates in [-1, 1] and k-means cluster labels for embeddings.
+
+    Runs in a layout worker process. Small sets get exact metric MDS and
+    KMeans; larger ones are PCA-reduced to MAP_PCA_DIMS, laid out with
+    landmark MDS and clustered with MiniBatchKMeans.
+    """
     n = len(embeddings)
     if n == 0:
-        return []
+        return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+    k = min(n_clusters or max(2, min(8, n // 2)), n)
     if n == 1:
-        return [(0.0, 0.0)]
+        return np.zeros((1, 2)), np.zeros(1, dtype=np.int64)
 
     try:
-        import numpy as np
-        from sklearn.metrics.pairwise import cosine_distances
-        from sklearn.preprocessing import normalize
-
-        X = np.array(embeddings, dtype=np.float32)
-        X = normalize(X)  # unit sphere
-
-        loop = asyncio.get_running_loop()
-
-        # Use MDS (Multidimensional Scaling) with contrast-stretched cosine
-        # distances.  MDS directly optimizes for preserving pairwise distances
-        # in 2D — unlike t-SNE it's stable, deterministic, and works well
-        # with small n.  Contrast stretching amplifies the narrow similarity
-        # range (0.36–0.75 for sci-fi premises) so similar worlds cluster
-        # tightly and dissimilar ones spread apart.
-        dist = cosine_distances(X)
-        positive = dist[dist > 0]
-        if positive.size and positive.max() > positive.min():
-            d_min, d_max = positive.min(), positive.max()
-            dist_stretched = (dist - d_min) / (d_max - d_min)
-            np.fill_diagonal(dist_stretched, 0.0)
-            dist_stretched = np.power(dist_stretched, 0.5)
-            np.fill_diagonal(dist_stretched, 0.0)
-        else:
-            dist_stretched = dist
-
-        logger.info("Running MDS on %d worlds (contrast-stretched distances)", n)
-        coords = await loop.run_in_executor(
-            _executor, _run_mds, dist_stretched.astype(np.float64)
-        )
-        logger.info("MDS complete, first coord: (%.4f, %.4f)", coords[0][0], coords[0][1])
-
-        # Normalize to [-1, 1] range
-        for i in range(2):
-            col = coords[:, i]
-            span = col.max() - col.min()
-            if span > 0:
-                coords[:, i] = 2.0 * (col - col.min()) / span - 1.0
-
-        # Detect degenerate layouts: if any axis has near-zero spread, add jitter.
-        # This happens with very small n (< ~15) where t-SNE collapses to ~1D.
-        rng_np = np.random.RandomState(42)
-        for i in range(2):
-            col = coords[:, i]
-            spread = col.max() - col.min()
-            if spread < 0.5:
-                # Apply jitter — more jitter when spread is smaller (more degenerate)
-                jitter_scale = min(1.0, 0.5 / (spread + 0.01))
-                coords[:, i] = col + rng_np.uniform(-jitter_scale, jitter_scale, size=len(col))
-                # Re-normalize after jitter
-                col2 = coords[:, i]
-                span2 = col2.max() - col2.min()
-                if span2 > 0:
-                    coords[:, i] = 2.0 * (col2 - col2.min()) / span2 - 1.0
-
-        return [(float(row[0]), float(row[1])) for row in coords]
-
+        from sklearn.cluster import KMeans, MiniBatchKMeans
+        from sklearn.decomposition import PCA
     except ImportError:
         logger.warning("scikit-learn not available — using random 2D layout")
         rng = random.Random(42)
-        return [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(n)]
-
-
-async def _cluster(embeddings: list[list[float]], n_clusters: int | None = None) -> list[int]:
-    """Assign cluster labels via k-means (runs in thread executor)."""
-    n = len(embeddings)
-    if n == 0:
-        return []
-
-    try:
-        import numpy as np
-        from sklearn.preprocessing import normalize
-
-        X = np.array(embeddings, dtype=np.float32)
-        X = normalize(X)
-
-        k = n_clusters or max(2, min(8, n // 2))
-        k = min(k, n)
-
-        loop = asyncio.get_running_loop()
-        labels = await loop.run_in_executor(_executor, _run_kmeans, X, k)
-        return [int(lbl) for lbl in labels]
-
-    except ImportError:
-        logger.warning("scikit-learn not available — assigning cluster 0 to all worlds")
-        return [0] * n
+        return np.array([[rng.uniform(-1, 1), rng.uniform(-1, 1)] for _ in range(n)]), np.zeros(n, dtype=np.int64)
+
+    X = _unit_rows(np.asarray(embeddings, dtype=np.float32))  # unit sphere
+    if n <= MAP_EXACT_LAYOUT_MAX:
+        coords = _exact_mds(X)
+        labels = KMeans(n_clusters=k, random_state=42, n_init=10).fit_predict(X)
+    else:
+        dims = min(MAP_PCA_DIMS, n, X.shape[1])
+        X = _unit_rows(PCA(n_components=dims, svd_solver="randomized", random_state=42).fit_transform(X))
+        coords = _landmark_mds(X, MAP_LANDMARKS)
+        labels = MiniBatchKMeans(
+            n_clusters=k, random_state=42, n_init=3, batch_size=2048
+        ).fit_predict(X)
+    return _normalize_coords(coords), labels
+
+
+async def _layout(embeddings: np.ndarray) -> tuple[list[tuple[float, float]], list[int]]:
+    """compute_layout() in a layout worker process."""
+    logger.info("Laying out %d worlds", len(embeddings))
+    loop = asyncio.get_running_loop()
+    coords, labels = await loop.run_in_executor(_get_executor(), compute_layout, embeddings)
+    return [(float(x), float(y)) for x, y in coords], [int(label) for label in labels]
 
 
 async def _label_cluster(world_names: list[str], world_premises: list[str]) -> str:
@@ -196,73 +262,277 @@ async def _label_cluster(world_names: list[str], world_premises: list[str]) -> s
         return world_names[0].lower() if world_names else "unknown"
 
 
-async def build_world_map(worlds: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def embedding_fingerprint(embedding: Any) -> str:
+    """Short digest of an embedding's float32 bytes."""
+    return hashlib.sha256(np.asarray(embedding, dtype=np.float32).tobytes()).hexdigest()[:16]
+
+
+def world_set_version(fingerprints: dict[str, str]) -> str:
+    """Hash of every (world id, embedding digest) pair, order-independent."""
+    digest = hashlib.sha256()
+    for world_id in sorted(fingerprints):
+        digest.update(f"{world_id}:{fingerprints[world_id]};".encode())
+    return digest.hexdigest()
+
+
+def _unit_rows(X: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return X / np.where(norms == 0, 1.0, norms)
+
+
+def place_new_worlds(
+    new_embeddings: np.ndarray,
+    known_embeddings: np.ndarray,
+    known_coords: np.ndarray,
+    centroids: np.ndarray,
+    k: int = MAP_PLACEMENT_NEIGHBORS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Out-of-sample placement onto an existing layout.
+
+    Each new world lands at the similarity-weighted mean of its k most similar
+    laid-out worlds' coordinates (so it stays inside [-1, 1]) and joins the
+    cluster with the nearest centroid. Returns (coords, cluster indexes into
+    centroids).
+    """
+    new_unit = _unit_rows(new_embeddings)
+    sims = new_unit @ _unit_rows(known_embeddings).T
+    k = min(k, sims.shape[1])
+    nearest = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    # Sharpen so the closest neighbour dominates instead of averaging to the middle
+    weights = np.clip(np.take_along_axis(sims, nearest, axis=1), 1e-6, None) ** 4
+    coords = (weights[:, :, None] * known_coords[nearest]).sum(axis=1) / weights.sum(axis=1, keepdims=True)
+    clusters = np.argmax(new_unit @ centroids.T, axis=1)
+    return coords, clusters
+
+
+def _match_clusters(
+    new_members: dict[int, set[str]],
+    old_members: dict[int, set[str]],
+) -> dict[int, int]:
+    """Map fresh KMeans cluster indexes to stable cluster ids.
+
+    Pairs are matched greedily by member overlap (Jaccard); matches at or above
+    MAP_LABEL_REUSE_JACCARD inherit the old id, the rest take ids no old
+    cluster used.
+    """
+    pairs = sorted(
+        (
+            (len(new & old) / len(new | old), new_cid, old_cid)
+            for new_cid, new in new_members.items()
+            for old_cid, old in old_members.items()
+            if new & old
+        ),
+        reverse=True,
+    )
+    mapping: dict[int, int] = {}
+    taken: set[int] = set()
+    for jaccard, new_cid, old_cid in pairs:
+        if jaccard < MAP_LABEL_REUSE_JACCARD:
+            break
+        if new_cid in mapping or old_cid in taken:
+            continue
+        mapping[new_cid] = old_cid
+        taken.add(old_cid)
+    # Never hand an unmatched cluster a retired id: it would inherit that label
+    free = (cid for cid in range(len(new_members) + len(old_members)) if cid not in old_members)
+    for new_cid in sorted(new_members):
+        if new_cid not in mapping:
+            mapping[new_cid] = next(free)
+    return mapping
+
+
+async def _full_layout(
+    world_ids: list[str],
+    names: list[str],
+    premises: list[str],
+    embeddings: np.ndarray,
+    previous: Any | None,
+) -> tuple[dict[str, Any], dict[str, str], dict[str, list[float]]]:
+    """MDS + KMeans over every world; reuses labels of clusters that survive."""
+    coords, raw_clusters = await _layout(embeddings)
+
+    new_members: dict[int, set[str]] = {}
+    for world_id, cid in zip(world_ids, raw_clusters):
+        new_members.setdefault(cid, set()).add(world_id)
+    old_members: dict[int, set[str]] = {}
+    old_labels: dict[str, str] = {}
+    if previous is not None:
+        old_labels = previous.cluster_labels
+        for world_id, pos in previous.positions.items():
+            old_members.setdefault(pos["cluster"], set()).add(world_id)
+    mapping = _match_clusters(new_members, old_members)
+    clusters = [mapping[cid] for cid in raw_clusters]
+
+    positions = {
+        world_id: {"x": x, "y": y, "cluster": cid}
+        for world_id, (x, y), cid in zip(world_ids, coords, clusters)
+    }
+
+    unit = _unit_rows(embeddings)
+    labels: dict[str, str] = {}
+    centroids: dict[str, list[float]] = {}
+    to_label: dict[int, list[int]] = {}
+    for cid in sorted(set(clusters)):
+        rows = [i for i, c in enumerate(clusters) if c == cid]
+        centroids[str(cid)] = _unit_rows(unit[rows].mean(axis=0, keepdims=True))[0].tolist()
+        if str(cid) in old_labels:
+            labels[str(cid)] = old_labels[str(cid)]
+        else:
+            to_label[cid] = rows
+    new_labels = await asyncio.gather(*(
+        _label_cluster([names[i] for i in rows], [premises[i] for i in rows]) for rows in to_label.values()
+    ))
+    labels.update({str(cid): label for cid, label in zip(to_label, new_labels)})
+    logger.info(
+        "World map laid out: %d worlds, %d clusters (%d newly labelled)",
+        len(world_ids), len(centroids), len(to_label),
+    )
+    return positions, labels, centroids
+
+
+async def refresh_world_map(db: AsyncSession) -> Any:
+    """Bring the stored world map up to date with the active worlds.
+
+    Returns the newest WorldMapLayout, or None when no active world has an
+    embedding. Writes a new version only when the world set changed; the
+    caller commits.
+    """
+    from db import World, WorldMapLayout
+
+    rows = (
+        await db.execute(
+            select(World.id, World.name, func.left(World.premise, 120), World.premise_embedding)
+            .where(World.is_active.is_(True), World.premise_embedding.is_not(None))
+            .order_by(World.created_at, World.id)
+        )
+    ).all()
+    if not rows:
+        return None
+
+    world_ids = [str(row[0]) for row in rows]
+    embeddings = np.vstack([np.asarray(row[3], dtype=np.float32) for row in rows])
+    fingerprints = {world_id: embedding_fingerprint(e) for world_id, e in zip(world_ids, embeddings)}
+    version = world_set_version(fingerprints)
+
+    previous = await db.scalar(
+        select(WorldMapLayout)
+        .options(undefer(WorldMapLayout.fingerprints), undefer(WorldMapLayout.cluster_centroids))
+        .order_by(WorldMapLayout.created_at.desc())
+        .limit(1)
+    )
+    if previous is not None and previous.version_hash == version:
+        return previous
+
+    # Worlds whose embedding is already laid out as-is
+    known = [
+        i for i, world_id in enumerate(world_ids)
+        if previous is not None and previous.fingerprints.get(world_id) == fingerprints[world_id]
+    ]
+    fresh = [i for i in range(len(world_ids)) if i not in set(known)]
+    placed_count = (previous.placed_count if previous is not None else 0) + len(fresh)
+
+    incremental = (
+        previous is not None
+        and len(known) >= 2
+        and placed_count <= MAP_RELAYOUT_FRACTION * previous.laid_out_count
+    )
+    if incremental:
+        positions = {world_ids[i]: previous.positions[world_ids[i]] for i in known}
+        if fresh:
+            cluster_ids = sorted(previous.cluster_centroids, key=int)
+            coords, nearest = place_new_worlds(
+                embeddings[fresh],
+                embeddings[known],
+                np.array([[positions[world_ids[i]]["x"], positions[world_ids[i]]["y"]] for i in known]),
+                np.array([previous.cluster_centroids[cid] for cid in cluster_ids]),
+            )
+            for i, (x, y), c in zip(fresh, coords, nearest):
+                positions[world_ids[i]] = {"x": float(x), "y": float(y), "cluster": int(cluster_ids[c])}
+        labels, centroids = previous.cluster_labels, previous.cluster_centroids
+        laid_out_count = previous.laid_out_count
+        logger.info("World map: placed %d new world(s) onto the existing layout", len(fresh))
+    else:
+        positions, labels, centroids = await _full_layout(
+            world_ids, [row[1] for row in rows], [row[2] or "" for row in rows], embeddings, previous,
+        )
+        laid_out_count, placed_count = len(world_ids), 0
+
+    await db.execute(
+        pg_insert(WorldMapLayout)
+        .values(
+            id=deterministic_uuid4(),
+            version_hash=version,
+            positions=positions,
+            cluster_labels=labels,
+            fingerprints=fingerprints,
+            cluster_centroids=centroids,
+            laid_out_count=laid_out_count,
+            placed_count=placed_count,
+        )
+        .on_conflict_do_nothing(index_elements=["version_hash"])
+    )
+    # Only the newest version is ever read
+    await db.execute(delete(WorldMapLayout).where(WorldMapLayout.version_hash != version))
+    return await db.scalar(select(WorldMapLayout).where(WorldMapLayout.version_hash == version))
+
+
+def is_stale(layout: Any, embedded_world_ids: set[str]) -> bool:
+    """Whether the active worlds with embeddings differ from the layout's."""
+    return layout is None or set(layout.positions) != embedded_world_ids
+
+
+def build_world_map(worlds: list[dict[str, Any]], layout: Any | None) -> list[dict[str, Any]]:
     """
-    Given a list of world dicts (with optional 'embedding' field),
-    compute 2D coordinates and cluster labels.
+    Position world dicts using a stored layout.
 
-    Returns enriched world dicts with added fields:
+    Worlds are dicts with an 'id' and a 'has_embedding' flag. Returns enriched
+    world dicts with added fields:
       x, y         — floats in [-1, 1]
       cluster      — int cluster index
       cluster_label — human-readable string
       cluster_color — hex color for this cluster
-    """
-    # Separate worlds with and without embeddings
-    with_emb = [(i, w) for i, w in enumerate(worlds) if w.get("embedding")]
-    without_emb = [(i, w) for i, w in enumerate(worlds) if not w.get("embedding")]
 
-    result: list[dict[str, Any] | None] = [None] * len(worlds)
-
-    if with_emb:
-        indices, emb_worlds = zip(*with_emb)
-        embeddings = [w["embedding"] for w in emb_worlds]
-
-        # Run 2D reduction and clustering concurrently
-        coords, cluster_ids = await asyncio.gather(
-            _reduce_to_2d(embeddings),
-            _cluster(embeddings),
-        )
+    Worlds the layout doesn't cover yet (no embedding, or embedded since the
+    last refresh) are scattered on the periphery as "uncharted".
+    """
+    positions = layout.positions if layout is not None else {}
+    labels = layout.cluster_labels if layout is not None else {}
+    # A world's stored position only counts while it still has an embedding
+    charted = {w["id"]: positions[w["id"]] for w in worlds if w.get("has_embedding") and w["id"] in positions}
+    uncharted = [w for w in worlds if w["id"] not in charted]
 
-        # Group worlds by cluster
-        cluster_groups: dict[int, list[int]] = {}
-        for pos, cid in enumerate(cluster_ids):
-            cluster_groups.setdefault(cid, []).append(pos)
-
-        # Generate cluster labels concurrently
-        label_tasks = {}
-        for cid, positions in cluster_groups.items():
-            member_names = [emb_worlds[p]["name"] for p in positions]
-            member_premises = [emb_worlds[p]["premise"][:120] for p in positions]
-            label_tasks[cid] = _label_cluster(member_names, member_premises)
-
-        label_results = await asyncio.gather(*label_tasks.values())
-        cluster_labels = dict(zip(label_tasks.keys(), label_results))
-
-        for pos, (orig_idx, world) in enumerate(zip(indices, emb_worlds)):
-            cid = cluster_ids[pos]
-            result[orig_idx] = {
-                **{k: v for k, v in world.items() if k != "embedding"},
-                "x": coords[pos][0],
-                "y": coords[pos][1],
-                "cluster": cid,
-                "cluster_label": cluster_labels.get(cid, "unknown"),
-                "cluster_color": CLUSTER_COLORS[cid % len(CLUSTER_COLORS)],
-                "has_embedding": True,
-            }
-
-    # Worlds without embeddings get scattered on the periphery
+    # Uncharted worlds get scattered on the periphery
     rng = random.Random(99)
-    for pos, (orig_idx, world) in enumerate(without_emb):
-        angle = (pos / max(len(without_emb), 1)) * 6.2832
+    peripheral: dict[str, tuple[float, float]] = {}
+    for pos, world in enumerate(uncharted):
+        angle = (pos / max(len(uncharted), 1)) * 6.2832
         r = 0.9 + rng.uniform(0, 0.1)
-        result[orig_idx] = {
-            **{k: v for k, v in world.items() if k != "embedding"},
-            "x": round(r * math.cos(angle), 4),
-            "y": round(r * math.sin(angle), 4),
-            "cluster": -1,
-            "cluster_label": "uncharted",
-            "cluster_color": "#52525B",  # zinc-600
-            "has_embedding": False,
-        }
-
-    return result  # type: ignore[return-value]
+        peripheral[world["id"]] = (round(r * math.cos(angle), 4), round(r * math.sin(angle), 4))
+
+    result: list[dict[str, Any]] = []
+    for world in worlds:
+        pos = charted.get(world["id"])
+        if pos is None:
+            x, y = peripheral[world["id"]]
+            result.append({
+                **world,
+                "x": x,
+                "y": y,
+                "cluster": -1,
+                "cluster_label": "uncharted",
+                "cluster_color": "#52525B",  # zinc-600
+                "has_embedding": world.get("has_embedding", False),
+            })
+            continue
+        cid = pos["cluster"]
+        result.append({
+            **world,
+            "x": pos["x"],
+            "y": pos["y"],
+            "cluster": cid,
+            "cluster_label": labels.get(str(cid), "unknown"),
+            "cluster_color": CLUSTER_COLORS[cid % len(CLUSTER_COLORS)],
+            "has_embedding": True,
+        })
+
+    return result
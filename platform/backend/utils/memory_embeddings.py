@@ -0,0 +1,72 @@
+"""Embeddings for dweller memory search.
+
+Memory search is full-text by default. Setting MEMORY_EMBEDDING_PROVIDER adds
+semantic recall on top of it:
+
+    (unset)  — disabled; no embeddings are written or queried
+    local    — deterministic hashed character trigrams; no network, for tests and dev
+    openai   — text-embedding-3-small shortened to MEMORY_EMBEDDING_DIMENSIONS
+
+Embeddings are stored in platform_dweller_memories.embedding (vector(256)).
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Must match the Vector(...) size of DwellerMemory.embedding.
+MEMORY_EMBEDDING_DIMENSIONS = 256
+
+MEMORY_EMBEDDING_PROVIDERS = ("local", "openai")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def memory_embedding_provider() -> str | None:
+    """Return the configured provider, or None when semantic recall is off."""
+    provider = os.getenv("MEMORY_EMBEDDING_PROVIDER", "").strip().lower()
+    if not provider:
+        return None
+    if provider not in MEMORY_EMBEDDING_PROVIDERS:
+        logger.warning(f"Unknown MEMORY_EMBEDDING_PROVIDER={provider!r}; semantic memory search disabled")
+        return None
+    return provider
+
+
+def local_embedding(text: str) -> list[float]:
+    """Hash each word's character trigrams into a unit vector.
+
+    Words sharing most trigrams ("copper" / "coppersmith") land close together,
+    which is enough to exercise the semantic half of memory search offline.
+    """
+    vector = [0.0] * MEMORY_EMBEDDING_DIMENSIONS
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            digest = hashlib.blake2b(padded[i:i + 3].encode(), digest_size=4).digest()
+            bucket = int.from_bytes(digest, "big")
+            sign = 1.0 if bucket & 1 else -1.0
+            vector[(bucket >> 1) % MEMORY_EMBEDDING_DIMENSIONS] += sign
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return vector
+    return [v / norm for v in vector]
+
+
+async def embed_memory_text(text: str) -> list[float] | None:
+    """Embed text with the configured provider. Returns None if disabled or on failure."""
+    provider = memory_embedding_provider()
+    if provider is None:
+        return None
+    if provider == "local":
+        return local_embedding(text)
+    try:
+        from utils.embeddings import generate_embedding
+        return await generate_embedding(text, dimensions=MEMORY_EMBEDDING_DIMENSIONS)
+    except Exception:
+        logger.exception("Failed to generate memory embedding")
+        return None
@@ -0,0 +1,141 @@
+"""Compiled multi-name matcher for finding dweller mentions in prose.
+
+Looking for N names with one word-boundary regex each costs O(N x text).
+NameMatcher indexes names by their first word instead. A scan walks the
+text's words once, and only names that start with the current word are
+compared there. Results are identical to the per-name search:
+
+    re.search(r'\\b' + re.escape(name.lower()) + r'\\b', text.lower())
+
+That includes overlapping names ("Ana" and "Ana Lee" both match "Ana Lee").
+
+Matchers for a world's active dwellers are cached per process. Each lookup
+checks a stamp computed in the database (active dweller count and an md5 of
+their ids and names), so a dweller created, renamed, retired or reactivated
+through another worker still rebuilds the matcher, while actions that only
+touch other dweller columns don't. Paths that create or rename dwellers also
+call invalidate_world_name_matcher() directly.
+
+For exact lookups of dwellers a request has already loaded (conversation
+partners, SPEAK targets), dwellers_by_name() builds the lower-cased name map
+once instead of scanning the list per name.
+
+Usage:
+    matcher = await get_world_name_matcher(db, world_id)
+    mentioned_ids = matcher.find(story.content)
+"""
+
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from uuid import UUID
+
+from sqlalchemy import Text, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import Dweller
+
+# Skip very short names to avoid false-positive matches in prose (e.g. "Al", "Ed").
+MIN_NAME_LENGTH = 3
+NAME_MATCHER_CACHE_MAX_WORLDS = int(os.getenv("NAME_MATCHER_CACHE_MAX_WORLDS", "256"))
+
+_WORD = re.compile(r"\w+")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundary(text: str, pos: int) -> bool:
+    """True where re's \\b would match at text[pos]."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+class NameMatcher:
+    """Finds which of a fixed set of names occur in a text, case-insensitively.
+
+    Built once from (key, name) pairs. find() returns the keys of the names
+    that occur, each once, in order of first occurrence.
+    """
+
+    def __init__(self, names: Iterable[tuple[Hashable, str]], min_length: int = MIN_NAME_LENGTH):
+        self._by_first_word: dict[str, list[tuple[str, Hashable]]] = {}
+        # Names that don't start with a word character can't be indexed by word
+        self._fallback: list[tuple[re.Pattern[str], Hashable]] = []
+        self.size = 0
+
+        for key, name in names:
+            name_lower = name.lower()
+            if len(name_lower) < min_length:
+                continue
+            self.size += 1
+            first = _WORD.match(name_lower)
+            if first:
+                self._by_first_word.setdefault(first.group(), []).append((name_lower, key))
+            else:
+                self._fallback.append((re.compile(r"\b" + re.escape(name_lower) + r"\b"), key))
+
+    def find(self, text: str) -> list[Hashable]:
+        text_lower = text.lower()
+        found: dict[Hashable, None] = {}
+        for word in _WORD.finditer(text_lower):
+            candidates = self._by_first_word.get(word.group())
+            if not candidates:
+                continue
+            start = word.start()
+            for name_lower, key in candidates:
+                if key in found:
+                    continue
+                if text_lower.startswith(name_lower, start) and _at_boundary(text_lower, start + len(name_lower)):
+                    found[key] = None
+        for pattern, key in self._fallback:
+            if key not in found and pattern.search(text_lower):
+                found[key] = None
+        return list(found)
+
+
+def dwellers_by_name(dwellers: Iterable[Dweller]) -> dict[str, Dweller]:
+    """Map lower-cased name to dweller. Names are unique per world, case-insensitively."""
+    return {d.name.lower(): d for d in dwellers}
+
+
+# world_id -> ((active dweller count, newest created_at), matcher), least recently used first
+_world_matchers: OrderedDict[UUID, tuple[tuple, NameMatcher]] = OrderedDict()
+
+
+async def get_world_name_matcher(db: AsyncSession, world_id: UUID) -> NameMatcher:
+    """Return the matcher over a world's active dwellers, keyed by dweller id (str).
+
+    One aggregate query when the cached matcher is current; a rebuild loads
+    (id, name) for the world's active dwellers.
+    """
+    active = (Dweller.world_id == world_id, Dweller.is_active == True)  # noqa: E712
+    names_digest = func.md5(func.string_agg(
+        cast(Dweller.id, Text) + ":" + Dweller.name,
+        aggregate_order_by(literal("\n"), Dweller.id),
+    ))
+    stamp = tuple((await db.execute(
+        select(func.count(), names_digest).where(*active)
+    )).one())
+
+    cached = _world_matchers.get(world_id)
+    if cached is not None and cached[0] == stamp:
+        _world_matchers.move_to_end(world_id)
+        return cached[1]
+
+    rows = (await db.execute(select(Dweller.id, Dweller.name).where(*active))).all()
+    matcher = NameMatcher((str(row.id), row.name) for row in rows)
+    _world_matchers[world_id] = (stamp, matcher)
+    _world_matchers.move_to_end(world_id)
+    while len(_world_matchers) > NAME_MATCHER_CACHE_MAX_WORLDS:
+        _world_matchers.popitem(last=False)
+    return matcher
+
+
+def invalidate_world_name_matcher(world_id: UUID) -> None:
+    """Drop the cached matcher for a world. Call after creating or renaming a dweller."""
+    _world_matchers.pop(world_id, None)
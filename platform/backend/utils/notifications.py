@@ -3,6 +3,7 @@
 Handles creating notifications and sending callbacks to agents.
 """
 
+import asyncio
 import ipaddress
 import logging
 import os
@@ -16,16 +17,18 @@ from uuid import UUID
 TESTING = os.getenv("TESTING", "").lower() in ("1", "true")
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import contains_eager
 
 from db import Notification, NotificationStatus, User
+from utils.agent_context_cache import invalidate_agent_context
+from utils.webhooks import get_webhook_client, host_slot, next_attempt_at, resolve_host
 
 logger = logging.getLogger(__name__)
 
 
-def validate_callback_url(url: str) -> tuple[bool, str | None]:
+async def validate_callback_url(url: str) -> tuple[bool, str | None]:
     """
     Validate a callback URL to prevent SSRF attacks.
 
@@ -52,11 +55,9 @@ def validate_callback_url(url: str) -> tuple[bool, str | None]:
         if not parsed.hostname:
             return False, "No hostname in URL"
 
-        # Resolve hostname to IP address(es)
+        # Resolve hostname to IP address(es), off the event loop and cached
         try:
-            # Get all IPs for the hostname
-            addr_info = socket.getaddrinfo(parsed.hostname, None, socket.AF_UNSPEC)
-            ips = set(info[4][0] for info in addr_info)
+            ips = await resolve_host(parsed.hostname)
         except socket.gaierror as e:
             return False, f"DNS resolution failed: {e}"
 
@@ -105,6 +106,8 @@ def validate_callback_url(url: str) -> tuple[bool, str | None]:
 # Callback configuration
 CALLBACK_TIMEOUT_SECONDS = 10
 CALLBACK_MAX_RETRIES = 3
+# Deliveries in flight at once per process_pending_notifications batch
+CALLBACK_BATCH_CONCURRENCY = int(os.getenv("CALLBACK_BATCH_CONCURRENCY", "20"))
 
 
 async def create_notification(
@@ -141,6 +144,7 @@ async def create_notification(
     )
     db.add(notification)
     await db.flush()  # Get the ID
+    invalidate_agent_context(user_id)
 
     # Attempt immediate callback if requested
     if send_callback_now:
@@ -156,6 +160,7 @@ async def create_notification(
             else:
                 notification.retry_count = 1
                 notification.last_error = error
+                notification.next_attempt_at = next_attempt_at(1)
                 # Keep as PENDING for retry by background job
 
     return notification
@@ -214,29 +219,29 @@ async def send_callback(
     # SSRF protection: validate callback URL before making request
     # Skip in test mode so mock servers on localhost work
     if not TESTING:
-        is_valid, ssrf_error = validate_callback_url(callback_url)
+        is_valid, ssrf_error = await validate_callback_url(callback_url)
         if not is_valid:
             logger.warning(f"Callback URL validation failed: {callback_url} - {ssrf_error}")
             return False, f"Invalid callback URL: {ssrf_error}"
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        async with host_slot(callback_url):
+            response = await get_webhook_client().post(
                 callback_url,
                 json=payload,
                 timeout=CALLBACK_TIMEOUT_SECONDS,
                 headers=headers,
             )
 
-            if response.status_code < 400:
-                logger.info(f"Callback sent successfully to {callback_url}")
-                return True, None
-            else:
-                error = f"HTTP {response.status_code}"
-                logger.warning(
-                    f"Callback failed with status {response.status_code}: {callback_url}"
-                )
-                return False, error
+        if response.status_code < 400:
+            logger.info(f"Callback sent successfully to {callback_url}")
+            return True, None
+        else:
+            error = f"HTTP {response.status_code}"
+            logger.warning(
+                f"Callback failed with status {response.status_code}: {callback_url}"
+            )
+            return False, error
 
     except httpx.TimeoutException:
         error = "Request timed out"
@@ -255,6 +260,7 @@ async def send_callback(
 async def process_pending_notifications(
     db: AsyncSession,
     batch_size: int = 50,
+    concurrency: int = CALLBACK_BATCH_CONCURRENCY,
 ) -> dict[str, int]:
     """
     Process pending notifications that need callback delivery.
@@ -264,10 +270,16 @@ async def process_pending_notifications(
     - Have status PENDING
     - Have a user with a callback_url
     - Have retry_count < CALLBACK_MAX_RETRIES
+    - Are due (next_attempt_at unset or in the past)
+
+    Callbacks in the batch are delivered concurrently, at most `concurrency`
+    at a time (and WEBHOOK_PER_HOST_CONCURRENCY per receiving host). Failed
+    deliveries are rescheduled with exponential backoff.
 
     Args:
         db: Database session
         batch_size: Maximum number of notifications to process in one batch
+        concurrency: Maximum callbacks in flight at once
 
     Returns:
         Dict with counts: {"processed": N, "sent": N, "failed": N, "retrying": N}
@@ -282,6 +294,7 @@ async def process_pending_notifications(
         .where(
             Notification.status == NotificationStatus.PENDING,
             Notification.retry_count < CALLBACK_MAX_RETRIES,
+            or_(Notification.next_attempt_at == None, Notification.next_attempt_at <= utc_now()),
             User.callback_url != None,
         )
         .order_by(Notification.created_at)
@@ -294,22 +307,27 @@ async def process_pending_notifications(
 
     stats = {"processed": 0, "sent": 0, "failed": 0, "retrying": 0}
 
-    for notification in notifications:
-        stats["processed"] += 1
+    # Deliveries don't touch the session, so they can overlap; the results
+    # are applied afterwards in batch order.
+    slots = asyncio.Semaphore(max(concurrency, 1))
 
+    async def deliver(notification: Notification) -> tuple[bool, str | None]:
         # Use eagerly loaded user (no additional query needed)
         user = notification.user
-        if not user or not user.callback_url:
-            continue
-
-        # Attempt to send the callback (with token if configured)
         token = getattr(user, 'callback_token', None)
-        success, error = await send_callback(user.callback_url, notification, token=token)
+        async with slots:
+            return await send_callback(user.callback_url, notification, token=token)
+
+    outcomes = await asyncio.gather(*(deliver(n) for n in notifications))
+
+    for notification, (success, error) in zip(notifications, outcomes):
+        stats["processed"] += 1
 
         if success:
             notification.status = NotificationStatus.SENT
             notification.sent_at = utc_now()
             notification.last_error = None
+            notification.next_attempt_at = None
             stats["sent"] += 1
             logger.info(f"Notification {notification.id} sent successfully")
         else:
@@ -318,11 +336,13 @@ async def process_pending_notifications(
 
             if notification.retry_count >= CALLBACK_MAX_RETRIES:
                 notification.status = NotificationStatus.FAILED
+                notification.next_attempt_at = None
                 stats["failed"] += 1
                 logger.warning(
                     f"Notification {notification.id} failed after {CALLBACK_MAX_RETRIES} retries"
                 )
             else:
+                notification.next_attempt_at = next_attempt_at(notification.retry_count)
                 stats["retrying"] += 1
                 logger.info(
                     f"Notification {notification.id} will retry (attempt {notification.retry_count}/{CALLBACK_MAX_RETRIES})"
@@ -26,9 +26,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import (
     Story, StoryReview, Notification, NotificationStatus,
-    Dweller, DwellerAction, Proposal, ProposalStatus,
+    Dweller, Proposal, ProposalStatus,
     Aspect, AspectStatus, Validation, AspectValidation, World,
 )
+from utils.activity_counters import get_activity_counters
 
 # Thresholds (shared with progression.py)
 FIRST_STORY_ACTION_THRESHOLD = 5
@@ -37,6 +38,60 @@ ACTION_TO_STORY_RATIO = 5
 DORMANT_DWELLER_HOURS = 12
 
 
+def community_count_columns(user_id) -> dict[str, Any]:
+    """Scalar subqueries for the community counts the waterfall consults.
+
+    Exposed so the heartbeat snapshot can fold them into its own aggregate
+    statement instead of running them again.
+    """
+    validated_subq = (
+        select(Validation.proposal_id)
+        .where(Validation.agent_id == user_id)
+        .scalar_subquery()
+    )
+    validated_aspects_subq = (
+        select(AspectValidation.aspect_id)
+        .where(AspectValidation.agent_id == user_id)
+        .scalar_subquery()
+    )
+    reviewed_subq = (
+        select(StoryReview.story_id)
+        .where(StoryReview.reviewer_id == user_id)
+        .scalar_subquery()
+    )
+    return {
+        "proposals_to_validate": select(func.count(Proposal.id)).where(
+            Proposal.status == ProposalStatus.VALIDATING,
+            Proposal.agent_id != user_id,
+            Proposal.id.notin_(validated_subq),
+        ).scalar_subquery(),
+        "aspects_to_validate": select(func.count(Aspect.id)).where(
+            Aspect.status == AspectStatus.VALIDATING,
+            Aspect.agent_id != user_id,
+            Aspect.id.notin_(validated_aspects_subq),
+        ).scalar_subquery(),
+        "stories_to_review": select(func.count(Story.id)).where(
+            Story.author_id != user_id,
+            Story.id.notin_(reviewed_subq),
+        ).scalar_subquery(),
+        "worlds": select(func.count(World.id)).scalar_subquery(),
+        "inhabitable_worlds": select(func.count(World.id)).where(
+            func.jsonb_array_length(World.regions) > 0
+        ).scalar_subquery(),
+        "worlds_without_media": select(func.count(World.id)).where(
+            World.is_active == True,
+            World.cover_image_url == None,
+        ).scalar_subquery(),
+    }
+
+
+async def load_community_counts(db: AsyncSession, user_id) -> dict[str, int]:
+    """All community counts in one statement."""
+    columns = community_count_columns(user_id)
+    row = (await db.execute(select(*(c.label(name) for name, c in columns.items())))).one()
+    return {name: row._mapping[name] or 0 for name in columns}
+
+
 async def build_nudge(
     db: AsyncSession,
     user_id,
@@ -44,32 +99,31 @@ async def build_nudge(
     notifications: list | None = None,
     lightweight: bool = False,
     dormant_dwellers: list | None = None,
+    community: dict[str, int] | None = None,
 ) -> dict[str, Any]:
     """Build a single nudge recommendation for the agent.
 
     Args:
         db: Database session
         user_id: Agent's user ID
-        counts: Pre-computed activity counts from completion tracking (avoids re-query).
-                 Includes 'unresponded_reviews' key.
+        counts: Activity counters from completion tracking (avoids re-query).
+                When omitted, the agent's counters row is read.
         notifications: Pre-fetched pending notifications (avoids re-query).
         lightweight: If True, only check top priorities (for action/story endpoints).
         dormant_dwellers: Pre-fetched dormant dweller rows from heartbeat (avoids re-query).
                           Each row is a tuple of (name, id, last_action_at).
+        community: Pre-fetched community counts keyed like community_count_columns()
+                   (avoids re-query). When omitted, loaded in one statement
+                   once the waterfall gets past the agent's own priorities.
 
     Returns:
         Single dict with action, message, endpoint, urgency.
     """
+    if counts is None:
+        counts = await get_activity_counters(db, user_id)
+
     # 1. Unread reviews on your stories
-    # Use pre-computed count from completion tracking when available
-    if counts and "unresponded_reviews" in counts:
-        unresponded = counts["unresponded_reviews"]
-    else:
-        unresponded = await db.scalar(
-            select(func.count(StoryReview.id))
-            .join(Story, StoryReview.story_id == Story.id)
-            .where(Story.author_id == user_id, StoryReview.author_responded == False)
-        ) or 0
+    unresponded = counts["unresponded_reviews"]
 
     if unresponded > 0:
         # Get the story title for a specific message
@@ -117,8 +171,8 @@ async def build_nudge(
             "urgency": "high",
         }
 
-    # 3. Story time (ratio-based) — only when counts available
-    if counts and counts.get("actions_taken", 0) >= STORY_TIME_ACTION_THRESHOLD:
+    # 3. Story time (ratio-based)
+    if counts.get("actions_taken", 0) >= STORY_TIME_ACTION_THRESHOLD:
         actions = counts["actions_taken"]
         stories = counts.get("stories_written", 0)
         if actions > stories * ACTION_TO_STORY_RATIO:
@@ -134,7 +188,7 @@ async def build_nudge(
         return _fallback_nudge()
 
     # 4. First story milestone
-    if counts and counts.get("actions_taken", 0) >= FIRST_STORY_ACTION_THRESHOLD and counts.get("stories_written", 0) == 0:
+    if counts.get("actions_taken", 0) >= FIRST_STORY_ACTION_THRESHOLD and counts.get("stories_written", 0) == 0:
         return {
             "action": "write_first_story",
             "message": f"{counts['actions_taken']} actions taken. Your dweller has a story to tell. Write it.",
@@ -143,33 +197,10 @@ async def build_nudge(
         }
 
     # 5. Community validation needed
-    validated_subq = (
-        select(Validation.proposal_id)
-        .where(Validation.agent_id == user_id)
-        .scalar_subquery()
-    )
-    proposals_to_validate = await db.scalar(
-        select(func.count(Proposal.id))
-        .where(
-            Proposal.status == ProposalStatus.VALIDATING,
-            Proposal.agent_id != user_id,
-            Proposal.id.notin_(validated_subq),
-        )
-    ) or 0
-
-    validated_aspects_subq = (
-        select(AspectValidation.aspect_id)
-        .where(AspectValidation.agent_id == user_id)
-        .scalar_subquery()
-    )
-    aspects_to_validate = await db.scalar(
-        select(func.count(Aspect.id))
-        .where(
-            Aspect.status == AspectStatus.VALIDATING,
-            Aspect.agent_id != user_id,
-            Aspect.id.notin_(validated_aspects_subq),
-        )
-    ) or 0
+    if community is None:
+        community = await load_community_counts(db, user_id)
+    proposals_to_validate = community["proposals_to_validate"]
+    aspects_to_validate = community["aspects_to_validate"]
 
     total_to_validate = proposals_to_validate + aspects_to_validate
     if total_to_validate > 0:
@@ -181,18 +212,7 @@ async def build_nudge(
         }
 
     # 6. Review others' stories (if stories exist that you haven't reviewed)
-    reviewed_subq = (
-        select(StoryReview.story_id)
-        .where(StoryReview.reviewer_id == user_id)
-        .scalar_subquery()
-    )
-    stories_to_review = await db.scalar(
-        select(func.count(Story.id))
-        .where(
-            Story.author_id != user_id,
-            Story.id.notin_(reviewed_subq),
-        )
-    ) or 0
+    stories_to_review = community["stories_to_review"]
 
     if stories_to_review > 0:
         return {
@@ -203,7 +223,7 @@ async def build_nudge(
         }
 
     # 7. Add aspects to worlds (if you've written stories but never proposed aspects)
-    if counts and counts.get("stories_written", 0) > 0 and counts.get("aspects_proposed", 0) == 0:
+    if counts.get("stories_written", 0) > 0 and counts.get("aspects_proposed", 0) == 0:
         return {
             "action": "add_aspect",
             "message": "You've told stories but never shaped a world's canon. Propose an aspect — technology, faction, location, or event.",
@@ -212,14 +232,7 @@ async def build_nudge(
         }
 
     # 8. Escalation-eligible actions
-    escalation_eligible = await db.scalar(
-        select(func.count(DwellerAction.id))
-        .where(
-            DwellerAction.actor_id == user_id,
-            DwellerAction.escalation_eligible == True,
-            DwellerAction.importance_confirmed_by == None,
-        )
-    ) or 0
+    escalation_eligible = counts["escalation_eligible_actions"]
 
     if escalation_eligible > 0:
         return {
@@ -266,13 +279,11 @@ async def build_nudge(
             }
 
     # 10. No dweller yet — check if worlds have regions first
-    if counts and counts.get("dwellers_created", 0) == 0:
-        world_count = await db.scalar(select(func.count(World.id))) or 0
+    if counts.get("dwellers_created", 0) == 0:
+        world_count = community["worlds"]
         if world_count > 0:
             # Check if any world has regions (required before creating dwellers)
-            inhabitable = await db.scalar(
-                select(func.count(World.id)).where(func.jsonb_array_length(World.regions) > 0)
-            ) or 0
+            inhabitable = community["inhabitable_worlds"]
             if inhabitable > 0:
                 return {
                     "action": "create_dweller",
@@ -289,12 +300,7 @@ async def build_nudge(
                 }
 
     # 11. Generate media (world/story missing cover image)
-    worlds_without_media = await db.scalar(
-        select(func.count(World.id)).where(
-            World.is_active == True,
-            World.cover_image_url == None,
-        )
-    ) or 0
+    worlds_without_media = community["worlds_without_media"]
 
     if worlds_without_media > 0:
         return {
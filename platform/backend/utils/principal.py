@@ -0,0 +1,196 @@
+"""Authenticated principal resolution, shared by middlewares and dependencies.
+
+An API key resolves to a Principal: the key's row id, its user and its expiry.
+Resolution happens at most once per request and the result is stored on the
+ASGI scope, so IdempotencyMiddleware, get_current_user and
+AgentContextMiddleware all reuse it. Behind the scope, a short-TTL in-process
+cache keyed by key hash means a warm key costs no auth queries at all.
+
+The app never revokes keys or removes users itself; that happens out of band
+(directly in SQL), so nothing in-process can invalidate the cache. A revoked
+key keeps working for at most PRINCIPAL_CACHE_TTL_SECONDS, and a missing user
+is re-checked immediately by get_current_user. PRINCIPAL_CACHE_TTL_SECONDS=0
+turns the cross-request cache off, so a resolution lives for one request only.
+
+Usage:
+    principal = await resolve_principal(scope, api_key)            # middleware
+    principal = await resolve_principal(request.scope, api_key, db)  # dependency
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import ApiKey
+from utils.clock import now as utc_now
+
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = 10_000
+
+# ApiKey.last_used_at is written at most this often per key.
+LAST_USED_RESOLUTION = timedelta(seconds=60)
+
+# Keys in scope["state"] (what Starlette exposes as request.state)
+_SCOPE_PRINCIPAL = "principal"
+_SCOPE_USER = "user"
+
+
+def hash_api_key(key: str) -> str:
+    """Hash an API key for storage."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class Principal:
+    """A valid, unrevoked API key and the user it belongs to."""
+
+    __slots__ = ("api_key_id", "user_id", "key_hash", "expires_at", "last_used_at")
+
+    def __init__(
+        self,
+        api_key_id: UUID,
+        user_id: UUID,
+        key_hash: str,
+        expires_at: datetime | None,
+        last_used_at: datetime | None,
+    ):
+        self.api_key_id = api_key_id
+        self.user_id = user_id
+        self.key_hash = key_hash
+        self.expires_at = expires_at
+        self.last_used_at = last_used_at
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at < utc_now()
+
+    def needs_last_used_write(self) -> bool:
+        """True if last_used_at is stale enough to be worth an UPDATE."""
+        return self.last_used_at is None or utc_now() - self.last_used_at >= LAST_USED_RESOLUTION
+
+
+class PrincipalCache:
+    """Bounded LRU of key hash -> Principal with a per-entry TTL."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Principal, datetime]] = OrderedDict()
+
+    def get(self, key_hash: str) -> Principal | None:
+        entry = self._entries.get(key_hash)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if utc_now() >= expires_at:
+            del self._entries[key_hash]
+            return None
+        self._entries.move_to_end(key_hash)
+        return principal
+
+    def put(self, principal: Principal) -> None:
+        if self.ttl <= timedelta(0):
+            return
+        self._entries[principal.key_hash] = (principal, utc_now() + self.ttl)
+        self._entries.move_to_end(principal.key_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_key(self, key_hash: str) -> None:
+        self._entries.pop(key_hash, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = PrincipalCache()
+
+
+def get_principal_cache() -> PrincipalCache:
+    return _cache
+
+
+def reset_principal_cache() -> None:
+    """Drop all cached principals (tests, and databases swapped under a live process)."""
+    _cache.clear()
+
+
+def api_key_from_headers(headers: list[tuple[bytes, bytes]]) -> str | None:
+    """X-API-Key, or the token from Authorization: Bearer."""
+    api_key = None
+    for key, value in headers:
+        if key == b"x-api-key":
+            api_key = value.decode()
+        elif key == b"authorization" and api_key is None:
+            auth_value = value.decode()
+            if auth_value.lower().startswith("bearer "):
+                api_key = auth_value[7:].strip()
+    return api_key
+
+
+async def _load_principal(db: AsyncSession, key_hash: str) -> Principal | None:
+    row = (await db.execute(
+        select(ApiKey.id, ApiKey.user_id, ApiKey.expires_at, ApiKey.last_used_at)
+        .where(ApiKey.key_hash == key_hash, ApiKey.is_revoked == False)  # noqa: E712
+    )).first()
+    if row is None:
+        return None
+    return Principal(row.id, row.user_id, key_hash, row.expires_at, row.last_used_at)
+
+
+async def resolve_principal(
+    scope: dict[str, Any],
+    api_key: str,
+    db: AsyncSession | None = None,
+    refresh: bool = False,
+) -> Principal | None:
+    """Resolve api_key once per request. None if the key is unknown or revoked.
+
+    Expired keys still resolve (callers decide how to report expiry). Pass the
+    request's session as db when one is open; otherwise a short-lived session
+    is used on a cache miss. refresh=True bypasses the cache, for when a cached
+    principal turned out to be stale (e.g. its user no longer exists).
+    """
+    state = scope.setdefault("state", {})
+    if not refresh and _SCOPE_PRINCIPAL in state:
+        return state[_SCOPE_PRINCIPAL]
+
+    key_hash = hash_api_key(api_key)
+    principal = None if refresh else _cache.get(key_hash)
+    if principal is None:
+        if refresh:
+            _cache.invalidate_key(key_hash)
+        if db is not None:
+            principal = await _load_principal(db, key_hash)
+        else:
+            from db.database import SessionLocal
+
+            async with SessionLocal() as session:
+                principal = await _load_principal(session, key_hash)
+        if principal is not None:
+            _cache.put(principal)
+
+    state[_SCOPE_PRINCIPAL] = principal
+    return principal
+
+
+def set_request_user(scope: dict[str, Any], user: Any) -> None:
+    """Remember the authenticated User row for later layers of this request."""
+    scope.setdefault("state", {})[_SCOPE_USER] = user
+
+
+def get_request_user(scope: dict[str, Any]) -> Any | None:
+    """The User row loaded by get_current_user for this request, if any."""
+    return scope.get("state", {}).get(_SCOPE_USER)
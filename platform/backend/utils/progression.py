@@ -8,10 +8,8 @@ from typing import Any
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import (
-    Proposal, Validation, Aspect, AspectValidation,
-    Dweller, DwellerAction, WorldEvent, Story, StoryReview,
-)
+from db import DwellerAction
+from utils.activity_counters import get_activity_counters
 
 
 # Progression thresholds
@@ -31,45 +29,12 @@ async def build_completion_tracking(db: AsyncSession, user_id) -> dict[str, Any]
     Returns counts of all activity types and a list of activities
     the agent has never performed (to help them discover features).
     """
-    # Count all activity types
-    counts = {
-        "stories_written": await db.scalar(
-            select(func.count(Story.id)).where(Story.author_id == user_id)
-        ) or 0,
-        "stories_reviewed": await db.scalar(
-            select(func.count(StoryReview.id)).where(StoryReview.reviewer_id == user_id)
-        ) or 0,
-        "proposals_validated": await db.scalar(
-            select(func.count(Validation.id)).where(Validation.agent_id == user_id)
-        ) or 0,
-        "aspects_validated": await db.scalar(
-            select(func.count(AspectValidation.id)).where(AspectValidation.agent_id == user_id)
-        ) or 0,
-        "dwellers_created": await db.scalar(
-            select(func.count(Dweller.id)).where(Dweller.created_by == user_id)
-        ) or 0,
-        "actions_taken": await db.scalar(
-            select(func.count(DwellerAction.id))
-            .where(DwellerAction.actor_id == user_id)
-        ) or 0,
-        "worlds_proposed": await db.scalar(
-            select(func.count(Proposal.id)).where(Proposal.agent_id == user_id)
-        ) or 0,
-        "aspects_proposed": await db.scalar(
-            select(func.count(Aspect.id)).where(Aspect.agent_id == user_id)
-        ) or 0,
-        "events_proposed": await db.scalar(
-            select(func.count(WorldEvent.id)).where(WorldEvent.proposed_by == user_id)
-        ) or 0,
-        # Unresponded reviews on agent's stories (used by nudge + progression prompts)
-        "unresponded_reviews": await db.scalar(
-            select(func.count(StoryReview.id))
-            .join(Story, StoryReview.story_id == Story.id)
-            .where(Story.author_id == user_id, StoryReview.author_responded == False)
-        ) or 0,
-    }
+    # One row, maintained on the write paths (see utils.activity_counters)
+    return completion_from_counts(await get_activity_counters(db, user_id))
+
 
-    # Build never_done list
+def completion_from_counts(counts: dict[str, int]) -> dict[str, Any]:
+    """Completion tracking for already-loaded activity counters (no DB needed)."""
     never_done = []
     mapping = {
         "stories_written": "never_written_story",
@@ -133,14 +98,17 @@ async def build_progression_prompts(
         })
 
     # High-importance actions eligible for escalation
-    escalation_eligible = await db.scalar(
-        select(func.count(DwellerAction.id))
-        .where(
-            DwellerAction.actor_id == user_id,
-            DwellerAction.escalation_eligible == True,
-            DwellerAction.importance_confirmed_by == None,
-        )
-    ) or 0
+    if "escalation_eligible_actions" in counts:
+        escalation_eligible = counts["escalation_eligible_actions"]
+    else:
+        escalation_eligible = await db.scalar(
+            select(func.count(DwellerAction.id))
+            .where(
+                DwellerAction.actor_id == user_id,
+                DwellerAction.escalation_eligible == True,
+                DwellerAction.importance_confirmed_by == None,
+            )
+        ) or 0
     if escalation_eligible > 0:
         prompts.append({
             "type": "escalation_eligible",
@@ -17,118 +17,85 @@ Directional signals (PROP-022 revision):
     co_occurrence_count — legacy: both named in same story (kept for backcompat)
 
 Score formula:
-    raw = 3*speaks_a_to_b + 3*speaks_b_to_a + 2*mention_a_to_b + 2*mention_b_to_a
-          + 1*thread_count + 1*co_occurrence_count
-    combined_score = raw / global_max_raw  (0.0–1.0)
+    raw_score = 3*speaks_a_to_b + 3*speaks_b_to_a + 2*mention_a_to_b + 2*mention_b_to_a
+                + 1*thread_count + 1*co_occurrence_count     (generated column)
+    combined_score = raw_score / global_max_raw_score  (0.0–1.0, computed on read)
+
+Writes are single INSERT ... ON CONFLICT DO UPDATE statements over every
+affected pair, so no write has to touch other rows to keep scores normalized.
 """
 
 import logging
-import re
 from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import select, text
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import Dweller, World
 from db.models import Story, DwellerAction, DwellerRelationship
+from utils.deterministic import deterministic_uuid4
+from utils.name_matcher import get_world_name_matcher
 
 logger = logging.getLogger(__name__)
 
-# Skip very short names to avoid false-positive matches in prose (e.g. "Al", "Ed").
-_MIN_NAME_LENGTH = 3
-
-
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+_COUNT_COLUMNS = (
+    "co_occurrence_count",
+    "speak_count_a_to_b",
+    "speak_count_b_to_a",
+    "story_mention_a_to_b",
+    "story_mention_b_to_a",
+    "thread_count",
+)
+
+
 def _canonical(a_id: str, b_id: str) -> tuple[str, str]:
     """Return (smaller_id, larger_id) to match the CHECK constraint."""
     return (a_id, b_id) if a_id < b_id else (b_id, a_id)
 
 
-async def _get_or_create_relationship(
-    db: AsyncSession,
-    a_id: str,
-    b_id: str,
-) -> DwellerRelationship:
-    """Load existing relationship row or create a blank one (not yet added to session)."""
-    existing = (await db.execute(
-        select(DwellerRelationship).where(
-            DwellerRelationship.dweller_a_id == UUID(a_id),
-            DwellerRelationship.dweller_b_id == UUID(b_id),
-        )
-    )).scalar_one_or_none()
-
-    if existing:
-        return existing
-
-    rel = DwellerRelationship(
-        dweller_a_id=UUID(a_id),
-        dweller_b_id=UUID(b_id),
-        co_occurrence_count=0,
-        shared_story_ids=[],
-        combined_score=0.0,
-        speak_count_a_to_b=0,
-        speak_count_b_to_a=0,
-        story_mention_a_to_b=0,
-        story_mention_b_to_a=0,
-        thread_count=0,
-    )
-    db.add(rel)
-    return rel
-
-
-def _raw_score(rel: DwellerRelationship) -> float:
-    return (
-        3.0 * rel.speak_count_a_to_b
-        + 3.0 * rel.speak_count_b_to_a
-        + 2.0 * rel.story_mention_a_to_b
-        + 2.0 * rel.story_mention_b_to_a
-        + 1.0 * rel.thread_count
-        + 1.0 * rel.co_occurrence_count
-    )
+def _pair_row(a_id: str, b_id: str, now: datetime, **counts: Any) -> dict[str, Any]:
+    """One VALUES row for _upsert_pairs: count increments for the (a, b) pair."""
+    row: dict[str, Any] = {
+        "id": deterministic_uuid4(),
+        "dweller_a_id": UUID(a_id),
+        "dweller_b_id": UUID(b_id),
+        "shared_story_ids": [],
+        "last_interaction_at": None,
+        "updated_at": now,
+    }
+    row.update({column: 0 for column in _COUNT_COLUMNS})
+    row.update(counts)
+    return row
 
 
-async def _recompute_scores_for_dwellers(
-    db: AsyncSession, dweller_ids: list[str]
-) -> None:
-    """Recompute combined_score for all relationships touching the given dwellers.
+async def _upsert_pairs(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Apply count increments to many pairs in one INSERT ... ON CONFLICT DO UPDATE.
 
-    combined_score = raw_score / global_max_raw_score  (normalized 0.0–1.0)
+    New pairs are inserted with the increments as their counts; existing pairs
+    add them. shared_story_ids gains the row's stories it doesn't have yet.
+    Each pair may appear only once in rows.
     """
-    # Global max raw score for normalization
-    max_result = await db.execute(
-        text("""
-            SELECT MAX(
-                3.0 * speak_count_a_to_b
-                + 3.0 * speak_count_b_to_a
-                + 2.0 * story_mention_a_to_b
-                + 2.0 * story_mention_b_to_a
-                + 1.0 * thread_count
-                + 1.0 * co_occurrence_count
-            )
-            FROM platform_dweller_relationships
-        """)
-    )
-    max_raw = float(max_result.scalar() or 1.0)
-    if max_raw == 0:
-        max_raw = 1.0
-
-    uuid_ids = [UUID(did) for did in dweller_ids]
-    rels_result = await db.execute(
-        select(DwellerRelationship).where(
-            (DwellerRelationship.dweller_a_id.in_(uuid_ids)) |
-            (DwellerRelationship.dweller_b_id.in_(uuid_ids))
-        )
+    if not rows:
+        return
+    stmt = pg_insert(DwellerRelationship).values(rows)
+    table = DwellerRelationship.__table__
+    excluded = stmt.excluded
+    set_: dict[str, Any] = {column: table.c[column] + excluded[column] for column in _COUNT_COLUMNS}
+    set_["shared_story_ids"] = case(
+        (table.c.shared_story_ids.contains(excluded.shared_story_ids), table.c.shared_story_ids),
+        else_=table.c.shared_story_ids.concat(excluded.shared_story_ids),
     )
-    rels = rels_result.scalars().all()
-
-    for rel in rels:
-        rel.combined_score = round(_raw_score(rel) / max_raw, 6)
+    set_["last_interaction_at"] = func.coalesce(excluded.last_interaction_at, table.c.last_interaction_at)
+    set_["updated_at"] = excluded.updated_at
+    await db.execute(stmt.on_conflict_do_update(constraint="uq_dweller_relationship_pair", set_=set_))
 
 
 # ---------------------------------------------------------------------------
@@ -140,37 +107,25 @@ async def update_relationships_for_story(db: AsyncSession, story: Story) -> None
 
     Signals updated:
     - story_mention_a_to_b: perspective dweller (A) mentions another dweller (B) by name
-    - co_occurrence_count: any two dwellers co-occurring in the story (legacy signal)
-    - shared_story_ids: story IDs with co-occurrence
+    - co_occurrence_count: any two non-perspective dwellers co-occurring in the story (legacy signal)
+    - shared_story_ids: the story, for every pair above
+
+    Two round trips regardless of how many dwellers are mentioned: check the
+    world's cached name matcher (utils/name_matcher.py), then one bulk upsert
+    of every pair.
 
     Called after story creation commits (in new transaction from stories.py).
     """
     if not story.content:
         return
 
-    # Load all active dwellers in this world
-    dweller_q = (
-        select(Dweller)
-        .where(Dweller.world_id == story.world_id, Dweller.is_active == True)  # noqa: E712
-    )
-    dweller_rows = (await db.execute(dweller_q)).scalars().all()
-
-    if not dweller_rows:
-        return
+    # Dwellers mentioned by name in the story content (word-boundary match)
+    matcher = await get_world_name_matcher(db, story.world_id)
+    mentioned_ids: list[str] = matcher.find(story.content)
 
-    content_lower = story.content.lower()
     story_id = str(story.id)
     perspective_id = str(story.perspective_dweller_id) if story.perspective_dweller_id else None
 
-    # Find dwellers mentioned by name in the story content (word-boundary match)
-    mentioned_ids: list[str] = []
-    for d in dweller_rows:
-        name_lower = d.name.lower()
-        if len(name_lower) < _MIN_NAME_LENGTH:
-            continue
-        if re.search(r'\b' + re.escape(name_lower) + r'\b', content_lower):
-            mentioned_ids.append(str(d.id))
-
     # Include the perspective dweller even if not mentioned by name
     if perspective_id and perspective_id not in mentioned_ids:
         mentioned_ids.append(perspective_id)
@@ -178,46 +133,35 @@ async def update_relationships_for_story(db: AsyncSession, story: Story) -> None
     if len(mentioned_ids) < 2:
         return
 
+    now = datetime.now(timezone.utc)
+    rows: list[dict[str, Any]] = []
+
     # ── Directional: story mentions (perspective dweller → mentioned dwellers) ──
     if perspective_id:
-        other_mentioned = [mid for mid in mentioned_ids if mid != perspective_id]
-        for other_id in other_mentioned:
+        for other_id in mentioned_ids:
+            if other_id == perspective_id:
+                continue
             a_id, b_id = _canonical(perspective_id, other_id)
-            rel = await _get_or_create_relationship(db, a_id, b_id)
-
             # perspective → other: is A→B or B→A depending on canonical order
-            if perspective_id == a_id:
-                rel.story_mention_a_to_b += 1
-            else:
-                rel.story_mention_b_to_a += 1
-            rel.updated_at = datetime.now(timezone.utc)
+            direction = "story_mention_a_to_b" if perspective_id == a_id else "story_mention_b_to_a"
+            rows.append(_pair_row(a_id, b_id, now, shared_story_ids=[story_id], **{direction: 1}))
 
     # ── Legacy co-occurrence: non-perspective pairs only ──
     # Pairs involving the perspective dweller are already captured directionally
     # via story_mention_a_to_b / story_mention_b_to_a above — skip them here to
     # avoid double-counting in the score formula.
     non_perspective_ids = [mid for mid in mentioned_ids if mid != perspective_id]
-    pairs: list[tuple[str, str]] = []
+    pairs = 0
     for i in range(len(non_perspective_ids)):
         for j in range(i + 1, len(non_perspective_ids)):
-            pairs.append(_canonical(non_perspective_ids[i], non_perspective_ids[j]))
-
-    for a_id, b_id in pairs:
-        rel = await _get_or_create_relationship(db, a_id, b_id)
-        rel.co_occurrence_count += 1
-        current_stories = list(rel.shared_story_ids or [])
-        if story_id not in current_stories:
-            current_stories.append(story_id)
-            rel.shared_story_ids = current_stories
-        rel.updated_at = datetime.now(timezone.utc)
+            a_id, b_id = _canonical(non_perspective_ids[i], non_perspective_ids[j])
+            rows.append(_pair_row(a_id, b_id, now, shared_story_ids=[story_id], co_occurrence_count=1))
+            pairs += 1
 
-    # Flush so score recomputation sees current counts
-    await db.flush()
-
-    await _recompute_scores_for_dwellers(db, mentioned_ids)
+    await _upsert_pairs(db, rows)
 
     logger.info(
-        "Updated relationships for story %s: %d pairs", story_id, len(pairs)
+        "Updated relationships for story %s: %d pairs", story_id, len(rows)
     )
 
 
@@ -228,6 +172,7 @@ async def update_relationships_for_story(db: AsyncSession, story: Story) -> None
 async def update_relationships_for_action(
     db: AsyncSession,
     action: DwellerAction,
+    target_dweller: Optional[Dweller] = None,
 ) -> None:
     """Update materialized relationships after a SPEAK action is created.
 
@@ -241,72 +186,53 @@ async def update_relationships_for_action(
     - last_interaction_at
 
     This is called synchronously after `db.flush()` in take_action(), before commit.
-    It assumes target_dweller has already been resolved by the caller (and passed
-    via action.target name), so we resolve target ID here by name lookup.
+    take_action() passes the target it already resolved; otherwise the target
+    is looked up by case-insensitive name in the speaker's world, through the
+    (world_id, lower(name)) index. Inactive targets are skipped.
     """
     if action.action_type != "speak" or not action.target:
         return
 
     speaker_id = str(action.dweller_id)
 
-    # Resolve target name to dweller ID in the same world
-    speaker = (await db.execute(
-        select(Dweller).where(Dweller.id == action.dweller_id)
-    )).scalar_one_or_none()
-
-    if not speaker:
-        logger.warning("update_relationships_for_action: speaker dweller %s not found", speaker_id)
-        return
-
-    target_q = select(Dweller).where(
-        Dweller.world_id == speaker.world_id,
-        Dweller.is_active == True,  # noqa: E712
-        # Case-insensitive match on name
-    )
-    all_world_dwellers = (await db.execute(target_q)).scalars().all()
-
-    target_dweller = None
-    target_name_lower = action.target.lower()
-    for d in all_world_dwellers:
-        if d.name.lower() == target_name_lower:
-            target_dweller = d
-            break
+    if target_dweller is None:
+        # Resolve target name to dweller in the speaker's world
+        target_dweller = await db.scalar(
+            select(Dweller).where(
+                Dweller.world_id == action.world_id,
+                func.lower(Dweller.name) == action.target.lower(),
+            )
+        )
 
-    if not target_dweller:
+    if target_dweller is None or not target_dweller.is_active:
         logger.debug(
-            "update_relationships_for_action: target '%s' not found as dweller in world %s",
-            action.target, speaker.world_id,
+            "update_relationships_for_action: target '%s' not found as active dweller in the world of %s",
+            action.target, speaker_id,
         )
         return
 
     target_id = str(target_dweller.id)
+    if target_id == speaker_id:
+        return
     a_id, b_id = _canonical(speaker_id, target_id)
-    rel = await _get_or_create_relationship(db, a_id, b_id)
 
     # Increment directional speak count (speaker → target)
-    if speaker_id == a_id:
-        rel.speak_count_a_to_b += 1
-    else:
-        rel.speak_count_b_to_a += 1
+    direction = "speak_count_a_to_b" if speaker_id == a_id else "speak_count_b_to_a"
+    counts = {direction: 1}
 
     # Thread counting: if this reply is to an action from the target dweller, it's a thread
     if action.in_reply_to_action_id:
-        replied_to = (await db.execute(
-            select(DwellerAction).where(DwellerAction.id == action.in_reply_to_action_id)
-        )).scalar_one_or_none()
-        if replied_to and str(replied_to.dweller_id) == target_id:
-            rel.thread_count += 1
-
-    rel.last_interaction_at = datetime.now(timezone.utc)
-    rel.updated_at = datetime.now(timezone.utc)
+        # Usually already in the session: take_action() validated the reply
+        replied_to = await db.get(DwellerAction, action.in_reply_to_action_id)
+        if replied_to is not None and str(replied_to.dweller_id) == target_id:
+            counts["thread_count"] = 1
 
-    await db.flush()
-
-    await _recompute_scores_for_dwellers(db, [speaker_id, target_id])
+    now = datetime.now(timezone.utc)
+    await _upsert_pairs(db, [_pair_row(a_id, b_id, now, last_interaction_at=now, **counts)])
 
     logger.info(
         "Updated relationship for speak action %s: %s → %s",
-        action.id, speaker.name, target_dweller.name,
+        action.id, speaker_id, target_dweller.name,
     )
 
 
@@ -321,7 +247,8 @@ async def get_dweller_graph(
 ) -> dict:
     """Return nodes (dwellers) and edges (relationships) for D3 visualization.
 
-    Reads from platform_dweller_relationships — zero computation.
+    Reads from platform_dweller_relationships. combined_score is raw_score
+    divided by the global maximum, so scores stay comparable across worlds.
 
     Returns:
         {
@@ -370,8 +297,10 @@ async def get_dweller_graph(
     # ── Load pre-computed relationships ────────────────────────────────────────
     dweller_uuids = [UUID(did) for did in dwellers_by_id]
 
+    max_raw = await db.scalar(select(func.max(DwellerRelationship.raw_score))) or 1.0
+
     rel_q = select(DwellerRelationship).where(
-        DwellerRelationship.combined_score > 0,
+        DwellerRelationship.raw_score > 0,
         (DwellerRelationship.dweller_a_id.in_(dweller_uuids)) |
         (DwellerRelationship.dweller_b_id.in_(dweller_uuids)),
     )
@@ -402,7 +331,7 @@ async def get_dweller_graph(
             "source": src,
             "target": tgt,
             "weight": total_interactions,
-            "combined_score": rel.combined_score,
+            "combined_score": round(rel.raw_score / max_raw, 6),
             "stories": rel.shared_story_ids or [],
             # Directional fields (PROP-022 revision)
             "speaks_a_to_b": rel.speak_count_a_to_b,
@@ -0,0 +1,153 @@
+"""Shared transport for agent webhook callbacks.
+
+send_callback() used to open a new httpx.AsyncClient (fresh connection pool,
+fresh TLS handshake) per notification, and SSRF validation resolved the
+callback host with a blocking socket.getaddrinfo on the event loop. This
+module provides the pieces the delivery path now shares:
+
+- one pooled AsyncClient per event loop, closed on app shutdown
+- async hostname resolution through the loop's resolver, cached with a TTL
+- a per-host semaphore so one slow receiver can't absorb a whole batch
+- exponential backoff for scheduling the next delivery attempt
+
+Usage:
+    ips = await resolve_host("hooks.example.com")
+    async with host_slot(url):
+        response = await get_webhook_client().post(url, json=payload)
+    notification.next_attempt_at = next_attempt_at(notification.retry_count)
+"""
+
+import asyncio
+import os
+import socket
+import weakref
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+import httpx
+
+from utils.clock import now as utc_now
+from utils.deterministic import randint
+
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "100"))
+WEBHOOK_PER_HOST_CONCURRENCY = int(os.getenv("WEBHOOK_PER_HOST_CONCURRENCY", "4"))
+WEBHOOK_DNS_TTL_SECONDS = int(os.getenv("WEBHOOK_DNS_TTL_SECONDS", "300"))
+# Failed lookups are cached briefly so a dead hostname isn't re-resolved per row
+WEBHOOK_DNS_NEGATIVE_TTL_SECONDS = 30
+WEBHOOK_DNS_MAX_ENTRIES = 10_000
+
+# Retry n waits BASE * 2^(n-1) seconds (plus up to 10% jitter), capped at MAX
+WEBHOOK_RETRY_BASE_SECONDS = int(os.getenv("WEBHOOK_RETRY_BASE_SECONDS", "60"))
+WEBHOOK_RETRY_MAX_SECONDS = 3600
+
+
+class DnsCache:
+    """Hostname -> resolved IPs, resolved off the event loop and kept for a TTL."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = WEBHOOK_DNS_TTL_SECONDS,
+        negative_ttl_seconds: int = WEBHOOK_DNS_NEGATIVE_TTL_SECONDS,
+        max_entries: int = WEBHOOK_DNS_MAX_ENTRIES,
+    ):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.negative_ttl = timedelta(seconds=negative_ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[frozenset[str] | socket.gaierror, datetime]] = {}
+
+    async def resolve(self, host: str) -> frozenset[str]:
+        """All addresses for host. Raises socket.gaierror if it doesn't resolve."""
+        entry = self._entries.get(host)
+        if entry is not None and utc_now() < entry[1]:
+            if isinstance(entry[0], socket.gaierror):
+                raise entry[0]
+            return entry[0]
+
+        loop = asyncio.get_running_loop()
+        try:
+            addr_info = await loop.getaddrinfo(host, None, family=socket.AF_UNSPEC)
+        except socket.gaierror as e:
+            self._store(host, e, self.negative_ttl)
+            raise
+        ips = frozenset(info[4][0] for info in addr_info)
+        self._store(host, ips, self.ttl)
+        return ips
+
+    def _store(self, host: str, value: frozenset[str] | socket.gaierror, ttl: timedelta) -> None:
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[host] = (value, utc_now() + ttl)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _LoopTransport:
+    """The pooled client and per-host limits belonging to one event loop."""
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=WEBHOOK_MAX_CONNECTIONS,
+                max_keepalive_connections=WEBHOOK_MAX_CONNECTIONS,
+            ),
+        )
+        self.host_slots: dict[str, asyncio.Semaphore] = {}
+
+
+_dns_cache = DnsCache()
+# asyncio primitives and pooled connections are bound to the loop that made
+# them; keying by loop keeps test loops (and worker processes) independent.
+_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopTransport]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _transport() -> _LoopTransport:
+    loop = asyncio.get_running_loop()
+    transport = _transports.get(loop)
+    if transport is None or transport.client.is_closed:
+        transport = _transports[loop] = _LoopTransport()
+    return transport
+
+
+def get_webhook_client() -> httpx.AsyncClient:
+    """The process-wide pooled client for callback delivery."""
+    return _transport().client
+
+
+def host_slot(url: str) -> asyncio.Semaphore:
+    """Semaphore limiting concurrent deliveries to url's host:port."""
+    slots = _transport().host_slots
+    host = urlparse(url).netloc.lower()
+    slot = slots.get(host)
+    if slot is None:
+        slot = slots[host] = asyncio.Semaphore(WEBHOOK_PER_HOST_CONCURRENCY)
+    return slot
+
+
+async def close_webhook_client() -> None:
+    """Close this loop's pooled client (app shutdown)."""
+    loop = asyncio.get_running_loop()
+    transport = _transports.pop(loop, None)
+    if transport is not None:
+        await transport.client.aclose()
+
+
+async def resolve_host(host: str) -> frozenset[str]:
+    """Resolve host through the shared TTL cache."""
+    return await _dns_cache.resolve(host)
+
+
+def reset_dns_cache() -> None:
+    """Forget cached lookups (tests)."""
+    _dns_cache.clear()
+
+
+def next_attempt_at(retry_count: int) -> datetime:
+    """When a delivery that has failed retry_count times should next be tried."""
+    delay = min(WEBHOOK_RETRY_BASE_SECONDS * 2 ** max(retry_count - 1, 0), WEBHOOK_RETRY_MAX_SECONDS)
+    return utc_now() + timedelta(seconds=delay + randint(0, delay // 10))
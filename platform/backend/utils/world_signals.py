@@ -3,13 +3,17 @@
 Provides aggregate statistics about world activity to help agents understand
 where attention is needed. No LLM interpretation - just raw counts and patterns
 that the agent's OpenClaw LLM can interpret.
+
+Each signal type is one grouped pass over all of the agent's worlds
+(GROUP BY world_id), so an agent touching 50 worlds costs the same five
+statements as one touching a single world.
 """
 
 from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import (
@@ -18,11 +22,8 @@ from db import (
     World,
     Aspect,
     AspectStatus,
-    WorldEvent,
-    WorldEventStatus,
-    ReviewFeedback,
-    User,
 )
+from utils.clock import now as utc_now
 
 
 async def build_world_signals(
@@ -41,133 +42,100 @@ async def build_world_signals(
     Returns:
         Dictionary mapping world_id to aggregate signals
     """
+    now = utc_now()
     # Default to last 24 hours
     if since is None:
-        since = datetime.utcnow() - timedelta(hours=24)
+        since = now - timedelta(hours=24)
 
     # Find all worlds where this user has created content
-    # (proposals, aspects, dwellers, stories, or is a validator)
+    # (created the world, proposed an aspect, created or inhabits a dweller)
     worlds_query = (
-        select(World)
-        .distinct()
-        .outerjoin(Aspect, Aspect.world_id == World.id)
-        .outerjoin(Dweller, Dweller.world_id == World.id)
+        select(World.id, World.name)
         .where(
-            (World.created_by == user_id)
-            | (Aspect.agent_id == user_id)
-            | (Dweller.created_by == user_id)
-            | (Dweller.inhabited_by == user_id)
-        )
-    )
-
-    result = await db.execute(worlds_query)
-    worlds = result.scalars().all()
-
-    signals: dict[str, Any] = {}
-
-    for world in worlds:
-        # Action counts by region
-        actions_by_region_query = (
-            select(
-                Dweller.current_region,
-                func.count(DwellerAction.id).label("count")
-            )
-            .select_from(DwellerAction)
-            .join(Dweller, DwellerAction.dweller_id == Dweller.id)
-            .where(
-                Dweller.world_id == world.id,
-                DwellerAction.created_at >= since,
-                Dweller.current_region.isnot(None),
-            )
-            .group_by(Dweller.current_region)
-        )
-
-        region_result = await db.execute(actions_by_region_query)
-        actions_by_region = {row[0]: row[1] for row in region_result.all()}
-
-        # Action counts by type
-        actions_by_type_query = (
-            select(
-                DwellerAction.action_type,
-                func.count(DwellerAction.id).label("count")
-            )
-            .select_from(DwellerAction)
-            .join(Dweller, DwellerAction.dweller_id == Dweller.id)
-            .where(
-                Dweller.world_id == world.id,
-                DwellerAction.created_at >= since,
-            )
-            .group_by(DwellerAction.action_type)
-        )
-
-        type_result = await db.execute(actions_by_type_query)
-        actions_by_type = {row[0]: row[1] for row in type_result.all()}
-
-        # Total action count
-        total_actions = sum(actions_by_type.values())
-
-        # Active dwellers (those who acted in the period)
-        active_dwellers_query = (
-            select(func.count(func.distinct(DwellerAction.dweller_id)))
-            .select_from(DwellerAction)
-            .join(Dweller, DwellerAction.dweller_id == Dweller.id)
-            .where(
-                Dweller.world_id == world.id,
-                DwellerAction.created_at >= since,
+            or_(
+                World.created_by == user_id,
+                World.id.in_(select(Aspect.world_id).where(Aspect.agent_id == user_id)),
+                World.id.in_(
+                    select(Dweller.world_id).where(
+                        or_(Dweller.created_by == user_id, Dweller.inhabited_by == user_id)
+                    )
+                ),
             )
         )
+        .order_by(World.created_at, World.id)
+    )
+    worlds = (await db.execute(worlds_query)).all()
+    if not worlds:
+        return {}
+
+    world_ids = [world.id for world in worlds]
+    recent_actions = (
+        DwellerAction.world_id.in_(world_ids),
+        DwellerAction.created_at >= since,
+    )
 
-        active_result = await db.execute(active_dwellers_query)
-        active_dwellers = active_result.scalar() or 0
-
-        # Active conversations (speak actions with in_reply_to)
-        conversations_query = (
-            select(func.count(func.distinct(DwellerAction.in_reply_to_action_id)))
-            .select_from(DwellerAction)
-            .join(Dweller, DwellerAction.dweller_id == Dweller.id)
-            .where(
-                Dweller.world_id == world.id,
-                DwellerAction.action_type == "speak",
-                DwellerAction.in_reply_to_action_id.isnot(None),
-                DwellerAction.created_at >= since,
-            )
-        )
-
-        conv_result = await db.execute(conversations_query)
-        active_conversations = conv_result.scalar() or 0
-
-        # Pending reviews
-        pending_reviews_query = (
-            select(func.count(Aspect.id))
-            .where(
-                Aspect.world_id == world.id,
-                Aspect.status == AspectStatus.VALIDATING,
-            )
+    # Action counts by region
+    actions_by_region: dict[UUID, dict[str, int]] = {world_id: {} for world_id in world_ids}
+    region_result = await db.execute(
+        select(DwellerAction.world_id, DwellerAction.region, func.count(DwellerAction.id))
+        .where(*recent_actions, DwellerAction.region.isnot(None))
+        .group_by(DwellerAction.world_id, DwellerAction.region)
+    )
+    for world_id, region, count in region_result:
+        actions_by_region[world_id][region] = count
+
+    # Action counts by type
+    actions_by_type: dict[UUID, dict[str, int]] = {world_id: {} for world_id in world_ids}
+    type_result = await db.execute(
+        select(DwellerAction.world_id, DwellerAction.action_type, func.count(DwellerAction.id))
+        .where(*recent_actions)
+        .group_by(DwellerAction.world_id, DwellerAction.action_type)
+    )
+    for world_id, action_type, count in type_result:
+        actions_by_type[world_id][action_type] = count
+
+    # Active dwellers (those who acted in the period) and active conversations
+    # (speak actions replying to another action)
+    activity_result = await db.execute(
+        select(
+            DwellerAction.world_id,
+            func.count(func.distinct(DwellerAction.dweller_id)),
+            func.count(func.distinct(DwellerAction.in_reply_to_action_id)).filter(
+                DwellerAction.action_type == "speak"
+            ),
         )
-
-        pending_result = await db.execute(pending_reviews_query)
-        pending_reviews = pending_result.scalar() or 0
-
-        # Recent canon changes
-        canon_changes_query = (
-            select(func.count(Aspect.id))
-            .where(
-                Aspect.world_id == world.id,
+        .where(*recent_actions)
+        .group_by(DwellerAction.world_id)
+    )
+    activity = {world_id: (dwellers, conversations) for world_id, dwellers, conversations in activity_result}
+
+    # Pending reviews and recent canon changes
+    aspect_result = await db.execute(
+        select(
+            Aspect.world_id,
+            func.count(Aspect.id).filter(Aspect.status == AspectStatus.VALIDATING),
+            func.count(Aspect.id).filter(
                 Aspect.status == AspectStatus.APPROVED,
                 Aspect.updated_at >= since,
-            )
+            ),
         )
+        .where(Aspect.world_id.in_(world_ids))
+        .group_by(Aspect.world_id)
+    )
+    aspects = {world_id: (pending, canon) for world_id, pending, canon in aspect_result}
 
-        canon_result = await db.execute(canon_changes_query)
-        recent_canon_changes = canon_result.scalar() or 0
-
+    period = f"last_{int((now - since).total_seconds() / 3600)}h"
+    signals: dict[str, Any] = {}
+    for world in worlds:
+        active_dwellers, active_conversations = activity.get(world.id, (0, 0))
+        pending_reviews, recent_canon_changes = aspects.get(world.id, (0, 0))
         signals[str(world.id)] = {
             "world_name": world.name,
-            "period": f"last_{int((datetime.utcnow() - since).total_seconds() / 3600)}h",
-            "action_count": total_actions,
+            "period": period,
+            "action_count": sum(actions_by_type[world.id].values()),
             "active_dwellers": active_dwellers,
-            "actions_by_region": actions_by_region,
-            "actions_by_type": actions_by_type,
+            "actions_by_region": actions_by_region[world.id],
+            "actions_by_type": actions_by_type[world.id],
             "active_conversations": active_conversations,
             "pending_reviews": pending_reviews,
             "recent_canon_changes": recent_canon_changes,
@@ -104,7 +104,7 @@ echo
 
 # Start backend API server
 echo -e "${BLUE}Starting backend API server...${NC}"
-uvicorn main:app --host 0.0.0.0 --port 8000 --reload > ../.backend.log 2>&1 &
+JOB_WORKER_EMBEDDED=true uvicorn main:app --host 0.0.0.0 --port 8000 --reload > ../.backend.log 2>&1 &
 BACKEND_PID=$!
 echo $BACKEND_PID > ../.backend.pid
 cd ..
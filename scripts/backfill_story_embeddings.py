@@ -36,19 +36,21 @@ logger = logging.getLogger("backfill")
 
 
 async def main() -> None:
-    from db.database import AsyncSessionLocal
+    from db.database import SessionLocal
     from utils.arc_service import detect_arcs
 
     logger.info("Starting story embedding backfill + arc detection")
 
-    async with AsyncSessionLocal() as db:
-        results = await detect_arcs(db=db)
+    async with SessionLocal() as db:
+        result = await detect_arcs(db=db)
+        await db.commit()
 
+    stats = result["stats"]
     logger.info(
-        "Done! %d arc(s) created or updated.",
-        len(results),
+        "Done! %d arc(s) created or updated; embedded %d stories (%d failed); %s stories/s.",
+        stats["arcs"], stats["embedded"], stats["embed_failed"], stats["stories_per_second"],
     )
-    for r in results:
+    for r in result["arcs"]:
         logger.info("  %s arc '%s' (%d stories)", r["action"], r["name"], r["story_count"])
 
 
@@ -132,9 +132,13 @@ async def run_backfill():
 
     async with SessionLocal() as db:
         try:
-            arcs = await detect_arcs(db)
+            result = await detect_arcs(db)
             await db.commit()
-            logger.info("Arc backfill complete: %d arcs created", len(arcs))
+            stats = result["stats"]
+            logger.info(
+                "Arc backfill complete: %d arcs from %d stories in %.1fs (%s stories/s)",
+                stats["arcs"], stats["stories"], stats["total_seconds"], stats["stories_per_second"],
+            )
         except Exception:
             logger.exception("Arc backfill failed")
 
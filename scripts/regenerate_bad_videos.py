@@ -27,7 +27,7 @@ from pathlib import Path
 from openai import OpenAI
 from sqlalchemy import create_engine, text
 
-# Allow importing from the backend (media.generator, storage.r2, etc.)
+# Allow importing from the backend (media.generator, storage, etc.)
 backend_dir = Path(__file__).parent.parent / "platform" / "backend"
 sys.path.insert(0, str(backend_dir))
 
@@ -158,16 +158,17 @@ async def process_story(story: dict, dry_run: bool, openai_client: OpenAI, engin
         return
 
     # Import here so dry-run doesn't require all env vars to be set
-    from media.generator import generate_video  # noqa: PLC0415
-    from storage.r2 import upload_media  # noqa: PLC0415
+    from media.generator import generate_video_url, stream_video  # noqa: PLC0415
+    from storage import upload_stream  # noqa: PLC0415
 
     logger.info("Generating video via Grok...")
-    video_bytes = await generate_video(rewritten)
+    source_url = await generate_video_url(rewritten)
 
     key = f"media/story/{story_id}/video/{uuid.uuid4()}.mp4"
-    logger.info(f"Uploading to R2: {key}")
-    video_url = upload_media(video_bytes, key, "video/mp4")
-    logger.info(f"Uploaded: {video_url}")
+    logger.info(f"Streaming to storage: {key}")
+    stored = await upload_stream(stream_video(source_url), key, "video/mp4")
+    video_url = stored.url
+    logger.info(f"Uploaded: {video_url} ({stored.size} bytes)")
 
     with engine.connect() as conn:
         update_story_video(conn, story_id, video_url, rewritten)
@@ -191,11 +192,19 @@ async def main() -> None:
         logger.info("Nothing to do.")
         return
 
-    for story in stories:
-        try:
-            await process_story(story, dry_run=args.dry_run, openai_client=openai_client, engine=engine)
-        except Exception as e:
-            logger.error(f"Failed for story {story['id']}: {e}", exc_info=True)
+    try:
+        for story in stories:
+            try:
+                await process_story(story, dry_run=args.dry_run, openai_client=openai_client, engine=engine)
+            except Exception as e:
+                logger.error(f"Failed for story {story['id']}: {e}", exc_info=True)
+    finally:
+        if not args.dry_run:
+            from media.generator import close_xai_client  # noqa: PLC0415
+            from storage import close_storage  # noqa: PLC0415
+
+            await close_xai_client()
+            await close_storage()
 
     logger.info("\nDone.")
 